@@ -14,6 +14,7 @@
 #define DEFAULT_LED_BRIGHTNESS      80      // percent (every preset)
 #define DEFAULT_LED_MAX_ON_TIME     3600    // seconds (every preset)
 #define DEFAULT_UNLOCK_DELAY_TIME   0       // milliseconds
+#define DEFAULT_GROUP_MASK          0       // member of no group (reg 82)
 
 // Factory palette for the 8 LED color presets ({brightness, R, G, B, maxOn}
 // per preset) — the legacy per-light defaults, so an R5.0 board dropped into
@@ -94,6 +95,12 @@
 // record; the AT24 has 3.8 KB spare above it.
 #define STATS_AT24_ADDR_B           384
 #define STATS_PERSIST_INTERVAL_MS   3600000UL // hourly, plus a flush before every commanded reset
+// Latch timing histograms (regs 810-839): their own A/B record, written by
+// the same change-detected persist as the blob above. Kept out of the
+// 92-byte blob so its layout, its write cliff and the downgrade path stay
+// as they are. 60 bytes from a 32-aligned base: three write cycles (30/2/28).
+#define LATCH_TIMING_AT24_ADDR      512
+#define LATCH_TIMING_AT24_ADDR_B    576
 
 // --- Commissioning record (AT24) ---
 // Which ID-patched image this board has already consumed. Deliberately NOT a
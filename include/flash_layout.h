@@ -44,11 +44,22 @@
 #define FLASH_OTA_MAX_IMAGE_SIZE    (FLASH_STAGING_IMAGE_PAGES * FLASH_LAYOUT_PAGE_SIZE) // 61,440
 
 // OTA transfer chunk: 128 bytes. Sized so one Modbus FC16 broadcast frame
-// (68 registers, ADU 145 bytes) fits the enlarged 256-byte UART RX ring,
+// (68 registers, ADU 145 bytes) fit the original 256-byte UART RX ring,
 // and so chunks divide both the flash page and the image cap exactly.
 #define FLASH_OTA_CHUNK_SIZE        128u
 #define FLASH_OTA_MAX_CHUNKS        (FLASH_OTA_MAX_IMAGE_SIZE / FLASH_OTA_CHUNK_SIZE)    // 480
 
+// Negotiated chunks (reg 358, reg 289 bits 8-15) go up to this: the largest
+// multiple of 8 whose frame — index, len, crc16, data, commit — is one FC16
+// (123 registers at most): 120 registers, ADU 249 bytes. Sizes are whole
+// doublewords (reg 289 carries size / 8), so every chunk still starts on
+// one; above 128 a chunk may straddle a page, which the staging driver takes.
+#define FLASH_OTA_WIDE_CHUNK_SIZE   232u
+
+// Compressed chunks (reg 289 bit 2, tools/ota_lz.py) each decode into at
+// most this many image bytes: the app's decode buffer, ~4x a raw chunk.
+#define FLASH_OTA_LZ_MAX_DECODED    512u
+
 // Staging header (written LAST, after the staged image verifies).
 // hdrCrc16 = CRC16-CCITT over magic..crc32 so a torn header self-invalidates.
 #define FLASH_OTA_HEADER_MAGIC      0x4C475355u   // 'LGSU'
@@ -2,7 +2,8 @@
 #define VERSION_H
 
 /*  @file version.h
- *  @brief Compile-time device identity, reported via Modbus registers 0-2.
+ *  @brief Compile-time device identity, reported via Modbus registers 0-2
+ *         (the build ID via 394-395).
  *
  *  These are constants baked into the firmware image (never stored in
  *  EEPROM), so the reported versions always match the running build.
@@ -45,4 +46,13 @@
 #define HW_VERSION      510
 #endif
 
+// Build ID: the git commit the image was built from, as its first 8 hex
+// digits (0x1a2b3c4d for 1a2b3c4d...), set by tools/build_id.py; 0 = built
+// outside a git checkout. FW_VERSION only moves at a release, so test builds
+// share one — the build ID and the image CRC next to it (regs 390-395) are
+// what tell them apart.
+#ifndef FW_BUILD_ID
+#define FW_BUILD_ID     0u
+#endif
+
 #endif // VERSION_H
@@ -11,6 +11,8 @@
 #include "app/servo_control.h"
 #include "app/ota_control.h"
 #include "app/diag_control.h"
+#include "app/group_control.h"
+#include "app/loop_profile.h"
 #include "drivers/board_io.h"
 #include "drivers/rs485_port.h"
 #include "drivers/led_ring.h"
@@ -107,7 +109,9 @@ void appInit()
     displayControlInit(functionMode == FUNC_SW_RUN && oledReady);
     servoControlInit();
     otaControlInit();
+    groupControlInit();
     diagControlInit(oledReady, (uint8_t)functionMode);
+    loopProfileInit();
     // Count this boot in ONE EEPROM write, now that diagControlInit has
     // reported the reset cause (IWDG boots ride the same write) and the
     // registers exist for the count to land in.
@@ -122,21 +126,28 @@ void appInit()
 
 void appRun()
 {
+    loopProfileBegin();
     IWatchdog.reload();
 
     // Fixed tick pipeline. Safety-relevant ticks run unconditionally BEFORE
     // mode logic, so no mode can starve latch tracking or the LED
-    // max-on-time enforcement.
+    // max-on-time enforcement. Each stage is stamped for the loop profile
+    // (regs 460-547).
     modbusServerTick();     // poll the bus + dispatch registered handlers
+    loopProfileMark(LOOP_STAGE_MODBUS);
 
     // Sample the time AFTER the Modbus tick: handlers stamp state with a
     // fresh millis(), so an earlier sample would make now - timestamp
     // underflow and instantly expire delays/max-on-time in the same loop.
     uint32_t now = millis();
     latchControlTick(now);  // pulse FSM + lock-state tracking + reg 40
+    loopProfileMark(LOOP_STAGE_LATCH);
     ledControlTick(now);    // max-on-time enforcement + statistics
-    otaControlTick(now);    // OTA session inactivity timeout
+    loopProfileMark(LOOP_STAGE_LED);
+    otaControlTick(now);    // OTA erase-ahead + session inactivity timeout
+    loopProfileMark(LOOP_STAGE_OTA);
     diagControlTick(now);   // uptime/health publishing
+    loopProfileMark(LOOP_STAGE_DIAG);
 
     switch (functionMode)
     {
@@ -146,6 +157,8 @@ void appRun()
         case FUNC_SW_RUN:           runNormalMode();        break;
         default:                                            break;
     }
+    loopProfileMark(LOOP_STAGE_MODE);
+    loopProfileTick(now);   // publish the profile once per second
 }
 
 // ---------------------------------------------------------------------------
@@ -355,7 +368,6 @@ static void runNormalMode()
     static PeriodicTimer sensorTimer{ROUTINE_SENSOR_READ_MS / 2};
     static PeriodicTimer currentTimer{ROUTINE_SENSOR_READ_MS};
     static bool runLedOn = false;
-    static bool readBoardNext = false;
 
     // Routine blink for run LED
     if (blinkTimer.due(millis()))
@@ -364,36 +376,46 @@ static void runNormalMode()
         boardSetRunLed(runLedOn);
     }
 
-    // Routine sensor read: alternate the two sensors so each is refreshed
-    // once per ROUTINE_SENSOR_READ_MS with only one ~10ms I2C read per tick.
-    if (sensorTimer.due(millis()))
+    // Routine sensor read, split-phase: every ROUTINE_SENSOR_READ_MS/2 start
+    // a conversion on one sensor, alternating, so each is refreshed once per
+    // ROUTINE_SENSOR_READ_MS; collect it TEMP_CONVERSION_MS later on whatever
+    // tick comes next. Each step is one short I2C transaction — the sensor
+    // converts on its own in between, so Modbus never waits on it.
+    static bool tempPending = false;
+    static uint32_t tempStartMs = 0;
+    static TempSensor tempNext = TEMP_SENSOR_ROOM;
+    if (tempPending && (millis() - tempStartMs) >= TEMP_CONVERSION_MS)
     {
+        tempPending = false;
         int16_t centiC = 0; // degrees C x100, integer (no float)
-        if (readBoardNext)
+        bool ok = tempCollectCenti(tempNext, centiC);
+        if (ok)
         {
-            bool ok = tempReadBoardCenti(centiC);
-            if (ok)
-            {
-                mbRegWrite(MB_REG_BOARD_TEMP, (uint16_t)centiC);
-            }
-            diagReportSensor(1, ok); // repeated failures -> 0x8000 sentinel
+            mbRegWrite(tempNext == TEMP_SENSOR_BOARD ? MB_REG_BOARD_TEMP : MB_REG_ROOM_TEMP,
+                       (uint16_t)centiC);
+        }
+        diagReportSensor(tempNext, ok); // repeated failures -> 0x8000 sentinel
+        tempNext = (tempNext == TEMP_SENSOR_ROOM) ? TEMP_SENSOR_BOARD : TEMP_SENSOR_ROOM;
+    }
+    if (!tempPending && sensorTimer.due(millis()))
+    {
+        if (tempStartMeasurement(tempNext))
+        {
+            tempPending = true;
+            tempStartMs = millis();
         }
         else
         {
-            bool ok = tempReadRoomCenti(centiC);
-            if (ok)
-            {
-                mbRegWrite(MB_REG_ROOM_TEMP, (uint16_t)centiC);
-            }
-            diagReportSensor(0, ok);
+            // NAK on the trigger is the same fault as a failed read.
+            diagReportSensor(tempNext, false);
+            tempNext = (tempNext == TEMP_SENSOR_ROOM) ? TEMP_SENSOR_BOARD : TEMP_SENSOR_ROOM;
         }
-        readBoardNext = !readBoardNext;
     }
 
     // Input current: a microsecond ADC sample, so it does not join the I2C
-    // round-robin above (that alternation exists to amortize ~10ms bus
-    // reads). The ADC cannot NAK — no ok-gate, no sentinel; boards without
-    // the INA180 fitted publish noise, which readers may ignore.
+    // round-robin above (that alternation spreads the bus transactions).
+    // The ADC cannot NAK — no ok-gate, no sentinel; boards without the
+    // INA180 fitted publish noise, which readers may ignore.
     if (currentTimer.due(millis()))
     {
         mbRegWrite(MB_REG_INPUT_CURRENT, boardInputCurrentMa());
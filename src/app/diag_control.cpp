@@ -1,5 +1,6 @@
 #include "app/diag_control.h"
 #include "config.h"
+#include "drivers/oled.h"
 #include "util/periodic_timer.h"
 #include "app/latch_control.h"
 #include "app/led_control.h"
@@ -65,6 +66,8 @@ void diagControlTick(uint32_t now)
     mbRegWrite(MB_REG_UPTIME_HI, (uint16_t)(uptimeS >> 16));
     mbRegWrite(MB_REG_UPTIME_LO, (uint16_t)uptimeS);
     mbRegWrite(MB_REG_ACTIVE_PRESET, ledControlActivePreset());
+    mbRegWrite(MB_REG_OLED_RENDER_US, oledLastRenderUs());
+    mbRegWrite(MB_REG_OLED_RENDER_PEAK, oledPeakRenderUs());
     publishHealth();
 }
 
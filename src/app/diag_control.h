@@ -7,7 +7,8 @@
  *  @brief Remote diagnostics on the Modbus surface (regs 5-11):
  *         uptime, boot counter, last reset cause, health bitfield,
  *         function mode and the active LED preset — plus the temperature
- *         sensor fault sentinel for regs 20/21.
+ *         sensor fault sentinel for regs 20/21 and the OLED render time
+ *         at regs 61/62.
  *
  *  Everything here is read-only on the wire and refreshed once per second;
  *  the goal is that a master can see from the bus what previously required
@@ -21,8 +21,9 @@ void render()
 // writes clamp to 99 and the register reflects the clamped value (mbRegWrite
 // syncs the CHANGE shadow, so the write-back cannot re-fire this handler).
 // While the display is enabled the new number renders immediately — the
-// handler runs after the Modbus response has been flushed, so the ~20 ms
-// OLED transfer only delays the next poll.
+// handler runs after the Modbus response has been flushed, so the OLED
+// transfer only delays the next poll — and the driver sends just the digit
+// that changed (regs 61/62 report what a render actually costs).
 void onSetNumDisplayChange(uint16_t addr, uint16_t value)
 {
     (void)addr;
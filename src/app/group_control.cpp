@@ -0,0 +1,57 @@
+#include "app/group_control.h"
+#include "app/display_control.h"
+#include "app/led_control.h"
+#include "svc/modbus_map.h"
+#include "svc/modbus_server.h"
+#include "svc/settings.h"
+
+namespace {
+
+bool addressedToMe(uint16_t target, uint16_t groups)
+{
+    if (target == settings().identifier || target == MB_GROUP_TARGET_ALL)
+    {
+        return true;
+    }
+    const uint16_t g = target - MB_GROUP_TARGET_ALL;    // wraps huge for IDs
+    return g >= 1 && g <= MB_GROUP_COUNT && (groups & (1u << (g - 1)));
+}
+
+// Sequence register (560) changed: a new frame is in the window. The whole
+// FC16 lands before the watch scan runs, so the entries are complete here.
+// Entries apply in order — a later entry for the same module wins, as it
+// would had the commands arrived one by one.
+void onGroupCommand(uint16_t addr, uint16_t value)
+{
+    (void)addr;
+    (void)value;
+    const uint16_t groups = mbRegRead(MB_REG_GROUP_MASK);
+    uint16_t count = mbRegRead(MB_REG_GROUP_COUNT);
+    if (count > MB_GROUP_MAX_ENTRIES)
+    {
+        count = MB_GROUP_MAX_ENTRIES;
+    }
+    for (uint16_t i = 0; i < count; i++)
+    {
+        if (!addressedToMe(mbRegRead(mbRegGroupTarget(i)), groups))
+        {
+            continue;
+        }
+        const uint16_t word = mbRegRead(mbRegGroupTarget(i) + 1);
+        if ((word & ~0x7Fu) == MB_GROUP_SHOW_NUMBER)
+        {
+            displayControlShowNumber(word & 0x7F);
+        }
+        else
+        {
+            ledControlApplyCoil(word & ~MB_GROUP_COIL_OFF, (word & MB_GROUP_COIL_OFF) == 0);
+        }
+    }
+}
+
+} // namespace
+
+void groupControlInit()
+{
+    mbRegisterHandler(MB_WATCH_REG_CHANGE, MB_REG_GROUP_SEQ, onGroupCommand);
+}
@@ -0,0 +1,21 @@
+#ifndef APP_GROUP_CONTROL_H
+#define APP_GROUP_CONTROL_H
+
+#include <Arduino.h>
+
+/*  @file app/group_control.h
+ *  @brief Group command window (regs 560-681) and group membership (reg 82):
+ *         one broadcast frame lights a whole pick list.
+ *
+ *  Lighting 10-30 slots used to take one unicast FC05 per module, each
+ *  waiting for its reply. The master now broadcasts the list once; every
+ *  module applies the entries addressed to its slave ID, to one of its
+ *  groups, or to everyone, through the same code paths a unicast coil
+ *  write takes (led_control). Broadcasts are never answered, so the master
+ *  confirms with reads where it needs to.
+ */
+
+/*  @brief Register the window's sequence-register handler. */
+void groupControlInit();
+
+#endif // APP_GROUP_CONTROL_H
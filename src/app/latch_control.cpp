@@ -35,6 +35,33 @@ bool lastSenseSample = false;
 
 uint32_t lastTimeLatchLocked = 0;
 
+// Pulse timing histograms (stats, regs 810-839): upper edges in ms of
+// buckets 0-6; bucket 7 takes the rest. See modbus_map.h for what each
+// measures.
+constexpr uint16_t kEnergizeEdges[] = {1, 2, 5, 10, 20, 50, 100};
+constexpr uint16_t kOpenEdges[]     = {50, 100, 150, 200, 250, 300, LATCH_MAX_UNLOCK_TIME};
+constexpr uint16_t kWidthEdges[]    = {300, 325, 350, 375, 400, 450, LATCH_MAX_UNLOCK_TIME};
+static_assert(sizeof(kEnergizeEdges) / sizeof(kEnergizeEdges[0]) == MB_LATCH_TIMING_BUCKETS - 1 &&
+              sizeof(kOpenEdges) == sizeof(kEnergizeEdges) &&
+              sizeof(kWidthEdges) == sizeof(kEnergizeEdges), "seven edges, eight buckets");
+
+uint32_t openMs = MB_LATCH_TIMING_NOT_OPEN;     // this pulse: start to sense open
+
+uint8_t bucketOf(const uint16_t (&edges)[MB_LATCH_TIMING_BUCKETS - 1], uint32_t ms)
+{
+    uint8_t b = 0;
+    while (b < MB_LATCH_TIMING_BUCKETS - 1 && ms >= edges[b])
+    {
+        b++;
+    }
+    return b;
+}
+
+uint16_t clampMs(uint32_t ms)
+{
+    return (ms > 0xFFFE) ? 0xFFFE : (uint16_t)ms;   // 0xFFFF means "did not open"
+}
+
 // Resolve the in-flight request: clear its coil and sync the requested
 // preset-enable coil when the LED-latch command asked for it. The sync is
 // skipped unless that coil still names the ACTIVE preset — the LED may have
@@ -171,6 +198,13 @@ void latchControlTick(uint32_t now)
                     pulseStartMs = now;
                     boardLatchMosfetSet(true);
                     statsNoteLatchFire(); // the one true-energize point
+                    // How late past the unlock delay the loop got here —
+                    // loop lateness, not the coil write to energize (a whole
+                    // ms; a healthy loop keeps nearly every pulse in bucket 0).
+                    const uint32_t lateMs = now - phaseStartMs - delayMs;
+                    statsNoteLatchTiming(LATCH_TIMING_ENERGIZE, clampMs(lateMs),
+                                         bucketOf(kEnergizeEdges, lateMs));
+                    openMs = MB_LATCH_TIMING_NOT_OPEN;
 
                     // Hardware backstop: a timer ISR forces the MOSFET low at
                     // the hard cap even if the loop stalls inside a long Modbus
@@ -200,11 +234,35 @@ void latchControlTick(uint32_t now)
             // ignoreSense (bench test): run a fixed pulse to the cap, no early
             // exit. Normal: min pulseMinMs, extend while locked, cap at 500ms.
             uint32_t elapsed = now - pulseStartMs;
+            const bool open = !boardLatchSenseLow();
+            if (open && openMs == MB_LATCH_TIMING_NOT_OPEN && elapsed < LATCH_MAX_UNLOCK_TIME)
+            {
+                openMs = elapsed;   // first tick that saw it open while driven
+            }
             if (elapsed >= LATCH_MAX_UNLOCK_TIME ||
-                (!pendingIgnoreSense && elapsed >= pulseMinMs && !boardLatchSenseLow()))
+                (!pendingIgnoreSense && elapsed >= pulseMinMs && open))
             {
                 boardLatchGuardDisarm();
                 boardLatchMosfetSet(false);
+                // Bench pulses ignore the sense pin and always run to the
+                // cap: they would only blur the two safety histograms. The
+                // guard may have cut the pulse at the cap before this tick.
+                if (!pendingIgnoreSense)
+                {
+                    const uint32_t widthMs = (elapsed > LATCH_MAX_UNLOCK_TIME)
+                                                 ? LATCH_MAX_UNLOCK_TIME : elapsed;
+                    // Open, but first seen only past the cap: the loop
+                    // stalled across it (the guard cut the drive), so when
+                    // it opened is unknown — no sample rather than a false
+                    // "never opened".
+                    if (openMs != MB_LATCH_TIMING_NOT_OPEN || !open)
+                    {
+                        statsNoteLatchTiming(LATCH_TIMING_OPEN, (uint16_t)openMs,
+                                             bucketOf(kOpenEdges, openMs));
+                    }
+                    statsNoteLatchTiming(LATCH_TIMING_WIDTH, (uint16_t)widthMs,
+                                         bucketOf(kWidthEdges, widthMs));
+                }
                 finishRequest();
                 state = LatchState::COOLDOWN;
             }
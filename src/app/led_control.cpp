@@ -26,7 +26,8 @@
 namespace {
 
 uint8_t activePreset = 0;                       // 0 = off, 1-8 = active preset
-uint32_t onSinceMs = 0;                         // millis() when the ring turned on (0 = off)
+uint32_t onSinceMs = 0;                         // start of the unaccounted on-interval (0 = off)
+uint32_t litAtMs = 0;                           // millis() when the active preset turned on
 uint16_t onTimeMsFrac[MB_LED_PRESET_COUNT] = {}; // sub-second remainder (<1000 ms)
 
 // Storage and publication of the counters moved to svc/stats (v3.3.0): this
@@ -131,6 +132,7 @@ void activatePreset(uint8_t n)
     activePreset = n;
     statsNoteLedOn(n);
     onSinceMs = millis();
+    litAtMs = onSinceMs;
 }
 
 // Ring off (from the active preset's coil, max-on-time, or a combo-off).
@@ -447,6 +449,49 @@ uint16_t ledControlActiveEnableCoil()
     return (activePreset != 0) ? mbCoilLedEnable(activePreset) : 0;
 }
 
+void ledControlApplyCoil(uint16_t coil, bool on)
+{
+    if (coil == MB_COIL_ALL_OFF)
+    {
+        if (on)
+        {
+            onAllOffCommand(coil, 1);
+        }
+        return;
+    }
+    const uint16_t n = coil % 10;
+    if (coil < mbCoilLedEnable(1) || coil > mbCoilLedLatchDisplay(MB_LED_PRESET_COUNT) ||
+        n < 1 || n > MB_LED_PRESET_COUNT)
+    {
+        return;                 // 1010, 1019, 1020 and 1029/1039 are not presets
+    }
+
+    // Leave the coil as the bus write would have. mbCoilWrite also syncs the
+    // CHANGE shadow, so the handler below runs exactly once, from here.
+    mbCoilWrite(coil, on);
+    switch ((coil - 1000) / 10)
+    {
+        case 0:
+            onLedEnableChange(coil, on);
+            break;
+        case 1:
+            onLedDisplayChange(coil, on);
+            break;
+        case 2:
+            if (on)
+            {
+                onLedLatchCommand(coil, 1);
+            }
+            break;
+        default:
+            if (on)
+            {
+                onLedLatchDisplayCommand(coil, 1);
+            }
+            break;
+    }
+}
+
 uint8_t ledControlActivePreset()
 {
     return activePreset;
@@ -454,11 +499,14 @@ uint8_t ledControlActivePreset()
 
 void ledControlTick(uint32_t now)
 {
-    // Enforce the ACTIVE preset's max-on-time limit (0 = unlimited)
+    // Enforce the ACTIVE preset's max-on-time limit (0 = unlimited). Timed
+    // from litAtMs, not onSinceMs: the hourly statistics flush restarts
+    // onSinceMs, which would otherwise push the limit out by an hour at a
+    // time and never fire for the default 3600 s.
     if (activePreset != 0 && onSinceMs != 0)
     {
         uint16_t maxOnTimeS = mbRegRead(mbRegLedBase(activePreset) + 4);
-        if (maxOnTimeS > 0 && now - onSinceMs > (uint32_t)maxOnTimeS * 1000)
+        if (maxOnTimeS > 0 && now - litAtMs > (uint32_t)maxOnTimeS * 1000)
         {
             deactivate(); // ring off + coil mirrors cleared (display state untouched)
         }
@@ -40,6 +40,14 @@ bool ledControlChannelOn();
  *         combo's requested coil before syncing it on pulse completion. */
 uint16_t ledControlActiveEnableCoil();
 
+/*  @brief Apply a coil write to a preset-family coil (1001-1038) or All Off
+ *         (511) exactly as if it had come in from the bus: radio switching,
+ *         the latch hand-off and the display mirror all behave the same.
+ *         The group command window (app/group_control) uses this to carry
+ *         those commands for many modules in one broadcast. Other addresses
+ *         are ignored. */
+void ledControlApplyCoil(uint16_t coil, bool on);
+
 /*  @brief Active preset number (0 = ring off, 1-8). Published at reg 11. */
 uint8_t ledControlActivePreset();
 
@@ -0,0 +1,142 @@
+#include "app/loop_profile.h"
+#include "config.h"
+#include "util/periodic_timer.h"
+#include "svc/modbus_map.h"
+#include "svc/modbus_server.h"
+#include <string.h>
+
+static_assert(LOOP_STAGE_COUNT == MB_PROF_STAGE_COUNT, "stage enum is the register block order");
+
+namespace {
+
+// Rolling average: exponential, weight 1/16 per loop — kept as 16x the
+// average so the update is a subtract and a shift.
+constexpr uint8_t AVG_SHIFT = 4;
+
+struct StageProfile
+{
+    uint32_t maxUs;
+    uint32_t avgX16;
+    uint16_t buckets[MB_PROF_BUCKET_COUNT];
+};
+
+StageProfile stages[LOOP_STAGE_COUNT];
+uint32_t loops = 0;             // loops whose stages were all recorded
+uint32_t stampUs = 0;           // last stage boundary
+uint32_t loopStartUs = 0;       // last appRun() entry
+bool started = false;
+
+// Two octaves per bucket: <64us, <256us, <1ms, ... , >=262ms. A shift loop
+// rather than a count-leading-zeros: the M0+ has no CLZ instruction.
+uint8_t bucketOf(uint32_t us)
+{
+    uint8_t b = 0;
+    while (us >= 64 && b < MB_PROF_BUCKET_COUNT - 1)
+    {
+        us >>= 2;
+        b++;
+    }
+    return b;
+}
+
+void record(LoopStage stage, uint32_t us)
+{
+    StageProfile &p = stages[stage];
+    if (us > p.maxUs)
+    {
+        p.maxUs = us;
+    }
+    p.avgX16 += us - (p.avgX16 >> AVG_SHIFT);
+    const uint8_t b = bucketOf(us);
+    if (p.buckets[b] == 0xFFFF)
+    {
+        // Full: halve the stage's whole histogram, as the latch timing
+        // histograms do. A saturated bucket would stop the common cases
+        // counting within seconds of boot while the rare slow ones went
+        // on, and the shape would be lost.
+        for (uint8_t i = 0; i < MB_PROF_BUCKET_COUNT; i++)
+        {
+            p.buckets[i] >>= 1;
+        }
+    }
+    p.buckets[b]++;
+}
+
+void clearProfile()
+{
+    memset(stages, 0, sizeof(stages));
+    loops = 0;
+    started = false;            // the rest of the loop in progress is not recorded
+}
+
+void publish()
+{
+    mbRegWrite(MB_REG_PROF_LOOPS_HI, (uint16_t)(loops >> 16));
+    mbRegWrite(MB_REG_PROF_LOOPS_HI + 1, (uint16_t)loops);
+    for (uint8_t s = 0; s < LOOP_STAGE_COUNT; s++)
+    {
+        const StageProfile &p = stages[s];
+        const uint32_t avg = p.avgX16 >> AVG_SHIFT;
+        mbRegWrite(mbRegProfMaxHi(s), (uint16_t)(p.maxUs >> 16));
+        mbRegWrite(mbRegProfMaxHi(s) + 1, (uint16_t)p.maxUs);
+        mbRegWrite(mbRegProfAvg(s), avg > 0xFFFF ? 0xFFFF : (uint16_t)avg);
+        for (uint8_t b = 0; b < MB_PROF_BUCKET_COUNT; b++)
+        {
+            mbRegWrite(mbRegProfBucket(s, b), p.buckets[b]);
+        }
+    }
+}
+
+// Coil 512: start a fresh measurement window (e.g. before a bench test).
+void onLoopProfileReset(uint16_t addr, uint16_t value)
+{
+    (void)value;
+    mbCoilWrite(addr, false);
+    clearProfile();
+    publish();
+}
+
+} // namespace
+
+void loopProfileInit()
+{
+    clearProfile();
+    publish();
+    mbRegisterHandler(MB_WATCH_COIL_COMMAND, MB_COIL_LOOP_PROFILE_RESET, onLoopProfileReset);
+}
+
+void loopProfileBegin()
+{
+    const uint32_t t = micros();
+    if (started)
+    {
+        record(LOOP_STAGE_PERIOD, t - loopStartUs);
+    }
+    started = true;
+    loopStartUs = t;
+    stampUs = t;
+}
+
+void loopProfileMark(LoopStage stage)
+{
+    if (!started)
+    {
+        return;
+    }
+    const uint32_t t = micros();
+    record(stage, t - stampUs);
+    stampUs = t;
+    if (stage == LOOP_STAGE_MODE)
+    {
+        loops++;
+    }
+}
+
+void loopProfileTick(uint32_t now)
+{
+    static PeriodicTimer publishTimer{DIAG_PUBLISH_INTERVAL_MS};
+    if (publishTimer.due(now))
+    {
+        publish();
+    }
+}
@@ -0,0 +1,48 @@
+#ifndef APP_LOOP_PROFILE_H
+#define APP_LOOP_PROFILE_H
+
+#include <Arduino.h>
+
+/*  @file app/loop_profile.h
+ *  @brief Per-stage main-loop timing on the Modbus surface (regs 460-547,
+ *         reset coil 512).
+ *
+ *  appRun() stamps micros() between its stages; for each stage this keeps
+ *  the maximum, a rolling average and a small log2 histogram, and publishes
+ *  them once per second. It answers "which stage made that loop take
+ *  300 ms" from the bus — the stalls the latch TIM7 guard exists for —
+ *  without a debugger attached.
+ *
+ *  Always on: eight micros() reads and a few dozen instructions per stage
+ *  per loop, a few microseconds in all, and the publish is one register
+ *  sweep a second.
+ */
+
+// Order is the wire order of the register block (svc/modbus_map.h).
+enum LoopStage : uint8_t
+{
+    LOOP_STAGE_MODBUS,
+    LOOP_STAGE_LATCH,
+    LOOP_STAGE_LED,
+    LOOP_STAGE_OTA,
+    LOOP_STAGE_DIAG,
+    LOOP_STAGE_MODE,
+    LOOP_STAGE_PERIOD,  // appRun() entry to the next entry: the whole loop
+    LOOP_STAGE_COUNT,
+};
+
+/*  @brief Clear the profile and register the reset coil handler. */
+void loopProfileInit();
+
+/*  @brief Top of appRun(): closes the previous loop period and starts the
+ *         stage clock. */
+void loopProfileBegin();
+
+/*  @brief After a stage: records the time since the previous stamp against
+ *         @p stage. */
+void loopProfileMark(LoopStage stage);
+
+/*  @brief Publish the block once per second. Call every loop. */
+void loopProfileTick(uint32_t now);
+
+#endif // APP_LOOP_PROFILE_H
@@ -1,12 +1,15 @@
 #include "app/ota_control.h"
 #include "config.h"
 #include "flash_layout.h"
+#include "version.h"
 #include "app/display_control.h"
 #include "app/latch_control.h"
 #include "app/ops.h"
 #include "drivers/flash_stage.h"
 #include "svc/modbus_map.h"
 #include "svc/modbus_server.h"
+#include "util/crc.h"
+#include "util/lzss.h"
 
 // ---------------------------------------------------------------------------
 // Session state
@@ -42,6 +45,31 @@ uint16_t totalChunks = 0;
 uint16_t chunksReceived = 0;
 uint32_t lastActivityMs = 0;
 uint8_t lastShownPercent = 0xFF;
+bool lzSession = false;                 // reg 289 bit 2: chunks are compressed
+uint16_t chunkSize = FLASH_OTA_CHUNK_SIZE;  // reg 289 bits 8-15
+
+// Largest chunk this build takes (reg 358): the largest whose frame —
+// payload plus 17 bytes of FC16 and window header — fits the RX ring twice,
+// one frame waiting for poll() while the next arrives behind a page erase,
+// up to the wide window. A ring too small for that keeps the 128-byte
+// window it always had.
+constexpr uint16_t OTA_FRAME_OVERHEAD = 17;
+constexpr uint16_t OTA_RING_CHUNK =
+    (uint16_t)(((SERIAL_RX_BUFFER_SIZE - 1) / 2 - OTA_FRAME_OVERHEAD) & ~7u);
+constexpr uint16_t OTA_MAX_CHUNK =
+    (OTA_RING_CHUNK >= FLASH_OTA_WIDE_CHUNK_SIZE) ? FLASH_OTA_WIDE_CHUNK_SIZE
+    : (OTA_RING_CHUNK > FLASH_OTA_CHUNK_SIZE)     ? OTA_RING_CHUNK
+                                                  : FLASH_OTA_CHUNK_SIZE;
+
+// Frame layout, from either window's index register (modbus_map.h).
+constexpr uint16_t OTA_FRAME_LEN  = MB_REG_OTA_CHUNK_LEN - MB_REG_OTA_CHUNK_INDEX;
+constexpr uint16_t OTA_FRAME_CRC  = MB_REG_OTA_CHUNK_CRC - MB_REG_OTA_CHUNK_INDEX;
+constexpr uint16_t OTA_FRAME_DATA = MB_REG_OTA_DATA_FIRST - MB_REG_OTA_CHUNK_INDEX;
+
+// Compressed chunk header: decoded offset (2), chunks back (1), decoded
+// length / 8 (1); the LZSS stream follows. Layout: tools/ota_lz.py.
+constexpr uint16_t OTA_LZ_HEADER = 4;
+uint8_t decoded[FLASH_OTA_LZ_MAX_DECODED];
 
 void publishState(OtaState s, OtaError err = OTA_ERR_NONE)
 {
@@ -71,21 +99,6 @@ void bitmapClearAll()
     }
 }
 
-// CRC16-CCITT over the chunk payload (matches the host tool).
-uint16_t crc16Payload(const uint8_t *p, uint16_t len)
-{
-    uint16_t crc = 0xFFFF;
-    while (len--)
-    {
-        crc ^= (uint16_t)(*p++) << 8;
-        for (uint8_t i = 0; i < 8; i++)
-        {
-            crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
-        }
-    }
-    return crc;
-}
-
 void resetSession()
 {
     imageSize = 0;
@@ -93,6 +106,8 @@ void resetSession()
     totalChunks = 0;
     chunksReceived = 0;
     lastShownPercent = 0xFF;
+    lzSession = false;
+    chunkSize = FLASH_OTA_CHUNK_SIZE;
     mbRegWrite(MB_REG_OTA_CHUNKS_RX, 0);
     bitmapClearAll();
 }
@@ -103,7 +118,7 @@ void showProgress()
     // count — instead of borrowing the slot-number display, where a lone big
     // number said nothing about what was happening. Rendered only when the
     // percent changes (~100 renders/session): a 20 ms OLED transfer between
-    // chunks, with the 256 B RX ring buffering the next broadcast frame.
+    // chunks, with the RX ring buffering the next broadcast frame.
     uint8_t percent = (uint8_t)(((uint32_t)chunksReceived * 100u) / totalChunks);
     if (percent > 100)
     {
@@ -116,6 +131,35 @@ void showProgress()
     }
 }
 
+// A compressed chunk decodes against the image staged so far: its copies
+// may read the `back` chunks before it, so it is dropped (repair re-sends
+// it) until those are in the bitmap — the ascending repair rounds bring
+// them first. False = not stored this time; decoded[0..outLen) otherwise.
+bool decodeChunk(uint16_t idx, const uint8_t *p, uint16_t len, uint32_t &offset, uint16_t &outLen)
+{
+    const uint8_t back = p[2];
+    offset = ((uint32_t)p[0] << 8) | p[1];
+    outLen = (uint16_t)(p[3] * 8u);
+    if (offset % 8 != 0 || offset >= imageSize || outLen == 0 ||
+        outLen > FLASH_OTA_LZ_MAX_DECODED || back > idx)
+    {
+        return false;
+    }
+    if (outLen > imageSize - offset)
+    {
+        outLen = (uint16_t)(imageSize - offset);
+    }
+    for (uint16_t k = idx - back; k < idx; k++)
+    {
+        if (!bitmapTest(k))
+        {
+            return false;
+        }
+    }
+    return lzssDecode(p + OTA_LZ_HEADER, len - OTA_LZ_HEADER, decoded, outLen,
+                      flashStageImage(), offset);
+}
+
 // --- Modbus handlers ---
 
 // Enter OTA (coil 505, broadcast): metadata must already sit in 284-288.
@@ -128,18 +172,41 @@ void onOtaEnter(uint16_t addr, uint16_t value)
     uint32_t size = ((uint32_t)mbRegRead(MB_REG_OTA_SIZE_HI) << 16) | mbRegRead(MB_REG_OTA_SIZE_LO);
     uint32_t crc  = ((uint32_t)mbRegRead(MB_REG_OTA_CRC_HI) << 16) | mbRegRead(MB_REG_OTA_CRC_LO);
     uint16_t chunks = mbRegRead(MB_REG_OTA_TOTAL_CHUNKS);
+    uint16_t flags = mbRegRead(MB_REG_OTA_FLAGS);
+    mbRegWrite(MB_REG_OTA_FLAGS, 0);    // options are per session, never inherited
+    const bool lz = (flags & MB_OTA_FLAG_LZ) != 0;
+    const uint16_t chunk = (flags >> MB_OTA_FLAGS_CHUNK_SHIFT)
+        ? (uint16_t)((flags >> MB_OTA_FLAGS_CHUNK_SHIFT) * 8u) : (uint16_t)FLASH_OTA_CHUNK_SIZE;
 
     if (!latchControlFsmIdle())
     {
         publishState(OTA_FAILED, OTA_ERR_LATCH_BUSY);
         return;
     }
+    // Resume: the same image as the session this board still holds (still
+    // receiving, verified, or timed out with staging and bitmap intact)
+    // carries on from its bitmap, no erase. Anything else starts over.
+    if ((flags & MB_OTA_FLAG_RESUME) && imageSize != 0 &&
+        size == imageSize && crc == imageCrc32 && chunks == totalChunks && lz == lzSession &&
+        chunk == chunkSize)
+    {
+        lastActivityMs = millis();
+        lastShownPercent = 0xFF;
+        publishState(OTA_RECEIVING);
+        showProgress();
+        return;
+    }
     if (size < 8 || size > FLASH_OTA_MAX_IMAGE_SIZE)
     {
         publishState(OTA_FAILED, OTA_ERR_BAD_SIZE);
         return;
     }
-    if (chunks == 0 || chunks != (size + FLASH_OTA_CHUNK_SIZE - 1) / FLASH_OTA_CHUNK_SIZE)
+    // 128 bytes goes through the original window, a larger size through the
+    // wide one, up to what this board advertises. Raw: one chunk per chunk
+    // size of image. Compressed: as many as the encoder made, up to what
+    // the bitmap holds.
+    if (chunk < FLASH_OTA_CHUNK_SIZE || chunk > OTA_MAX_CHUNK || chunks == 0 ||
+        (lz ? chunks > FLASH_OTA_MAX_CHUNKS : chunks != (size + chunk - 1) / chunk))
     {
         publishState(OTA_FAILED, OTA_ERR_BAD_CHUNKS);
         return;
@@ -149,35 +216,45 @@ void onOtaEnter(uint16_t addr, uint16_t value)
     imageSize = size;
     imageCrc32 = crc;
     totalChunks = chunks;
+    lzSession = lz;
+    chunkSize = chunk;
 
-    flashStageEraseAll();       // ~700ms of page erases (IWDG fed inside)
+    // Header + every image page (~22-40 ms each, bus stalled; the master
+    // waits), or with erase-ahead header + first page only and the rest
+    // from otaControlTick, one page ahead of the chunk stream.
+    flashStageBegin(size, (flags & MB_OTA_FLAG_ERASE_AHEAD) != 0);
 
     lastActivityMs = millis();
     publishState(OTA_RECEIVING);
     showProgress();             // 0% on the OLED
 }
 
-// Chunk commit (reg 357, REG_CHANGE): the master bumps this on EVERY
-// transmission (including retransmits), so it always fires. A chunk that
-// fails its CRC16 is silently ignored — the bitmap repair rounds re-send it.
+// Chunk commit (reg 357, or 809 for the wide window; REG_CHANGE): the
+// master bumps this on EVERY transmission (including retransmits), so it
+// always fires. Only the session's window is read. A chunk that fails its
+// CRC16 is silently ignored — the bitmap repair rounds re-send it.
 void onOtaCommit(uint16_t addr, uint16_t value)
 {
-    (void)addr;
     (void)value;
 
-    if (state != OTA_RECEIVING)
+    const uint16_t base = (addr == MB_REG_OTA_WIDE_COMMIT) ? MB_REG_OTA_WIDE_INDEX
+                                                           : MB_REG_OTA_CHUNK_INDEX;
+    const bool wide = chunkSize > FLASH_OTA_CHUNK_SIZE;
+    if (state != OTA_RECEIVING || wide != (base == MB_REG_OTA_WIDE_INDEX))
     {
         return;
     }
     lastActivityMs = millis();
 
-    uint16_t idx = mbRegRead(MB_REG_OTA_CHUNK_INDEX);
-    uint16_t len = mbRegRead(MB_REG_OTA_CHUNK_LEN);
+    uint16_t idx = mbRegRead(base);
+    uint16_t len = mbRegRead(base + OTA_FRAME_LEN);
     uint16_t expectedLen = (idx == totalChunks - 1)
-        ? (uint16_t)(imageSize - (uint32_t)idx * FLASH_OTA_CHUNK_SIZE)
-        : (uint16_t)FLASH_OTA_CHUNK_SIZE;
+        ? (uint16_t)(imageSize - (uint32_t)idx * chunkSize)
+        : chunkSize;
+    bool lenOk = lzSession ? (len > OTA_LZ_HEADER && len <= chunkSize)
+                           : len == expectedLen;
 
-    if (idx >= totalChunks || len != expectedLen)
+    if (idx >= totalChunks || !lenOk)
     {
         return; // malformed frame: drop, repair rounds handle it
     }
@@ -187,19 +264,32 @@ void onOtaCommit(uint16_t addr, uint16_t value)
     }
 
     // Unpack the payload window (big-endian bytes, two per register).
-    uint8_t payload[FLASH_OTA_CHUNK_SIZE];
+    uint8_t payload[FLASH_OTA_WIDE_CHUNK_SIZE];
     for (uint16_t i = 0; i < len; i++)
     {
-        uint16_t reg = mbRegRead(MB_REG_OTA_DATA_FIRST + i / 2);
+        uint16_t reg = mbRegRead(base + OTA_FRAME_DATA + i / 2);
         payload[i] = (i & 1) ? (uint8_t)reg : (uint8_t)(reg >> 8);
     }
-    if (crc16Payload(payload, len) != mbRegRead(MB_REG_OTA_CHUNK_CRC))
+    if (crc16Ccitt(payload, len) != mbRegRead(base + OTA_FRAME_CRC))
     {
         return; // corrupt on the wire: drop
     }
 
-    if (!flashStageWriteChunk((uint32_t)idx * FLASH_OTA_CHUNK_SIZE, payload, len))
+    uint32_t offset = (uint32_t)idx * chunkSize;
+    const uint8_t *bytes = payload;
+    if (lzSession)
     {
+        uint16_t decodedLen = 0;
+        if (!decodeChunk(idx, payload, len, offset, decodedLen))
+        {
+            return; // malformed, or ahead of the chunks it copies from
+        }
+        bytes = decoded;
+        len = decodedLen;
+    }
+    if (!flashStageWriteChunk(offset, bytes, len))
+    {
+        resetSession();         // staging no longer trusted: nothing to resume
         publishState(OTA_FAILED, OTA_ERR_FLASH);
         return;
     }
@@ -234,6 +324,7 @@ void onOtaFinalize(uint16_t addr, uint16_t value)
     }
     else
     {
+        resetSession();
         publishState(OTA_FAILED, OTA_ERR_CRC32);
     }
 }
@@ -253,6 +344,7 @@ void onOtaApply(uint16_t addr, uint16_t value)
     }
     if (!flashStageCommitHeader(imageSize, imageCrc32))
     {
+        resetSession();         // a half-programmed header needs a fresh erase
         publishState(OTA_FAILED, OTA_ERR_FLASH);
         return;
     }
@@ -284,14 +376,32 @@ void otaControlInit()
     mbRegisterHandler(MB_WATCH_COIL_COMMAND, MB_COIL_OTA_APPLY, onOtaApply);
     mbRegisterHandler(MB_WATCH_COIL_COMMAND, MB_COIL_OTA_ABORT, onOtaAbort);
     mbRegisterHandler(MB_WATCH_REG_CHANGE, MB_REG_OTA_COMMIT, onOtaCommit);
+    mbRegisterHandler(MB_WATCH_REG_CHANGE, MB_REG_OTA_WIDE_COMMIT, onOtaCommit);
+    mbRegWrite(MB_REG_OTA_MAX_CHUNK, OTA_MAX_CHUNK);
+
+    // The running image's fingerprint, once: ~60 KB through the CRC unit is
+    // well under a millisecond, and the image cannot change until a reset.
+    uint32_t appSize = 0;
+    const uint32_t appCrc = flashStageAppCrc32(appSize);
+    mbRegWrite(MB_REG_OTA_APP_SIZE_HI, (uint16_t)(appSize >> 16));
+    mbRegWrite(MB_REG_OTA_APP_SIZE_LO, (uint16_t)appSize);
+    mbRegWrite(MB_REG_OTA_APP_CRC_HI, (uint16_t)(appCrc >> 16));
+    mbRegWrite(MB_REG_OTA_APP_CRC_LO, (uint16_t)appCrc);
+    mbRegWrite(MB_REG_OTA_BUILD_ID_HI, (uint16_t)((uint32_t)FW_BUILD_ID >> 16));
+    mbRegWrite(MB_REG_OTA_BUILD_ID_LO, (uint16_t)FW_BUILD_ID);
     publishState(OTA_IDLE);
 }
 
 void otaControlTick(uint32_t now)
 {
+    if (state == OTA_RECEIVING)
+    {
+        flashStageTick();               // erase-ahead: one page at most
+    }
     if (state == OTA_RECEIVING && now - lastActivityMs > OTA_SESSION_TIMEOUT_MS)
     {
-        resetSession();
+        // The session stays held (staging, bitmap, chunk count) for a resume;
+        // abort, a new session or a reset drops it.
         publishState(OTA_FAILED, OTA_ERR_TIMEOUT);
         displayControlSetEnabled(false);
     }
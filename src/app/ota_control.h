@@ -4,8 +4,8 @@
 #include <Arduino.h>
 
 /*  @file app/ota_control.h
- *  @brief OTA-over-RS485 session: Modbus surface (regs 282-389, coils
- *         505-508), staging download, verification and the apply handoff
+ *  @brief OTA-over-RS485 session: Modbus surface (regs 282-395 and
+ *         690-809, coils 505-508), staging download, verification and the apply handoff
  *         to the bootloader.
  *
  *  Transport is Modbus broadcast FC16 (slave id 0): the master streams
@@ -14,19 +14,42 @@
  *  bitmap (regs 360-389) the master reads back per device to re-send only
  *  what was lost. Flow:
  *
- *    metadata (regs 284-288) -> coil 505 enter (staging erase) -> chunks ->
+ *    metadata (regs 284-289) -> coil 505 enter (staging erase) -> chunks ->
  *    bitmap repair rounds -> coil 506 finalize (CRC32 verify) ->
  *    coil 507 apply (header commit + reset; bootloader copies)
  *
  *  Session states (reg 282 lo byte): 0 idle, 1 receiving, 2 verified,
- *  3 failed (hi byte = error code). A session with no bus activity for
- *  OTA_SESSION_TIMEOUT_MS fails out and returns to idle.
+ *  3 failed (hi byte = error code). Reg 289 bit 0 selects erase-ahead:
+ *  coil 505 then erases only the header and the first image page and
+ *  returns; each further page is erased one page ahead of the chunks. A
+ *  session with no bus activity for OTA_SESSION_TIMEOUT_MS fails out.
+ *
+ *  A timed-out session is still held — staging contents, bitmap, chunk
+ *  count — until abort, a new session or a reset. Reg 289 bit 1 (resume)
+ *  with the same size, CRC32 and chunk count picks it back up at coil 505
+ *  without an erase; the master then sends only what the bitmap lacks.
+ *
+ *  Reg 289 bit 2 (compressed): the chunk count is whatever tools/ota_lz.py
+ *  made of the image, and each chunk decodes (util/lzss) into up to 512
+ *  image bytes, possibly copying from chunks already staged; size, CRC32,
+ *  finalize and apply are those of the decoded image as before.
+ *
+ *  Chunk size: reg 358 advertises the largest this build takes (232 with
+ *  the 512 B RX ring, else 128). Reg 289 bits 8-15 set the session's size
+ *  / 8 (0 = 128); above 128 the frames go to the wide window (regs
+ *  690-809, same layout) and the 128-byte window is ignored. The bitmap is
+ *  one bit per chunk either way; resume also needs the same size.
+ *
+ *  Regs 390-395 are the running image's fingerprint — size and CRC32 of
+ *  the app as firmware.bin, and FW_BUILD_ID — set once at init, so a
+ *  master can leave a board alone that already runs the file it holds.
  */
 
-/*  @brief Register the OTA Modbus handlers. */
+/*  @brief Register the OTA Modbus handlers and publish the fingerprint. */
 void otaControlInit();
 
-/*  @brief Session upkeep (inactivity timeout). Call once per loop. */
+/*  @brief Session upkeep: erase-ahead (one staging page at most) and the
+ *         inactivity timeout. Call once per loop. */
 void otaControlTick(uint32_t now);
 
 #endif // APP_OTA_CONTROL_H
@@ -10,10 +10,11 @@
  *       No/invalid header -> just boot the app.
  *    3. Header valid: CRC32 the staged image. Mismatch -> erase the header
  *       (drop the bad request) and boot the old app untouched.
- *    4. Match: erase the app slot, copy doubleword-wise, CRC32-verify the
- *       app slot, and only THEN erase the staging header. Power loss at any
- *       point before that final erase leaves the header valid, so the next
- *       boot simply copies again. Then reset.
+ *    4. Match: for each app page the image covers, compare it with the
+ *       staged bytes and erase + reprogram only the pages that differ; then
+ *       CRC32-verify the app slot, and only THEN erase the staging header.
+ *       Power loss at any point before that final erase leaves the header
+ *       valid, so the next boot simply compares and copies again. Then reset.
  *    5. Jump to the app after a sanity check of its vector table.
  *
  *  Shared layout contract: include/flash_layout.h (also used by the app).
@@ -21,6 +22,7 @@
 
 #include "stm32g0xx.h"
 #include "flash_layout.h"
+#include "util/crc.h"
 
 #define RAM_START 0x20000000u
 #define RAM_END   0x20009000u   /* 36KB */
@@ -30,36 +32,6 @@ static inline void iwdgReload(void)
     IWDG->KR = 0x0000AAAAu; /* harmless when the IWDG was never started */
 }
 
-/* --- CRCs (bitwise, table-free — size over speed) --------------------- */
-
-static uint32_t crc32Image(const uint8_t *p, uint32_t len)
-{
-    uint32_t crc = 0xFFFFFFFFu;
-    while (len--)
-    {
-        crc ^= *p++;
-        for (int i = 0; i < 8; i++)
-        {
-            crc = (crc >> 1) ^ (0xEDB88320u & (0u - (crc & 1u)));
-        }
-    }
-    return crc ^ 0xFFFFFFFFu;
-}
-
-static uint16_t crc16Header(const uint8_t *p, uint32_t len)
-{
-    uint16_t crc = 0xFFFFu;
-    while (len--)
-    {
-        crc ^= (uint16_t)(*p++) << 8;
-        for (int i = 0; i < 8; i++)
-        {
-            crc = (crc & 0x8000u) ? (uint16_t)((crc << 1) ^ 0x1021u) : (uint16_t)(crc << 1);
-        }
-    }
-    return crc;
-}
-
 /* --- Flash driver (direct registers, G0: 2KB pages, 8-byte program) --- */
 
 static void flashWait(void)
@@ -107,30 +79,84 @@ static void flashProgramDoubleword(uint32_t addr, uint64_t data)
 
 /* --- Apply / jump ------------------------------------------------------ */
 
-static void applyStagedImage(uint32_t size, uint32_t crc32)
+/* Reading an app page that a power loss left half-programmed can hit a
+ * doubleword whose ECC no longer matches: the flash raises a double-error
+ * NMI. The default handler would spin until the watchdog reset us — into the
+ * same read, forever. Instead note it and return; the page being compared
+ * then counts as different and gets erased, which is what it needed. */
+static volatile uint32_t eccFault;
+
+void NMI_Handler(void)
 {
-    flashUnlock();
+    if (FLASH->ECCR & FLASH_ECCR_ECCD)
+    {
+        FLASH->ECCR |= FLASH_ECCR_ECCD;     /* W1C */
+        eccFault = 1u;
+        return;
+    }
+    for (;;)
+    {
+        iwdgReload();                       /* any other NMI: park, rescuable */
+    }
+}
 
-    for (uint32_t p = FLASH_APP_FIRST_PAGE; p < FLASH_APP_FIRST_PAGE + FLASH_APP_PAGES; p++)
+/* true when the app slot already holds the staged bytes [off, off + len). */
+static int appMatchesStaged(uint32_t off, uint32_t len)
+{
+    const uint64_t *app = (const uint64_t *)(FLASH_APP_ADDR + off);
+    const uint64_t *stg = (const uint64_t *)(FLASH_STAGING_IMAGE_ADDR + off);
+    eccFault = 0u;
+    for (uint32_t i = 0; i < len / 8u; i++)
     {
-        flashErasePage(p);
+        if (app[i] != stg[i])
+        {
+            return 0;
+        }
     }
+    return eccFault == 0u;
+}
 
-    /* Copy padded to whole doublewords; staging beyond the image is erased
-     * (0xFF), so reading a full trailing doubleword is safe. */
-    uint32_t doublewords = (size + 7u) / 8u;
+static void applyStagedImage(uint32_t size, uint32_t crc32)
+{
+    flashUnlock();
+
+    /* Only the pages the image covers, and of those only the ones whose
+     * bytes differ: an OTA that changes a few functions rewrites a few pages,
+     * and a 20KB image never touches the slot beyond its own end (whatever
+     * the previous image left there is never executed — nothing in the new
+     * one links to it). Skipped pages also skip their erase cycles' wear.
+     *
+     * Compared and copied padded to whole doublewords; staging beyond the
+     * image is erased (0xFF), so reading a full trailing doubleword is safe. */
+    const uint32_t padded = (size + 7u) & ~7u;
     const uint64_t *src = (const uint64_t *)FLASH_STAGING_IMAGE_ADDR;
-    for (uint32_t i = 0; i < doublewords; i++)
+    for (uint32_t off = 0; off < padded; off += FLASH_LAYOUT_PAGE_SIZE)
     {
-        if ((i & 63u) == 0u)
+        uint32_t len = padded - off;
+        if (len > FLASH_LAYOUT_PAGE_SIZE)
         {
-            iwdgReload();
+            len = FLASH_LAYOUT_PAGE_SIZE;
+        }
+        iwdgReload();
+        if (appMatchesStaged(off, len))
+        {
+            continue;
+        }
+
+        flashErasePage(FLASH_APP_FIRST_PAGE + off / FLASH_LAYOUT_PAGE_SIZE);
+        for (uint32_t i = off / 8u; i < (off + len) / 8u; i++)
+        {
+            /* The erase already left all-ones; programming them again is a
+             * wasted ~85us cycle (padding, and the tail of a short page). */
+            if (src[i] != 0xFFFFFFFFFFFFFFFFull)
+            {
+                flashProgramDoubleword(FLASH_APP_ADDR + i * 8u, src[i]);
+            }
         }
-        flashProgramDoubleword(FLASH_APP_ADDR + i * 8u, src[i]);
     }
 
     iwdgReload();
-    if (crc32Image((const uint8_t *)FLASH_APP_ADDR, size) == crc32)
+    if (crc32Zlib((const uint8_t *)FLASH_APP_ADDR, size) == crc32)
     {
         /* Copy verified: consume the request. This is the commit point. */
         flashErasePage(FLASH_STAGING_HEADER_PAGE);
@@ -167,10 +193,10 @@ int main(void)
     const OtaStagingHeader *hdr = (const OtaStagingHeader *)FLASH_STAGING_HEADER_ADDR;
     if (hdr->magic == FLASH_OTA_HEADER_MAGIC &&
         hdr->imageSize >= 8u && hdr->imageSize <= FLASH_OTA_MAX_IMAGE_SIZE &&
-        crc16Header((const uint8_t *)hdr, 12u) == hdr->hdrCrc16)
+        crc16Ccitt((const uint8_t *)hdr, 12u) == hdr->hdrCrc16)
     {
         iwdgReload();
-        if (crc32Image((const uint8_t *)FLASH_STAGING_IMAGE_ADDR, hdr->imageSize) == hdr->imageCrc32)
+        if (crc32Zlib((const uint8_t *)FLASH_STAGING_IMAGE_ADDR, hdr->imageSize) == hdr->imageCrc32)
         {
             applyStagedImage(hdr->imageSize, hdr->imageCrc32); /* resets */
         }
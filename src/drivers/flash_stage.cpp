@@ -1,57 +1,40 @@
 #include "drivers/flash_stage.h"
+#include "drivers/flash_stage_hal.h"
+#include "util/crc.h"
 #include <IWatchdog.h>
 #include <string.h>
 
+static_assert(FLASH_STAGING_IMAGE_PAGES <= 32, "one bit per image page in a uint32_t");
+
 // ---------------------------------------------------------------------------
 // Internal helpers
 // ---------------------------------------------------------------------------
 
 namespace {
 
-// CRC-32/ISO-HDLC (zlib), bitwise — matches the host tool and the bootloader.
-uint32_t crc32Bytes(const uint8_t *p, uint32_t len)
-{
-    uint32_t crc = 0xFFFFFFFFu;
-    while (len--)
-    {
-        crc ^= *p++;
-        for (int i = 0; i < 8; i++)
-        {
-            crc = (crc >> 1) ^ (0xEDB88320u & (0u - (crc & 1u)));
-        }
-    }
-    return crc ^ 0xFFFFFFFFu;
-}
+// The session: what was declared at flashStageBegin, which image pages have
+// been erased since, and which hold at least one programmed chunk.
+uint32_t sessionBytes = 0;          // 0 = no session: every write is refused
+uint32_t neededPages = 0;           // bit k: image page k is inside the image
+uint32_t erasedPages = 0;
+uint32_t writtenPages = 0;
 
-// CRC16-CCITT for the staging header (same polynomial as the bootloader).
-uint16_t crc16Bytes(const uint8_t *p, uint32_t len)
+void erasePage(uint16_t k)
 {
-    uint16_t crc = 0xFFFFu;
-    while (len--)
-    {
-        crc ^= (uint16_t)(*p++) << 8;
-        for (int i = 0; i < 8; i++)
-        {
-            crc = (crc & 0x8000u) ? (uint16_t)((crc << 1) ^ 0x1021u) : (uint16_t)(crc << 1);
-        }
-    }
-    return crc;
+    flashHalErasePage(FLASH_STAGING_IMAGE_FIRST_PAGE + k);
+    erasedPages |= 1u << k;
 }
 
-bool programDoublewords(uint32_t addr, const uint8_t *data, uint32_t byteCount)
+// Lowest set bit's index; mask != 0.
+uint16_t lowestPage(uint32_t mask)
 {
-    // byteCount is already a multiple of 8 (callers pad).
-    bool ok = true;
-    HAL_FLASH_Unlock();
-    FLASH->SR = FLASH->SR; // W1C: clear every latched error/status flag
-    for (uint32_t i = 0; i < byteCount && ok; i += 8)
+    uint16_t k = 0;
+    while (!(mask & 1u))
     {
-        uint64_t dw;
-        memcpy(&dw, data + i, sizeof(dw));
-        ok = (HAL_FLASH_Program(FLASH_TYPEPROGRAM_DOUBLEWORD, addr + i, dw) == HAL_OK);
+        mask >>= 1;
+        k++;
     }
-    HAL_FLASH_Lock();
-    return ok;
+    return k;
 }
 
 } // namespace
@@ -60,55 +43,86 @@ bool programDoublewords(uint32_t addr, const uint8_t *data, uint32_t byteCount)
 // Public API
 // ---------------------------------------------------------------------------
 
-void flashStageEraseAll()
+void flashStageBegin(uint32_t imageSize, bool eraseAhead)
 {
-    HAL_FLASH_Unlock();
-    FLASH->SR = FLASH->SR; // W1C: clear every latched error/status flag
-
-    // Header page first, image pages after — erase one page per HAL call so
-    // the watchdog can be fed between the ~22-40ms bus-stalling erases.
-    for (uint32_t page = FLASH_STAGING_HEADER_PAGE;
-         page < FLASH_STAGING_IMAGE_FIRST_PAGE + FLASH_STAGING_IMAGE_PAGES; page++)
+    const uint16_t pages = flashStagePagesFor(imageSize);
+    sessionBytes = imageSize;
+    neededPages  = (pages >= 32) ? 0xFFFFFFFFu : ((1u << pages) - 1u);
+    erasedPages  = 0;
+    writtenPages = 0;
+
+    // The header page goes every time: it may still hold the last commit.
+    flashHalErasePage(FLASH_STAGING_HEADER_PAGE);
+    uint32_t now = eraseAhead ? (neededPages & 1u) : neededPages;
+    while (now)
     {
-        IWatchdog.reload();
-        FLASH_EraseInitTypeDef erase = {};
-        erase.TypeErase = FLASH_TYPEERASE_PAGES;
-        erase.Banks     = FLASH_BANK_1;
-        erase.Page      = page;
-        erase.NbPages   = 1;
-        uint32_t pageError = 0;
-        HAL_FLASHEx_Erase(&erase, &pageError);
+        const uint16_t k = lowestPage(now);
+        erasePage(k);
+        now &= ~(1u << k);
     }
+}
 
-    HAL_FLASH_Lock();
-    IWatchdog.reload();
+bool flashStageTick()
+{
+    // Page k+1 once page k has data: one page ahead of the stream, so the
+    // ~22-40 ms stall lands in the gap after a chunk, not on every loop.
+    const uint32_t due = (writtenPages << 1) & neededPages & ~erasedPages;
+    if (!due)
+    {
+        return false;
+    }
+    erasePage(lowestPage(due));
+    return true;
 }
 
 bool flashStageWriteChunk(uint32_t offset, const uint8_t *data, uint16_t len)
 {
-    if (len == 0 || len > FLASH_OTA_CHUNK_SIZE ||
-        offset % 8 != 0 || offset + len > FLASH_OTA_MAX_IMAGE_SIZE)
+    if (len == 0 || len > FLASH_OTA_LZ_MAX_DECODED ||
+        offset % 8 != 0 || offset + len > sessionBytes)
     {
         return false;
     }
+    const uint32_t whole  = len & ~7u;
+    const uint32_t padded = (len + 7u) & ~7u;
+
+    // A chunk ahead of the erase-ahead (a lost run, a repair round out of
+    // order) erases its own page rather than program a stale one.
+    const uint16_t first = (uint16_t)(offset / FLASH_LAYOUT_PAGE_SIZE);
+    const uint16_t last  = (uint16_t)((offset + padded - 1) / FLASH_LAYOUT_PAGE_SIZE);
+    for (uint16_t k = first; k <= last; k++)
+    {
+        if (!(erasedPages & (1u << k)))
+        {
+            erasePage(k);
+        }
+        writtenPages |= 1u << k;
+    }
 
-    // Pad a short trailing chunk with 0xFF up to whole doublewords (0xFF
-    // keeps un-owned bytes in the erased state).
-    uint8_t buf[FLASH_OTA_CHUNK_SIZE];
-    uint32_t padded = (len + 7u) & ~7u;
-    memcpy(buf, data, len);
-    if (padded > len)
+    if (whole && !flashHalProgram(FLASH_STAGING_IMAGE_ADDR + offset, data, whole))
+    {
+        return false;
+    }
+    if (padded == whole)
     {
-        memset(buf + len, 0xFF, padded - len);
+        return true;
     }
+    // Pad a short trailing chunk with 0xFF up to a whole doubleword (0xFF
+    // keeps un-owned bytes in the erased state).
+    uint8_t tail[8];
+    memset(tail, 0xFF, sizeof(tail));
+    memcpy(tail, data + whole, len - whole);
+    return flashHalProgram(FLASH_STAGING_IMAGE_ADDR + offset + whole, tail, sizeof(tail));
+}
 
-    return programDoublewords(FLASH_STAGING_IMAGE_ADDR + offset, buf, padded);
+const uint8_t *flashStageImage()
+{
+    return flashHalRead(FLASH_STAGING_IMAGE_ADDR);
 }
 
 uint32_t flashStageCrc32(uint32_t size)
 {
     IWatchdog.reload();
-    uint32_t crc = crc32Bytes((const uint8_t *)FLASH_STAGING_IMAGE_ADDR, size);
+    uint32_t crc = crc32Zlib(flashHalRead(FLASH_STAGING_IMAGE_ADDR), size);
     IWatchdog.reload();
     return crc;
 }
@@ -119,8 +133,17 @@ bool flashStageCommitHeader(uint32_t imageSize, uint32_t imageCrc32)
     hdr.magic      = FLASH_OTA_HEADER_MAGIC;
     hdr.imageSize  = imageSize;
     hdr.imageCrc32 = imageCrc32;
-    hdr.hdrCrc16   = crc16Bytes((const uint8_t *)&hdr, 12);
+    hdr.hdrCrc16   = crc16Ccitt((const uint8_t *)&hdr, 12);
     hdr.reserved   = 0xFFFF;
 
-    return programDoublewords(FLASH_STAGING_HEADER_ADDR, (const uint8_t *)&hdr, sizeof(hdr));
+    return flashHalProgram(FLASH_STAGING_HEADER_ADDR, (const uint8_t *)&hdr, sizeof(hdr));
+}
+
+uint32_t flashStageAppCrc32(uint32_t &size)
+{
+    size = flashHalAppSize();
+    IWatchdog.reload();
+    uint32_t crc = crc32Zlib(flashHalRead(FLASH_APP_ADDR), size);
+    IWatchdog.reload();
+    return crc;
 }
@@ -5,27 +5,51 @@
 #include "flash_layout.h"
 
 /*  @file drivers/flash_stage.h
- *  @brief OTA staging-area flash driver (HAL): erase, chunk writes, CRC32
- *         and the final header commit. Layout comes from flash_layout.h.
+ *  @brief OTA staging-area flash driver: erase, chunk writes, CRC32 and the
+ *         final header commit. Layout comes from flash_layout.h.
  *
- *  Writes are 8-byte (doubleword) HAL programs; a partial trailing chunk is
+ *  Writes are 8-byte (doubleword) programs; a partial trailing chunk is
  *  0xFF-padded. The caller (app/ota_control) is responsible for never
  *  writing the same chunk twice — reprogramming a non-blank doubleword
  *  raises PROGERR on the G0.
+ *
+ *  A session erases only the image pages the declared size needs, and
+ *  never programs a page it has not erased itself: a chunk for a page that
+ *  is still waiting its turn erases that page first. The part-specific
+ *  calls live behind drivers/flash_stage_hal.h.
  */
 
-/*  @brief Erase the whole staging area (header page + 30 image pages).
- *         ~700ms of bus-stalling page erases; the watchdog is reloaded
- *         around every page. Call once when an OTA session starts. */
-void flashStageEraseAll();
+/*  @brief Image pages (2 KB each) an image of @p imageSize bytes occupies. */
+inline uint16_t flashStagePagesFor(uint32_t imageSize)
+{
+    return (uint16_t)((imageSize + FLASH_LAYOUT_PAGE_SIZE - 1) / FLASH_LAYOUT_PAGE_SIZE);
+}
+
+/*  @brief Start a staging session for an image of @p imageSize bytes: erase
+ *         the header page and the image pages the image needs — all of them
+ *         here (22-40 ms each, bus stalled; the watchdog is reloaded around
+ *         every page), or with @p eraseAhead only the first, the rest one
+ *         per flashStageTick() as the chunk stream reaches them. */
+void flashStageBegin(uint32_t imageSize, bool eraseAhead);
+
+/*  @brief Erase-ahead upkeep: once a chunk has landed in image page k and
+ *         page k+1 is still unerased, erase it — at most one page a call.
+ *         Call once per loop while a session is receiving.
+ *  @return true if a page was erased (the loop just stalled for it) */
+bool flashStageTick();
 
 /*  @brief Program one received chunk into the staging image area.
- *  @param offset byte offset inside the image (chunkIndex * 128; 8-aligned)
- *  @param data   payload bytes
- *  @param len    1..FLASH_OTA_CHUNK_SIZE; padded with 0xFF to doublewords
- *  @return false on a HAL programming error */
+ *  @param offset byte offset inside the image (8-aligned: chunkIndex * chunk size,
+ *                or a compressed chunk's decoded offset), within the size
+ *                given to flashStageBegin
+ *  @param data   image bytes
+ *  @param len    1..FLASH_OTA_LZ_MAX_DECODED; padded with 0xFF to doublewords
+ *  @return false on a HAL programming error or a chunk outside the image */
 bool flashStageWriteChunk(uint32_t offset, const uint8_t *data, uint16_t len);
 
+/*  @brief The staged image bytes as programmed so far (read-only). */
+const uint8_t *flashStageImage();
+
 /*  @brief CRC-32/ISO-HDLC (zlib) over the first @p size staged image bytes. */
 uint32_t flashStageCrc32(uint32_t size);
 
@@ -35,4 +59,9 @@ uint32_t flashStageCrc32(uint32_t size);
  *  @return false on a HAL programming error */
 bool flashStageCommitHeader(uint32_t imageSize, uint32_t imageCrc32);
 
+/*  @brief CRC-32/ISO-HDLC over the running app image (the app slot up to
+ *         the end of firmware.bin); @p size receives its length. The same
+ *         pair ota_sender.py works out for the file it sends. */
+uint32_t flashStageAppCrc32(uint32_t &size);
+
 #endif // DRIVERS_FLASH_STAGE_H
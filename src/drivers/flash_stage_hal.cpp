@@ -0,0 +1,52 @@
+#include "drivers/flash_stage_hal.h"
+#include "flash_layout.h"
+#include <Arduino.h>
+#include <IWatchdog.h>
+#include <string.h>
+
+// Linker-script symbols: .data's initialisers are the last thing placed in
+// flash, so the image objcopy writes out ends where they do.
+extern "C" uint32_t _sidata, _sdata, _edata;
+
+void flashHalErasePage(uint32_t page)
+{
+    IWatchdog.reload();
+    HAL_FLASH_Unlock();
+    FLASH->SR = FLASH->SR; // W1C: clear every latched error/status flag
+
+    FLASH_EraseInitTypeDef erase = {};
+    erase.TypeErase = FLASH_TYPEERASE_PAGES;
+    erase.Banks     = FLASH_BANK_1;
+    erase.Page      = page;
+    erase.NbPages   = 1;
+    uint32_t pageError = 0;
+    HAL_FLASHEx_Erase(&erase, &pageError);
+
+    HAL_FLASH_Lock();
+    IWatchdog.reload();
+}
+
+bool flashHalProgram(uint32_t addr, const uint8_t *data, uint32_t bytes)
+{
+    bool ok = true;
+    HAL_FLASH_Unlock();
+    FLASH->SR = FLASH->SR;
+    for (uint32_t i = 0; i < bytes && ok; i += 8)
+    {
+        uint64_t dw;
+        memcpy(&dw, data + i, sizeof(dw));
+        ok = (HAL_FLASH_Program(FLASH_TYPEPROGRAM_DOUBLEWORD, addr + i, dw) == HAL_OK);
+    }
+    HAL_FLASH_Lock();
+    return ok;
+}
+
+const uint8_t *flashHalRead(uint32_t addr)
+{
+    return (const uint8_t *)addr;   // memory-mapped
+}
+
+uint32_t flashHalAppSize()
+{
+    return (uint32_t)&_sidata + ((uint32_t)&_edata - (uint32_t)&_sdata) - FLASH_APP_ADDR;
+}
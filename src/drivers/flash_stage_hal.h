@@ -0,0 +1,31 @@
+#ifndef DRIVERS_FLASH_STAGE_HAL_H
+#define DRIVERS_FLASH_STAGE_HAL_H
+
+#include <stdint.h>
+
+/*  @file drivers/flash_stage_hal.h
+ *  @brief The four things drivers/flash_stage.cpp needs from the part.
+ *
+ *  drivers/flash_stage_hal.cpp implements them with the STM32 HAL; the host
+ *  bench (tools/host/host_drivers.cpp) implements them on a flash model, so
+ *  the staging driver's page bookkeeping runs unchanged off the board.
+ *  Nothing outside flash_stage.cpp includes this.
+ */
+
+/*  @brief Erase one 2 KB flash page (absolute page number). ~22-40 ms with
+ *         the bus stalled; the watchdog is reloaded before and after. */
+void flashHalErasePage(uint32_t page);
+
+/*  @brief Program @p bytes (a multiple of 8) at @p addr as doublewords.
+ *  @return false on a programming error (e.g. a non-blank doubleword) */
+bool flashHalProgram(uint32_t addr, const uint8_t *data, uint32_t bytes);
+
+/*  @brief Flash contents at @p addr, readable for as long as the part is. */
+const uint8_t *flashHalRead(uint32_t addr);
+
+/*  @brief Bytes of the running app image from FLASH_APP_ADDR: the length of
+ *         the firmware.bin it was built as (tools/post_build_check.py holds
+ *         the build to that). */
+uint32_t flashHalAppSize();
+
+#endif // DRIVERS_FLASH_STAGE_HAL_H
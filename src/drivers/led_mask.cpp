@@ -1,11 +1,19 @@
 #include "drivers/led_mask.h"
 #include <Adafruit_NeoPixel.h>
+#include "drivers/pixel_dma.h"
 
 // SK6812MINI RGBW: same 800 kHz protocol as the ring's WS2812B but four
-// bytes per pixel, the fourth driving a dedicated white die.
+// bytes per pixel, the fourth driving a dedicated white die. As on the ring,
+// Adafruit_NeoPixel only packs and buffers; frames leave through pixel_dma
+// (TIM3_CH2 + DMA, the upgrade path board.h reserved PB5 for).
 static Adafruit_NeoPixel mask(HW_LED_MASK_PIXEL_COUNT, HW_LED_MASK_PIN,
                               NEO_GRBW + NEO_KHZ800);
 
+static void maskShow()
+{
+    pixelDmaShow(PIXEL_STREAM_MASK, mask.getPixels(), HW_LED_MASK_PIXEL_COUNT * 4);
+}
+
 /*  Colors arrive as the ring's packed RGB (0x00RRGGBB) so the preset engine
  *  stays one code path for both displays. Neutral values are re-routed to
  *  the white die: mixing R+G+B to make white on an RGBW part gives a tinted
@@ -29,10 +37,9 @@ void maskInit()
 {
     mask.begin();       // drives the data pin OUTPUT LOW, defining the line
     mask.clear();
-    // Twice, for the same reason as the ring: the first show() after boot
-    // can glitch the leading pixel's bit timing on STM32.
-    mask.show();
-    mask.show();
+    pixelDmaInit(PIXEL_STREAM_MASK);
+    // One frame is enough with the timer driving the bits (see ledInit).
+    maskShow();
 }
 
 // Index as read off the front of the mask (1-8) -> position in the data
@@ -51,7 +58,7 @@ void maskShowIndex(uint8_t index, uint32_t color)
     {
         mask.setPixelColor(kIndexToChain[index - 1], toMaskColor(color));
     }
-    mask.show();
+    maskShow();
 }
 
 void maskShowRainbow(uint16_t phase)
@@ -77,7 +84,7 @@ void maskShowRainbow(uint16_t phase)
         // crosses the mask, and only this file knows how the data snakes.
         mask.setPixelColor(kIndexToChain[pos], toMaskColor(rgb));
     }
-    mask.show();
+    maskShow();
 }
 
 void maskSetAll(uint32_t color)
@@ -87,11 +94,11 @@ void maskSetAll(uint32_t color)
     {
         mask.setPixelColor(pixel, c);
     }
-    mask.show();
+    maskShow();
 }
 
 void maskOff()
 {
     mask.clear();
-    mask.show();
+    maskShow();
 }
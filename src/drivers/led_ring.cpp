@@ -1,7 +1,15 @@
 #include "drivers/led_ring.h"
+#include "drivers/pixel_dma.h"
 
+// Adafruit_NeoPixel is the frame buffer and colour maths; the frame goes out
+// through pixel_dma (TIM1_CH1 + DMA) instead of its interrupts-off show().
 static Adafruit_NeoPixel ledRing(LED_RING_PIXEL_COUNT, HW_LED_RING_PIN, NEO_GRB + NEO_KHZ800);
 
+static void ringShow()
+{
+    pixelDmaShow(PIXEL_STREAM_RING, ledRing.getPixels(), LED_RING_PIXEL_COUNT * 3);
+}
+
 uint32_t ledColor(uint8_t red, uint8_t green, uint8_t blue)
 {
     return ledRing.Color(red, green, blue);
@@ -16,7 +24,7 @@ void ledSetAllPixels(int ledIndex, uint32_t color)
     {
         ledRing.setPixelColor(pixel, color);
     }
-    ledRing.show();
+    ringShow();
 }
 
 void ledShowRainbowRipple(uint16_t phase)
@@ -33,18 +41,18 @@ void ledShowRainbowRipple(uint16_t phase)
         ledRing.setPixelColor(pixel, color);
     }
 
-    ledRing.show();
+    ringShow();
 }
 
 void ledInit()
 {
     ledRing.begin();    // drives the data pin OUTPUT LOW, defining the line
     ledRing.clear();
+    pixelDmaInit(PIXEL_STREAM_RING);
 
-    // Send the all-black frame twice: on STM32 the very first NeoPixel show()
-    // after boot can glitch the first pixel's bit timing (it latches green,
-    // the leading G byte). The second frame reliably resets it. Call ledInit
-    // early in appInit so the data line is not left floating during boot.
-    ledRing.show();
-    ledRing.show();
+    // One all-black frame. The bit-banged show() needed two — its first
+    // frame after boot could glitch the leading pixel's timing — but the
+    // timer produces every bit the same way, the first one included. Call
+    // ledInit early in appInit so the data line is not left floating.
+    ringShow();
 }
@@ -1,5 +1,5 @@
 #include "drivers/oled.h"
-#include "drivers/oled_font_bignum.h"
+#include "drivers/oled_font_bignum_pages.h"
 
 // Dedicated I2C2 bus for the OLED (separate from the internal I2C1 sensor bus)
 static TwoWire WireOLED(HW_I2C2_SDA_PIN, HW_I2C2_SCL_PIN);
@@ -11,8 +11,124 @@ static bool oledProbeAddress(uint8_t address)
     WireOLED.beginTransmission(address);
     return (WireOLED.endTransmission() == 0);
 }
+
+// ---------------------------------------------------------------------------
+// Dirty-region flush
+// ---------------------------------------------------------------------------
+
+constexpr uint8_t  OLED_PAGES = OLED_HEIGHT / 8;
+// Adafruit_SSD1306 chunks its transfers to the 32-byte Wire buffer, one of
+// which is the 0x40 data control byte; stay inside the same limit.
+constexpr uint8_t  OLED_DATA_CHUNK = 31;
+// The clocks Adafruit_SSD1306 brackets its own transfers with (its
+// constructor defaults): 400 kHz while talking, 100 kHz at rest.
+constexpr uint32_t OLED_I2C_CLK_DURING = 400000UL;
+constexpr uint32_t OLED_I2C_CLK_AFTER  = 100000UL;
+
+// What the panel's GDDRAM holds, in the library's page-major layout (byte
+// = 8 vertical pixels, page p column c at [p * OLED_WIDTH + c]). Every draw
+// call still clears and redraws the whole framebuffer — that is cheap RAM
+// work — but only the columns that came out different from this copy go
+// over I2C. Redrawing "42" as "43" sends the one digit's columns, not the
+// 1 KB frame that costs ~20 ms and delays the next poll().
+uint8_t  shown[OLED_WIDTH * OLED_PAGES];
+bool     shownValid = false;    // false: panel content unknown, push it all
+uint16_t lastRenderUs = 0;
+uint16_t peakRenderUs = 0;
+
+// Send one page's columns [c0, c1] through SSD1306 page/column addressing.
+// In horizontal addressing mode (what Adafruit's init selects) the window
+// confines the write, so the data bytes land exactly there.
+bool sendSpan(uint8_t page, uint8_t c0, uint8_t c1, const uint8_t *src)
+{
+    WireOLED.beginTransmission(OLED_I2C_ADDR);
+    WireOLED.write((uint8_t)0x00);                  // command stream
+    WireOLED.write((uint8_t)SSD1306_COLUMNADDR);
+    WireOLED.write(c0);
+    WireOLED.write(c1);
+    WireOLED.write((uint8_t)SSD1306_PAGEADDR);
+    WireOLED.write(page);
+    WireOLED.write(page);
+    if (WireOLED.endTransmission() != 0)
+    {
+        return false;
+    }
+
+    uint16_t n = (uint16_t)(c1 - c0) + 1;
+    while (n > 0)
+    {
+        uint8_t chunk = (n > OLED_DATA_CHUNK) ? OLED_DATA_CHUNK : (uint8_t)n;
+        WireOLED.beginTransmission(OLED_I2C_ADDR);
+        WireOLED.write((uint8_t)0x40);              // data stream
+        WireOLED.write(src, chunk);
+        if (WireOLED.endTransmission() != 0)
+        {
+            return false;
+        }
+        src += chunk;
+        n -= chunk;
+    }
+    return true;
 }
 
+// Push only what differs from `shown`, one span per dirty page (first to
+// last differing column). A failed transfer leaves the panel in an unknown
+// state, so the next flush falls back to the full frame.
+void flush()
+{
+    const uint8_t *buf = oled.getBuffer();
+    if (!shownValid)
+    {
+        oled.display();
+        memcpy(shown, buf, sizeof(shown));
+        shownValid = true;
+        return;
+    }
+
+    WireOLED.setClock(OLED_I2C_CLK_DURING);
+    for (uint8_t page = 0; page < OLED_PAGES; page++)
+    {
+        const uint16_t row = (uint16_t)page * OLED_WIDTH;
+        int16_t first = -1;
+        int16_t last = -1;
+        for (uint16_t c = 0; c < OLED_WIDTH; c++)
+        {
+            if (buf[row + c] != shown[row + c])
+            {
+                if (first < 0)
+                {
+                    first = (int16_t)c;
+                }
+                last = (int16_t)c;
+            }
+        }
+        if (first < 0)
+        {
+            continue;
+        }
+        if (!sendSpan(page, (uint8_t)first, (uint8_t)last, buf + row + first))
+        {
+            shownValid = false;
+            break;
+        }
+        memcpy(shown + row + first, buf + row + first, (size_t)(last - first + 1));
+    }
+    WireOLED.setClock(OLED_I2C_CLK_AFTER);
+}
+
+// Flush, and record how long the whole render took (drawing + transfer).
+void present(uint32_t startUs)
+{
+    flush();
+    uint32_t us = micros() - startUs;
+    lastRenderUs = (us > 0xFFFF) ? 0xFFFF : (uint16_t)us;
+    if (lastRenderUs > peakRenderUs)
+    {
+        peakRenderUs = lastRenderUs;
+    }
+}
+} // namespace
+
 bool oledInit()
 {
     WireOLED.begin();
@@ -32,47 +148,43 @@ bool oledInit()
     oled.setRotation(0);
     oled.clearDisplay();
     oled.display();
+    memcpy(shown, oled.getBuffer(), sizeof(shown));
+    shownValid = true;
 
     return true;
 }
 
 void oledClear()
 {
+    uint32_t t0 = micros();
     oled.clearDisplay();
-    oled.display();
+    present(t0);
 }
 
 void oledPrint(const char *text, uint8_t textSize)
 {
+    uint32_t t0 = micros();
     oled.clearDisplay();
     oled.setFont(nullptr);
     oled.setTextSize(textSize);
     oled.setCursor(0, 0);
     oled.println(text);
-    oled.display();
+    present(t0);
 }
 
 void oledPrintLargeNumber(uint8_t value)
 {
+    uint32_t t0 = micros();
     char buf[4];
     sniprintf(buf, sizeof(buf), "%02u", (unsigned)(value % 100)); // two tabular digits
 
+    // Straight into the framebuffer in its own page layout: a byte OR per
+    // column per page, instead of GFX testing and plotting ~3,800 pixels
+    // one call at a time. Centred exactly as the GFXfont path was (ink
+    // bounds of both digits, both axes), so every number keeps its pixels.
     oled.clearDisplay();
-    oled.setFont(&OledBigNum);
-    oled.setTextColor(SSD1306_WHITE);
-    oled.setTextSize(1);
-
-    // Centre the two big digits both axes via the font metrics.
-    int16_t bx, by;
-    uint16_t bw, bh;
-    oled.getTextBounds(buf, 0, 0, &bx, &by, &bw, &bh);
-    int16_t x = ((int16_t)OLED_WIDTH - (int16_t)bw) / 2 - bx;
-    int16_t y = ((int16_t)OLED_HEIGHT - (int16_t)bh) / 2 - by;
-    oled.setCursor(x, y);
-    oled.print(buf);
-
-    oled.setFont(nullptr);   // restore the built-in font for other draw calls
-    oled.display();
+    oledBlitCentered(oled.getBuffer(), OLED_WIDTH, OLED_PAGES, OledBigNumPages, buf);
+    present(t0);
 }
 
 namespace {
@@ -95,6 +207,7 @@ void drawCentered(const char *text, int16_t y)
 
 void oledPrintTitledNumber(const char *title, uint16_t value)
 {
+    uint32_t t0 = micros();
     char buf[6];
     // sniprintf = integer-only variant: avoids linking the float-capable
     // vfprintf path (dtoa + double soft-float) that plain snprintf drags in.
@@ -110,11 +223,12 @@ void oledPrintTitledNumber(const char *title, uint16_t value)
     oled.setTextSize(4);
     drawCentered(buf, 26);       // large value below (32px tall, fits 0-63)
 
-    oled.display();
+    present(t0);
 }
 
 void oledPrintOtaProgress(uint8_t percent, uint16_t done, uint16_t total)
 {
+    uint32_t t0 = micros();
     char pct[8];
     char chunks[20];
     sniprintf(pct, sizeof(pct), "%u%%", (unsigned)percent);
@@ -131,11 +245,12 @@ void oledPrintOtaProgress(uint8_t percent, uint16_t done, uint16_t total)
     oled.setTextSize(1);
     drawCentered(chunks, 52);
 
-    oled.display();
+    present(t0);
 }
 
 void oledPrintCentered2(const char *line1, const char *line2, uint8_t textSize)
 {
+    uint32_t t0 = micros();
     oled.clearDisplay();
     oled.setFont(nullptr);
     oled.setTextColor(SSD1306_WHITE);
@@ -158,5 +273,15 @@ void oledPrintCentered2(const char *line1, const char *line2, uint8_t textSize)
         drawCentered(line2, top + lineHeight + lineGap);
     }
 
-    oled.display();
+    present(t0);
+}
+
+uint16_t oledLastRenderUs()
+{
+    return lastRenderUs;
+}
+
+uint16_t oledPeakRenderUs()
+{
+    return peakRenderUs;
 }
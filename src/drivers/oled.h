@@ -9,6 +9,10 @@
 
 /*  @file drivers/oled.h
  *  @brief 0.96" SSD1306 OLED driver on the dedicated I2C2 bus.
+ *
+ *  Every draw call rebuilds the frame in RAM, but only the page/column spans
+ *  that differ from what the panel already shows are sent over I2C — a new
+ *  number costs the changed digit's columns instead of the full 1 KB frame.
  */
 
 #define OLED_WIDTH      128
@@ -58,4 +62,11 @@ void oledPrintCentered2(const char *line1, const char *line2, uint8_t textSize);
  */
 void oledPrintOtaProgress(uint8_t percent, uint16_t done, uint16_t total);
 
+/*  @brief Duration of the most recent draw call, drawing plus I2C transfer,
+ *         in microseconds (saturates at 65535). */
+uint16_t oledLastRenderUs();
+
+/*  @brief Longest draw call since boot, in microseconds (saturating). */
+uint16_t oledPeakRenderUs();
+
 #endif // DRIVERS_OLED_H
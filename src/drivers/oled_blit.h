@@ -0,0 +1,128 @@
+#ifndef DRIVERS_OLED_BLIT_H
+#define DRIVERS_OLED_BLIT_H
+
+#include <stdint.h>
+
+/*  @file drivers/oled_blit.h
+ *  @brief Page-major glyphs, copied straight into the SSD1306 framebuffer.
+ *
+ *  The panel's RAM (and Adafruit_SSD1306's buffer) is page-major: one byte
+ *  is 8 vertical pixels, bit 0 on top, page p column c at [p * width + c].
+ *  A GFXfont is row-major bits, so GFX draws it pixel by pixel — for the two
+ *  big digits that is ~3,800 bit tests and writePixel calls per frame. A
+ *  glyph stored in the panel's own layout is a byte OR per column per page,
+ *  plus one shift when the glyph does not start on a page boundary.
+ *
+ *  Glyphs come from tools/gen_oled_bignum.py (oled_font_bignum_pages.h).
+ *  Plain C++ with no Arduino dependency: tools/check_oled_blit.py compiles
+ *  it on the host and compares every frame with what the GFXfont drew.
+ */
+
+/*  One glyph: `width` columns of ceil(height / 8) pages, page-major, bit 0 =
+ *  top row, rows past `height` zero. Offsets place the ink box in the
+ *  tabular cell the way GFXglyph's xOffset/yOffset do, but yOffset counts
+ *  down from the top of the cell instead of up from the baseline.
+ */
+struct OledPageGlyph
+{
+    uint16_t offset;    // into OledPageFont::bitmap
+    uint8_t  width;
+    uint8_t  height;
+    uint8_t  xOffset;
+    uint8_t  yOffset;
+};
+
+struct OledPageFont
+{
+    const uint8_t       *bitmap;
+    const OledPageGlyph *glyphs;
+    uint8_t first;      // first character
+    uint8_t last;       // last character
+    uint8_t xAdvance;   // tabular: one advance for every glyph
+    uint8_t height;     // cell height
+};
+
+/*  @brief OR a glyph's ink into the framebuffer, top-left ink pixel at (x, y).
+ *         Columns and pages outside the buffer are clipped.
+ */
+inline void oledBlitGlyph(uint8_t *buf, uint8_t bufWidth, uint8_t bufPages,
+                          const OledPageFont &font, const OledPageGlyph &g,
+                          int16_t x, int16_t y)
+{
+    const uint8_t *src = font.bitmap + g.offset;
+    const uint8_t pages = (uint8_t)((g.height + 7) / 8);
+    // Floor division: a glyph above the top edge starts on a negative page.
+    const int16_t page0 = (y >= 0) ? (int16_t)(y / 8) : (int16_t)(-((7 - y) / 8));
+    const uint8_t shift = (uint8_t)(y - page0 * 8);
+
+    for (uint8_t k = 0; k < pages; k++)
+    {
+        const int16_t upper = page0 + k;        // gets the byte's top rows
+        const int16_t lower = upper + 1;        // gets the rest when shifted
+        for (uint8_t c = 0; c < g.width; c++)
+        {
+            const int16_t col = x + c;
+            if (col < 0 || col >= bufWidth)
+            {
+                continue;
+            }
+            const uint16_t v = (uint16_t)src[k * g.width + c] << shift;
+            if (upper >= 0 && upper < bufPages)
+            {
+                buf[upper * bufWidth + col] |= (uint8_t)v;
+            }
+            if (shift && lower >= 0 && lower < bufPages)
+            {
+                buf[lower * bufWidth + col] |= (uint8_t)(v >> 8);
+            }
+        }
+    }
+}
+
+/*  @brief Draw `text` with the ink bounds of the whole string centred on the
+ *         buffer — the placement getTextBounds + setCursor gave the GFXfont,
+ *         so a number lands on exactly the same pixels it always did.
+ *         Characters outside the font are skipped but still advance.
+ */
+inline void oledBlitCentered(uint8_t *buf, uint8_t bufWidth, uint8_t bufPages,
+                             const OledPageFont &font, const char *text)
+{
+    int16_t minX = INT16_MAX, minY = INT16_MAX, maxX = INT16_MIN, maxY = INT16_MIN;
+    int16_t penX = 0;
+    for (const char *p = text; *p; p++, penX += font.xAdvance)
+    {
+        const uint8_t ch = (uint8_t)*p;
+        if (ch < font.first || ch > font.last)
+        {
+            continue;
+        }
+        const OledPageGlyph &g = font.glyphs[ch - font.first];
+        if (!g.width || !g.height)
+        {
+            continue;
+        }
+        if (penX + g.xOffset < minX) minX = penX + g.xOffset;
+        if (penX + g.xOffset + g.width - 1 > maxX) maxX = penX + g.xOffset + g.width - 1;
+        if (g.yOffset < minY) minY = g.yOffset;
+        if (g.yOffset + g.height - 1 > maxY) maxY = g.yOffset + g.height - 1;
+    }
+    if (maxX < minX)
+    {
+        return;                                 // nothing to draw
+    }
+
+    const int16_t x = ((int16_t)bufWidth - (maxX - minX + 1)) / 2 - minX;
+    const int16_t y = ((int16_t)(bufPages * 8) - (maxY - minY + 1)) / 2 - minY;
+    penX = x;
+    for (const char *p = text; *p; p++, penX += font.xAdvance)
+    {
+        const uint8_t ch = (uint8_t)*p;
+        if (ch >= font.first && ch <= font.last)
+        {
+            const OledPageGlyph &g = font.glyphs[ch - font.first];
+            oledBlitGlyph(buf, bufWidth, bufPages, font, g, penX + g.xOffset, y + g.yOffset);
+        }
+    }
+}
+
+#endif // DRIVERS_OLED_BLIT_H
@@ -0,0 +1,192 @@
+#include "drivers/pixel_dma.h"
+#include "drivers/pixel_encode.h"
+#include "board.h"
+
+// --- Timer PWM + DMA, bare registers (RM0454) ---------------------------
+// The HAL TIM/DMA layers would pull in several KB for what is a handful of
+// register writes per stream, the same trade the input-current ADC made in
+// board_io.cpp.
+
+namespace {
+
+constexpr uint32_t PIXEL_BIT_HZ = 800000;       // WS2812B and SK6812 alike
+// Low time that makes the strip latch what it received. SK6812 needs 80 us,
+// recent WS2812B lots 280 us; one figure for both streams.
+constexpr uint32_t PIXEL_LATCH_US = 300;
+// A frame never needs longer than this to clear, even the 32-byte mask:
+// 256 bits x 1.25 us + latch. Past it the transfer is presumed dead.
+constexpr uint32_t PIXEL_WAIT_MAX_US = 2000;
+
+constexpr size_t RING_BYTES = HW_LED_RING_PIXEL_COUNT * 3;  // GRB
+constexpr size_t MASK_BYTES = HW_LED_MASK_PIXEL_COUNT * 4;  // GRBW
+
+uint8_t ringSlots[pixelSlotCount(RING_BYTES)];
+uint8_t maskSlots[pixelSlotCount(MASK_BYTES)];
+
+struct Stream
+{
+    TIM_TypeDef *tim;
+    volatile uint32_t *ccr;             // the compare register the DMA feeds
+    DMA_Channel_TypeDef *dma;
+    DMAMUX_Channel_TypeDef *mux;
+    uint32_t muxRequest;
+    uint32_t flagShift;                 // channel n's ISR/IFCR bits start at 4*(n-1)
+    IRQn_Type irq;
+    uint8_t *slots;
+    size_t capacity;                    // bytes of pixel data the slots hold
+    volatile bool sending;
+    volatile uint32_t doneUs;           // micros() when the last frame ended
+};
+
+Stream streams[2] =
+{
+    { TIM1, &TIM1->CCR1, DMA1_Channel1, DMAMUX1_Channel0, DMA_REQUEST_TIM1_UP,
+      0, DMA1_Channel1_IRQn, ringSlots, RING_BYTES, false, 0 },
+    { TIM3, &TIM3->CCR2, DMA1_Channel2, DMAMUX1_Channel1, DMA_REQUEST_TIM3_UP,
+      4, DMA1_Channel2_3_IRQn, maskSlots, MASK_BYTES, false, 0 },
+};
+
+uint8_t ticksT0 = 0;
+uint8_t ticksT1 = 0;
+
+void pinToAlternate(GPIO_TypeDef *port, uint8_t pin, uint8_t af)
+{
+    port->OSPEEDR |= 3u << (pin * 2);                       // very high speed
+    port->AFR[pin >> 3] = (port->AFR[pin >> 3] & ~(0xFu << ((pin & 7) * 4)))
+                        | ((uint32_t)af << ((pin & 7) * 4));
+    port->MODER = (port->MODER & ~(3u << (pin * 2))) | (2u << (pin * 2));
+}
+
+// Stop the timer and the channel. The compare register is left at the tail's
+// 0, so the output sits low — the line level the strip latches on.
+void stop(Stream &s)
+{
+    s.tim->CR1 &= ~TIM_CR1_CEN;
+    s.tim->DIER &= ~TIM_DIER_UDE;
+    s.dma->CCR &= ~DMA_CCR_EN;
+    DMA1->IFCR = DMA_IFCR_CGIF1 << s.flagShift;
+    s.doneUs = micros();
+    s.sending = false;
+}
+
+// Both flags end the frame: TC because it is done (the tail's first zero
+// slot is already active, so the last data bit has left the pin), TE
+// because nothing more will come out of it.
+void onDmaIrq(Stream &s)
+{
+    const uint32_t flags = DMA1->ISR >> s.flagShift;
+    if (flags & (DMA_ISR_TCIF1 | DMA_ISR_TEIF1))
+    {
+        stop(s);
+    }
+}
+
+} // namespace
+
+extern "C" void DMA1_Channel1_IRQHandler(void)
+{
+    onDmaIrq(streams[PIXEL_STREAM_RING]);
+}
+
+extern "C" void DMA1_Channel2_3_IRQHandler(void)
+{
+    onDmaIrq(streams[PIXEL_STREAM_MASK]);
+}
+
+// ---------------------------------------------------------------------------
+// Public API
+// ---------------------------------------------------------------------------
+
+void pixelDmaInit(PixelStream stream)
+{
+    Stream &s = streams[stream];
+
+    // One bit = one timer period at the full timer clock (64 MHz -> 80
+    // ticks). 0 = 0.375 us high, 1 = 0.70 us high: inside the WS2812B window
+    // (0.4 / 0.8 +-0.15) and the SK6812 one (0.3 / 0.6 +-0.15) at once.
+    const uint32_t period = SystemCoreClock / PIXEL_BIT_HZ;
+    ticksT0 = (uint8_t)(period * 3 / 10);
+    ticksT1 = (uint8_t)(period * 9 / 16);
+
+    RCC->AHBENR |= RCC_AHBENR_DMA1EN;
+    if (stream == PIXEL_STREAM_RING)
+    {
+        RCC->IOPENR |= RCC_IOPENR_GPIOAEN;
+        RCC->APBENR2 |= RCC_APBENR2_TIM1EN;
+        (void)RCC->APBENR2;                      // settle the clock enable
+        // PWM mode 1 with compare preload: a DMA write lands in the preload
+        // register and takes effect at the next period, so every bit gets a
+        // whole period regardless of when the DMA got to it.
+        TIM1->CCMR1 = TIM_CCMR1_OC1M_2 | TIM_CCMR1_OC1M_1 | TIM_CCMR1_OC1PE;
+        TIM1->CCER = TIM_CCER_CC1E;
+        TIM1->BDTR = TIM_BDTR_MOE;               // advanced timer: outputs gated by MOE
+        pinToAlternate(GPIOA, 8, 2);             // PA8 = TIM1_CH1 (AF2)
+    }
+    else
+    {
+        RCC->IOPENR |= RCC_IOPENR_GPIOBEN;
+        RCC->APBENR1 |= RCC_APBENR1_TIM3EN;
+        (void)RCC->APBENR1;
+        TIM3->CCMR1 = TIM_CCMR1_OC2M_2 | TIM_CCMR1_OC2M_1 | TIM_CCMR1_OC2PE;
+        TIM3->CCER = TIM_CCER_CC2E;
+        pinToAlternate(GPIOB, 5, 1);             // PB5 = TIM3_CH2 (AF1)
+    }
+
+    s.tim->CR1 = TIM_CR1_ARPE;
+    s.tim->PSC = 0;
+    s.tim->ARR = period - 1;
+    *s.ccr = 0;
+    s.tim->EGR = TIM_EGR_UG;                     // load ARR/CCR, output low
+
+    // Memory bytes widen to the 16-bit compare register (zero-extended by
+    // the DMA), so the slot buffer stays one byte per bit.
+    s.dma->CCR = 0;
+    s.dma->CPAR = (uint32_t)s.ccr;
+    s.mux->CCR = s.muxRequest;                   // the timer's update request
+
+    NVIC_SetPriority(s.irq, 3);                  // lowest: the tail slots give it slack
+    NVIC_EnableIRQ(s.irq);
+    s.sending = false;
+    s.doneUs = micros() - PIXEL_LATCH_US;        // nothing pending
+}
+
+bool pixelDmaBusy(PixelStream stream)
+{
+    const Stream &s = streams[stream];
+    return s.sending || (micros() - s.doneUs) < PIXEL_LATCH_US;
+}
+
+void pixelDmaShow(PixelStream stream, const uint8_t *wire, size_t len)
+{
+    Stream &s = streams[stream];
+    if (len > s.capacity)
+    {
+        len = s.capacity;
+    }
+
+    const uint32_t waitStart = micros();
+    while (pixelDmaBusy(stream))
+    {
+        if (micros() - waitStart > PIXEL_WAIT_MAX_US)
+        {
+            stop(s);                             // a lost completion must not wedge the LEDs
+            break;
+        }
+    }
+
+    const size_t n = pixelEncode(wire, len, s.slots, ticksT0, ticksT1);
+
+    s.sending = true;
+    s.dma->CCR = 0;
+    DMA1->IFCR = DMA_IFCR_CGIF1 << s.flagShift;
+    s.dma->CMAR = (uint32_t)s.slots;
+    s.dma->CNDTR = n;
+    s.dma->CCR = DMA_CCR_DIR | DMA_CCR_MINC | DMA_CCR_PSIZE_0
+               | DMA_CCR_TCIE | DMA_CCR_TEIE | DMA_CCR_EN;
+
+    // Restart from a known phase: the first update loads the preload (0) and
+    // requests slot 0, so the frame opens with low periods, never a runt.
+    s.tim->CNT = 0;
+    s.tim->DIER |= TIM_DIER_UDE;
+    s.tim->CR1 |= TIM_CR1_CEN;
+}
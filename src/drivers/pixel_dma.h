@@ -0,0 +1,51 @@
+#ifndef DRIVERS_PIXEL_DMA_H
+#define DRIVERS_PIXEL_DMA_H
+
+#include <Arduino.h>
+
+/*  @file drivers/pixel_dma.h
+ *  @brief Background WS2812B / SK6812 output: timer PWM fed by DMA.
+ *
+ *  Adafruit_NeoPixel::show() bit-bangs with interrupts off — ~480 us for the
+ *  16-pixel ring, during which a byte arriving on the RS485 UART has nowhere
+ *  to go. Here a frame is encoded into one compare value per bit
+ *  (drivers/pixel_encode.h) and a DMA channel feeds those to the timer, one
+ *  per 1.25 us period, while the CPU goes back to the tick. Nothing runs
+ *  with interrupts masked.
+ *
+ *  Two streams, each on the timer channel board.h reserved for it:
+ *    PIXEL_STREAM_RING  PA8 = TIM1_CH1, DMA1 channel 1
+ *    PIXEL_STREAM_MASK  PB5 = TIM3_CH2, DMA1 channel 2
+ *
+ *  The pixel drivers keep using Adafruit_NeoPixel for colour packing and as
+ *  the frame buffer; only its show() is replaced by pixelDmaShow().
+ */
+
+enum PixelStream : uint8_t
+{
+    PIXEL_STREAM_RING = 0,
+    PIXEL_STREAM_MASK = 1,
+};
+
+/*  @brief Hand the stream's pin to its timer and set up the timer + DMA.
+ *         Call after Adafruit_NeoPixel::begin() has driven the pin low. */
+void pixelDmaInit(PixelStream stream);
+
+/*  @brief Start sending one frame and return without waiting for it.
+ *
+ *  @p wire is copied (encoded) before this returns, so the caller may change
+ *  its buffer straight away. If the previous frame is still on the wire or
+ *  inside its latch gap, this waits for it first — a frame is never cut
+ *  short or overwritten mid-transfer (that is what tears the ring). The wait
+ *  is with interrupts enabled and bounded by one frame plus the latch.
+ *
+ *  @param wire Pixel bytes in the strip's colour order
+ *  @param len  Byte count; must not exceed the stream's pixel capacity
+ */
+void pixelDmaShow(PixelStream stream, const uint8_t *wire, size_t len);
+
+/*  @brief true while a frame is being sent or the strip has not yet seen the
+ *         low time that latches it. */
+bool pixelDmaBusy(PixelStream stream);
+
+#endif // DRIVERS_PIXEL_DMA_H
@@ -0,0 +1,65 @@
+#ifndef DRIVERS_PIXEL_ENCODE_H
+#define DRIVERS_PIXEL_ENCODE_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+/*  @file drivers/pixel_encode.h
+ *  @brief WS2812B / SK6812 bit encoding for the timer-PWM + DMA pixel
+ *         output (drivers/pixel_dma).
+ *
+ *  Every data bit becomes one timer period ("slot") whose compare value sets
+ *  how long the line stays high: a short high is a 0, a long high a 1. The
+ *  DMA writes one slot per period into the timer's compare register, so the
+ *  buffer built here IS the waveform.
+ *
+ *  Plain C++ with no Arduino or HAL dependency on purpose: it is the one
+ *  piece of the pixel path whose correctness can be checked off-target, and
+ *  tools/check_pixel_encode.py compiles it on the host and compares it with
+ *  an independent reference.
+ */
+
+// Zero-compare slots after the data: the output is already low, and the
+// first of them is what the DMA completion leaves active, so the last data
+// bit has fully left the pin by the time the completion interrupt stops the
+// timer.
+constexpr size_t PIXEL_TAIL_SLOTS = 2;
+
+/*  @brief Slots needed for @p bytes of pixel data (8 per byte + the tail). */
+constexpr size_t pixelSlotCount(size_t bytes)
+{
+    return bytes * 8 + PIXEL_TAIL_SLOTS;
+}
+
+/*  @brief Expand wire-order pixel bytes into per-bit compare values.
+ *
+ *  Bytes go out in the order given (the caller's buffer is already in the
+ *  strip's colour order, e.g. G R B or G R B W), each byte MSB first.
+ *
+ *  @param wire   Pixel bytes in transmission order
+ *  @param len    Number of bytes in @p wire
+ *  @param slots  Output; must hold pixelSlotCount(len) entries
+ *  @param t0     Compare value (timer ticks high) for a 0 bit
+ *  @param t1     Compare value for a 1 bit
+ *  @return Number of slots written, always pixelSlotCount(len)
+ */
+inline size_t pixelEncode(const uint8_t *wire, size_t len, uint8_t *slots,
+                          uint8_t t0, uint8_t t1)
+{
+    size_t n = 0;
+    for (size_t i = 0; i < len; i++)
+    {
+        const uint8_t byte = wire[i];
+        for (uint8_t mask = 0x80; mask != 0; mask >>= 1)
+        {
+            slots[n++] = (byte & mask) ? t1 : t0;
+        }
+    }
+    for (size_t i = 0; i < PIXEL_TAIL_SLOTS; i++)
+    {
+        slots[n++] = 0;
+    }
+    return n;
+}
+
+#endif // DRIVERS_PIXEL_ENCODE_H
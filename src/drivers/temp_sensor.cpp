@@ -1,42 +1,82 @@
 #include "drivers/temp_sensor.h"
 #include <Wire.h>
-#include <SensirionI2CSts4x.h>
 #include "board.h"
 
-// Two STS40 variants on the internal I2C1 bus, distinguished by address:
-// CD1B -> 0x46 (library default ADDR_STS4X), AD1B -> 0x44 (ADDR_STS4X_ALT).
-static SensirionI2CSts4x stsRoom;   // STS40-CD1B-R3, room temperature
-static SensirionI2CSts4x stsBoard;  // STS40-AD1B-R3, board temperature
+// Two STS40 variants on the internal I2C1 bus, distinguished by address.
+// Driven with bare Wire transactions rather than the Sensirion library: its
+// measure calls send the command, delay() through the conversion and only
+// then read — exactly the 10 ms of dead loop time this driver exists to
+// remove — and the two transactions it wraps are all the protocol there is.
 
-void tempSensorInit()
+namespace {
+
+constexpr uint8_t STS40_ADDR[2] =
 {
-    // I2C1 (default Wire instance) is brought up by boardI2C1Init().
-    stsRoom.begin(Wire, ADDR_STS4X);        // 0x46
-    stsBoard.begin(Wire, ADDR_STS4X_ALT);   // 0x44
-}
+    0x46,                       // STS40-CD1B-R3, room temperature
+    0x44,                       // STS40-AD1B-R3, board temperature
+};
+constexpr uint8_t STS40_CMD_MEASURE_HIGH = 0xFD;
+constexpr uint8_t STS40_CMD_SOFT_RESET   = 0x94;
 
-namespace {
-// STS4x datasheet: degC = (175 * ticks / 65535) - 45. In centidegrees and
-// pure integer math: (17500 * ticks / 65535) - 4500. 17500 * 65535 fits in
-// uint32 (~1.15e9), so no overflow and no float is pulled in.
-bool readCenti(SensirionI2CSts4x &sensor, int16_t &centiC)
+// Sensirion CRC-8: poly 0x31, init 0xFF, over the two data bytes.
+uint8_t crc8(const uint8_t *data, uint8_t len)
 {
-    uint16_t ticks = 0;
-    if (sensor.measureHighPrecisionTicks(ticks) != 0)
+    uint8_t crc = 0xFF;
+    for (uint8_t i = 0; i < len; i++)
     {
-        return false;
+        crc ^= data[i];
+        for (uint8_t bit = 0; bit < 8; bit++)
+        {
+            crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0x31) : (uint8_t)(crc << 1);
+        }
     }
-    centiC = (int16_t)((uint32_t)17500 * ticks / 65535) - 4500;
-    return true;
+    return crc;
+}
+
+bool sendCommand(uint8_t address, uint8_t command)
+{
+    Wire.beginTransmission(address);
+    Wire.write(command);
+    return (Wire.endTransmission() == 0);
 }
+
 } // namespace
 
-bool tempReadRoomCenti(int16_t &centiC)
+void tempSensorInit()
+{
+    // I2C1 (default Wire instance) is brought up by boardI2C1Init(). A soft
+    // reset puts each sensor in a known idle state (a conversion a previous
+    // image started before reset would otherwise NAK the first command);
+    // the sensors need ~1 ms afterwards, long gone by the first tick.
+    sendCommand(STS40_ADDR[TEMP_SENSOR_ROOM], STS40_CMD_SOFT_RESET);
+    sendCommand(STS40_ADDR[TEMP_SENSOR_BOARD], STS40_CMD_SOFT_RESET);
+}
+
+bool tempStartMeasurement(TempSensor sensor)
 {
-    return readCenti(stsRoom, centiC);
+    return sendCommand(STS40_ADDR[sensor], STS40_CMD_MEASURE_HIGH);
 }
 
-bool tempReadBoardCenti(int16_t &centiC)
+bool tempCollectCenti(TempSensor sensor, int16_t &centiC)
 {
-    return readCenti(stsBoard, centiC);
+    uint8_t raw[3];
+    if (Wire.requestFrom(STS40_ADDR[sensor], (uint8_t)sizeof(raw)) != sizeof(raw))
+    {
+        return false;           // NAK: still converting, or not there
+    }
+    for (uint8_t i = 0; i < sizeof(raw); i++)
+    {
+        raw[i] = (uint8_t)Wire.read();
+    }
+    if (crc8(raw, 2) != raw[2])
+    {
+        return false;
+    }
+
+    // STS4x datasheet: degC = (175 * ticks / 65535) - 45. In centidegrees and
+    // pure integer math: (17500 * ticks / 65535) - 4500. 17500 * 65535 fits in
+    // uint32 (~1.15e9), so no overflow and no float is pulled in.
+    const uint16_t ticks = (uint16_t)((raw[0] << 8) | raw[1]);
+    centiC = (int16_t)((uint32_t)17500 * ticks / 65535) - 4500;
+    return true;
 }
@@ -8,26 +8,39 @@
  *
  *  - STS40-CD1B-R3 @0x46: room (ambient) temperature -> Modbus reg 20
  *  - STS40-AD1B-R3 @0x44: board temperature          -> Modbus reg 21
+ *
+ *  Split-phase: a measurement is started by one short I2C write and its
+ *  result collected by one short read at least TEMP_CONVERSION_MS later.
+ *  The sensor converts on its own in between, so the ~10 ms a blocking read
+ *  used to spend waiting no longer stalls the main loop (and Modbus).
  */
 
-/*  @brief Initialize the internal I2C1 bus and both STS40 sensors. */
+enum TempSensor : uint8_t
+{
+    TEMP_SENSOR_ROOM  = 0,      // matches diagReportSensor()'s index
+    TEMP_SENSOR_BOARD = 1,
+};
+
+// High-repeatability conversion: 8.3 ms max per the STS4x datasheet, plus
+// margin. Collecting earlier than this reads a NAK, not a stale value.
+#define TEMP_CONVERSION_MS  10
+
+/*  @brief Initialize both STS40 sensors (I2C1 must already be up). */
 void tempSensorInit();
 
-/*  @brief Read the room (ambient) temperature from the STS40-CD1B (0x46).
+/*  @brief Start a high-precision measurement and return immediately.
+ *  @return true when the sensor acknowledged the command */
+bool tempStartMeasurement(TempSensor sensor);
+
+/*  @brief Collect the result of the measurement started on @p sensor.
  *
- *  Integer-only path (no float): reads raw ticks and converts to
+ *  Call no sooner than TEMP_CONVERSION_MS after tempStartMeasurement().
+ *  Integer-only path (no float): raw ticks are CRC-checked and converted to
  *  centidegrees Celsius, so the firmware pulls in no soft-float.
  *
  *  @param centiC Output temperature in hundredths of a degree Celsius
- *  @return true when a value was read successfully
- */
-bool tempReadRoomCenti(int16_t &centiC);
-
-/*  @brief Read the board temperature from the STS40-AD1B (0x44).
- *
- *  @param centiC Output temperature in hundredths of a degree Celsius
- *  @return true when a value was read successfully
+ *  @return true when a value was read and its CRC matched
  */
-bool tempReadBoardCenti(int16_t &centiC);
+bool tempCollectCenti(TempSensor sensor, int16_t &centiC);
 
 #endif // DRIVERS_TEMP_SENSOR_H
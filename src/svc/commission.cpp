@@ -6,6 +6,7 @@
 #include "version.h"
 #include "drivers/eeprom_at24.h"
 #include "svc/settings.h"
+#include "util/crc.h"
 
 // ---------------------------------------------------------------------------
 // The block itself
@@ -79,22 +80,6 @@ static_assert(sizeof(ProvisioningRecord) == 16,
 static_assert(STATS_AT24_ADDR + 128 <= COMMISSION_AT24_ADDR,
               "the commissioning record must not overlap the statistics blob");
 
-// CRC16-CCITT, same parameters as the settings blob (poly 0x1021, init
-// 0xFFFF) so there is one checksum to reason about across the firmware.
-uint16_t crc16(const uint8_t *data, size_t len)
-{
-    uint16_t crc = 0xFFFF;
-    for (size_t i = 0; i < len; i++)
-    {
-        crc ^= (uint16_t)data[i] << 8;
-        for (uint8_t bit = 0; bit < 8; bit++)
-        {
-            crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
-        }
-    }
-    return crc;
-}
-
 /*  @brief The token this board already consumed, or 0 if there is none.
  *
  *  A missing, unreadable or damaged record reads as "nothing consumed", so
@@ -111,7 +96,7 @@ bool readRecord(ProvisioningRecord &r)
     {
         return false;
     }
-    return r.crc == crc16((const uint8_t *)&r, offsetof(ProvisioningRecord, crc));
+    return r.crc == crc16Ccitt((const uint8_t *)&r, offsetof(ProvisioningRecord, crc));
 }
 
 uint32_t storedToken()
@@ -129,7 +114,7 @@ bool writeRecord(uint32_t token, uint16_t deviceType)
     r.size       = sizeof(r);
     r.token      = token;
     r.deviceType = deviceType;
-    r.crc        = crc16((const uint8_t *)&r, offsetof(ProvisioningRecord, crc));
+    r.crc        = crc16Ccitt((const uint8_t *)&r, offsetof(ProvisioningRecord, crc));
     return at24Write(COMMISSION_AT24_ADDR, (const uint8_t *)&r, sizeof(r));
 }
 
@@ -169,7 +154,7 @@ bool commissionRead(CommissionBlock *out)
         memcpy(&v1, &b, COMMISSION_BLOCK_SIZE_V1);
         const uint16_t crc = *(const uint16_t *)((const uint8_t *)&b
                                                  + COMMISSION_BLOCK_SIZE_V1 - 2);
-        if (crc16((const uint8_t *)&b, COMMISSION_BLOCK_SIZE_V1 - 2) != crc)
+        if (crc16Ccitt((const uint8_t *)&b, COMMISSION_BLOCK_SIZE_V1 - 2) != crc)
         {
             return false;
         }
@@ -182,7 +167,7 @@ bool commissionRead(CommissionBlock *out)
     {
         return false;
     }
-    if (crc16((const uint8_t *)&b, COMMISSION_CRC_LEN) != b.crc)
+    if (crc16Ccitt((const uint8_t *)&b, COMMISSION_CRC_LEN) != b.crc)
     {
         return false;
     }
@@ -51,8 +51,12 @@ constexpr uint16_t MB_REG_LATCH_LOCKED      = 41;   // 1 = latch reads locked (d
 
 // --- Configuration group (holding registers) ---
 constexpr uint16_t MB_REG_SET_NUM_DISPLAY   = 60;   // R5.0 renders 0-99 (clamped); legacy range 0-9999
+constexpr uint16_t MB_REG_OLED_RENDER_US    = 61;   // RO: last OLED render, drawing + I2C, microseconds
+constexpr uint16_t MB_REG_OLED_RENDER_PEAK  = 62;   // RO: longest OLED render since boot, microseconds
 
 constexpr uint16_t MB_REG_UNLOCK_DELAY      = 80;   // milliseconds 0-8000, (F)
+// 81 stays unused: Delivery-era masters still write it (LED num per strip).
+constexpr uint16_t MB_REG_GROUP_MASK        = 82;   // group membership, bit g-1 = group g (1-16), (F)
 
 // LED color presets 1-8: one physical ring, eight persisted color presets.
 // Preset n (1-8) owns five registers at 100 + 10n .. 104 + 10n, matching the
@@ -79,7 +83,8 @@ constexpr uint16_t MB_REG_LED_1_ON_TIME     = 211;  // seconds
 
 // --- OTA group (holding registers 282-399; see doc + include/flash_layout.h) ---
 // Transfer runs over Modbus broadcast FC16 (slave id 0): the master streams
-// 128-byte chunks into the data window; the commit register is a REG_CHANGE
+// chunks (128 bytes, or the negotiated size: reg 358, reg 289 bits 8-15)
+// into a data window; each window's commit register is a REG_CHANGE
 // watch whose value the master increments on EVERY transmission (including
 // retransmits) so the handler always fires.
 constexpr uint16_t MB_REG_OTA_STATE          = 282; // RO: lo=state (0 idle/1 rx/2 verified/3 failed), hi=error
@@ -88,15 +93,44 @@ constexpr uint16_t MB_REG_OTA_SIZE_HI        = 284; // W: image size u32 (hi/lo)
 constexpr uint16_t MB_REG_OTA_SIZE_LO        = 285;
 constexpr uint16_t MB_REG_OTA_CRC_HI         = 286; // W: image CRC32 (hi/lo)
 constexpr uint16_t MB_REG_OTA_CRC_LO         = 287;
-constexpr uint16_t MB_REG_OTA_TOTAL_CHUNKS   = 288; // W: must equal ceil(size/128)
+constexpr uint16_t MB_REG_OTA_TOTAL_CHUNKS   = 288; // W: must equal ceil(size/chunk size)
+constexpr uint16_t MB_REG_OTA_FLAGS          = 289; // W: session options, read (then cleared) at coil 505
 constexpr uint16_t MB_REG_OTA_CHUNK_INDEX    = 290; // W: chunk number 0..N-1
 constexpr uint16_t MB_REG_OTA_CHUNK_LEN      = 291; // W: payload bytes 1..128
 constexpr uint16_t MB_REG_OTA_CHUNK_CRC      = 292; // W: CRC16 of the payload bytes
 constexpr uint16_t MB_REG_OTA_DATA_FIRST     = 293; // W: payload window, 64 regs
 constexpr uint16_t MB_REG_OTA_DATA_LAST      = 356; //    (2 bytes/reg, big-endian)
 constexpr uint16_t MB_REG_OTA_COMMIT         = 357; // W: tx-counter commit (fires the handler)
+constexpr uint16_t MB_REG_OTA_MAX_CHUNK      = 358; // RO: largest chunk this board takes (0 = older fw: 128)
 constexpr uint16_t MB_REG_OTA_BITMAP_FIRST   = 360; // RO: received bitmap, 30 regs = 480 bits
 constexpr uint16_t MB_REG_OTA_BITMAP_LAST    = 389;
+// Fingerprint of the running image, set once at boot (0 = older fw: unknown).
+// Size and CRC32 cover firmware.bin as built, so a master compares them with
+// the file it is about to send; 394-395 is the build's git commit.
+constexpr uint16_t MB_REG_OTA_APP_SIZE_HI    = 390; // RO: running image size u32 (hi/lo)
+constexpr uint16_t MB_REG_OTA_APP_SIZE_LO    = 391;
+constexpr uint16_t MB_REG_OTA_APP_CRC_HI     = 392; // RO: running image CRC32 (hi/lo)
+constexpr uint16_t MB_REG_OTA_APP_CRC_LO     = 393;
+constexpr uint16_t MB_REG_OTA_BUILD_ID_HI    = 394; // RO: FW_BUILD_ID (version.h) (hi/lo)
+constexpr uint16_t MB_REG_OTA_BUILD_ID_LO    = 395;
+// reg 289 bits. 0 (what a master that never writes 289 leaves) = the
+// original session: every page the image needs is erased at coil 505.
+constexpr uint16_t MB_OTA_FLAG_ERASE_AHEAD   = 0x0001; // erase page k+1 while page k arrives
+constexpr uint16_t MB_OTA_FLAG_RESUME        = 0x0002; // same image as the held session: keep it
+constexpr uint16_t MB_OTA_FLAG_LZ            = 0x0004; // chunks are compressed (tools/ota_lz.py)
+constexpr uint16_t MB_OTA_FLAGS_CHUNK_SHIFT  = 8;      // bits 8-15: chunk size / 8, 0 = 128
+
+// --- Wide OTA chunk window (holding registers 690-809) ---
+// The 290-357 frame with room for a chunk of up to 232 bytes, for sessions
+// whose chunk size is above 128: one FC16 of 120 registers (ADU 249 B).
+// A shorter chunk leaves the tail of the data window unused. 682-689 are
+// reserved and read as 0.
+constexpr uint16_t MB_REG_OTA_WIDE_INDEX      = 690; // W: chunk number 0..N-1
+constexpr uint16_t MB_REG_OTA_WIDE_LEN        = 691; // W: payload bytes 1..chunk size
+constexpr uint16_t MB_REG_OTA_WIDE_CRC        = 692; // W: CRC16 of the payload bytes
+constexpr uint16_t MB_REG_OTA_WIDE_DATA_FIRST = 693; // W: payload window, 116 regs
+constexpr uint16_t MB_REG_OTA_WIDE_DATA_LAST  = 808;
+constexpr uint16_t MB_REG_OTA_WIDE_COMMIT     = 809; // W: tx-counter commit (fires the handler)
 
 // --- Statistics v2 (holding registers, read-only, fw >= v3.3.0) ---
 // True u32 values of the lifetime counters, hi word first within each pair
@@ -115,6 +149,73 @@ constexpr uint16_t mbRegS2OnCounterHi(uint16_t n) { return 420 + 4 * (n - 1); }
 constexpr uint16_t mbRegS2OnTimeHi(uint16_t n)    { return 422 + 4 * (n - 1); } // +1 = lo
 constexpr uint16_t MB_REG_S2_LAST             = 451;
 
+// --- Loop profile (holding registers, read-only, R5.0-new) ---
+// Where the main loop's time goes, per tick-pipeline stage, since boot or
+// the last coil 512. Stage s (0 modbus, 1 latch, 2 led, 3 ota, 4 diag,
+// 5 mode handler, 6 whole loop period) owns twelve registers at 464 + 12s:
+//   +0/+1 max microseconds (u32, hi word first)   +2 rolling average us
+//   +3 reserved (0)   +4..+11 histogram: loops per two-octave log2 bucket,
+//   <64us, <256us, <1ms, <4ms, <16ms, <65ms, <262ms, longer (u16; at
+//   65535 the stage's whole histogram halves, so it keeps its shape)
+// 452-459 and 462-463 are reserved and read as 0.
+constexpr uint16_t MB_PROF_STAGE_COUNT   = 7;
+constexpr uint16_t MB_PROF_BUCKET_COUNT  = 8;
+constexpr uint16_t MB_REG_PROF_LOOPS_HI  = 460;  // 461 = lo, loops sampled
+constexpr uint16_t mbRegProfMaxHi(uint16_t s)   { return 464 + 12 * s; }     // s = 0..6, +1 = lo
+constexpr uint16_t mbRegProfAvg(uint16_t s)     { return 466 + 12 * s; }
+constexpr uint16_t mbRegProfBucket(uint16_t s, uint16_t b) { return 468 + 12 * s + b; } // b = 0..7
+constexpr uint16_t MB_REG_PROF_LAST      = 547;
+
+// --- Group command window (holding registers 560-681, R5.0-new) ---
+// One broadcast FC16 (slave id 0) carries a whole pick list: up to 60
+// entries of {target, coil word}. Every module walks the list and applies
+// the entries that target its slave ID, a group it belongs to (reg 82) or
+// everyone, exactly as if the coil write had been addressed to it. The
+// sequence register is a REG_CHANGE watch: the master changes it on every
+// frame (never back to 0) so the same list can be sent twice.
+//   target     1-247 slave ID | 0x100 every module | 0x100 + g group g (1-16)
+//   coil word  a preset-family coil (1001-1038) or All Off (511);
+//              bit 15 set = write 0 instead of 1;
+//              0x4000 + v = show number v (0-99) on the display (reg 60),
+//              so a pick list can carry each slot's quantity
+// 548-559 are reserved and read as 0.
+constexpr uint16_t MB_REG_GROUP_SEQ        = 560;  // W: frame sequence (fires the handler)
+constexpr uint16_t MB_REG_GROUP_COUNT      = 561;  // W: entries in this frame, 0-60
+constexpr uint16_t MB_GROUP_MAX_ENTRIES    = 60;
+constexpr uint16_t mbRegGroupTarget(uint16_t i) { return 562 + 2 * i; }  // i = 0..59, +1 = coil word
+constexpr uint16_t MB_REG_GROUP_LAST       = 681;
+constexpr uint16_t MB_GROUP_TARGET_ALL     = 0x100;
+constexpr uint16_t MB_GROUP_COUNT          = 16;
+constexpr uint16_t MB_GROUP_COIL_OFF       = 0x8000;
+constexpr uint16_t MB_GROUP_SHOW_NUMBER    = 0x4000;
+
+// --- Latch timing (holding registers 810-839, read-only, R5.0-new) ---
+// How the solenoids really behave, to tune LATCH_PULSE_MS and to spot
+// sticky latches across a fleet: three fixed-bucket histograms kept by the
+// pulse state machine, persisted with the statistics (AT24, hourly and
+// before every commanded reset) and cleared with them (coil 510).
+// Histogram h owns ten registers at 810 + 10h:
+//   +0 its most recent sample (ms)   +1 reserved (0)
+//   +2..+9 pulses per bucket (u16; at 65535 the whole histogram halves,
+//          so it keeps its shape)
+//   h = 0  loop lateness: how far past the unlock delay (reg 80) the
+//          loop tick that energized came, in whole ms; every pulse. Not
+//          the coil write to energize — a healthy loop keeps nearly all
+//          of it in bucket 0, and anything else means the loop stalled.
+//          <1, <2, <5, <10, <20, <50, <100 ms, longer
+//   h = 1  pulse start to the sense pin reading open; safety pulses only.
+//          <50, <100, <150, <200, <250, <300, <500 ms, never opened
+//          (+0 reads 0xFFFF then). A latch first seen open only after a
+//          loop stall past the cap is not counted at all.
+//   h = 2  final pulse width; safety pulses only.
+//          <300, <325, <350, <375, <400, <450, <500 ms, ran to the cap
+constexpr uint16_t MB_LATCH_TIMING_COUNT    = 3;
+constexpr uint16_t MB_LATCH_TIMING_BUCKETS  = 8;
+constexpr uint16_t MB_LATCH_TIMING_NOT_OPEN = 0xFFFF;
+constexpr uint16_t mbRegLatchTimingRecent(uint16_t h) { return 810 + 10 * h; }  // h = 0..2
+constexpr uint16_t mbRegLatchTimingBucket(uint16_t h, uint16_t b) { return 812 + 10 * h + b; } // b = 0..7
+constexpr uint16_t MB_REG_LATCH_TIMING_LAST = 839;
+
 // --- Operation group (coils) ---
 constexpr uint16_t MB_COIL_FACTORY_RESET                 = 500;
 constexpr uint16_t MB_COIL_APPLY_FACTORY_RESET_EXCEPT_ID = 501;
@@ -128,6 +229,7 @@ constexpr uint16_t MB_COIL_OTA_ABORT                     = 508;
 constexpr uint16_t MB_COIL_IDENTIFY                      = 509; // blink the ring white ~5s (find this unit)
 constexpr uint16_t MB_COIL_CLEAR_STATS                   = 510; // zero the LED statistics (RAM + AT24)
 constexpr uint16_t MB_COIL_ALL_OFF                       = 511; // one command: ring + display off
+constexpr uint16_t MB_COIL_LOOP_PROFILE_RESET            = 512; // zero the loop profile (regs 460-547)
 
 // --- Control group (coils) ---
 // Preset coil families (n = 1..8, all on the single physical ring):
@@ -177,13 +279,33 @@ static_assert(mbRegLedOnTime(8) == 281,          "wire contract");
 static_assert(MB_REG_OTA_STATE == 282,           "wire contract");
 static_assert(MB_REG_OTA_DATA_LAST - MB_REG_OTA_DATA_FIRST + 1 == 64, "128-byte chunk window");
 static_assert(MB_REG_OTA_COMMIT == 357,          "wire contract");
+static_assert(MB_REG_OTA_MAX_CHUNK == 358,       "wire contract");
 static_assert(MB_REG_OTA_BITMAP_LAST == 389,     "wire contract");
+static_assert(MB_REG_OTA_APP_SIZE_HI == 390,     "wire contract");
+static_assert(MB_REG_OTA_BUILD_ID_LO == 395,     "wire contract");
+static_assert(MB_REG_OTA_WIDE_INDEX == 690,      "wire contract");
+static_assert(MB_REG_OTA_WIDE_DATA_LAST - MB_REG_OTA_WIDE_DATA_FIRST + 1 == 116, "232-byte chunk window");
+static_assert(MB_REG_OTA_WIDE_COMMIT - MB_REG_OTA_WIDE_INDEX + 1 <= 123, "one FC16 carries the whole frame");
+static_assert(mbRegLatchTimingRecent(0) == MB_REG_OTA_WIDE_COMMIT + 1, "wire contract");
+static_assert(mbRegLatchTimingBucket(MB_LATCH_TIMING_COUNT - 1, MB_LATCH_TIMING_BUCKETS - 1)
+              == MB_REG_LATCH_TIMING_LAST,       "wire contract");
+static_assert(MB_REG_OTA_WIDE_COMMIT - MB_REG_OTA_WIDE_DATA_LAST == MB_REG_OTA_COMMIT - MB_REG_OTA_DATA_LAST &&
+              MB_REG_OTA_WIDE_DATA_FIRST - MB_REG_OTA_WIDE_INDEX == MB_REG_OTA_DATA_FIRST - MB_REG_OTA_CHUNK_INDEX,
+              "both chunk windows share one frame layout");
 static_assert(MB_REG_S2_TOTAL_ON_CNT_HI == 400,  "wire contract");
 static_assert(MB_REG_S2_IWDG_RESETS == 410,      "wire contract");
 static_assert(mbRegS2OnCounterHi(1) == 420,      "wire contract");
 static_assert(mbRegS2OnCounterHi(8) == 448,      "wire contract");
 static_assert(mbRegS2OnTimeHi(8) == 450,         "wire contract");
 static_assert(MB_REG_S2_LAST == 451,             "wire contract");
+static_assert(MB_REG_PROF_LOOPS_HI == 460,       "wire contract");
+static_assert(mbRegProfBucket(MB_PROF_STAGE_COUNT - 1, MB_PROF_BUCKET_COUNT - 1) == MB_REG_PROF_LAST,
+              "wire contract");
+static_assert(MB_COIL_LOOP_PROFILE_RESET == 512, "wire contract");
+static_assert(MB_REG_GROUP_MASK == 82,           "wire contract");
+static_assert(MB_REG_GROUP_SEQ == 560,           "wire contract");
+static_assert(mbRegGroupTarget(MB_GROUP_MAX_ENTRIES - 1) + 1 == MB_REG_GROUP_LAST, "wire contract");
+static_assert(MB_REG_GROUP_LAST - MB_REG_GROUP_SEQ + 1 <= 123, "one FC16 carries the whole window");
 static_assert(MB_COIL_WRITE_TO_EEPROM == 503,    "wire contract");
 static_assert(MB_COIL_OTA_ENTER == 505,          "wire contract (legacy OTA coil)");
 static_assert(MB_COIL_OTA_ABORT == 508,          "wire contract");
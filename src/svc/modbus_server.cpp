@@ -13,12 +13,13 @@
 namespace {
 
 // R5.0 map: coils end at the latch+display combos (1031-1038), registers at
-// the Statistics-v2 block (451). Addresses outside the model raise Modbus
+// the latch timing block (839). Addresses outside the model raise Modbus
 // exceptions — which is exactly how a v3.2.0 master learns this firmware
-// has no 400+ block, so the ceiling is part of the wire contract.
+// has no 400+ block, and an older R5.0 build that it has no 460+ (or 810+)
+// block, so the ceiling is part of the wire contract.
 constexpr uint16_t COIL_NUM             = 1040;
 constexpr uint16_t DISCRETE_INPUT_NUM   = 1;
-constexpr uint16_t HOLDING_REGISTER_NUM = MB_REG_S2_LAST + 1;   // = 452
+constexpr uint16_t HOLDING_REGISTER_NUM = MB_REG_LATCH_TIMING_LAST + 1; // = 840
 constexpr uint16_t INPUT_REGISTER_NUM   = 1;
 
 ModbusRTUServerClass RTUServer;
@@ -43,6 +44,7 @@ const PersistRow kPersistRows[] =
     { MB_REG_BAUD_RATE,         offsetof(Settings, baudRate) },
     { MB_REG_IDENTIFIER,        offsetof(Settings, identifier) },
     { MB_REG_UNLOCK_DELAY,      offsetof(Settings, unlockDelayMs) },
+    { MB_REG_GROUP_MASK,        offsetof(Settings, groupMask) },
 };
 
 uint16_t& settingsFieldAt(Settings &s, uint8_t offset)
@@ -64,9 +66,10 @@ uint16_t* presetFields(Settings &s, uint8_t presetIdx)   // presetIdx = 0..7
 // --- Watch table: bus writes -> app handlers ---
 // Sized for the full preset surface (41 rows: ops 3 + latch 2 + enables 8 +
 // latch combos 8 + display combos 8 + triple combos 8 + reg 60/coil 1010 2 +
-// globals 2) plus the OTA family (coils 505-508 + commit reg = 5) and
-// headroom. mbRegisterHandler drops registrations SILENTLY when this is
-// full — bump it BEFORE adding handler families.
+// globals 2) plus the OTA family (coils 505-508 + two commit regs = 6), the
+// loop-profile reset coil, the group command sequence and headroom.
+// mbRegisterHandler drops registrations SILENTLY when this is full — bump it
+// BEFORE adding handler families.
 constexpr uint8_t MB_MAX_WATCH_ROWS = 56;
 
 struct WatchRow
@@ -151,8 +154,8 @@ void modbusServerTick()
     // is a pick vanishing under the pharmacist's hand.
     //
     // Gating on the frame gap means that when poll() finally runs, every
-    // byte of the frame is already in the ring (256 B, sized for the
-    // largest ADU) and no read inside it can block on the wire.
+    // byte of the frame is already in the ring (512 B: two of the largest
+    // ADU) and no read inside it can block on the wire.
     const int have = rs485.available();
     if (have <= 0)
     {
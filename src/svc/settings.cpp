@@ -1,6 +1,7 @@
 #include "svc/settings.h"
 #include "config.h"
 #include "drivers/eeprom_at24.h"
+#include "util/crc.h"
 
 // ---------------------------------------------------------------------------
 // Storage format
@@ -9,7 +10,7 @@
 namespace {
 
 constexpr uint32_t SETTINGS_MAGIC   = 0x4C475335; // 'LGS5'
-constexpr uint16_t SETTINGS_SCHEMA  = 2;          // v2 = 8 LED presets
+constexpr uint16_t SETTINGS_SCHEMA  = 3;          // v2 = 8 LED presets, v3 = + group mask
 constexpr uint16_t SETTINGS_AT24_ADDR = 0;        // blob lives at offset 0
 
 // Schema v1 payload (single LED channel) — kept only for the one-time
@@ -26,6 +27,17 @@ struct SettingsV1
     uint16_t ledMaxOnTimeS;
 };
 
+// Schema v2 payload (8 presets, no groups) — v3 is this plus a tail, so
+// the v2 -> v3 migration is a prefix copy.
+struct SettingsV2
+{
+    uint16_t identifier;
+    uint16_t baudRate;
+    uint16_t unlockDelayMs;
+    LedPreset presets[8];
+};
+static_assert(offsetof(Settings, groupMask) == sizeof(SettingsV2), "v3 = v2 + tail");
+
 struct SettingsBlob
 {
     uint32_t magic;
@@ -41,25 +53,17 @@ const Settings kDefaults =
     .baudRate      = DEFAULT_BAUD_RATE,
     .unlockDelayMs = DEFAULT_UNLOCK_DELAY_TIME,
     .presets       = DEFAULT_LED_PRESETS,
+    .groupMask     = DEFAULT_GROUP_MASK,
+    .reserved      = 0,
 };
 
 Settings active;        // the live configuration
 Settings persisted;     // copy of what the AT24 holds, for change detection
 bool storageOk = false;
-
-uint16_t crc16(const uint8_t *data, size_t len)
-{
-    uint16_t crc = 0xFFFF;
-    for (size_t i = 0; i < len; i++)
-    {
-        crc ^= (uint16_t)data[i] << 8;
-        for (uint8_t bit = 0; bit < 8; bit++)
-        {
-            crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
-        }
-    }
-    return crc;
-}
+// false after a write that failed part-way: the chip then holds some mix of
+// persisted and active, so the next save cannot trust a page comparison
+// against `persisted` and rewrites the whole payload instead.
+bool persistedOnChip = false;
 
 constexpr uint16_t BLOB_HEADER_SIZE = offsetof(SettingsBlob, payload);
 
@@ -71,12 +75,96 @@ bool writePayload(const Settings &s)
 {
     SettingsBlob blob;
     blob.payload = s;
-    blob.crc = crc16((const uint8_t *)&blob.payload, sizeof(Settings));
+    blob.crc = crc16Ccitt((const uint8_t *)&blob.payload, sizeof(Settings));
     return at24Write(SETTINGS_AT24_ADDR + BLOB_HEADER_SIZE,
                      (const uint8_t *)&blob + BLOB_HEADER_SIZE,
                      sizeof(SettingsBlob) - BLOB_HEADER_SIZE);
 }
 
+// The AT24's page size (drivers/eeprom_at24.cpp). A page is the unit of one
+// internal write cycle, so it is also the unit a delta save skips.
+constexpr uint16_t AT24_PAGE_SIZE = 32;
+
+static_assert(offsetof(SettingsBlob, crc) + sizeof(uint16_t) == sizeof(SettingsBlob),
+              "the CRC must be the last bytes of the blob: delta saves rely on "
+              "it being the last thing written");
+static_assert(SETTINGS_AT24_ADDR % AT24_PAGE_SIZE == 0,
+              "blob pages must line up with AT24 pages");
+
+// Write only the payload + CRC bytes that differ from what the AT24 already
+// holds (`before`), one AT24 page at a time, lowest page first. Changing one
+// preset's colour then costs the page it lives in plus the CRC page instead
+// of every page of the payload — each one ~5ms of ack-polling the main loop
+// sits through.
+//
+// The torn-write guarantee is the same as writePayload's: the header is
+// never touched, and the CRC is the last field of the blob, so it sits in
+// the last page written and at the end of the last chunk within it. Until
+// that lands, the chip holds new payload bytes under the old CRC — a tear
+// anywhere before then reads back as a bad-CRC blob, never as a valid blob
+// mixing old and new values.
+//
+// Only valid while `before` really is the chip's content; settingsSave()
+// falls back to writePayload after any failed write.
+bool writePayloadDelta(const Settings &s, const Settings &before)
+{
+    SettingsBlob next;
+    SettingsBlob prev;
+    next.payload = s;
+    next.crc = crc16Ccitt((const uint8_t *)&next.payload, sizeof(Settings));
+    prev.payload = before;
+    prev.crc = crc16Ccitt((const uint8_t *)&prev.payload, sizeof(Settings));
+
+    const uint8_t *a = (const uint8_t *)&next;
+    const uint8_t *b = (const uint8_t *)&prev;
+    constexpr uint16_t crcAt = offsetof(SettingsBlob, crc);
+
+    for (uint16_t pageStart = 0; pageStart < sizeof(SettingsBlob); pageStart += AT24_PAGE_SIZE)
+    {
+        uint16_t lo = (pageStart < BLOB_HEADER_SIZE) ? BLOB_HEADER_SIZE : pageStart;
+        uint16_t hi = pageStart + AT24_PAGE_SIZE;
+        if (hi > sizeof(SettingsBlob))
+        {
+            hi = sizeof(SettingsBlob);
+        }
+
+        // Narrow to the differing span, so a small edit fits one Wire chunk
+        // (30 bytes) rather than the two a full 32-byte page needs.
+        uint16_t first = hi;
+        uint16_t last = lo;
+        for (uint16_t i = lo; i < hi; i++)
+        {
+            if (a[i] != b[i])
+            {
+                if (first == hi)
+                {
+                    first = i;
+                }
+                last = i + 1;
+            }
+        }
+        // The CRC is written even if it happens to come out unchanged: it
+        // is what commits the save, and this is the page that carries it.
+        if (crcAt >= lo && crcAt < hi)
+        {
+            if (first == hi)
+            {
+                first = crcAt;
+            }
+            last = hi;
+        }
+        if (first == hi)
+        {
+            continue;                   // page already holds these bytes
+        }
+        if (!at24Write(SETTINGS_AT24_ADDR + first, a + first, last - first))
+        {
+            return false;
+        }
+    }
+    return true;
+}
+
 // One-time format: commit the header AFTER the payload so the magic only
 // ever appears above a valid payload.
 bool writeHeader()
@@ -136,26 +224,29 @@ void settingsInit()
         return;
     }
 
+    // Whether `persisted` (set below) ends up byte-for-byte what the chip
+    // holds — the precondition for the next save to write only a delta.
+    bool onChip = false;
     if (blob.magic == SETTINGS_MAGIC)
     {
         bool intact = (blob.schemaVersion == SETTINGS_SCHEMA)
                    && (blob.payloadSize == sizeof(Settings))
-                   && (blob.crc == crc16((const uint8_t *)&blob.payload, sizeof(Settings)));
-
-        // One-time v1 -> v2 migration: the v1 payload+CRC live inside what a
-        // v2-sized read parsed as payload bytes, so re-slice the raw buffer.
-        // Payload is committed before the (v2) header, so a migration torn by
-        // power loss leaves a v1 header over v2 bytes -> the v1 CRC fails ->
-        // the torn path below still salvages the identifier.
-        bool migratedV1 = false;
+                   && (blob.crc == crc16Ccitt((const uint8_t *)&blob.payload, sizeof(Settings)));
+
+        // One-time v1/v2 -> v3 migration: the old payload+CRC live inside
+        // what a v3-sized read parsed as payload bytes, so re-slice the raw
+        // buffer. Payload is committed before the (v3) header, so a migration
+        // torn by power loss leaves an old header over v3 bytes -> the old
+        // CRC fails -> the torn path below still salvages the identifier.
+        const uint8_t *raw = (const uint8_t *)&blob;
+        bool migrated = false;
         if (!intact && blob.schemaVersion == 1 && blob.payloadSize == sizeof(SettingsV1))
         {
-            const uint8_t *raw = (const uint8_t *)&blob;
             SettingsV1 v1;
             uint16_t crcV1;
             memcpy(&v1, raw + BLOB_HEADER_SIZE, sizeof(v1));
             memcpy(&crcV1, raw + BLOB_HEADER_SIZE + sizeof(v1), sizeof(crcV1));
-            if (crcV1 == crc16((const uint8_t *)&v1, sizeof(v1)))
+            if (crcV1 == crc16Ccitt((const uint8_t *)&v1, sizeof(v1)))
             {
                 active = kDefaults;
                 if (v1.identifier >= 1 && v1.identifier <= 247)
@@ -172,23 +263,46 @@ void settingsInit()
                 // presets 2-8 keep the default palette
                 if (writePayload(active))
                 {
-                    writeHeader(); // header last: schema/size flip to v2 only above a full payload
+                    writeHeader(); // header last: schema/size flip to v3 only above a full payload
+                    onChip = true;
+                }
+                migrated = true;
+            }
+        }
+        if (!intact && blob.schemaVersion == 2 && blob.payloadSize == sizeof(SettingsV2))
+        {
+            uint16_t crcV2;
+            memcpy(&crcV2, raw + BLOB_HEADER_SIZE + sizeof(SettingsV2), sizeof(crcV2));
+            if (crcV2 == crc16Ccitt(raw + BLOB_HEADER_SIZE, sizeof(SettingsV2)))
+            {
+                active = kDefaults;
+                memcpy(&active, raw + BLOB_HEADER_SIZE, sizeof(SettingsV2));
+                if (active.identifier < 1 || active.identifier > 247)
+                {
+                    active.identifier = DEFAULT_IDENTIFIER;
+                }
+                if (writePayload(active))
+                {
+                    writeHeader();
+                    onChip = true;
                 }
-                migratedV1 = true;
+                migrated = true;
             }
         }
 
         if (intact)
         {
             active = blob.payload;
+            onChip = true;
             // Never trust an out-of-range slave ID into the RTU stack (it
             // would alias mod-256 and answer at another device's address).
             if (active.identifier < 1 || active.identifier > 247)
             {
                 active.identifier = DEFAULT_IDENTIFIER;
+                onChip = false;     // RAM no longer matches the chip
             }
         }
-        else if (migratedV1)
+        else if (migrated)
         {
             // active already holds the migrated configuration
         }
@@ -202,7 +316,7 @@ void settingsInit()
             {
                 active.identifier = blob.payload.identifier;
             }
-            writePayload(active);
+            onChip = writePayload(active);
         }
     }
     else
@@ -213,10 +327,12 @@ void settingsInit()
         if (writePayload(active))
         {
             writeHeader();
+            onChip = true;
         }
     }
 
     persisted = active;
+    persistedOnChip = onChip;
 }
 
 const Settings& settings()
@@ -239,7 +355,9 @@ bool settingsSave()
     {
         return false; // unchanged, avoid the write cycle
     }
-    if (!writePayload(active))
+    persistedOnChip = persistedOnChip ? writePayloadDelta(active, persisted)
+                                      : writePayload(active);
+    if (!persistedOnChip)
     {
         return false;
     }
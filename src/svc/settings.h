@@ -8,9 +8,10 @@
  *
  *  The blob is versioned (magic + schema version + CRC16). Loading follows
  *  a strict order:
- *    1. valid v2 blob on the AT24         -> use it
- *    2. valid v1 blob                     -> one-time in-place migration
- *       (v1 fields become preset 1; presets 2-8 = factory palette)
+ *    1. valid v3 blob on the AT24         -> use it
+ *    2. valid v2 blob                     -> one-time in-place migration
+ *       (no groups); valid v1 blob -> likewise (v1 fields become
+ *       preset 1; presets 2-8 = factory palette)
  *    3. no/foreign magic                  -> format with factory defaults
  *    4. valid magic but bad CRC (torn)    -> defaults, salvaging a plausible
  *       identifier
@@ -29,15 +30,20 @@ struct LedPreset
     uint16_t maxOnTimeS;        // seconds, 0 = unlimited
 };
 
-// Values persisted for the R/W(F) Modbus registers (schema v2).
+// Values persisted for the R/W(F) Modbus registers (schema v3).
 // identifier MUST stay the first field: the torn-blob recovery salvages it
-// by offset 0, across schema versions.
+// by offset 0, across schema versions. New fields go at the end, so each
+// schema is the previous one plus a tail.
 struct Settings
 {
     uint16_t identifier;        // Modbus slave ID (reg 4)
     uint16_t baudRate;          // bps (reg 3), whitelist enforced at apply time
     uint16_t unlockDelayMs;     // pre-unlock delay (reg 80), 0-8000 ms
     LedPreset presets[8];       // color presets 1-8 (one physical ring)
+    uint16_t groupMask;         // group membership (reg 82), v3
+    uint16_t reserved;          // 0; keeps the blob 4-byte sized so its CRC
+                                // stays the last bytes (settings.cpp); the
+                                // next field takes this slot
 };
 
 /*  @brief Load configuration from the AT24 (with legacy import / recovery). */
@@ -3,6 +3,7 @@
 #include "drivers/eeprom_at24.h"
 #include "svc/modbus_map.h"
 #include "svc/modbus_server.h"
+#include "util/crc.h"
 #include <string.h>
 
 namespace {
@@ -58,6 +59,32 @@ static_assert(sizeof(StatsBlobV2) <= 94, "EEPROM write-cycle cliff");
 static_assert(STATS_AT24_ADDR + sizeof(StatsBlobV2) <= COMMISSION_AT24_ADDR,
               "stats blob must not overlap the commissioning record");
 
+// --- Latch timing record (AT24 @ LATCH_TIMING_AT24_ADDR, A/B like above) ---
+//
+// A record of its own rather than a v3 blob: the histograms are new, so an
+// older build simply never reads them, and the blob keeps its 92 bytes.
+
+struct LatchTimingBlob
+{
+    uint32_t magic;
+    uint16_t version;                           // = 1
+    uint16_t seq;                               // A/B slot age
+    uint16_t buckets[MB_LATCH_TIMING_COUNT][MB_LATCH_TIMING_BUCKETS];
+    uint16_t reserved;                          // 0; spells out the tail padding
+    uint16_t crc;                               // CRC16-CCITT over magic..reserved
+};
+
+constexpr uint32_t LATCH_TIMING_MAGIC = 0x4C47534C;     // 'LGSL'
+constexpr uint16_t LATCH_TIMING_VERSION = 1;
+
+static_assert(LATCH_TIMING_COUNT == MB_LATCH_TIMING_COUNT, "one histogram per register group");
+static_assert(sizeof(LatchTimingBlob) == 60, "latch timing wire layout");
+static_assert(LATCH_TIMING_AT24_ADDR % 32 == 0 && LATCH_TIMING_AT24_ADDR_B % 32 == 0,
+              "page-aligned: three write cycles per record");
+static_assert(STATS_AT24_ADDR_B + sizeof(StatsBlobV2) <= LATCH_TIMING_AT24_ADDR &&
+              LATCH_TIMING_AT24_ADDR + sizeof(LatchTimingBlob) <= LATCH_TIMING_AT24_ADDR_B,
+              "latch timing slots must not overlap");
+
 // --- State -----------------------------------------------------------------
 
 uint16_t bootCount = 0;
@@ -76,19 +103,12 @@ StatsBlobV2 persistedStats = {};                // change-detection cache
 bool     liveSlotB = false;                     // which slot holds the newest
 uint16_t slotSeq = 0;                           // its sequence number
 
-uint16_t statsCrc16(const uint8_t *p, size_t len)
-{
-    uint16_t crc = 0xFFFF;
-    while (len--)
-    {
-        crc ^= (uint16_t)(*p++) << 8;
-        for (uint8_t bit = 0; bit < 8; bit++)
-        {
-            crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
-        }
-    }
-    return crc;
-}
+uint16_t latchBuckets[MB_LATCH_TIMING_COUNT][MB_LATCH_TIMING_BUCKETS] = {};
+uint16_t latchRecent[MB_LATCH_TIMING_COUNT] = {};         // 0 until a pulse
+bool     latchTimingDirty = true;               // registers need a publish
+LatchTimingBlob persistedLatch = {};            // same scheme as the blob's
+bool     latchSlotB = false;
+uint16_t latchSeq = 0;
 
 void statsFill(StatsBlobV2 &b)
 {
@@ -103,7 +123,17 @@ void statsFill(StatsBlobV2 &b)
     b.opSeconds = opSeconds;
     b.iwdgResets = iwdgResets;
     b.seq = slotSeq;            // the live sequence: only a real write bumps it
-    b.crc = statsCrc16((const uint8_t *)&b, offsetof(StatsBlobV2, crc));
+    b.crc = crc16Ccitt((const uint8_t *)&b, offsetof(StatsBlobV2, crc));
+}
+
+void latchTimingFill(LatchTimingBlob &b)
+{
+    memset(&b, 0, sizeof(b));
+    b.magic = LATCH_TIMING_MAGIC;
+    b.version = LATCH_TIMING_VERSION;
+    b.seq = latchSeq;
+    memcpy(b.buckets, latchBuckets, sizeof(latchBuckets));
+    b.crc = crc16Ccitt((const uint8_t *)&b, offsetof(LatchTimingBlob, crc));
 }
 
 // Fold the running operating-time into opSeconds (mutating). Only the
@@ -146,7 +176,35 @@ static bool readSlot(uint16_t addr, StatsBlobV2 &out)
     return at24Read(addr, (uint8_t *)&out, sizeof(out)) &&
            out.magic == STATS_MAGIC &&
            out.version == STATS_VERSION &&
-           out.crc == statsCrc16((const uint8_t *)&out, offsetof(StatsBlobV2, crc));
+           out.crc == crc16Ccitt((const uint8_t *)&out, offsetof(StatsBlobV2, crc));
+}
+
+static bool readLatchSlot(uint16_t addr, LatchTimingBlob &out)
+{
+    return at24Read(addr, (uint8_t *)&out, sizeof(out)) &&
+           out.magic == LATCH_TIMING_MAGIC &&
+           out.version == LATCH_TIMING_VERSION &&
+           out.crc == crc16Ccitt((const uint8_t *)&out, offsetof(LatchTimingBlob, crc));
+}
+
+// Write the latch timing record to its non-live slot when it changed.
+static void persistLatchTiming()
+{
+    LatchTimingBlob b;
+    latchTimingFill(b);
+    if (memcmp(&b, &persistedLatch, sizeof(b)) == 0)
+    {
+        return;
+    }
+    b.seq = (uint16_t)(latchSeq + 1);
+    b.crc = crc16Ccitt((const uint8_t *)&b, offsetof(LatchTimingBlob, crc));
+    const uint16_t addr = latchSlotB ? LATCH_TIMING_AT24_ADDR : LATCH_TIMING_AT24_ADDR_B;
+    if (at24Write(addr, (const uint8_t *)&b, sizeof(b)))
+    {
+        latchSlotB = !latchSlotB;
+        latchSeq = b.seq;
+        persistedLatch = b;
+    }
 }
 
 void statsInit()
@@ -184,7 +242,7 @@ void statsInit()
         StatsBlobV1 v1;
         if (at24Read(STATS_AT24_ADDR, (uint8_t *)&v1, sizeof(v1)) &&
             v1.magic == STATS_MAGIC &&
-            v1.crc == statsCrc16((const uint8_t *)&v1, offsetof(StatsBlobV1, crc)))
+            v1.crc == crc16Ccitt((const uint8_t *)&v1, offsetof(StatsBlobV1, crc)))
         {
             // One-time import from a v3.2.0-or-older blob: the counters it
             // has survive, the new ones start at zero. The persist cache
@@ -196,6 +254,20 @@ void statsInit()
         }
         // else: blank or torn — every counter starts at zero.
     }
+
+    // Latch timing: same newest-valid-slot rule. None valid (a board new to
+    // this build, or both torn) starts empty; the cache stays zeroed, so
+    // the first pulse persists.
+    LatchTimingBlob la, lb;
+    const bool okLA = readLatchSlot(LATCH_TIMING_AT24_ADDR, la);
+    const bool okLB = readLatchSlot(LATCH_TIMING_AT24_ADDR_B, lb);
+    if (okLA || okLB)
+    {
+        latchSlotB = okLB && (!okLA || seqNewer(lb.seq, la.seq));
+        persistedLatch = latchSlotB ? lb : la;
+        latchSeq = persistedLatch.seq;
+        memcpy(latchBuckets, persistedLatch.buckets, sizeof(latchBuckets));
+    }
     opStampMs = millis();
 }
 
@@ -243,6 +315,27 @@ void statsNoteLatchFire()
     latchFires++;
 }
 
+void statsNoteLatchTiming(LatchTiming which, uint16_t ms, uint8_t bucket)
+{
+    if (which >= LATCH_TIMING_COUNT || bucket >= MB_LATCH_TIMING_BUCKETS)
+    {
+        return;
+    }
+    uint16_t *h = latchBuckets[which];
+    if (h[bucket] == 0xFFFF)
+    {
+        // Full: halve the whole histogram. The shape survives, and recent
+        // pulses weigh a little more than a lifetime of old ones.
+        for (uint8_t i = 0; i < MB_LATCH_TIMING_BUCKETS; i++)
+        {
+            h[i] >>= 1;
+        }
+    }
+    h[bucket]++;
+    latchRecent[which] = ms;
+    latchTimingDirty = true;
+}
+
 void statsNotePress()
 {
     buttonPresses++;
@@ -250,6 +343,7 @@ void statsNotePress()
 
 void statsPersistIfChanged()
 {
+    persistLatchTiming();
     foldOpSeconds();
     StatsBlobV2 b;
     statsFill(b);
@@ -260,7 +354,7 @@ void statsPersistIfChanged()
     // Write the slot that is NOT live, then flip: until this write completes
     // and validates, the previous copy is the one statsInit() would pick.
     b.seq = (uint16_t)(slotSeq + 1);
-    b.crc = statsCrc16((const uint8_t *)&b, offsetof(StatsBlobV2, crc));
+    b.crc = crc16Ccitt((const uint8_t *)&b, offsetof(StatsBlobV2, crc));
     const uint16_t addr = liveSlotB ? STATS_AT24_ADDR : STATS_AT24_ADDR_B;
     if (at24Write(addr, (const uint8_t *)&b, sizeof(b)))
     {
@@ -278,6 +372,9 @@ void statsClearUsage()
     buttonPresses = 0;
     opSeconds = 0;
     iwdgResets = 0;
+    memset(latchBuckets, 0, sizeof(latchBuckets));
+    memset(latchRecent, 0, sizeof(latchRecent));
+    latchTimingDirty = true;
     // Re-stamp so operating-time accrued before the clear cannot leak back
     // in at the next fold.
     opStampMs = millis();
@@ -318,4 +415,19 @@ void statsPublishRegisters(uint32_t now)
         pub32(mbRegS2OnCounterHi(n), onCount[n - 1]);
         pub32(mbRegS2OnTimeHi(n), onTimeS[n - 1]);
     }
+
+    // Latch timing (810-839): 30 registers that move only when a pulse
+    // ends, so they are written then rather than every tick.
+    if (latchTimingDirty)
+    {
+        for (uint16_t h = 0; h < MB_LATCH_TIMING_COUNT; h++)
+        {
+            mbRegWrite(mbRegLatchTimingRecent(h), latchRecent[h]);
+            for (uint16_t b = 0; b < MB_LATCH_TIMING_BUCKETS; b++)
+            {
+                mbRegWrite(mbRegLatchTimingBucket(h, b), latchBuckets[h][b]);
+            }
+        }
+        latchTimingDirty = false;
+    }
 }
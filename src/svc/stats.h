@@ -13,9 +13,12 @@
  *  commanded reset (opsSystemReset) and once per boot (statsBootCommit).
  *  A power cut therefore loses at most the last un-flushed hour.
  *
+ *  The latch timing histograms (latch_control's pulse measurements) ride
+ *  the same persist in a record of their own (LATCH_TIMING_AT24_ADDR).
+ *
  *  Publication covers BOTH register views: the legacy clamped u16 group
  *  (200-281, saturates at 65535) and the Statistics-v2 u32 block (400-451,
- *  hi word first — fw >= v3.3.0).
+ *  hi word first — fw >= v3.3.0), plus the latch timing block 810-839.
  *
  *  Layering: svc only (drivers + svc includes). app modules call in via
  *  the statsNote... and statsAdd... accessors; the one upward value (boot
@@ -49,6 +52,19 @@ void statsAddOnTime(uint8_t preset, uint32_t seconds);
  *         never counted; DEMO bench pulses are (wear odometer). */
 void statsNoteLatchFire();
 
+/*  @brief The three latch timing histograms (regs 810 + 10h). */
+enum LatchTiming : uint8_t
+{
+    LATCH_TIMING_ENERGIZE,      // loop lateness past the unlock delay
+    LATCH_TIMING_OPEN,          // pulse start to sense open (safety pulses)
+    LATCH_TIMING_WIDTH,         // final pulse width (safety pulses)
+    LATCH_TIMING_COUNT
+};
+
+/*  @brief One pulse measurement: @p ms is published as the most recent
+ *         value, @p bucket (0-7, the caller's edges) counts it. */
+void statsNoteLatchTiming(LatchTiming which, uint16_t ms, uint8_t bucket);
+
 /*  @brief One accepted pick-confirm press (RUN mode, debounced). */
 void statsNotePress();
 
@@ -57,13 +73,14 @@ void statsNotePress();
  *         hourly keeps the odometer honest. */
 void statsPersistIfChanged();
 
-/*  @brief Zero every usage counter (LED, latch, presses, op-time, IWDG)
- *         and persist. Boot count survives — the one "since first
+/*  @brief Zero every usage counter (LED, latch, presses, op-time, IWDG,
+ *         latch timing) and persist. Boot count survives — the one "since first
  *         commissioning" number. Coil 510 and factory reset use this. */
 void statsClearUsage();
 
-/*  @brief Publish all statistics registers: legacy 200-281 (u16 clamped)
- *         and the v2 u32 block 400-451. Called every led_control tick. */
+/*  @brief Publish all statistics registers: legacy 200-281 (u16 clamped),
+ *         the v2 u32 block 400-451 and, when it changed, the latch timing
+ *         block 810-839. Called every led_control tick. */
 void statsPublishRegisters(uint32_t now);
 
 #endif // SVC_STATS_H
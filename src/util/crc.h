@@ -0,0 +1,39 @@
+#ifndef UTIL_CRC_H
+#define UTIL_CRC_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+/*  @file util/crc.h
+ *  @brief The firmware's two checksums, one implementation each, shared by
+ *         the app, the bootloader (env LGS_BOOT builds util/crc.c too) and
+ *         the host bench.
+ *
+ *  crc16Ccitt: CRC-16/CCITT-FALSE, poly 0x1021, init 0xFFFF, no reflection,
+ *  no final xor (Python: binascii.crc_hqx(data, 0xFFFF)). The settings and
+ *  statistics blobs, the commissioning record, every OTA chunk and the
+ *  staging header. A 16-entry table (32 B of flash) takes a nibble per
+ *  step: two lookups a byte where the bitwise loop took eight shift/xors.
+ *  -D CRC16_BITWISE keeps the table-less loop instead: the bootloader checks
+ *  one 12-byte header per boot and counts bytes in a 4 KB slot, not cycles.
+ *
+ *  crc32Zlib: CRC-32/ISO-HDLC (zlib.crc32), the staged OTA image. On the G0
+ *  it runs on the CRC peripheral, one word write per 4 bytes; anywhere else
+ *  (host bench, tools/check_crc.py) it is a nibble-table loop. The
+ *  peripheral is one unit: never call this from an interrupt.
+ *
+ *  tools/check_crc.py checks both against zlib/binascii on the host.
+ */
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+uint16_t crc16Ccitt(const uint8_t *p, size_t len);
+uint32_t crc32Zlib(const uint8_t *p, size_t len);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // UTIL_CRC_H
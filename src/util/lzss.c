@@ -0,0 +1,93 @@
+#include "util/lzss.h"
+
+typedef struct
+{
+    const uint8_t *p;
+    const uint8_t *end;
+    uint8_t byte;
+    uint8_t left;           /* bits of byte not yet taken */
+} BitReader;
+
+/* Next @p width bits as a number; -1 once the input runs out. */
+static int32_t takeBits(BitReader *r, uint8_t width)
+{
+    int32_t v = 0;
+    while (width--)
+    {
+        if (!r->left)
+        {
+            if (r->p == r->end)
+            {
+                return -1;
+            }
+            r->byte = *r->p++;
+            r->left = 8;
+        }
+        r->left--;
+        v = (v << 1) | ((r->byte >> r->left) & 1);
+    }
+    return v;
+}
+
+/* Elias gamma, >= 1; 0 = input ran out or the value overflows 16 bits. */
+static uint32_t takeGamma(BitReader *r)
+{
+    uint8_t zeros = 0;
+    int32_t bit;
+    while ((bit = takeBits(r, 1)) == 0)
+    {
+        if (++zeros > 16)
+        {
+            return 0;
+        }
+    }
+    if (bit < 0)
+    {
+        return 0;
+    }
+    int32_t rest = takeBits(r, zeros);
+    return (rest < 0) ? 0 : ((1u << zeros) | (uint32_t)rest);
+}
+
+bool lzssDecode(const uint8_t *in, size_t inLen, uint8_t *out, size_t outLen,
+                const uint8_t *prior, size_t priorLen)
+{
+    BitReader r = { in, in + inLen, 0, 0 };
+    size_t pos = 0;
+    while (pos < outLen)
+    {
+        int32_t flag = takeBits(&r, 1);
+        if (flag < 0)
+        {
+            return false;
+        }
+        if (!flag)
+        {
+            int32_t literal = takeBits(&r, 8);
+            if (literal < 0)
+            {
+                return false;
+            }
+            out[pos++] = (uint8_t)literal;
+            continue;
+        }
+        uint32_t hi = takeGamma(&r);
+        int32_t low = takeBits(&r, 7);
+        uint32_t len = takeGamma(&r) + 1;
+        if (!hi || low < 0 || len < 2)
+        {
+            return false;
+        }
+        size_t dist = (((size_t)(hi - 1) << 7) | (size_t)low) + 1;
+        if (dist > priorLen + pos || len > outLen - pos)
+        {
+            return false;
+        }
+        /* Byte by byte: a copy may overlap its own output (a run). */
+        for (size_t from = priorLen + pos - dist; len; len--, from++)
+        {
+            out[pos++] = (from < priorLen) ? prior[from] : out[from - priorLen];
+        }
+    }
+    return true;
+}
@@ -0,0 +1,38 @@
+#ifndef UTIL_LZSS_H
+#define UTIL_LZSS_H
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+
+/*  @file util/lzss.h
+ *  @brief Decoder for the compressed OTA chunk bitstream (reg 289 bit 2).
+ *
+ *  LZSS, MSB first: 0 + 8 bits is a literal byte; 1 + gamma(hi) + 7 bits +
+ *  gamma(len - 1) copies len >= 2 bytes from ((hi - 1) << 7 | low) + 1
+ *  back. gamma(n) is Elias gamma: bit_length(n) - 1 zeros, then n. The
+ *  encoder, the chunk header around this stream and the format's rationale
+ *  are in tools/ota_lz.py, which also checks this file against it.
+ *
+ *  No state outside the call and no table: the code is the whole cost.
+ */
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*  @brief Decode one chunk's bitstream into @p out.
+ *  @param in       bitstream bytes (trailing pad bits are ignored)
+ *  @param out      @p outLen bytes, written in full on success
+ *  @param prior    the image before @p out: copies that reach back past the
+ *                  start of @p out read prior[0 .. priorLen)
+ *  @return false if the stream ends early or a copy reaches before prior
+ *          or past outLen (out is then partly written) */
+bool lzssDecode(const uint8_t *in, size_t inLen, uint8_t *out, size_t outLen,
+                const uint8_t *prior, size_t priorLen);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // UTIL_LZSS_H
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Index of the firmware images in assets/ and .pio/build, with OTA metadata.
+
+Every tool that opens an image works the same things out again: SHA-256,
+CRC32, the CRC16 of every OTA chunk, whether the vector table fits the app
+slot, where the commissioning block sits. This keeps them in one sidecar,
+assets/catalog.json (not committed; rebuilt from the files), so that work
+is done once per image:
+
+  files   path (relative to the repo) -> size, mtime_ns, sha256. A file
+          whose size and mtime are unchanged is not even read again.
+  images  sha256 -> metadata. Content-keyed: a copy or a rename costs a
+          hash, not a rescan, and the factory image's app part points at
+          the OTA image with the same bytes.
+
+Per image: size, sha256, crc32, the initial SP/PC (and the app's, 0x1000
+in), the commissioning-block offset and count, and for an app linked at the
+G070 app slot the CRC16 of each OTA chunk at both chunk sizes (128, 232), 4
+hex digits per chunk. The file name adds target MCU, version and date, and
+with them the kind — "ota" (app slot, 0x08001000), "factory" (bootloader +
+app, flashed at 0x08000000), "bootloader", or "app" (STM32F103, whole
+flash, no OTA) — and whether the vector table checks out for it.
+
+ota_sender.py and make_factory_image.py load images through Catalog.entry(),
+which brings the one entry up to date and returns it. Files outside assets/
+and .pio/build are worked out the same way but not recorded.
+
+    <python> tools/asset_catalog.py               # scan, update, list
+    <python> tools/asset_catalog.py --rebuild     # forget the index first
+    <python> tools/asset_catalog.py --find v3.3.0 # the newest OTA image for it
+"""
+
+from __future__ import annotations
+
+import argparse
+import binascii
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import zlib
+
+from make_factory_image import APP_ADDR, BOOT_SLOT, RAM_END, RAM_START, ROOT, valid_blocks
+
+CATALOG = ROOT / "assets" / "catalog.json"
+SCHEMA = 1
+SCAN = ("assets/*.bin", ".pio/build/*/firmware.bin")
+CHUNK_SIZES = (128, 232)            # the two OTA windows (regs 290-357, 690-809)
+FLASH_BASE = 0x08000000
+APP_END = APP_ADDR + 61440          # FLASH_OTA_MAX_IMAGE_SIZE past the app slot start
+
+# firmware_stm32g070_v3.3.0_factory_2026-08-13.bin, bootloader_stm32g070_v1.0_2026-07-17.bin
+NAME = re.compile(r"^(?P<what>firmware|bootloader)_(?P<mcu>stm32\w+?)_(?P<version>v[\d.]+\w*?)"
+                  r"(?P<factory>_factory)?_(?P<date>\d{4}-\d{2}-\d{2})\.bin$")
+
+
+def chunk_crcs(image: bytes, chunk: int) -> str:
+    """CRC16-CCITT of each chunk, 4 hex digits apiece (crc_hqx from 0xFFFF is it)."""
+    return "".join(f"{binascii.crc_hqx(image[i:i + chunk], 0xFFFF):04x}"
+                   for i in range(0, len(image), chunk))
+
+
+def split_crcs(packed: str) -> list[int]:
+    return [int(packed[i:i + 4], 16) for i in range(0, len(packed), 4)]
+
+
+def vector(image: bytes, at: int) -> tuple[int, int]:
+    """Initial SP and PC of the vector table at `at` (0, 0 past the end)."""
+    return struct.unpack_from("<2I", image, at) if len(image) >= at + 8 else (0, 0)
+
+
+def content(image: bytes) -> dict:
+    """What the bytes alone say: the part of an entry kept per sha256."""
+    sp, pc = vector(image, 0)
+    app_sp, app_pc = vector(image, BOOT_SLOT)
+    blocks = valid_blocks(image)
+    meta = {
+        "size": len(image),
+        "sha256": hashlib.sha256(image).hexdigest(),
+        "crc32": f"{zlib.crc32(image):08x}",
+        "sp": sp, "pc": pc, "app_sp": app_sp, "app_pc": app_pc,
+        "block_offset": blocks[0] if len(blocks) == 1 else None,
+        "block_count": len(blocks),
+    }
+    if APP_ADDR <= pc < APP_END:
+        meta["chunks"] = {str(c): chunk_crcs(image, c) for c in CHUNK_SIZES}
+    elif len(image) > BOOT_SLOT:
+        meta["app_sha256"] = hashlib.sha256(image[BOOT_SLOT:]).hexdigest()
+    return meta
+
+
+def classify(name: str, meta: dict) -> dict:
+    """What the name adds: MCU, version, date, and with them kind and vector check."""
+    m = NAME.match(name)
+    # Files without the asset naming (build outputs) are this repo's target.
+    mcu = m.group("mcu") if m else "stm32g070"
+    ram = lambda sp: RAM_START <= sp <= RAM_END  # noqa: E731
+    sp, pc = meta["sp"], meta["pc"]
+    if mcu != "stm32g070":
+        kind, ok = "app", ram(sp) and pc >= FLASH_BASE
+    elif APP_ADDR <= pc < APP_END:
+        kind, ok = "ota", ram(sp)
+    elif meta["size"] <= BOOT_SLOT:
+        kind, ok = "bootloader", ram(sp) and FLASH_BASE <= pc < APP_ADDR
+    else:
+        kind = "factory"
+        ok = (ram(sp) and FLASH_BASE <= pc < APP_ADDR
+              and ram(meta["app_sp"]) and APP_ADDR <= meta["app_pc"] < APP_END)
+    return {"name": name, "mcu": mcu, "version": m.group("version") if m else None,
+            "date": m.group("date") if m else None, "kind": kind, "vector_ok": ok}
+
+
+class Catalog:
+    """The index on disk; entry() and scan() bring it up to date, save() writes it."""
+
+    def __init__(self, path=CATALOG, files=None, images=None):
+        self.path = path
+        self.files = files or {}
+        self.images = images or {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=CATALOG) -> "Catalog":
+        try:
+            with open(path, encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if d.get("schema") != SCHEMA:
+            return cls(path)            # older layout: rebuilt from the files
+        return cls(path, d.get("files"), d.get("images"))
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp = str(self.path) + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"schema": SCHEMA, "files": self.files, "images": self.images},
+                          f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)  # a crash mid-write keeps the old one
+            self.dirty = False
+        except OSError as e:
+            print(f"[WARN] {os.path.relpath(self.path, ROOT)} not saved ({e})")
+
+    def entry(self, path, image: bytes | None = None) -> dict:
+        """Metadata for the file at `path`, worked out only if it changed.
+        Pass `image` when the caller has the bytes already."""
+        path = os.path.abspath(path)
+        rel = os.path.relpath(path, ROOT).replace(os.sep, "/")
+        tracked = any(fnmatch.fnmatch(rel, pattern) for pattern in SCAN)
+        st = os.stat(path)
+        known = self.files.get(rel) if tracked else None
+        if known and (known["size"], known["mtime_ns"]) == (st.st_size, st.st_mtime_ns) \
+                and known["sha256"] in self.images:
+            meta = self.images[known["sha256"]]
+        else:
+            if image is None:
+                with open(path, "rb") as f:
+                    image = f.read()
+            sha256 = hashlib.sha256(image).hexdigest()
+            meta = self.images.get(sha256) or content(image)
+            if tracked:
+                self.images[sha256] = meta
+                self.files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256}
+                self.dirty = True
+        return {**meta, **classify(os.path.basename(path), meta)}
+
+    def scan(self) -> list[tuple[str, dict]]:
+        """Every file under SCAN, up to date; entries for files gone are dropped."""
+        seen = []
+        for pattern in SCAN:
+            for path in sorted(glob.glob(str(ROOT / pattern))):
+                seen.append((os.path.relpath(path, ROOT).replace(os.sep, "/"), self.entry(path)))
+        live = {rel for rel, _ in seen}
+        for rel in [r for r in self.files if r not in live]:
+            del self.files[rel]
+            self.dirty = True
+        used = {f["sha256"] for f in self.files.values()}
+        for sha in [s for s in self.images if s not in used]:
+            del self.images[sha]
+            self.dirty = True
+        return seen
+
+    def find(self, version: str, kind: str = "ota", mcu: str = "stm32g070") -> str | None:
+        """Path of the newest-dated `kind` image of `version` (e.g. "v3.3.0")."""
+        hits = [(meta["date"] or "", rel) for rel, meta in self.scan()
+                if meta["version"] == version and meta["kind"] == kind and meta["mcu"] == mcu]
+        return str(ROOT / max(hits)[1]) if hits else None
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rebuild", action="store_true", help="ignore the existing index")
+    ap.add_argument("--find", metavar="VERSION", help="print the newest OTA image of VERSION and exit")
+    args = ap.parse_args()
+
+    cat = Catalog(CATALOG) if args.rebuild else Catalog.load(CATALOG)
+    if args.rebuild:
+        cat.dirty = True
+    if args.find:
+        path = cat.find(args.find)
+        cat.save()
+        if not path:
+            print(f"no OTA image for {args.find} in assets/ or .pio/build")
+            return 1
+        print(os.path.relpath(path, ROOT))
+        return 0
+
+    rows = cat.scan()
+    cat.save()
+    print(f"{'file':<56}{'kind':<11}{'mcu':<11}{'size':>8}  {'crc32':<9}{'block':>7}  vector")
+    for rel, meta in rows:
+        block = f"0x{meta['block_offset']:05x}" if meta["block_offset"] is not None else "-"
+        print(f"{rel:<56}{meta['kind']:<11}{meta['mcu']:<11}{meta['size']:>8,}  {meta['crc32']:<9}"
+              f"{block:>7}  {'ok' if meta['vector_ok'] else 'BAD'}")
+    bad = [rel for rel, meta in rows if not meta["vector_ok"]]
+    print(f"{len(rows)} image(s), {len(cat.images)} distinct -> {os.path.relpath(cat.path, ROOT)}")
+    for rel in bad:
+        print(f"BAD vector table: {rel}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
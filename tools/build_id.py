@@ -0,0 +1,32 @@
+"""Stamp the app build with the git commit it is built from (FW_BUILD_ID).
+
+FW_VERSION (include/version.h) only moves at a release, so every test build
+in between reports the same reg 1. The app publishes FW_BUILD_ID in regs
+394-395 next to its image size and CRC32 (390-393); this sets it to the
+first 8 hex digits of HEAD — 0x1a2b3c4d for commit 1a2b3c4d... — so a
+board can say which commit it runs. Outside a git checkout (a source
+tarball, no git on PATH) it stays at version.h's 0.
+
+A dirty tree builds with HEAD's ID: the image CRC beside it still tells
+the two apart, and that pair is what ota_sender.py compares.
+
+Wired in from platformio.ini as a pre: extra_script, so the define is in
+place before anything compiles.
+"""
+Import("env")  # noqa: F821  — injected by PlatformIO/SCons
+
+import subprocess
+
+
+def build_id(project_dir: str) -> int:
+    try:
+        head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_dir, capture_output=True,
+                              text=True, check=True, timeout=10).stdout.strip()
+        return int(head[:8], 16)
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return 0
+
+
+value = build_id(env.subst("$PROJECT_DIR"))  # noqa: F821
+env.Append(CPPDEFINES=[("FW_BUILD_ID", f"0x{value:08X}u")])  # noqa: F821
+print(f"build id: 0x{value:08X}" + ("" if value else " (not a git checkout)"))
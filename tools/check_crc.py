@@ -0,0 +1,274 @@
+"""Host check of the shared CRCs (src/util/crc.c) and what they cost.
+
+The firmware had the same bitwise CRC16-CCITT loop in five places (settings,
+stats, commissioning record, OTA chunk, staging header) plus a bitwise
+CRC32 over the staged image, and the bootloader its own pair. They are now
+crc16Ccitt() and crc32Zlib() in util/crc.c, and a wrong CRC there breaks
+every blob on the AT24 at once — so this compiles the real file with the
+host C++ compiler and checks:
+
+  * crc16Ccitt against binascii.crc_hqx(data, 0xFFFF) and crc32Zlib (the
+    software path the host builds) against zlib.crc32: the catalogue check
+    strings, every length 0-300, pages, a full erased staging area, at all
+    four pointer alignments; both CRC16 builds (nibble table and
+    -D CRC16_BITWISE, the bootloader's)
+  * the G0's CRC peripheral path, on the bit-level model of the unit in
+    tools/sim_boot_apply.py, at all four alignments
+
+and reports flash bytes per routine (when an arm-none-eabi-gcc is found:
+cortex-m0plus, -Os, as the firmware builds) and cycles per KB: host ns/KB
+measured against the old bitwise loops, and M0+ cycles/KB from the
+instruction timings of each inner loop.
+
+Usage:
+    <python> tools/check_crc.py            # uses $CXX or c++/g++/clang++
+    <python> tools/check_crc.py --cxx g++ --arm-gcc ~/.platformio/packages/toolchain-gccarmnoneeabi/bin/arm-none-eabi-gcc
+"""
+
+from __future__ import annotations
+
+import argparse
+import binascii
+import glob
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import zlib
+
+from sim_boot_apply import crc32_peripheral
+from size_budget import read_elf
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.normpath(os.path.join(HERE, "..", "src"))
+CRC_C = os.path.join(SRC_DIR, "util", "crc.c")
+
+# The loops util/crc.c replaced, verbatim, as the timing baseline.
+BITWISE = r"""
+#include <stddef.h>
+#include <stdint.h>
+
+extern "C" uint16_t oldCrc16(const uint8_t *p, size_t len)
+{
+    uint16_t crc = 0xFFFF;
+    while (len--)
+    {
+        crc ^= (uint16_t)(*p++) << 8;
+        for (uint8_t bit = 0; bit < 8; bit++)
+        {
+            crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
+        }
+    }
+    return crc;
+}
+
+extern "C" uint32_t oldCrc32(const uint8_t *p, size_t len)
+{
+    uint32_t crc = 0xFFFFFFFFu;
+    while (len--)
+    {
+        crc ^= *p++;
+        for (int i = 0; i < 8; i++)
+        {
+            crc = (crc >> 1) ^ (0xEDB88320u & (0u - (crc & 1u)));
+        }
+    }
+    return crc ^ 0xFFFFFFFFu;
+}
+"""
+
+HARNESS = r"""
+#include <chrono>
+#include <cstdio>
+#include <cstring>
+#include "util/crc.h"
+
+extern "C" uint16_t oldCrc16(const uint8_t *p, size_t len);
+extern "C" uint32_t oldCrc32(const uint8_t *p, size_t len);
+
+// stdin: one hex string per line ("-" = empty) -> "crc16 crc32" at pointer
+// offsets 0..3, space separated. Then "T": ns per KB of each routine.
+static uint8_t buf[61440 + 8];
+
+template <typename F>
+static double nsPerKb(F f)
+{
+    volatile uint32_t sink = 0;
+    const int rounds = 200;
+    const auto t0 = std::chrono::steady_clock::now();
+    for (int i = 0; i < rounds; i++)
+    {
+        buf[i & 4095] ^= 1;     // keep the compiler from hoisting the call
+        sink = sink + f(buf, 4096);
+    }
+    const auto ns = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - t0).count();
+    return ns / rounds / 4.0;
+}
+
+int main()
+{
+    static char line[2 * 61440 + 16];
+    static uint8_t data[61440];
+    while (std::scanf("%s", line) == 1)
+    {
+        if (line[0] == 'T')
+        {
+            std::printf("%.0f %.0f %.0f %.0f\n", nsPerKb(oldCrc16), nsPerKb(crc16Ccitt),
+                        nsPerKb(oldCrc32), nsPerKb(crc32Zlib));
+            continue;
+        }
+        size_t n = 0;
+        for (const char *h = (line[0] == '-') ? "" : line; h[0] && h[1]; h += 2)
+        {
+            unsigned v;
+            std::sscanf(h, "%2x", &v);
+            data[n++] = (uint8_t)v;
+        }
+        for (int off = 0; off < 4; off++)
+        {
+            std::memcpy(buf + off, data, n);
+            std::printf("%04x %08x%c", crc16Ccitt(buf + off, n), crc32Zlib(buf + off, n),
+                        off == 3 ? '\n' : ' ');
+        }
+    }
+    return 0;
+}
+"""
+
+# Cortex-M0+ inner loops, cycles per byte from the instruction timings (1
+# per ALU op, 2 per load/store and per taken branch), rounded up: the
+# figure to expect from the loop profile on the board.
+M0_CYCLES_PER_BYTE = {
+    "crc16 bitwise": 52,     # 8 x (test, shift, conditional xor, uxth, branch) + load
+    "crc16 nibble": 22,      # 2 x (shift, xor, index, ldrh, shift, xor, uxth) + load
+    "crc32 bitwise": 60,     # 8 x (and, neg, and, shift, xor, branch) + load
+    "crc32 nibble": 20,      # 2 x (and, index, ldr, shift, xor) + load
+    "crc32 peripheral": 2,   # ldr + str to CRC->DR + loop, per 4 bytes
+}
+
+
+def vectors(rng: random.Random) -> list[tuple[str, bytes]]:
+    out = [("check string 123456789", b"123456789"), ("empty", b"")]
+    out += [(f"{n} random bytes", rng.randbytes(n)) for n in range(1, 301)]
+    out += [("2048-byte page", rng.randbytes(2048)),
+            ("61,440-byte erased staging area", b"\xff" * 61440),
+            ("61,440-byte image", rng.randbytes(61440))]
+    return out
+
+
+def find_cxx(requested: str | None) -> str | None:
+    for name in filter(None, [requested, os.environ.get("CXX"), "c++", "g++", "clang++"]):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def find_arm_gcc(requested: str | None) -> str | None:
+    pio = glob.glob(os.path.expanduser("~/.platformio/packages/toolchain-gccarmnoneeabi*/bin/arm-none-eabi-gcc"))
+    for name in filter(None, [requested, "arm-none-eabi-gcc", *pio]):
+        path = shutil.which(name) or (name if os.path.isfile(name) else None)
+        if path:
+            return path
+    return None
+
+
+def build(cxx: str, tmp: str, name: str, defines: list[str]) -> str:
+    harness, old = os.path.join(tmp, "harness.cpp"), os.path.join(tmp, "bitwise.cpp")
+    for path, text in ((harness, HARNESS), (old, BITWISE)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    exe = os.path.join(tmp, name)
+    subprocess.run([cxx, "-std=c++14", "-O2", "-Wall", "-Wextra", "-Werror", *defines,
+                    "-I", SRC_DIR, harness, old, "-x", "c++", CRC_C, "-o", exe], check=True)
+    return exe
+
+
+def arm_sizes(gcc: str, tmp: str) -> dict[str, int]:
+    """Flash bytes (code + table) per routine, cortex-m0plus -Os."""
+    old = os.path.join(tmp, "bitwise.cpp")
+    sizes = {}
+    for label, src, defines in (("table", CRC_C, []), ("bitwise", CRC_C, ["-DCRC16_BITWISE"]),
+                                ("old", old, [])):
+        obj = os.path.join(tmp, f"arm_{label}.o")
+        subprocess.run([gcc, "-mcpu=cortex-m0plus", "-mthumb", "-Os", "-ffunction-sections",
+                        "-fdata-sections", *defines, "-I", SRC_DIR, "-x", "c", "-c", src, "-o", obj]
+                       if src == CRC_C else
+                       [gcc, "-mcpu=cortex-m0plus", "-mthumb", "-Os", "-x", "c++", "-c", src, "-o", obj],
+                       check=True)
+        for sym, (_region, size) in read_elf(obj).symbols.items():
+            sizes[f"{label}:{sym}"] = size
+    return {
+        "crc16 bitwise": sizes.get("old:oldCrc16", 0),
+        "crc16 nibble": sizes.get("table:crc16Ccitt", 0) + sizes.get("table:CRC16_NIBBLE", 0),
+        "crc16 bitwise (CRC16_BITWISE)": sizes.get("bitwise:crc16Ccitt", 0),
+        "crc32 bitwise": sizes.get("old:oldCrc32", 0),
+        "crc32 nibble": sizes.get("table:crc32Zlib", 0) + sizes.get("table:CRC32_NIBBLE", 0),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cxx", help="host C++ compiler")
+    ap.add_argument("--arm-gcc", help="arm-none-eabi-gcc for the flash-size column")
+    args = ap.parse_args()
+
+    cxx = find_cxx(args.cxx)
+    if not cxx:
+        print("no host C++ compiler found (set --cxx or $CXX)")
+        return 2
+
+    rng = random.Random(0xC7C)
+    cases = vectors(rng)
+    stdin = "".join((data.hex() or "-") + "\n" for _, data in cases) + "T\n"
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = {}
+        for name, defines in (("nibble", []), ("bitwise", ["-DCRC16_BITWISE"])):
+            exe = build(cxx, tmp, name, defines)
+            runs[name] = subprocess.run([exe], input=stdin, capture_output=True, text=True,
+                                        check=True).stdout.splitlines()
+        gcc = find_arm_gcc(args.arm_gcc)
+        sizes = arm_sizes(gcc, tmp) if gcc else {}
+
+    for build_name, out in runs.items():
+        if len(out) != len(cases) + 1:
+            failures.append(f"{build_name}: harness answered {len(out) - 1} of {len(cases)} cases")
+            continue
+        for (label, data), line in zip(cases, out):
+            want = f"{binascii.crc_hqx(data, 0xFFFF):04x} {zlib.crc32(data):08x}"
+            for off, got in enumerate(" ".join(line.split()[i:i + 2]) for i in range(0, 8, 2)):
+                if got != want:
+                    failures.append(f"{build_name}: {label} at +{off}: got {got}, want {want}")
+    for label, data in cases[:40] + cases[-3:-1]:
+        for addr in range(4):
+            if crc32_peripheral(data, addr) != zlib.crc32(data):
+                failures.append(f"peripheral path: {label} at +{addr}")
+    print(f"crc16Ccitt (nibble table and CRC16_BITWISE) and crc32Zlib (software) on "
+          f"{len(cases)} vectors x 4 alignments, CRC peripheral path on "
+          f"{len(cases[:40]) + 2} x 4: " + ("OK" if not failures else f"{len(failures)} mismatch(es)"))
+
+    ns = dict(zip(("crc16 bitwise", "crc16 nibble", "crc32 bitwise", "crc32 nibble"),
+                  map(int, runs["nibble"][-1].split())))
+    print(f"\n{'routine':<32}{'flash B':>9}{'host ns/KB':>12}{'M0+ cycles/KB':>15}{'ms/KB @64MHz':>14}")
+    for name in ("crc16 bitwise", "crc16 nibble", "crc16 bitwise (CRC16_BITWISE)",
+                 "crc32 bitwise", "crc32 nibble", "crc32 peripheral"):
+        cycles = M0_CYCLES_PER_BYTE.get(name.split(" (")[0], 0) * 1024
+        flash = sizes.get(name)
+        print(f"{name:<32}{flash if flash else '-':>9}{ns.get(name, '-'):>12}"
+              f"{cycles:>15,}{cycles / 64_000:>14.2f}")
+    if not sizes:
+        print("(no arm-none-eabi-gcc found: flash sizes skipped; pass --arm-gcc)")
+
+    if failures:
+        print()
+        for f in failures[:20]:
+            print("FAIL", f)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
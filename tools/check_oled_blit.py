@@ -0,0 +1,199 @@
+"""Host check of the page-major big-number path (src/drivers/oled_blit.h).
+
+oledPrintLargeNumber() used to draw the GFXfont OledBigNum through
+Adafruit_GFX; it now ORs OledBigNumPages (oled_font_bignum_pages.h)
+straight into the SSD1306 framebuffer. Both fonts come out of
+tools/gen_oled_bignum.py, which round-trips each one on its own — this
+checks the part in between: that the blit and its centring put every
+number on exactly the pixels the GFX path lit.
+
+It compiles the real header and the generated font with the host C++
+compiler and renders all 100 two-digit numbers, plus every digit at
+placements that exercise the page shift and the clipping at all four edges.
+Each frame is compared byte for byte with an independent Python model of
+Adafruit_GFX (getTextBounds + setCursor + drawChar) drawing the GFXfont.
+
+Usage:
+    <python> tools/check_oled_blit.py            # uses $CXX or c++/g++/clang++
+    <python> tools/check_oled_blit.py --cxx g++
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.normpath(os.path.join(HERE, "..", "src"))
+GFX_FONT = os.path.join(SRC_DIR, "drivers", "oled_font_bignum.h")
+
+WIDTH, HEIGHT = 128, 64                # OLED_WIDTH, OLED_HEIGHT
+PAGES = HEIGHT // 8
+
+HARNESS = r"""
+#include <cstdio>
+#include <cstring>
+#include "drivers/oled_font_bignum_pages.h"
+
+// stdin: "N <text>" centres a string, "G <char> <x> <y>" places one glyph's
+// ink box at (x, y). stdout: the 1 KB framebuffer as hex, one line each.
+int main()
+{
+    char op[2], text[16];
+    static uint8_t buf[128 * 8];
+    while (std::scanf("%1s %15s", op, text) == 2)
+    {
+        std::memset(buf, 0, sizeof(buf));
+        if (op[0] == 'N')
+        {
+            oledBlitCentered(buf, 128, 8, OledBigNumPages, text);
+        }
+        else
+        {
+            int x, y;
+            if (std::scanf("%d %d", &x, &y) != 2)
+            {
+                return 1;
+            }
+            const OledPageGlyph &g = OledBigNumPages.glyphs[text[0] - OledBigNumPages.first];
+            oledBlitGlyph(buf, 128, 8, OledBigNumPages, g, (int16_t)x, (int16_t)y);
+        }
+        for (uint8_t b : buf)
+        {
+            std::printf("%02x", b);
+        }
+        std::printf("\n");
+    }
+    return 0;
+}
+"""
+
+
+def parse_gfx_font(path: str):
+    """(bitmap bytes, {char: (offset, w, h, xAdvance, xOffset, yOffset)})."""
+    text = open(path, encoding="utf-8").read()
+    body = re.search(r"OledBigNumBitmaps\[\] = \{([^}]*)\}", text).group(1)
+    bitmap = bytes(int(v, 16) for v in re.findall(r"0x[0-9A-Fa-f]{2}", body))
+    glyphs = {}
+    for m in re.finditer(r"\{\s*(\d+),\s*(\d+),\s*(\d+),\s*(\d+),\s*(-?\d+),\s*(-?\d+)\s*\}, // '(.)'", text):
+        glyphs[m.group(7)] = tuple(int(m.group(i)) for i in range(1, 7))
+    assert len(glyphs) == 10, f"expected 10 GFX glyphs, got {len(glyphs)}"
+    return bitmap, glyphs
+
+
+class GfxModel:
+    """What Adafruit_GFX draws for a custom font at text size 1, no wrap hit."""
+
+    def __init__(self, bitmap, glyphs) -> None:
+        self.bitmap, self.glyphs = bitmap, glyphs
+
+    def plot_glyph(self, buf, ch, left, top) -> None:
+        """drawChar's bit walk (MSB-first, row-major), ink box top-left at (left, top)."""
+        off, w, h, _xa, _xo, _yo = self.glyphs[ch]
+        for i in range(w * h):
+            if (self.bitmap[off + i // 8] >> (7 - i % 8)) & 1:
+                x, y = left + i % w, top + i // w
+                if 0 <= x < WIDTH and 0 <= y < HEIGHT:       # drawPixel's clip
+                    buf[(y // 8) * WIDTH + x] |= 1 << (y % 8)
+
+    def centred(self, text: str) -> bytes:
+        # getTextBounds(text, 0, 0, ...)
+        minx = miny = 10 ** 6
+        maxx = maxy = -(10 ** 6)
+        pen = 0
+        for ch in text:
+            _off, w, h, xa, xo, yo = self.glyphs[ch]
+            if w and h:
+                minx, maxx = min(minx, pen + xo), max(maxx, pen + xo + w - 1)
+                miny, maxy = min(miny, yo), max(maxy, yo + h - 1)
+            pen += xa
+        bw, bh = maxx - minx + 1, maxy - miny + 1
+        # oledPrintLargeNumber (before): setCursor to centre, then print.
+        # C++ `/` truncates; both numerators here are non-negative.
+        x = (WIDTH - bw) // 2 - minx
+        y = (HEIGHT - bh) // 2 - miny
+        buf = bytearray(WIDTH * PAGES)
+        for ch in text:
+            _off, _w, _h, xa, xo, yo = self.glyphs[ch]
+            self.plot_glyph(buf, ch, x + xo, y + yo)
+            x += xa
+        return bytes(buf)
+
+    def placed(self, ch: str, x: int, y: int) -> bytes:
+        buf = bytearray(WIDTH * PAGES)
+        self.plot_glyph(buf, ch, x, y)
+        return bytes(buf)
+
+
+def cases() -> list[tuple[str, str]]:
+    """(harness line, description)."""
+    out = [(f"N {v:02d}", f"number {v:02d}") for v in range(100)]
+    # Every shift 0..7 on both sides of the panel, half off each edge, and
+    # wholly off it.
+    spots = [(0, 0), (3, 5), (46, 7), (91, 9), (100, 13), (-10, 2), (110, 20),
+             (20, -3), (20, -9), (20, 30), (20, 60), (-40, -60), (128, 0), (0, 64)]
+    for ch in "0123456789":
+        for x, y in spots:
+            out.append((f"G {ch} {x} {y}", f"glyph '{ch}' at ({x}, {y})"))
+    return out
+
+
+def find_cxx(requested: str | None) -> str | None:
+    for name in filter(None, [requested, os.environ.get("CXX"), "c++", "g++", "clang++"]):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cxx", help="host C++ compiler")
+    args = ap.parse_args()
+
+    cxx = find_cxx(args.cxx)
+    if not cxx:
+        print("no host C++ compiler found (set --cxx or $CXX)")
+        return 2
+
+    model = GfxModel(*parse_gfx_font(GFX_FONT))
+    all_cases = cases()
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "harness.cpp")
+        exe = os.path.join(tmp, "harness")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(HARNESS)
+        subprocess.run([cxx, "-std=c++14", "-O2", "-Wall", "-Wextra", "-Werror",
+                        "-I", SRC_DIR, src, "-o", exe], check=True)
+        stdin = "".join(line + "\n" for line, _ in all_cases)
+        out = subprocess.run([exe], input=stdin, capture_output=True, text=True,
+                             check=True).stdout.splitlines()
+
+    failures = []
+    for (line, name), got in zip(all_cases, out):
+        parts = line.split()
+        want = model.centred(parts[1]) if parts[0] == "N" else \
+            model.placed(parts[1], int(parts[2]), int(parts[3]))
+        if bytes.fromhex(got) != want:
+            diff = sum(bin(a ^ b).count("1") for a, b in zip(bytes.fromhex(got), want))
+            failures.append(f"{name}: {diff} pixels differ")
+    if len(out) != len(all_cases):
+        failures.append(f"harness answered {len(out)} of {len(all_cases)} cases")
+
+    if failures:
+        for f in failures[:20]:
+            print("FAIL", f)
+        print(f"{len(failures)} of {len(all_cases)} frames differ")
+        return 1
+    print(f"oledBlitCentered/oledBlitGlyph match the GFXfont path on {len(all_cases)} frames "
+          "(100 numbers + 140 edge placements) — OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
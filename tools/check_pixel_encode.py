@@ -0,0 +1,193 @@
+"""Host check of the NeoPixel bit encoder (src/drivers/pixel_encode.h).
+
+The DMA pixel driver sends whatever pixelEncode() put in its slot buffer:
+one timer compare value per bit, MSB first, then the zero tail that lets
+the last bit leave the pin before the timer stops. A mistake there (bit
+order, a missing tail slot, a byte skipped) shows up on the cabinet as the
+wrong colour or a ring that never latches — and is invisible on a logic
+analyser unless you already know what to look for.
+
+This compiles the real header with the host C++ compiler, runs it over a
+set of frames (single bits, every byte value, the ring's GRB and the mask's
+GRBW frame sizes, random frames) and compares the output slot for slot with
+an independent Python reference. It also decodes the slots back to bytes,
+the way a strip reads them, and checks the waveform timing the driver's
+constants give at 64 MHz against the WS2812B and SK6812 windows.
+
+Usage:
+    <python> tools/check_pixel_encode.py            # uses $CXX or c++/g++/clang++
+    <python> tools/check_pixel_encode.py --cxx g++
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEADER_DIR = os.path.normpath(os.path.join(HERE, "..", "src"))
+
+# Mirrors pixelDmaInit() at SystemCoreClock = 64 MHz.
+CORE_HZ = 64_000_000
+BIT_HZ = 800_000
+PERIOD = CORE_HZ // BIT_HZ          # 80 ticks
+T0 = PERIOD * 3 // 10               # 24 ticks = 0.375 us
+T1 = PERIOD * 9 // 16               # 45 ticks = 0.703 us
+TAIL = 2                            # PIXEL_TAIL_SLOTS
+
+RING_BYTES = 16 * 3
+MASK_BYTES = 8 * 4
+
+# (name, T0H min/max, T1H min/max) in microseconds, datasheet +-150 ns.
+TIMING_WINDOWS = [
+    ("WS2812B", (0.25, 0.55), (0.65, 0.95)),
+    ("SK6812",  (0.15, 0.45), (0.45, 0.75)),
+]
+
+HARNESS = r"""
+#include <cstdio>
+#include <vector>
+#include "drivers/pixel_encode.h"
+
+// stdin: lines of "<t0> <t1> <hex bytes or '-'>"; stdout: one line of
+// space-separated slot values per input line, prefixed with the count.
+int main()
+{
+    unsigned t0, t1;
+    char hex[4096];
+    while (std::scanf("%u %u %4095s", &t0, &t1, hex) == 3)
+    {
+        std::vector<uint8_t> wire;
+        for (const char *p = hex; p[0] != '-' && p[0] && p[1]; p += 2)
+        {
+            unsigned v;
+            std::sscanf(p, "%2x", &v);
+            wire.push_back((uint8_t)v);
+        }
+        std::vector<uint8_t> slots(pixelSlotCount(wire.size()), 0xEE);
+        size_t n = pixelEncode(wire.data(), wire.size(), slots.data(),
+                               (uint8_t)t0, (uint8_t)t1);
+        std::printf("%zu", n);
+        for (uint8_t s : slots)
+        {
+            std::printf(" %u", s);
+        }
+        std::printf("\n");
+    }
+    return 0;
+}
+"""
+
+
+def reference(wire: bytes, t0: int, t1: int) -> list[int]:
+    out = []
+    for byte in wire:
+        for bit in range(7, -1, -1):
+            out.append(t1 if (byte >> bit) & 1 else t0)
+    return out + [0] * TAIL
+
+
+def decode(slots: list[int], t0: int, t1: int) -> bytes:
+    """What a strip would latch: bits until the first zero (low) slot."""
+    bits = []
+    for s in slots:
+        if s == 0:
+            break
+        bits.append(1 if s == t1 else 0)
+    return bytes(int("".join(map(str, bits[i:i + 8])), 2) for i in range(0, len(bits) - 7, 8))
+
+
+def cases() -> list[tuple[str, bytes, int, int]]:
+    rng = random.Random(0x1E5)
+    out = [
+        ("empty frame", b"", T0, T1),
+        ("single 0x80 (MSB first)", b"\x80", T0, T1),
+        ("single 0x01 (LSB last)", b"\x01", T0, T1),
+        ("every byte value", bytes(range(256)), T0, T1),
+        ("ring black (GRB)", bytes(RING_BYTES), T0, T1),
+        ("ring white (GRB)", b"\xFF" * RING_BYTES, T0, T1),
+        ("mask W-only index (GRBW)", bytes(12) + b"\x00\x00\x00\x80" + bytes(16), T0, T1),
+        ("odd tick values", b"\xA5\x5A", 7, 250),
+    ]
+    for i in range(20):
+        n = rng.choice([RING_BYTES, MASK_BYTES, rng.randrange(1, 64)])
+        out.append((f"random #{i} ({n} B)", bytes(rng.randrange(256) for _ in range(n)), T0, T1))
+    return out
+
+
+def find_cxx(requested: str | None) -> str | None:
+    for name in filter(None, [requested, os.environ.get("CXX"), "c++", "g++", "clang++"]):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def check_timing() -> list[str]:
+    problems = []
+    tick_us = 1e6 / CORE_HZ
+    t0h, t1h = T0 * tick_us, T1 * tick_us
+    print(f"timing @ {CORE_HZ // 1_000_000} MHz: period {PERIOD} ticks "
+          f"({PERIOD * tick_us:.3f} us), T0H {T0} ({t0h:.3f} us), T1H {T1} ({t1h:.3f} us)")
+    for name, (lo0, hi0), (lo1, hi1) in TIMING_WINDOWS:
+        if not (lo0 <= t0h <= hi0 and lo1 <= t1h <= hi1):
+            problems.append(f"timing outside the {name} window")
+    if max(T0, T1, PERIOD - 1) > 255:
+        problems.append("compare values no longer fit the 8-bit slot buffer")
+    return problems
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cxx", help="host C++ compiler")
+    args = ap.parse_args()
+
+    failures = check_timing()
+
+    cxx = find_cxx(args.cxx)
+    if not cxx:
+        print("no host C++ compiler found (set --cxx or $CXX)")
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "harness.cpp")
+        exe = os.path.join(tmp, "harness")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(HARNESS)
+        subprocess.run([cxx, "-std=c++14", "-O2", "-Wall", "-Werror",
+                        "-I", HEADER_DIR, src, "-o", exe], check=True)
+
+        all_cases = cases()
+        stdin = "".join(f"{t0} {t1} {w.hex() or '-'}\n" for _, w, t0, t1 in all_cases)
+        out = subprocess.run([exe], input=stdin, capture_output=True, text=True,
+                             check=True).stdout.splitlines()
+
+    for (name, wire, t0, t1), line in zip(all_cases, out):
+        fields = [int(v) for v in line.split()]
+        count, slots = fields[0], fields[1:]
+        want = reference(wire, t0, t1)
+        ok = count == len(want) == len(slots) and slots == want
+        if ok and decode(slots, t0, t1) != wire:
+            ok = False
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}: {len(wire)} B -> {count} slots")
+        if not ok:
+            failures.append(name)
+    if len(out) != len(all_cases):
+        failures.append(f"harness answered {len(out)} of {len(all_cases)} cases")
+
+    print()
+    if failures:
+        for f in failures:
+            print("FAIL", f)
+        return 1
+    print(f"pixelEncode matches the reference on {len(all_cases)} frames — OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
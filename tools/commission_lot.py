@@ -0,0 +1,266 @@
+"""Commission a production lot in one go: per-board images or a patch manifest.
+
+The LGS Test Tool commissions one board at a time: pick the factory image,
+type an ID, write. For a lot of 200 boards this does the file side up front.
+The generic image is opened once (memory-mapped) and the commissioning block
+(include/commission_block.h) is located once with valid_blocks(). Then, per
+board, only that block is rewritten:
+- the Modbus ID;
+- an apply-once token, random and unique in the lot;
+- applyMask, flags and the device type;
+- a CRC16 carried on from the block's fixed 20-byte head rather than
+  recomputed over it.
+Every other byte stays the generic image's.
+
+Outputs, any combination:
+- --images DIR: one flashable file per board (<image stem>_id<NNN>.bin).
+- --manifest FILE: one JSON file with the generic image's sha256 and, per
+  board, ID, token, patch offset and the 36 patched bytes. This is for a
+  programmer that flashes the generic image and then writes the block.
+- --log FILE (default data/exports/commission_log.csv): one row per board.
+  If the file already exists, rows are appended in its own column order.
+  device_uid stays empty until the board is flashed and its UID read over
+  SWD.
+
+    python tools/commission_lot.py assets/firmware_stm32g070_v3.3.0_factory_2026-10-01.bin \\
+        --ids 1-200 --type 20 --lot L2026-41 --images out/L2026-41 --manifest out/L2026-41.json
+
+Same safety rules as the Test Tool. An image never renumbers a board that
+already has an ID unless it was made with --force. Each file is consumed
+once per board, because the board records the token.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import secrets
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from lgs_client import parse_ids
+from make_factory_image import BOOT_SLOT, MAGIC, ROOT, crc16_ccitt, valid_blocks
+
+FLASH_BASE = 0x08000000
+LOG = ROOT / "data" / "exports" / "commission_log.csv"
+LOG_COLUMNS = ["time", "lot", "slave_id", "device_type", "force", "token",
+               "device_uid", "image", "image_sha256", "block_offset"]
+
+APPLY_ID, APPLY_DEVICE_TYPE = 0x0001, 0x0002       # COMMISSION_APPLY_*
+FLAG_FORCE = 0x0001                                # COMMISSION_FLAG_FORCE
+TOKEN_NONE, TOKEN_ERASED = 0x00000000, 0xFFFFFFFF  # reserved, never issued
+HEAD = 20                    # magic[16] + version + size: identical on every board
+ID_MIN, ID_MAX = 1, 245      # 246 = SET_ID mode, 247 = "not set"
+DEVICE_TYPES = {10: "STANDARD", 20: "NARCOTIC", 30: "LITE", 40: "DELIVERY"}
+
+
+def _crc_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+        table.append(crc)
+    return table
+
+
+_TABLE = _crc_table()
+
+
+def crc16_update(crc: int, data: bytes) -> int:
+    """CRC16-CCITT (poly 0x1021) carried on from `crc` — byte-at-a-time table.
+
+    crc16_update(0xFFFF, data) == crc16_ccitt(data), and it chains: the CRC
+    of head + tail is crc16_update(crc16_update(0xFFFF, head), tail).
+    """
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _TABLE[(crc >> 8) ^ byte]
+    return crc
+
+
+class Lot:
+    """The generic image, mapped once, and the block's place in it."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self.image = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        blocks = valid_blocks(self.image)
+        if len(blocks) != 1:
+            self.close()
+            raise ValueError(f"{path.name} carries {len(blocks)} valid commissioning blocks, "
+                             "expected 1 (build it with tools/make_factory_image.py)")
+        self.offset = blocks[0]
+        self.version, self.size = struct.unpack_from("<2H", self.image, self.offset + len(MAGIC) + 2)
+        block = self.image[self.offset:self.offset + self.size]
+        token = struct.unpack_from("<2H", block, HEAD)
+        if token != (0, 0):
+            self.close()
+            raise ValueError(f"{path.name} is already patched (token 0x{token[1]:04X}{token[0]:04X}); "
+                             "start from the generic image")
+        self.head = bytes(block[:HEAD])
+        self.reserved = struct.unpack_from("<H", block, 32)[0] if self.version >= 2 else 0
+        self.head_crc = crc16_update(0xFFFF, self.head)
+        self.sha256 = hashlib.sha256(self.image).hexdigest()
+
+    def close(self) -> None:
+        self.image.close()
+        self._file.close()
+
+    def __enter__(self) -> "Lot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def block(self, identifier: int, token: int, device_type: int = 0, force: bool = False) -> bytes:
+        """The patched block for one board: fields after the head, then the CRC."""
+        mask = APPLY_ID | (APPLY_DEVICE_TYPE if device_type else 0)
+        fields = [token & 0xFFFF, token >> 16, mask, FLAG_FORCE if force else 0, identifier]
+        if self.version >= 2:
+            fields += [device_type, self.reserved]
+        body = struct.pack(f"<{len(fields)}H", *fields)
+        crc = crc16_update(self.head_crc, body)
+        return self.head + body + struct.pack("<H", crc)
+
+    def write_image(self, out: Path, block: bytes) -> None:
+        view = memoryview(self.image)
+        try:
+            with open(out, "wb") as fh:
+                fh.write(view[:self.offset])
+                fh.write(block)
+                fh.write(view[self.offset + self.size:])
+        finally:
+            view.release()
+
+
+def issue_tokens(count: int) -> list[int]:
+    """Random 32-bit tokens, unique in the lot, never a reserved value."""
+    tokens: set[int] = set()
+    out = []
+    while len(out) < count:
+        t = secrets.randbits(32)
+        if t in (TOKEN_NONE, TOKEN_ERASED) or t in tokens:
+            continue
+        tokens.add(t)
+        out.append(t)
+    return out
+
+
+def append_log(path: Path, rows: list[dict]) -> None:
+    """Append in the existing file's column order; new file: LOG_COLUMNS."""
+    columns = LOG_COLUMNS
+    if path.exists() and path.stat().st_size:
+        with open(path, newline="", encoding="utf-8-sig") as fh:
+            columns = next(csv.reader(fh), None) or LOG_COLUMNS
+        new = False
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        new = True
+    with open(path, "a", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=columns, extrasaction="ignore", restval="")
+        if new:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("image", type=Path, help="generic factory image (or app-only .bin)")
+    ap.add_argument("--ids", required=True, help="Slave IDs, e.g. 1-200 or 21,22,30-40")
+    ap.add_argument("--type", type=int, default=0, choices=sorted(DEVICE_TYPES),
+                    help="device type to record (default: leave the board's own)")
+    ap.add_argument("--force", action="store_true",
+                    help="also renumber boards that already have an ID")
+    ap.add_argument("--lot", default="", help="production lot, copied into the log")
+    ap.add_argument("--images", type=Path, help="write one patched image per board here")
+    ap.add_argument("--manifest", type=Path, help="write the patch manifest (JSON) here")
+    ap.add_argument("--log", type=Path, default=LOG, help="commissioning log to append to")
+    ap.add_argument("--no-log", action="store_true")
+    ap.add_argument("--base", type=lambda s: int(s, 0), default=None,
+                    help="flash address of the image's first byte "
+                         "(default: 0x08000000 for a factory image, 0x08001000 for an app)")
+    args = ap.parse_args()
+
+    try:
+        ids = parse_ids(args.ids, ID_MIN, ID_MAX)
+    except ValueError as exc:
+        print(f"[ERR] --ids: {exc}")
+        return 2
+    if not (args.images or args.manifest):
+        print("nothing to write: give --images DIR and/or --manifest FILE")
+        return 2
+
+    started = time.perf_counter()
+    try:
+        lot = Lot(args.image)
+    except (OSError, ValueError) as exc:
+        print(exc)
+        return 1
+    with lot:
+        if args.type and lot.version < 2:
+            print(f"{args.image.name} has a v{lot.version} block: no device type field")
+            return 1
+        # A factory image starts with the bootloader; an app image links at the slot.
+        base = args.base if args.base is not None else \
+            FLASH_BASE if lot.offset >= BOOT_SLOT else FLASH_BASE + BOOT_SLOT
+
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        boards, rows = [], []
+        if args.images:
+            args.images.mkdir(parents=True, exist_ok=True)
+        for identifier, token in zip(ids, issue_tokens(len(ids))):
+            block = lot.block(identifier, token, args.type, args.force)
+            # Belt and braces: the chained CRC must be the one the firmware
+            # checks. Not an assert: python -O would drop it.
+            if crc16_ccitt(block[:-2]) != struct.unpack_from("<H", block, len(block) - 2)[0]:
+                print(f"[ERR] id {identifier}: the patched block fails its own CRC; nothing written")
+                return 1
+            name = ""
+            if args.images:
+                out = args.images / f"{args.image.stem}_id{identifier:03d}.bin"
+                lot.write_image(out, block)
+                name = out.name
+            boards.append({"id": identifier, "token": f"0x{token:08X}", "image": name,
+                           "bytes": block.hex()})
+            rows.append({"time": stamp, "lot": args.lot, "slave_id": identifier,
+                         "device_type": args.type or "", "force": int(args.force),
+                         "token": f"0x{token:08X}", "device_uid": "",
+                         "image": name or args.image.name, "image_sha256": lot.sha256,
+                         "block_offset": f"0x{lot.offset:05X}"})
+
+        if args.manifest:
+            args.manifest.parent.mkdir(parents=True, exist_ok=True)
+            manifest = {
+                "lot": args.lot, "created": stamp,
+                "image": args.image.name, "image_size": len(lot.image), "sha256": lot.sha256,
+                "block_version": lot.version, "block_size": lot.size,
+                "patch_offset": lot.offset, "patch_address": f"0x{base + lot.offset:08X}",
+                "force": args.force, "device_type": args.type, "boards": boards,
+            }
+            args.manifest.write_text(json.dumps(manifest, indent=1) + "\n", encoding="utf-8")
+        if not args.no_log:
+            append_log(args.log, rows)
+        elapsed = time.perf_counter() - started
+
+        print(f"{args.image.name}: block v{lot.version} at 0x{lot.offset:05X} "
+              f"(flash 0x{base + lot.offset:08X}), sha256 {lot.sha256[:16]}...")
+        print(f"{len(ids)} boards, IDs {ids[0]}..{ids[-1]}"
+              f"{', type ' + str(args.type) + ' ' + DEVICE_TYPES[args.type] if args.type else ''}"
+              f"{', FORCE' if args.force else ''} in {elapsed * 1000:.0f} ms")
+        if args.images:
+            print(f"->   {len(ids)} images in {args.images}")
+        if args.manifest:
+            print(f"->   manifest {args.manifest}")
+        if not args.no_log:
+            print(f"->   {len(rows)} rows appended to {args.log}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
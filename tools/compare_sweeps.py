@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Compare test_modbus_rtu.py sweep logs: values, errors, latency per address.
+
+The sweep is the on-hardware golden-log gate, but until now two logs (say
+v3.2.0 against v3.3.0 on the same board) were compared by eye. This lines
+their rows up by (phase, fc, addr, op) and reports, per address:
+
+  - value changes — only where the value held still within each log;
+    live registers (uptime, temperatures, counters) move on their own and
+    are listed as volatile instead;
+  - new exceptions and failures (ERR/FAIL where the baseline had none), and
+    the ones that went away;
+  - latency shifts, tested with Mann-Whitney U (tie-corrected, normal
+    approximation). Latency is skewed and quantised to 0.1 ms, so medians
+    and ranks say more than means. A shift is reported when p < --alpha AND
+    the medians moved by at least --min-shift-ms; with fewer than
+    --min-samples rows a side (a one-loop log) the per-key medians go to the
+    JSON report only, and the per-phase pooled test still applies.
+
+The first log is the baseline; every further log is compared with it. Logs
+are streamed row by row into per-key columns (result counts, a handful of
+distinct values, a latency histogram), so a multi-loop soak log never has
+to fit in memory as rows — about 5 s per million rows.
+
+    python tools/compare_sweeps.py logs/rtu_sweep_v320.csv logs/rtu_sweep_v330.csv
+    python tools/compare_sweeps.py base.csv a.csv b.csv --json report.json --quiet
+
+Exit status: 0 clean, 1 when any comparison has new errors or failures or
+a significant latency increase (also changed stable values with --strict),
+2 on unreadable input.
+
+Since the sweep went block-read (lgs_client), a read row carries the whole
+block's latency, noted "block FIRST+COUNT"; older logs time one register
+per row. The two do not measure the same thing, so where the baseline and
+the candidate log a key differently its latency is not tested (nor its
+phase's pooled latency) and the report says so. Values and errors are
+compared as usual.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from operator import itemgetter
+
+KEY_COLUMNS = ("phase", "fc", "addr", "op")
+MAX_VALUES = 8            # distinct raw values kept per key; past that it is "many"
+FW_KEY_TEXT = ("READ", "3", "1", "read")    # reg 1, firmware version, as logged
+
+
+@dataclass
+class KeyStats:
+    """One (phase, fc, addr, op) column set from one log."""
+    name: str = ""
+    rows: int = 0
+    results: Counter = field(default_factory=Counter)
+    values: Counter = field(default_factory=Counter)
+    many_values: bool = False
+    latency: Counter = field(default_factory=Counter)   # ms -> rows; 0.1 ms steps
+    first_problem: str = ""
+    block: bool = False         # logged from block reads: latency is the block's
+
+    @property
+    def problems(self) -> int:
+        return self.results["ERR"] + self.results["FAIL"]
+
+    @property
+    def stable_value(self) -> str | None:
+        """The one value this key always had, or None if it moved (or never had one)."""
+        if self.many_values or len(self.values) != 1:
+            return None
+        return next(iter(self.values))
+
+
+@dataclass
+class SweepLog:
+    path: str
+    keys: dict = field(default_factory=dict)
+    rows: int = 0
+    loops: int = 0
+    firmware: str = ""
+
+    def meta(self) -> dict:
+        return {"path": self.path, "rows": self.rows, "loops": self.loops,
+                "keys": len(self.keys), "firmware": self.firmware}
+
+
+def load(path: str) -> SweepLog:
+    log = SweepLog(path)
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if not header:
+            raise ValueError(f"{path}: empty file")
+        try:
+            i_loop, i_phase, i_fc, i_addr, i_name, i_op, i_raw, i_dec, i_res, i_lat, i_note = (
+                header.index(c) for c in ("loop", "phase", "fc", "addr", "name", "op", "raw",
+                                          "decoded", "result", "latency_ms", "note"))
+        except ValueError as exc:
+            raise ValueError(f"{path}: not a sweep log ({exc})") from None
+        # The hot loop: keys stay the CSV's strings and latencies are
+        # counted as text, so a row costs a few dict operations and no
+        # number parsing. Everything is converted once per key afterwards.
+        key_of = itemgetter(i_phase, i_fc, i_addr, i_op)
+        keys = {}
+        rows = 0
+        last_loop = "0"
+        for row in reader:
+            if len(row) <= i_note:
+                continue                           # truncated last line of an aborted run
+            key = key_of(row)
+            ks = keys.get(key)
+            if ks is None:
+                ks = keys[key] = KeyStats(name=row[i_name])
+            ks.rows += 1
+            result = row[i_res]
+            ks.results[result] += 1
+            if result in ("ERR", "FAIL") and not ks.first_problem:
+                ks.first_problem = row[i_note] or row[i_dec] or result
+            raw = row[i_raw]
+            if raw and not ks.many_values:
+                ks.values[raw] += 1
+                if len(ks.values) > MAX_VALUES:
+                    ks.many_values = True
+                    ks.values.clear()
+            ks.latency[row[i_lat]] += 1
+            if not ks.block and row[i_note].startswith("block "):
+                ks.block = True
+            last_loop = row[i_loop] or last_loop
+            rows += 1
+            if not log.firmware and key == FW_KEY_TEXT and result == "OK":
+                log.firmware = row[i_dec]
+    log.rows = rows
+    log.loops = int(last_loop)
+    for (phase, fc, addr, op), ks in keys.items():
+        ks.latency = Counter({float(ms): n for ms, n in ks.latency.items() if ms})
+        log.keys[(phase, int(fc), int(addr), op)] = ks
+    return log
+
+
+# --- statistics -------------------------------------------------------------------
+
+def median(hist: Counter) -> float:
+    n = sum(hist.values())
+    if not n:
+        return float("nan")
+    lo_rank, hi_rank = (n - 1) // 2, n // 2       # 0-based; equal when n is odd
+    seen, lo = 0, None
+    for v in sorted(hist):
+        seen += hist[v]
+        if lo is None and seen > lo_rank:
+            lo = v
+        if seen > hi_rank:
+            return (lo + v) / 2.0
+    return float("nan")
+
+
+def mann_whitney(a: Counter, b: Counter) -> tuple[float, float]:
+    """(p two-sided, P(b > a) effect) for two latency histograms.
+
+    Normal approximation with tie and continuity correction. Latency is
+    logged in 0.1 ms steps, so a histogram has a few hundred distinct
+    values however many rows went in: ranks are assigned per value, not
+    per row. NaN p when every value ties.
+    """
+    n1, n2 = sum(a.values()), sum(b.values())
+    n = n1 + n2
+    rank_sum_a = 0.0
+    ties = 0.0
+    below = 0
+    for v in sorted(a.keys() | b.keys()):
+        ca, cb = a.get(v, 0), b.get(v, 0)
+        t = ca + cb
+        rank_sum_a += ca * (below + (t + 1) / 2.0)     # average of ranks below+1..below+t
+        ties += t ** 3 - t
+        below += t
+    u_a = rank_sum_a - n1 * (n1 + 1) / 2.0         # pairs where a > b
+    mu = n1 * n2 / 2.0
+    var = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    effect = 1.0 - u_a / (n1 * n2)                  # share of pairs where b is slower
+    if var <= 0:
+        return float("nan"), effect
+    z = (abs(u_a - mu) - 0.5) / math.sqrt(var)
+    return math.erfc(max(z, 0.0) / math.sqrt(2.0)), effect
+
+
+@dataclass
+class Thresholds:
+    alpha: float = 0.01
+    min_shift_ms: float = 1.0
+    min_samples: int = 8
+
+
+def latency_shift(label: dict, a: Counter, b: Counter, th: Thresholds) -> dict | None:
+    na, nb = sum(a.values()), sum(b.values())
+    if not na or not nb:
+        return None
+    ma, mb = median(a), median(b)
+    entry = {**label, "n": [na, nb], "median_ms": [round(ma, 2), round(mb, 2)],
+             "shift_ms": round(mb - ma, 2)}
+    if min(na, nb) < th.min_samples:
+        entry["tested"] = False
+        return entry
+    p, effect = mann_whitney(a, b)
+    entry.update(tested=True, p=None if math.isnan(p) else float(f"{p:.3g}"),
+                 p_slower=round(effect, 3))
+    entry["significant"] = (not math.isnan(p) and p < th.alpha
+                            and abs(mb - ma) >= th.min_shift_ms)
+    return entry
+
+
+# --- comparison -------------------------------------------------------------------
+
+def key_label(key, ks: KeyStats) -> dict:
+    phase, fc, addr, op = key
+    return {"phase": phase, "fc": fc, "addr": addr, "op": op, "name": ks.name}
+
+
+def compare(base: SweepLog, cand: SweepLog, th: Thresholds, strict: bool) -> dict:
+    value_changes, volatile, new_errors, resolved, shifts, untested = [], [], [], [], [], []
+    mixed = []                  # keys timed per block on one side, per register on the other
+    for key in sorted(base.keys.keys() & cand.keys.keys(), key=lambda k: (k[2], k[1], k[0], k[3])):
+        b, c = base.keys[key], cand.keys[key]
+        label = key_label(key, c)
+        vb, vc = b.stable_value, c.stable_value
+        if vb is not None and vc is not None:
+            if vb != vc:
+                value_changes.append({**label, "baseline": vb, "candidate": vc})
+        elif b.values or c.values or b.many_values or c.many_values:
+            volatile.append(label["addr"])
+        if c.problems and not b.problems:
+            new_errors.append({**label, "results": dict(c.results), "example": c.first_problem})
+        elif b.problems and not c.problems:
+            resolved.append({**label, "baseline_results": dict(b.results)})
+        if b.block != c.block:
+            mixed.append(key)
+            continue
+        s = latency_shift(label, b.latency, c.latency, th)
+        if s and s.get("significant"):
+            shifts.append(s)
+        elif s and not s["tested"] and abs(s["shift_ms"]) >= th.min_shift_ms:
+            untested.append(s)                     # too few rows to call; JSON only
+
+    phases = []
+    mixed_phases = sorted({k[0] for k in mixed})
+    for phase in sorted({k[0] for k in base.keys} | {k[0] for k in cand.keys}):
+        if phase in mixed_phases:
+            continue
+        a, b = Counter(), Counter()
+        for log, hist in ((base, a), (cand, b)):
+            for k, ks in log.keys.items():
+                if k[0] == phase:
+                    hist.update(ks.latency)
+        s = latency_shift({"phase": phase}, a, b, th)
+        if s:
+            phases.append(s)
+
+    missing = [key_label(k, base.keys[k]) for k in sorted(base.keys.keys() - cand.keys.keys())]
+    added = [key_label(k, cand.keys[k]) for k in sorted(cand.keys.keys() - base.keys.keys())]
+    slower = [s for s in shifts if s.get("significant") and s["shift_ms"] > 0]
+    slower_phases = [s for s in phases if s.get("significant") and s["shift_ms"] > 0]
+    regressions = len(new_errors) + len(slower) + len(slower_phases) + \
+        (len(value_changes) if strict else 0)
+    return {
+        "candidate": cand.meta(),
+        "summary": {"matched_keys": len(base.keys.keys() & cand.keys.keys()),
+                    "value_changes": len(value_changes), "new_errors": len(new_errors),
+                    "resolved_errors": len(resolved),
+                    "slower": len(slower), "faster": sum(1 for s in shifts
+                                                         if s.get("significant") and s["shift_ms"] < 0),
+                    "missing_keys": len(missing), "new_keys": len(added),
+                    "latency_not_compared": len(mixed),
+                    "regressions": regressions},
+        "value_changes": value_changes,
+        "volatile_addrs": sorted(set(volatile)),
+        "new_errors": new_errors,
+        "resolved_errors": resolved,
+        "latency_shifts": sorted(shifts, key=lambda s: -abs(s["shift_ms"])),
+        "latency_untested": untested,
+        "phase_latency": phases,
+        "latency_not_compared": {"keys": [key_label(k, cand.keys[k]) for k in mixed],
+                                 "phases": mixed_phases,
+                                 "baseline_block_reads": sum(base.keys[k].block for k in mixed)},
+        "missing_keys": missing,
+        "new_keys": added,
+    }
+
+
+def print_report(base: SweepLog, result: dict, limit: int) -> None:
+    cand, s = result["candidate"], result["summary"]
+
+    def who(meta):
+        return f"{meta['path']} ({meta['firmware'] or 'fw ?'}, {meta['rows']:,} rows, {meta['loops']} loops)"
+    print(f"baseline  {who(base.meta())}")
+    print(f"candidate {who(cand)}")
+    print(f"  {s['matched_keys']} keys matched, {s['missing_keys']} missing, {s['new_keys']} new; "
+          f"{len(result['volatile_addrs'])} volatile addresses not value-compared")
+
+    def section(title, rows, fmt):
+        if rows:
+            print(f"  {title} ({len(rows)}):")
+            for r in rows[:limit]:
+                print("    " + fmt(r))
+            if len(rows) > limit:
+                print(f"    ... {len(rows) - limit} more in the JSON report")
+
+    where = "{phase:<8} fc{fc:<2} {addr:>5} {op:<11} {name:<24}".format
+    section("value changes", result["value_changes"],
+            lambda r: f"{where(**r)} {r['baseline']} -> {r['candidate']}")
+    section("NEW errors/failures", result["new_errors"],
+            lambda r: f"{where(**r)} {r['results']}  {r['example']}")
+    section("resolved errors", result["resolved_errors"],
+            lambda r: f"{where(**r)} was {r['baseline_results']}")
+
+    def lat(r):
+        base_ms, cand_ms = r["median_ms"]
+        test = (f"p={r['p']:.2g}, P(slower)={r['p_slower']:.2f}" if r["tested"]
+                else f"n={r['n'][0]}/{r['n'][1]}, untested")
+        return f"{base_ms:7.1f} -> {cand_ms:7.1f} ms ({r['shift_ms']:+.1f}, {test})"
+    skipped = result["latency_not_compared"]
+    if skipped["keys"]:
+        n = len(skipped["keys"])
+        older = "candidate" if skipped["baseline_block_reads"] == n else "baseline"
+        print(f"  latency NOT compared for {n} key(s) in phase(s) {', '.join(skipped['phases'])}: "
+              f"the {older} log times one register per row, the other whole block reads "
+              f"(values and errors still compared)")
+    section("latency shifts", result["latency_shifts"], lambda r: f"{where(**r)} {lat(r)}")
+    section("latency by phase", result["phase_latency"],
+            lambda r: f"{r['phase']:<8} {lat(r)}{'  SIGNIFICANT' if r.get('significant') else ''}")
+    print(f"  -> {s['regressions']} regression(s): {s['new_errors']} new errors, "
+          f"{s['slower']} addresses slower, "
+          f"{sum(1 for r in result['phase_latency'] if r.get('significant') and r['shift_ms'] > 0)} phases slower")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0],
+                                 formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    ap.add_argument("logs", nargs="+", help="sweep CSVs; the first is the baseline")
+    ap.add_argument("--json", help="write the machine-readable report here ('-' = stdout)")
+    ap.add_argument("--alpha", type=float, default=Thresholds.alpha,
+                    help="significance level for a latency shift")
+    ap.add_argument("--min-shift-ms", type=float, default=Thresholds.min_shift_ms,
+                    help="smallest median shift worth reporting")
+    ap.add_argument("--min-samples", type=int, default=Thresholds.min_samples,
+                    help="rows per side needed before testing a key")
+    ap.add_argument("--strict", action="store_true",
+                    help="count changed stable values as regressions too")
+    ap.add_argument("--limit", type=int, default=25, help="rows per section on screen")
+    ap.add_argument("--quiet", action="store_true", help="no screen report")
+    args = ap.parse_args()
+    if len(args.logs) < 2:
+        ap.error("need a baseline and at least one log to compare")
+
+    th = Thresholds(args.alpha, args.min_shift_ms, args.min_samples)
+    try:
+        base = load(args.logs[0])
+        results = []
+        for path in args.logs[1:]:
+            results.append(compare(base, load(path), th, args.strict))
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    if not args.quiet:
+        for i, result in enumerate(results):
+            if i:
+                print()
+            print_report(base, result, args.limit)
+    report = {"baseline": base.meta(),
+              "thresholds": {"alpha": th.alpha, "min_shift_ms": th.min_shift_ms,
+                             "min_samples": th.min_samples, "strict": args.strict},
+              "comparisons": results,
+              "regressions": sum(r["summary"]["regressions"] for r in results)}
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=1)
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,14 @@
 """Convert the fixed 53x64 digit bitmaps (oled_font_digits.h) into a compact
-Adafruit GFXfont (oled_font_bignum.h) containing only glyphs '0'-'9'.
+Adafruit GFXfont (oled_font_bignum.h) containing only glyphs '0'-'9', and the
+same glyphs page-major (oled_font_bignum_pages.h) for drivers/oled_blit.h.
 
 Each glyph is trimmed to its ink bounding box and bit-packed contiguously
 (no per-row byte padding), which removes the blank columns of the fixed-cell
-format. A built-in round-trip check asserts every generated glyph decodes
-back to the grid it was packed from before the header is written.
+format. The page-major copy stores the same box the way the SSD1306 RAM is
+laid out — 8-row pages, a byte per column, bit 0 on top — so the firmware
+can OR it into the framebuffer instead of plotting pixels through GFX. A
+built-in round-trip check asserts every glyph decodes back to the grid it
+was packed from, in both formats, before either header is written.
 
 The digits are also scaled down to CELL_HEIGHT. At the source's full 64 px
 they filled the panel top to bottom and the bezel over the glass cut the
@@ -16,11 +20,14 @@ can say why.
 The resample is a 2-D box filter with a 50% threshold (an output pixel turns
 on when at least half the source area it covers was ink), which keeps
 strokes solid and gaps open — dropping rows and columns outright would thin
-some strokes away and fatten others.
+some strokes away and fatten others. It reads coverage from one summed-area
+table per digit, in exact integers, so sizing up other heights costs a few
+lookups per pixel rather than another pass over the source.
 
 Usage:
     <python> tools/gen_oled_bignum.py               # CELL_HEIGHT
     <python> tools/gen_oled_bignum.py --height 48
+    <python> tools/gen_oled_bignum.py --compare 40,48   # sizes only, nothing written
 """
 
 import argparse
@@ -30,6 +37,7 @@ import re
 HERE = os.path.dirname(__file__)
 SRC = os.path.normpath(os.path.join(HERE, "..", "src", "drivers", "oled_font_digits.h"))
 OUT = os.path.normpath(os.path.join(HERE, "..", "src", "drivers", "oled_font_bignum.h"))
+OUT_PAGES = os.path.normpath(os.path.join(HERE, "..", "src", "drivers", "oled_font_bignum_pages.h"))
 
 DIGITS = "0123456789"
 CELL_GAP = 6      # horizontal gap between tabular digit cells
@@ -61,35 +69,51 @@ def to_grid(data, width, height, stride):
     return grid
 
 
-def resize_grid(grid, src_w, src_h, dst_w, dst_h):
-    """Box-filter the grid to dst_w x dst_h, 50%-of-area threshold."""
-    if (dst_w, dst_h) == (src_w, src_h):
-        return grid
-    sx = src_w / dst_w
-    sy = src_h / dst_h
-    cell_area = sx * sy
+def summed_area(grid, width, height):
+    """Summed-area table: sat[y][x] = ink in rows < y, columns < x."""
+    sat = [[0] * (width + 1) for _ in range(height + 1)]
+    for y in range(height):
+        run = 0
+        above, row, out = sat[y], grid[y], sat[y + 1]
+        for x in range(width):
+            run += row[x]
+            out[x + 1] = above[x + 1] + run
+    return sat
+
+
+def ink_before(sat, x_num, y_num, den_x, den_y):
+    """Ink area of [0, x) x [0, y), x = x_num / den_x and y = y_num / den_y,
+    scaled by den_x * den_y so it stays an exact integer.
+
+    Ink is constant inside each source pixel, so the integral is bilinear
+    between the table's integer corners — interpolating it is exact.
+    """
+    x0, fx = divmod(x_num, den_x)
+    y0, fy = divmod(y_num, den_y)
+    x1 = min(x0 + 1, len(sat[0]) - 1)
+    y1 = min(y0 + 1, len(sat) - 1)
+    top = sat[y0][x0] * den_x + (sat[y0][x1] - sat[y0][x0]) * fx
+    bottom = sat[y1][x0] * den_x + (sat[y1][x1] - sat[y1][x0]) * fx
+    return top * den_y + (bottom - top) * fy
+
+
+def resize_grid(sat, src_w, src_h, dst_w, dst_h):
+    """Box-filter to dst_w x dst_h, 50%-of-area threshold.
+
+    Four table lookups per output pixel instead of a loop over the source
+    pixels it covers, so one table per digit serves every size asked for.
+    Integer arithmetic throughout: a pixel exactly half covered is common
+    at these ratios, and float rounding must not decide it.
+    """
+    # Output edge x sits at x * src_w / dst_w source pixels.
+    edges = [[ink_before(sat, x * src_w, y * src_h, dst_w, dst_h) for x in range(dst_w + 1)]
+             for y in range(dst_h + 1)]
+    full = src_w * src_h            # one output pixel's area, in the same units
     out = []
     for y in range(dst_h):
-        top = y * sy
-        bottom = (y + 1) * sy
-        row = [0] * dst_w
-        for x in range(dst_w):
-            left = x * sx
-            right = (x + 1) * sx
-            covered = 0.0
-            for syi in range(int(top), min(src_h, int(bottom - 1e-9) + 1)):
-                wy = min(syi + 1.0, bottom) - max(float(syi), top)
-                if wy <= 0:
-                    continue
-                srow = grid[syi]
-                for sxi in range(int(left), min(src_w, int(right - 1e-9) + 1)):
-                    if not srow[sxi]:
-                        continue
-                    wx = min(sxi + 1.0, right) - max(float(sxi), left)
-                    if wx > 0:
-                        covered += wx * wy
-            row[x] = 1 if covered >= cell_area / 2.0 else 0
-        out.append(row)
+        a, b = edges[y], edges[y + 1]
+        out.append([1 if 2 * (b[x + 1] - b[x] - a[x + 1] + a[x]) >= full else 0
+                    for x in range(dst_w)])
     return out
 
 
@@ -103,79 +127,80 @@ def bbox(grid, width, height):
     return minx, miny, maxx, maxy
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--height", type=int, default=CELL_HEIGHT,
-                    help="cell height in pixels after the vertical squash")
-    args = ap.parse_args()
-
-    src_width, src_height, stride, glyphs = parse_source()
-    height = args.height
-    # Width follows height so the digits keep their proportions.
-    width = int(round(src_width * height / src_height))
-    print(f"cell: {src_width}x{src_height} source -> {width}x{height} "
-          f"({src_height - height} px shorter, scale {height / src_height:.3f})")
-
-    trimmed = []   # (w, h, minx, miny, [packed bytes], grid_region)
-    for data in glyphs:
-        grid = to_grid(data, src_width, src_height, stride)
-        grid = resize_grid(grid, src_width, src_height, width, height)
-        minx, miny, maxx, maxy = bbox(grid, width, height)
-        w = maxx - minx + 1
-        h = maxy - miny + 1
-        # bit-pack contiguously, MSB-first, row-major
-        bits = []
-        region = []
-        for y in range(miny, maxy + 1):
-            row = []
-            for x in range(minx, maxx + 1):
-                bits.append(grid[y][x])
-                row.append(grid[y][x])
-            region.append(row)
-        packed = bytearray()
-        acc = 0
-        n = 0
-        for bit in bits:
+def pack_rows(region):
+    """GFXfont bitmap: contiguous bits, MSB-first, row-major."""
+    packed = bytearray()
+    acc = n = 0
+    for row in region:
+        for bit in row:
             acc = (acc << 1) | bit
             n += 1
             if n == 8:
                 packed.append(acc); acc = 0; n = 0
-        if n:
-            packed.append(acc << (8 - n))
-        trimmed.append((w, h, minx, miny, bytes(packed), region))
+    if n:
+        packed.append(acc << (8 - n))
+    return bytes(packed)
+
+
+def pack_pages(region):
+    """SSD1306 layout: per 8-row page, one byte per column, bit 0 on top."""
+    h, w = len(region), len(region[0])
+    packed = bytearray()
+    for top in range(0, h, 8):
+        for x in range(w):
+            byte = 0
+            for bit, y in enumerate(range(top, min(top + 8, h))):
+                byte |= region[y][x] << bit
+            packed.append(byte)
+    return bytes(packed)
 
-    # --- round-trip verify: decode packed -> compare to region ---
-    for i, (w, h, minx, miny, packed, region) in enumerate(trimmed):
-        idx = 0
+
+def round_trip(trimmed):
+    """Decode both formats back to pixels; every glyph must match its grid."""
+    for i, (w, h, minx, miny, rows, pages, region) in enumerate(trimmed):
         for y in range(h):
             for x in range(w):
-                byte = packed[idx // 8]
-                bit = (byte >> (7 - (idx % 8))) & 1
-                assert bit == region[y][x], f"digit {i} mismatch at {x},{y}"
-                idx += 1
-    print("round-trip pixel check: OK (all 10 digits decode back exactly)")
+                idx = y * w + x
+                bit = (rows[idx // 8] >> (7 - (idx % 8))) & 1
+                assert bit == region[y][x], f"digit {i} GFXfont mismatch at {x},{y}"
+                bit = (pages[(y // 8) * w + x] >> (y % 8)) & 1
+                assert bit == region[y][x], f"digit {i} page-major mismatch at {x},{y}"
+        assert len(pages) == w * ((h + 7) // 8), f"digit {i} page-major size"
 
-    cell_w = max(t[0] for t in trimmed)
-    x_advance = cell_w + CELL_GAP
 
-    # build bitmap + glyph table
+def build(sats, src_width, src_height, height):
+    """Scale and trim every digit to one cell height; both packings."""
+    # Width follows height so the digits keep their proportions.
+    width = int(round(src_width * height / src_height))
+    trimmed = []   # (w, h, minx, miny, row bytes, page bytes, grid region)
+    for sat in sats:
+        grid = resize_grid(sat, src_width, src_height, width, height)
+        minx, miny, maxx, maxy = bbox(grid, width, height)
+        region = [row[minx:maxx + 1] for row in grid[miny:maxy + 1]]
+        trimmed.append((maxx - minx + 1, maxy - miny + 1, minx, miny,
+                        pack_rows(region), pack_pages(region), region))
+    round_trip(trimmed)
+    return width, trimmed
+
+
+def write_if_changed(path, text):
+    """Leave an identical header alone, so its mtime does not force a rebuild."""
+    if os.path.exists(path) and open(path, encoding="utf-8").read() == text:
+        print(f"unchanged {path}")
+        return
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    print(f"written {path}")
+
+
+def gfx_header(trimmed, width, height, src_width, src_height, cell_w, x_advance):
     bitmap = bytearray()
     glyph_rows = []
-    offsets = []
-    for (w, h, minx, miny, packed, region) in trimmed:
-        offsets.append(len(bitmap))
-        bitmap.extend(packed)
-    for i, (w, h, minx, miny, packed, region) in enumerate(trimmed):
+    for (w, h, minx, miny, rows, pages, region) in trimmed:
         x_offset = (cell_w - w) // 2          # centre the glyph in its tabular cell
         y_offset = miny - height              # reproduce original vertical position
-        glyph_rows.append((offsets[i], w, h, x_advance, x_offset, y_offset))
-
-    old_size = len(glyphs) * stride * src_height   # the fixed-cell source
-    new_size = len(bitmap) + len(trimmed) * 7 + 8  # bitmap + glyph table + GFXfont
-    print(f"digit widths: {[t[0] for t in trimmed]}  cell={cell_w} advance={x_advance}")
-    print(f"bitmap bytes: {len(bitmap)}  (glyph table {len(trimmed)*7} + struct ~8)")
-    print(f"flash: old kOledDigits {old_size} B -> GFXfont ~{new_size} B "
-          f"(save ~{old_size - new_size} B, {100*(old_size-new_size)/old_size:.0f}%)")
+        glyph_rows.append((len(bitmap), w, h, x_advance, x_offset, y_offset))
+        bitmap.extend(rows)
 
     lines = []
     lines.append("#ifndef DRIVERS_OLED_FONT_BIGNUM_H")
@@ -204,10 +229,94 @@ def main():
     lines.append("")
     lines.append("#endif // DRIVERS_OLED_FONT_BIGNUM_H")
     lines.append("")
+    return "\n".join(lines), len(bitmap)
+
+
+def pages_header(trimmed, width, height, cell_w, x_advance):
+    bitmap = bytearray()
+    glyph_rows = []
+    for (w, h, minx, miny, rows, pages, region) in trimmed:
+        glyph_rows.append((len(bitmap), w, h, (cell_w - w) // 2, miny))
+        bitmap.extend(pages)
+
+    lines = []
+    lines.append("#ifndef DRIVERS_OLED_FONT_BIGNUM_PAGES_H")
+    lines.append("#define DRIVERS_OLED_FONT_BIGNUM_PAGES_H")
+    lines.append("")
+    lines.append('#include "drivers/oled_blit.h"  // OledPageFont / OledPageGlyph')
+    lines.append("")
+    lines.append("// Auto-generated by tools/gen_oled_bignum.py from oled_font_digits.h.")
+    lines.append("// The same digits as OledBigNum (oled_font_bignum.h), pixel for pixel,")
+    lines.append("// stored the way the SSD1306 framebuffer is laid out: 8-row pages, one")
+    lines.append(f"// byte per column, bit 0 on top. {width}x{height} cell. Draw with oledBlitCentered().")
+    lines.append("")
+    lines.append("static const uint8_t OledBigNumPageBitmaps[] = {")
+    for d, (off, w, h, xo, yo) in zip(DIGITS, glyph_rows):
+        chunk = bitmap[off:off + w * ((h + 7) // 8)]
+        lines.append(f"    /* '{d}' */ " + ", ".join(f"0x{b:02X}" for b in chunk) + ",")
+    lines.append("};")
+    lines.append("")
+    lines.append("static const OledPageGlyph OledBigNumPageGlyphs[] = {")
+    for d, (off, w, h, xo, yo) in zip(DIGITS, glyph_rows):
+        lines.append(f"    {{ {off:4d}, {w:2d}, {h:2d}, {xo:2d}, {yo:2d} }}, // '{d}'")
+    lines.append("};")
+    lines.append("")
+    lines.append("static const OledPageFont OledBigNumPages = {")
+    lines.append("    OledBigNumPageBitmaps,")
+    lines.append("    OledBigNumPageGlyphs,")
+    lines.append(f"    0x30, 0x39, {x_advance}, {height}   // first '0', last '9', xAdvance, cell height")
+    lines.append("};")
+    lines.append("")
+    lines.append("#endif // DRIVERS_OLED_FONT_BIGNUM_PAGES_H")
+    lines.append("")
+    return "\n".join(lines), len(bitmap)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--height", type=int, default=CELL_HEIGHT,
+                    help="cell height in pixels after the vertical squash")
+    ap.add_argument("--compare", default="",
+                    help="also size up these heights, e.g. 40,48 (nothing written for them)")
+    args = ap.parse_args()
+
+    src_width, src_height, stride, glyphs = parse_source()
+    # One summed-area table per digit, shared by every height below.
+    sats = [summed_area(to_grid(data, src_width, src_height, stride), src_width, src_height)
+            for data in glyphs]
+
+    heights = [args.height] + [int(h) for h in args.compare.split(",") if h.strip()]
+    for height in heights[1:]:
+        width, trimmed = build(sats, src_width, src_height, height)
+        rows = sum(len(t[4]) for t in trimmed)
+        pages = sum(len(t[5]) for t in trimmed)
+        print(f"  {width}x{height}: GFXfont bitmap {rows} B, page-major {pages} B, "
+              f"widest digit {max(t[0] for t in trimmed)}")
+
+    height = heights[0]
+    width, trimmed = build(sats, src_width, src_height, height)
+    print(f"cell: {src_width}x{src_height} source -> {width}x{height} "
+          f"({src_height - height} px shorter, scale {height / src_height:.3f})")
+    print("round-trip pixel check: OK (all 10 digits decode back exactly, both formats)")
+
+    cell_w = max(t[0] for t in trimmed)
+    x_advance = cell_w + CELL_GAP
+
+    gfx_text, gfx_bytes = gfx_header(trimmed, width, height, src_width, src_height,
+                                     cell_w, x_advance)
+    page_text, page_bytes = pages_header(trimmed, width, height, cell_w, x_advance)
+
+    old_size = len(glyphs) * stride * src_height   # the fixed-cell source
+    new_size = gfx_bytes + len(trimmed) * 7 + 8    # bitmap + glyph table + GFXfont
+    print(f"digit widths: {[t[0] for t in trimmed]}  cell={cell_w} advance={x_advance}")
+    print(f"bitmap bytes: {gfx_bytes}  (glyph table {len(trimmed)*7} + struct ~8)")
+    print(f"flash: old kOledDigits {old_size} B -> GFXfont ~{new_size} B "
+          f"(save ~{old_size - new_size} B, {100*(old_size-new_size)/old_size:.0f}%)")
+    print(f"page-major: {page_bytes} B + glyph table {len(trimmed)*6} B "
+          f"({page_bytes - gfx_bytes:+d} B against the GFXfont bitmap)")
 
-    with open(OUT, "w", encoding="utf-8") as fh:
-        fh.write("\n".join(lines))
-    print(f"written {OUT}")
+    write_if_changed(OUT, gfx_text)
+    write_if_changed(OUT_PAGES, page_text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,487 @@
+#include "host.h"
+
+#include <time.h>
+
+#include <iostream>
+#include <sstream>
+#include <string>
+
+#include "app.h"
+#include "app/diag_control.h"
+#include "app/latch_control.h"
+#include "app/led_control.h"
+#include "app/ota_control.h"
+#include "svc/modbus_server.h"
+
+// The benchmark driver: boots the real appInit(), then runs appRun() under a
+// script read from stdin (tools/host_bench.py writes it) and reports, per
+// script section, what every tick-pipeline stage cost.
+//
+// Per-stage timing needs no change to app.cpp: host_bench.py compiles it
+// with -DmodbusServerTick=benchModbusServerTick (and so on for each stage),
+// so appRun() calls the wrappers below, which time the real functions
+// compiled from the other translation units. Whatever appRun() spends
+// outside those calls — the watchdog reload and the mode handler — is the
+// "mode" stage.
+//
+// Two costs per stage:
+//   cpu   host nanoseconds. Relative only: the same code on a desktop core,
+//         not cycles on the M0+.
+//   wait  virtual microseconds the stage spent blocked on modelled hardware
+//         (I2C transfers, AT24 write cycles, flash erase/program, UART
+//         flushes, the OLED). This part IS the board's figure, to the
+//         accuracy of the device models, and it dominates every worst case.
+
+void benchModbusServerTick();
+void benchLatchControlTick(uint32_t now);
+void benchLedControlTick(uint32_t now);
+void benchOtaControlTick(uint32_t now);
+void benchDiagControlTick(uint32_t now);
+
+namespace {
+
+enum Stage : uint8_t
+{
+    STAGE_MODBUS,
+    STAGE_LATCH,
+    STAGE_LED,
+    STAGE_OTA,
+    STAGE_DIAG,
+    STAGE_MODE,
+    STAGE_LOOP,
+    STAGE_COUNT,
+};
+
+const char *const kStageNames[STAGE_COUNT] =
+{
+    "modbus", "latch", "led", "ota", "diag", "mode", "loop",
+};
+
+struct StageStats
+{
+    uint64_t count;
+    uint64_t ns;
+    uint64_t nsMax;
+    uint64_t waitUs;
+    uint64_t waitMaxUs;
+};
+
+std::string sectionName = "idle";
+StageStats stats[STAGE_COUNT];
+HostCounters sectionStart;
+uint64_t sectionStartUs = 0;
+
+uint64_t loopStagedNs = 0;
+uint64_t loopStagedWaitUs = 0;
+uint32_t quantumUs = 50;
+bool rebooted = false;
+
+uint64_t hostNs()
+{
+    timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ULL + (uint64_t)ts.tv_nsec;
+}
+
+void record(Stage s, uint64_t ns, uint64_t waitUs)
+{
+    StageStats &st = stats[s];
+    st.count++;
+    st.ns += ns;
+    st.waitUs += waitUs;
+    if (ns > st.nsMax)
+    {
+        st.nsMax = ns;
+    }
+    if (waitUs > st.waitMaxUs)
+    {
+        st.waitMaxUs = waitUs;
+    }
+}
+
+template <typename Fn>
+void timed(Stage s, Fn fn)
+{
+    const uint64_t t0 = hostNs();
+    const uint64_t v0 = hostNowUs();
+    fn();
+    const uint64_t ns = hostNs() - t0;
+    const uint64_t waitUs = hostNowUs() - v0;
+    loopStagedNs += ns;
+    loopStagedWaitUs += waitUs;
+    record(s, ns, waitUs);
+}
+
+void openSection(const std::string &name)
+{
+    sectionName = name;
+    memset(stats, 0, sizeof(stats));
+    hostCounters.watchdogMaxGapUs = 0;
+    sectionStart = hostCounters;
+    sectionStartUs = hostNowUs();
+}
+
+void closeSection()
+{
+    for (uint8_t s = 0; s < STAGE_COUNT; s++)
+    {
+        const StageStats &st = stats[s];
+        printf("stats %s %s %llu %llu %llu %llu %llu\n", sectionName.c_str(), kStageNames[s],
+               (unsigned long long)st.count,
+               (unsigned long long)(st.count ? st.ns / st.count : 0),
+               (unsigned long long)st.nsMax,
+               (unsigned long long)st.waitUs,
+               (unsigned long long)st.waitMaxUs);
+    }
+    const HostCounters &c = hostCounters;
+    const HostCounters &b = sectionStart;
+    printf("counters %s virtual_us=%llu at24_cycles=%u at24_bytes=%u i2c_us=%llu "
+           "rx_overflow=%u tx_bytes=%u tx_us=%llu erases=%u doublewords=%u stale_writes=%u "
+           "oled=%u guard_trips=%u wdg_resets=%u wdg_max_gap_us=%llu\n",
+           sectionName.c_str(),
+           (unsigned long long)(hostNowUs() - sectionStartUs),
+           c.at24WriteCycles - b.at24WriteCycles, c.at24BytesWritten - b.at24BytesWritten,
+           (unsigned long long)(c.i2cBusUs - b.i2cBusUs),
+           c.uartRxOverflows - b.uartRxOverflows, c.uartTxBytes - b.uartTxBytes,
+           (unsigned long long)(c.uartTxUs - b.uartTxUs),
+           c.flashPageErases - b.flashPageErases, c.flashDoublewords - b.flashDoublewords,
+           c.flashStaleWrites - b.flashStaleWrites,
+           c.oledDraws - b.oledDraws, c.latchGuardTrips - b.latchGuardTrips,
+           c.watchdogResets - b.watchdogResets, (unsigned long long)c.watchdogMaxGapUs);
+}
+
+// One pass of the Arduino loop(), then the CPU time the board would have
+// spent on it (the quantum) passes on the virtual clock.
+void loopOnce()
+{
+    loopStagedNs = 0;
+    loopStagedWaitUs = 0;
+    const uint64_t t0 = hostNs();
+    const uint64_t v0 = hostNowUs();
+    try
+    {
+        appRun();
+    }
+    catch (const HostReset &)
+    {
+        rebooted = true;
+        printf("reset %llu\n", (unsigned long long)hostNowUs());
+        return;
+    }
+    const uint64_t ns = hostNs() - t0;
+    const uint64_t waitUs = hostNowUs() - v0;
+    record(STAGE_MODE, ns - loopStagedNs, waitUs - loopStagedWaitUs);
+    record(STAGE_LOOP, ns, waitUs);
+    hostAdvanceUs(quantumUs);
+}
+
+std::vector<uint8_t> fromHex(const std::string &hex)
+{
+    std::vector<uint8_t> out;
+    for (size_t i = 0; i + 1 < hex.size(); i += 2)
+    {
+        out.push_back((uint8_t)strtoul(hex.substr(i, 2).c_str(), nullptr, 16));
+    }
+    return out;
+}
+
+void printHex(const char *tag, const uint8_t *p, size_t len)
+{
+    printf("%s ", tag);
+    for (size_t i = 0; i < len; i++)
+    {
+        printf("%02x", p[i]);
+    }
+    printf(len ? "\n" : "-\n");
+}
+
+// Script commands, one per line:
+//   section NAME          report the previous section, start a new one
+//   quantum US            loop CPU time charged to the virtual clock
+//   run MS                loop for MS of virtual time
+//   send GAP_US HEX       put a frame on the line GAP_US after it went quiet
+//   recv TIMEOUT_MS       loop until a reply is complete -> "reply HEX|-"
+//   line START_US HEX     bytes on the line back to back from START_US
+//                         (absolute virtual time): a capture being replayed
+//   until US              loop until the virtual clock reaches US
+//   replies               -> "tx DONE_US HEX" per reply not yet taken, then
+//                         "replies N"
+//   button 0|1, sense 0|1, i2c ADDR 0|1
+//   at24 ADDR LEN, stage LEN, header, pulses, ring   -> state dumps
+//   baud                  -> "baud RATE" (the rate the UART was opened at)
+//   clock                 -> "clock US" (virtual time now)
+//   settle TIMEOUT_MS     loop until the LED ring is redrawn -> "settle US|-"
+void execute(const std::string &line)
+{
+    std::istringstream in(line);
+    std::string cmd;
+    in >> cmd;
+    const bool dump = (cmd == "at24" || cmd == "stage" || cmd == "header" ||
+                       cmd == "pulses" || cmd == "ring" || cmd == "clock" ||
+                       cmd == "replies" || cmd == "baud");
+    if (cmd.empty() || cmd[0] == '#' || (rebooted && !dump && cmd != "section"))
+    {
+        return;                         // after a reset only the dumps mean anything
+    }
+
+    if (cmd == "section")
+    {
+        std::string name;
+        in >> name;
+        closeSection();
+        openSection(name);
+    }
+    else if (cmd == "quantum")
+    {
+        in >> quantumUs;
+    }
+    else if (cmd == "run")
+    {
+        uint64_t ms = 0;
+        in >> ms;
+        const uint64_t until = hostNowUs() + ms * 1000;
+        while (!rebooted && hostNowUs() < until)
+        {
+            loopOnce();
+        }
+    }
+    else if (cmd == "send")
+    {
+        uint32_t gapUs = 0;
+        std::string hex;
+        in >> gapUs >> hex;
+        const std::vector<uint8_t> frame = fromHex(hex);
+        hostUartSend(frame.data(), frame.size(), gapUs);
+    }
+    else if (cmd == "line")
+    {
+        uint64_t startUs = 0;
+        std::string hex;
+        in >> startUs >> hex;
+        const std::vector<uint8_t> bytes = fromHex(hex);
+        hostUartSendAt(bytes.data(), bytes.size(), startUs);
+    }
+    else if (cmd == "until")
+    {
+        uint64_t us = 0;
+        in >> us;
+        while (!rebooted && hostNowUs() < us)
+        {
+            loopOnce();
+        }
+    }
+    else if (cmd == "replies")
+    {
+        std::vector<uint8_t> frame;
+        uint64_t doneUs = 0;
+        unsigned n = 0;
+        while (hostUartTakeReply(frame, doneUs))
+        {
+            printf("tx %llu", (unsigned long long)doneUs);
+            printHex("", frame.data(), frame.size());
+            n++;
+        }
+        printf("replies %u\n", n);
+    }
+    else if (cmd == "recv")
+    {
+        uint64_t ms = 0;
+        in >> ms;
+        const uint64_t until = hostNowUs() + ms * 1000;
+        std::vector<uint8_t> frame;
+        uint64_t doneUs = 0;
+        bool got = false;
+        while (!rebooted && !(got = hostUartTakeReply(frame, doneUs)) && hostNowUs() < until)
+        {
+            loopOnce();
+        }
+        if (got)
+        {
+            // The master sees the reply once its last byte is in.
+            if (doneUs > hostNowUs())
+            {
+                hostAdvanceUs(doneUs - hostNowUs());
+            }
+            printHex("reply", frame.data(), frame.size());
+        }
+        else
+        {
+            printf("reply -\n");
+        }
+    }
+    else if (cmd == "settle")
+    {
+        uint64_t ms = 0;
+        in >> ms;
+        const uint64_t until = hostNowUs() + ms * 1000;
+        const uint32_t frames = hostRingFrames;
+        while (!rebooted && hostRingFrames == frames && hostNowUs() < until)
+        {
+            loopOnce();
+        }
+        if (hostRingFrames != frames)
+        {
+            printf("settle %llu\n", (unsigned long long)hostNowUs());
+        }
+        else
+        {
+            printf("settle -\n");
+        }
+    }
+    else if (cmd == "clock")
+    {
+        printf("clock %llu\n", (unsigned long long)hostNowUs());
+    }
+    else if (cmd == "button" || cmd == "sense")
+    {
+        int v = 0;
+        in >> v;
+        (cmd == "button" ? hostButtonPressed : hostLatchSenseLow) = (v != 0);
+    }
+    else if (cmd == "i2c")
+    {
+        unsigned addr = 0;
+        int v = 0;
+        in >> std::hex >> addr >> std::dec >> v;
+        hostI2cSetPresent((uint8_t)addr, v != 0);
+    }
+    else if (cmd == "at24")
+    {
+        unsigned addr = 0, len = 0;
+        in >> addr >> len;
+        printHex("at24", hostAt24Bytes() + addr, len);
+    }
+    else if (cmd == "stage")
+    {
+        unsigned len = 0;
+        in >> len;
+        printHex("stage", hostStageImage(), len);
+    }
+    else if (cmd == "header")
+    {
+        uint32_t size = 0, crc = 0;
+        if (hostStageHeaderCommitted(size, crc))
+        {
+            printf("header %u %08x\n", size, crc);
+        }
+        else
+        {
+            printf("header -\n");
+        }
+    }
+    else if (cmd == "pulses")
+    {
+        printf("pulses");
+        for (const auto &p : hostLatchPulses)
+        {
+            printf(" %llu:%llu", (unsigned long long)p.first, (unsigned long long)p.second);
+        }
+        printf("\n");
+    }
+    else if (cmd == "baud")
+    {
+        printf("baud %lu\n", (unsigned long)hostUartBaud());
+    }
+    else if (cmd == "ring")
+    {
+        printf("ring %06x %u %u\n", hostRingColor, hostRingFrames, hostMaskIndex);
+    }
+    else
+    {
+        fprintf(stderr, "unknown script command: %s\n", line.c_str());
+        exit(2);
+    }
+}
+
+} // namespace
+
+// ---------------------------------------------------------------------------
+// Stage wrappers (app.cpp calls these; see the top of this file)
+// ---------------------------------------------------------------------------
+
+void benchModbusServerTick()          { timed(STAGE_MODBUS, [] { modbusServerTick(); }); }
+void benchLatchControlTick(uint32_t n) { timed(STAGE_LATCH, [n] { latchControlTick(n); }); }
+void benchLedControlTick(uint32_t n)   { timed(STAGE_LED, [n] { ledControlTick(n); }); }
+void benchOtaControlTick(uint32_t n)   { timed(STAGE_OTA, [n] { otaControlTick(n); }); }
+void benchDiagControlTick(uint32_t n)  { timed(STAGE_DIAG, [n] { diagControlTick(n); }); }
+
+// ---------------------------------------------------------------------------
+// Entry point
+// ---------------------------------------------------------------------------
+
+int main(int argc, char **argv)
+{
+    std::string at24Path;
+    std::string appPath;
+    std::string capturePath;
+    for (int i = 1; i < argc; i++)
+    {
+        const std::string arg = argv[i];
+        if (arg == "--at24" && i + 1 < argc)
+        {
+            at24Path = argv[++i];
+        }
+        else if (arg == "--app" && i + 1 < argc)
+        {
+            appPath = argv[++i];
+        }
+        else if (arg == "--capture" && i + 1 < argc)
+        {
+            capturePath = argv[++i];
+        }
+        else if (arg == "--no-oled")
+        {
+            hostOledPresent = false;
+        }
+        else
+        {
+            fprintf(stderr, "usage: %s [--at24 FILE] [--app FILE] [--capture FILE] [--no-oled] < script\n", argv[0]);
+            return 2;
+        }
+    }
+    if (!at24Path.empty())
+    {
+        hostAt24Load(at24Path);         // a missing file is a blank chip
+    }
+    if (!appPath.empty() && !hostAppLoad(appPath))
+    {
+        fprintf(stderr, "cannot load %s into the app slot\n", appPath.c_str());
+        return 2;
+    }
+    if (!capturePath.empty() && !hostCaptureOpen(capturePath))
+    {
+        fprintf(stderr, "cannot create %s\n", capturePath.c_str());
+        return 2;
+    }
+
+    const uint64_t t0 = hostNs();
+    try
+    {
+        appInit();
+    }
+    catch (const HostReset &)
+    {
+        rebooted = true;
+        printf("reset %llu\n", (unsigned long long)hostNowUs());
+    }
+    printf("boot %llu %llu\n", (unsigned long long)(hostNs() - t0),
+           (unsigned long long)hostNowUs());
+    openSection(sectionName);
+
+    std::string line;
+    while (std::getline(std::cin, line))
+    {
+        execute(line);
+        fflush(stdout);
+    }
+    closeSection();
+    hostCaptureClose();
+
+    if (!at24Path.empty() && !hostAt24Save(at24Path))
+    {
+        fprintf(stderr, "cannot write %s\n", at24Path.c_str());
+        return 1;
+    }
+    printf("end %llu\n", (unsigned long long)hostNowUs());
+    return 0;
+}
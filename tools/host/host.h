@@ -0,0 +1,123 @@
+#ifndef HOST_HOST_H
+#define HOST_HOST_H
+
+#include <Arduino.h>
+
+#include <string>
+#include <utility>
+#include <vector>
+
+/*  @file tools/host/host.h
+ *  @brief The host harness's side of the fakes: virtual clock, UART line,
+ *         I2C devices, staging flash and board pins, as the benchmark driver
+ *         (bench.cpp) sees them.
+ *
+ *  The firmware modules never include this — they see only the shim headers
+ *  in tools/host/shim and the unchanged driver headers in src/drivers.
+ */
+
+// Thrown by NVIC_SystemReset(): the run ends where the board would reboot.
+struct HostReset
+{
+};
+
+// --- Virtual clock ---------------------------------------------------------
+
+uint64_t hostNowUs();
+
+/*  @brief Let @p us of virtual time pass: UART bytes due in that window land
+ *         in the RX ring, the latch guard fires if its deadline passes. */
+void hostAdvanceUs(uint64_t us);
+
+// --- UART line (the scripted master) ---------------------------------------
+
+uint32_t hostUartBaud();
+
+/*  @brief Put a frame on the line, byte by byte at the line rate, starting
+ *         @p gapUs after the line last went quiet (or now, if later). */
+void hostUartSend(const uint8_t *frame, size_t len, uint32_t gapUs);
+
+/*  @brief Put bytes on the line back to back, the first start bit at
+ *         @p startUs (virtual, absolute; no earlier than the bytes already
+ *         queued): a replayed capture keeps every gap it recorded, the
+ *         ones inside a frame included. */
+void hostUartSendAt(const uint8_t *bytes, size_t len, uint64_t startUs);
+
+/*  @brief Pop the oldest complete reply the device has finished sending.
+ *  @return false when none is waiting */
+bool hostUartTakeReply(std::vector<uint8_t> &frame, uint64_t &doneUs);
+
+/*  @brief Device-side TX hook for RS485Class::flush(): the pending bytes go
+ *         out as one frame, holding the caller for their time on the wire. */
+void hostUartFlushTx(const std::vector<uint8_t> &bytes);
+
+/*  @brief Record the line to @p path from here on, in the capture format of
+ *         tools/lgs_client/capture.py: master bytes as the RX ring takes
+ *         them, device frames as they are flushed, baud changes.
+ *  @return false if the file cannot be created */
+bool hostCaptureOpen(const std::string &path);
+
+/*  @brief Write out what is still held back and close the capture. */
+void hostCaptureClose();
+
+// --- I2C1 devices -----------------------------------------------------------
+
+void hostI2cSetPresent(uint8_t address, bool present);
+bool hostAt24Load(const std::string &path);
+bool hostAt24Save(const std::string &path);
+const uint8_t *hostAt24Bytes();
+
+// --- Flash -------------------------------------------------------------------
+
+/*  @brief Put a firmware.bin in the app slot: what flashHalAppSize() and the
+ *         fingerprint regs report. @return false if unreadable or too big */
+bool hostAppLoad(const std::string &path);
+
+const uint8_t *hostStageImage();
+bool hostStageHeaderCommitted(uint32_t &size, uint32_t &crc32);
+
+// --- Board pins -------------------------------------------------------------
+
+extern bool hostButtonPressed;
+extern bool hostLatchSenseLow;
+
+// MOSFET on/off edges in virtual microseconds, one pair per pulse.
+extern std::vector<std::pair<uint64_t, uint64_t>> hostLatchPulses;
+
+/*  @brief Drive the latch MOSFET model; edges are logged in hostLatchPulses. */
+void hostLatchMosfetDrive(bool on);
+
+/*  @brief Arm (deadline in virtual us) or disarm (0) the pulse guard: like
+ *         the board's one-shot timer it forces the MOSFET off at the
+ *         deadline, whatever the loop is doing. */
+void hostLatchGuard(uint64_t deadlineUs);
+
+// --- LEDs / OLED ---------------------------------------------------------------
+
+extern uint32_t hostRingColor;      // 0x00RRGGBB of the ring's first pixel
+extern uint32_t hostRingFrames;     // frames handed to the ring
+extern uint8_t hostMaskIndex;       // 1-8 lit on the mask, 0 = dark or other
+extern bool hostOledPresent;        // answer oledInit() gives (set before boot)
+
+// --- Counters the benchmark reports per section -------------------------------
+
+struct HostCounters
+{
+    uint32_t at24WriteCycles;
+    uint32_t at24BytesWritten;
+    uint64_t i2cBusUs;          // time I2C1 transactions held the CPU
+    uint32_t uartRxOverflows;   // bytes lost to a full RX ring
+    uint32_t uartTxBytes;
+    uint64_t uartTxUs;          // time TX flushes held the CPU
+    uint32_t flashPageErases;
+    uint32_t flashDoublewords;
+    uint32_t flashStaleWrites;  // image programs into a page not erased this session
+    uint32_t oledDraws;
+    uint32_t latchGuardTrips;
+    uint32_t watchdogResets;    // reload gaps past the timeout
+    uint64_t watchdogMaxGapUs;
+};
+
+extern HostCounters hostCounters;
+
+#endif // HOST_HOST_H
@@ -0,0 +1,382 @@
+#include "host.h"
+#include <ArduinoRS485.h>
+#include <IWatchdog.h>
+
+#include <cstdio>
+#include <deque>
+
+// Virtual clock, UART line, watchdog and the latch MOSFET model — the parts
+// of the board every fake shares.
+
+HostCounters hostCounters = {};
+RCC_TypeDef hostRcc = { RCC_CSR_PINRSTF | RCC_CSR_PWRRSTF };    // a power-on boot
+IWatchdogClass IWatchdog;
+
+bool hostButtonPressed = false;
+bool hostLatchSenseLow = true;                  // latch fitted and locked
+std::vector<std::pair<uint64_t, uint64_t>> hostLatchPulses;
+
+namespace {
+
+uint64_t clockUs = 0;
+
+// --- UART ---
+// stm32duino's RX ring keeps one slot empty: SERIAL_RX_BUFFER_SIZE - 1 bytes.
+constexpr size_t RX_RING_BYTES = SERIAL_RX_BUFFER_SIZE - 1;
+
+uint32_t baud = 9600;
+std::deque<std::pair<uint64_t, uint8_t>> onTheLine;     // (arrival us, byte)
+std::deque<uint8_t> rxRing;
+uint64_t lineQuietUs = 0;                               // master's last byte ends
+std::deque<std::pair<std::vector<uint8_t>, uint64_t>> replies;
+std::vector<uint8_t> txPending;
+
+double byteUs()
+{
+    return 10.0e6 / baud;                               // 8N1: 10 bits per byte
+}
+
+// --- Capture (the format is in tools/lgs_client/capture.py) ---
+constexpr uint8_t CAPTURE_MASTER = 0;
+constexpr uint8_t CAPTURE_DEVICE = 1;
+constexpr uint8_t CAPTURE_BAUD = 2;
+
+FILE *captureFile = nullptr;
+uint64_t captureLastUs = 0;
+std::vector<uint8_t> captureRun;                        // master bytes held back
+uint64_t captureRunStartUs = 0;
+uint64_t captureRunEndUs = 0;
+
+void captureVarint(uint64_t v)
+{
+    while (v >= 0x80)
+    {
+        fputc((int)(v & 0x7F) | 0x80, captureFile);
+        v >>= 7;
+    }
+    fputc((int)v, captureFile);
+}
+
+// One record; for CAPTURE_BAUD, n is the new rate and p is null.
+void captureRecord(uint8_t kind, uint64_t atUs, const uint8_t *p, size_t n)
+{
+    if (atUs < captureLastUs)
+    {
+        atUs = captureLastUs;                           // records only go forward
+    }
+    captureVarint(((atUs - captureLastUs) << 2) | kind);
+    captureVarint(n);
+    if (p)
+    {
+        fwrite(p, 1, n, captureFile);
+    }
+    captureLastUs = atUs;
+}
+
+void captureFlushMaster()
+{
+    if (!captureRun.empty())
+    {
+        captureRecord(CAPTURE_MASTER, captureRunStartUs, captureRun.data(), captureRun.size());
+        captureRun.clear();
+    }
+}
+
+// Master bytes are recorded as they arrive, so a run ends wherever the line
+// went quiet — mid-frame included — not where a script line ended.
+void captureMasterByte(uint64_t arrivalUs, uint8_t b)
+{
+    const uint64_t startUs = arrivalUs - (uint64_t)byteUs();
+    if (captureRun.empty() || startUs > captureRunEndUs + 1)    // +1: byteUs() rounding
+    {
+        captureFlushMaster();
+        captureRunStartUs = startUs;
+    }
+    captureRun.push_back(b);
+    captureRunEndUs = arrivalUs;
+}
+
+// --- Watchdog ---
+uint64_t watchdogTimeoutUs = 0;
+uint64_t lastReloadUs = 0;
+
+// --- Latch ---
+bool mosfetOn = false;
+uint64_t guardDeadlineUs = 0;
+
+} // namespace
+
+// ---------------------------------------------------------------------------
+// Virtual clock
+// ---------------------------------------------------------------------------
+
+uint64_t hostNowUs()
+{
+    return clockUs;
+}
+
+void hostAdvanceUs(uint64_t us)
+{
+    const uint64_t until = clockUs + us;
+
+    if (guardDeadlineUs != 0 && guardDeadlineUs <= until)
+    {
+        if (mosfetOn)
+        {
+            hostLatchPulses.back().second = guardDeadlineUs;
+            mosfetOn = false;
+            hostCounters.latchGuardTrips++;
+        }
+        guardDeadlineUs = 0;
+    }
+
+    while (!onTheLine.empty() && onTheLine.front().first <= until)
+    {
+        if (captureFile)
+        {
+            captureMasterByte(onTheLine.front().first, onTheLine.front().second);
+        }
+        if (rxRing.size() < RX_RING_BYTES)
+        {
+            rxRing.push_back(onTheLine.front().second);
+        }
+        else
+        {
+            hostCounters.uartRxOverflows++;
+        }
+        onTheLine.pop_front();
+    }
+    clockUs = until;
+}
+
+uint32_t millis()
+{
+    return (uint32_t)(clockUs / 1000);
+}
+
+uint32_t micros()
+{
+    return (uint32_t)clockUs;
+}
+
+void delay(uint32_t ms)
+{
+    hostAdvanceUs((uint64_t)ms * 1000);
+}
+
+void delayMicroseconds(uint32_t us)
+{
+    hostAdvanceUs(us);
+}
+
+// ---------------------------------------------------------------------------
+// HAL / CMSIS
+// ---------------------------------------------------------------------------
+
+uint32_t HAL_GetUIDw0() { return 0x00470036; }
+uint32_t HAL_GetUIDw1() { return 0x4B4B5009; }
+uint32_t HAL_GetUIDw2() { return 0x20383653; }
+
+void NVIC_SystemReset()
+{
+    throw HostReset();
+}
+
+void IWatchdogClass::begin(uint32_t timeoutUs, uint32_t windowUs)
+{
+    (void)windowUs;
+    _enabled = true;
+    watchdogTimeoutUs = timeoutUs;
+    lastReloadUs = clockUs;
+}
+
+void IWatchdogClass::reload()
+{
+    if (!_enabled)
+    {
+        return;
+    }
+    const uint64_t gap = clockUs - lastReloadUs;
+    if (gap > hostCounters.watchdogMaxGapUs)
+    {
+        hostCounters.watchdogMaxGapUs = gap;
+    }
+    if (gap > watchdogTimeoutUs)
+    {
+        hostCounters.watchdogResets++;
+    }
+    lastReloadUs = clockUs;
+}
+
+// ---------------------------------------------------------------------------
+// UART line
+// ---------------------------------------------------------------------------
+
+uint32_t hostUartBaud()
+{
+    return baud;
+}
+
+void hostUartSend(const uint8_t *frame, size_t len, uint32_t gapUs)
+{
+    uint64_t start = lineQuietUs + gapUs;
+    if (start < clockUs)
+    {
+        start = clockUs;
+    }
+    for (size_t i = 0; i < len; i++)
+    {
+        onTheLine.emplace_back(start + (uint64_t)((i + 1) * byteUs()), frame[i]);
+    }
+    lineQuietUs = onTheLine.back().first;
+}
+
+void hostUartSendAt(const uint8_t *bytes, size_t len, uint64_t startUs)
+{
+    if (len == 0)
+    {
+        return;
+    }
+    if (startUs < clockUs)
+    {
+        startUs = clockUs;
+    }
+    if (!onTheLine.empty() && startUs < onTheLine.back().first)
+    {
+        startUs = onTheLine.back().first;
+    }
+    for (size_t i = 0; i < len; i++)
+    {
+        onTheLine.emplace_back(startUs + (uint64_t)((i + 1) * byteUs()), bytes[i]);
+    }
+    if (lineQuietUs < onTheLine.back().first)
+    {
+        lineQuietUs = onTheLine.back().first;
+    }
+}
+
+bool hostUartTakeReply(std::vector<uint8_t> &frame, uint64_t &doneUs)
+{
+    if (replies.empty())
+    {
+        return false;
+    }
+    frame = replies.front().first;
+    doneUs = replies.front().second;
+    replies.pop_front();
+    return true;
+}
+
+void hostUartFlushTx(const std::vector<uint8_t> &bytes)
+{
+    const uint64_t txUs = (uint64_t)(bytes.size() * byteUs());
+    hostCounters.uartTxBytes += bytes.size();
+    hostCounters.uartTxUs += txUs;
+    if (captureFile)
+    {
+        captureFlushMaster();
+        captureRecord(CAPTURE_DEVICE, clockUs, bytes.data(), bytes.size());
+    }
+    replies.emplace_back(bytes, clockUs + txUs);
+    // The master answers a reply, never talks over it.
+    if (lineQuietUs < clockUs + txUs)
+    {
+        lineQuietUs = clockUs + txUs;
+    }
+    hostAdvanceUs(txUs);
+}
+
+bool hostCaptureOpen(const std::string &path)
+{
+    captureFile = fopen(path.c_str(), "wb");
+    if (!captureFile)
+    {
+        return false;
+    }
+    const uint8_t header[12] = { 'L', 'G', 'S', 'C', 'A', 'P', 1, 0, (uint8_t)baud,
+                                 (uint8_t)(baud >> 8), (uint8_t)(baud >> 16), (uint8_t)(baud >> 24) };
+    fwrite(header, 1, sizeof(header), captureFile);
+    captureLastUs = clockUs;
+    return true;
+}
+
+void hostCaptureClose()
+{
+    if (captureFile)
+    {
+        captureFlushMaster();
+        fclose(captureFile);
+        captureFile = nullptr;
+    }
+}
+
+void RS485Class::begin(unsigned long rate)
+{
+    if (captureFile && rate != baud)
+    {
+        captureFlushMaster();
+        captureRecord(CAPTURE_BAUD, clockUs, nullptr, rate);
+    }
+    baud = (uint32_t)rate;
+    rxRing.clear();
+    txPending.clear();
+}
+
+int RS485Class::available()
+{
+    return (int)rxRing.size();
+}
+
+int RS485Class::read()
+{
+    if (rxRing.empty())
+    {
+        return -1;
+    }
+    const uint8_t b = rxRing.front();
+    rxRing.pop_front();
+    return b;
+}
+
+int RS485Class::peek()
+{
+    return rxRing.empty() ? -1 : rxRing.front();
+}
+
+size_t RS485Class::write(uint8_t b)
+{
+    txPending.push_back(b);
+    return 1;
+}
+
+void RS485Class::flush()
+{
+    if (!txPending.empty())
+    {
+        std::vector<uint8_t> frame;
+        frame.swap(txPending);
+        hostUartFlushTx(frame);
+    }
+}
+
+// ---------------------------------------------------------------------------
+// Latch MOSFET
+// ---------------------------------------------------------------------------
+
+void hostLatchMosfetDrive(bool on)
+{
+    if (on && !mosfetOn)
+    {
+        hostLatchPulses.emplace_back(clockUs, 0);
+    }
+    else if (!on && mosfetOn)
+    {
+        hostLatchPulses.back().second = clockUs;
+    }
+    mosfetOn = on;
+}
+
+void hostLatchGuard(uint64_t deadlineUs)
+{
+    guardDeadlineUs = deadlineUs;
+}
@@ -0,0 +1,330 @@
+#include "host.h"
+#include <IWatchdog.h>
+#include "flash_layout.h"
+
+#include "drivers/board_io.h"
+#include "drivers/flash_stage_hal.h"
+#include "drivers/led_mask.h"
+#include "drivers/led_ring.h"
+#include "drivers/oled.h"
+#include "drivers/rs485_port.h"
+
+#include <cstdio>
+
+// Stand-ins for the drivers that are registers and DMA all the way down.
+// Each implements its real header, so app/ and svc/ link against them
+// unchanged. Where the real driver blocks, the fake charges the virtual
+// clock the figure from the datasheet (flash) or the bench (OLED); where it
+// runs in the background (pixel DMA), it charges nothing.
+
+uint32_t hostRingColor = 0;
+uint32_t hostRingFrames = 0;
+uint8_t hostMaskIndex = 0;
+bool hostOledPresent = true;
+
+namespace {
+
+// G0 datasheet typicals: page erase 22 ms, doubleword program 85 us.
+constexpr uint32_t FLASH_PAGE_ERASE_US   = 22000;
+constexpr uint32_t FLASH_DOUBLEWORD_US   = 85;
+
+// One OLED draw call with the dirty-span flush: a changed two-digit number
+// is a few hundred bytes at 400 kHz plus the GFX rendering.
+constexpr uint32_t OLED_DRAW_US = 4000;
+
+// The staging pages start out holding "something" (zeros), never blank. An
+// image page goes stale when the header page is erased (a session starts)
+// and fresh when it is erased itself: programming a stale page is the bug
+// erase-ahead must not have, even where its old bytes happen to be blank.
+uint8_t stageHeader[FLASH_LAYOUT_PAGE_SIZE];
+uint8_t stageImage[FLASH_OTA_MAX_IMAGE_SIZE];
+bool stagePageFresh[FLASH_STAGING_IMAGE_PAGES];
+
+// The app slot the bench "runs": empty unless --app loads a firmware.bin,
+// so the fingerprint reads 0 (unknown) like a board on older firmware.
+uint8_t appSlot[FLASH_APP_PAGES * FLASH_LAYOUT_PAGE_SIZE];
+uint32_t appBytes = 0;
+
+uint16_t oledLastUs = 0;
+uint16_t oledPeakUs = 0;
+
+void oledDraw()
+{
+    hostCounters.oledDraws++;
+    hostAdvanceUs(OLED_DRAW_US);
+    oledLastUs = OLED_DRAW_US;
+    if (oledLastUs > oledPeakUs)
+    {
+        oledPeakUs = oledLastUs;
+    }
+}
+
+bool programDoublewords(uint8_t *dst, const uint8_t *src, uint32_t bytes)
+{
+    for (uint32_t i = 0; i < bytes; i += 8)
+    {
+        for (uint32_t k = 0; k < 8; k++)
+        {
+            if (dst[i + k] != 0xFF)
+            {
+                return false;           // PROGERR: not an erased doubleword
+            }
+        }
+        memcpy(dst + i, src + i, 8);
+        hostCounters.flashDoublewords++;
+        hostAdvanceUs(FLASH_DOUBLEWORD_US);
+    }
+    return true;
+}
+
+} // namespace
+
+// ---------------------------------------------------------------------------
+// drivers/board_io.h
+// ---------------------------------------------------------------------------
+
+void boardIoInit()
+{
+    hostLatchMosfetDrive(false);
+}
+
+void boardI2C1Init()
+{
+    Wire.begin();
+}
+
+void boardSetRunLed(bool on)
+{
+    (void)on;
+}
+
+bool boardFunctionSwitchPressed()
+{
+    return hostButtonPressed;
+}
+
+uint16_t boardInputCurrentMa()
+{
+    return 180;
+}
+
+void boardLatchMosfetSet(bool on)
+{
+    hostLatchMosfetDrive(on);
+}
+
+void boardLatchGuardArm(uint32_t timeoutMs)
+{
+    hostLatchGuard(hostNowUs() + (uint64_t)timeoutMs * 1000);
+}
+
+void boardLatchGuardDisarm()
+{
+    hostLatchGuard(0);
+}
+
+bool boardLatchSenseLow()
+{
+    return hostLatchSenseLow;
+}
+
+// ---------------------------------------------------------------------------
+// drivers/rs485_port.h
+// ---------------------------------------------------------------------------
+
+RS485Class rs485;
+
+void rs485PortBegin(uint32_t baud)
+{
+    rs485.begin(baud);
+    const uint32_t charMs = (8UL * 10UL * 1000UL + baud - 1) / baud;
+    rs485.setTimeout(charMs + 20UL);
+}
+
+// ---------------------------------------------------------------------------
+// drivers/led_ring.h, drivers/led_mask.h
+// ---------------------------------------------------------------------------
+
+uint32_t ledColor(uint8_t red, uint8_t green, uint8_t blue)
+{
+    return ((uint32_t)red << 16) | ((uint32_t)green << 8) | blue;
+}
+
+void ledInit()
+{
+    hostRingColor = 0;
+    hostRingFrames++;
+}
+
+void ledSetAllPixels(int ledIndex, uint32_t color)
+{
+    if (ledIndex == 0)
+    {
+        hostRingColor = color;
+    }
+    hostRingFrames++;
+}
+
+void ledShowRainbowRipple(uint16_t phase)
+{
+    hostRingColor = phase;
+    hostRingFrames++;
+}
+
+void maskInit()
+{
+    hostMaskIndex = 0;
+}
+
+void maskShowIndex(uint8_t index, uint32_t color)
+{
+    (void)color;
+    hostMaskIndex = (index >= 1 && index <= HW_LED_MASK_PIXEL_COUNT) ? index : 0;
+}
+
+void maskSetAll(uint32_t color)
+{
+    (void)color;
+    hostMaskIndex = 0;
+}
+
+void maskOff()
+{
+    hostMaskIndex = 0;
+}
+
+void maskShowRainbow(uint16_t phase)
+{
+    (void)phase;
+    hostMaskIndex = 0;
+}
+
+// ---------------------------------------------------------------------------
+// drivers/oled.h
+// ---------------------------------------------------------------------------
+
+bool oledInit()
+{
+    return hostOledPresent;
+}
+
+void oledClear()                                                { oledDraw(); }
+void oledPrint(const char *, uint8_t)                           { oledDraw(); }
+void oledPrintLargeNumber(uint8_t)                              { oledDraw(); }
+void oledPrintTitledNumber(const char *, uint16_t)              { oledDraw(); }
+void oledPrintCentered2(const char *, const char *, uint8_t)    { oledDraw(); }
+void oledPrintOtaProgress(uint8_t, uint16_t, uint16_t)          { oledDraw(); }
+
+uint16_t oledLastRenderUs()
+{
+    return oledLastUs;
+}
+
+uint16_t oledPeakRenderUs()
+{
+    return oledPeakUs;
+}
+
+// ---------------------------------------------------------------------------
+// drivers/flash_stage_hal.h — the real drivers/flash_stage.cpp runs on these
+// ---------------------------------------------------------------------------
+
+void flashHalErasePage(uint32_t page)
+{
+    IWatchdog.reload();
+    hostCounters.flashPageErases++;
+    hostAdvanceUs(FLASH_PAGE_ERASE_US);
+    if (page == FLASH_STAGING_HEADER_PAGE)
+    {
+        memset(stageHeader, 0xFF, sizeof(stageHeader));
+        memset(stagePageFresh, 0, sizeof(stagePageFresh));
+    }
+    else if (page >= FLASH_STAGING_IMAGE_FIRST_PAGE &&
+             page < FLASH_STAGING_IMAGE_FIRST_PAGE + FLASH_STAGING_IMAGE_PAGES)
+    {
+        const uint32_t k = page - FLASH_STAGING_IMAGE_FIRST_PAGE;
+        memset(stageImage + k * FLASH_LAYOUT_PAGE_SIZE, 0xFF, FLASH_LAYOUT_PAGE_SIZE);
+        stagePageFresh[k] = true;
+    }
+    IWatchdog.reload();
+}
+
+bool flashHalProgram(uint32_t addr, const uint8_t *data, uint32_t bytes)
+{
+    if (addr >= FLASH_STAGING_HEADER_ADDR &&
+        addr + bytes <= FLASH_STAGING_HEADER_ADDR + FLASH_LAYOUT_PAGE_SIZE)
+    {
+        return programDoublewords(stageHeader + (addr - FLASH_STAGING_HEADER_ADDR), data, bytes);
+    }
+    if (addr < FLASH_STAGING_IMAGE_ADDR ||
+        addr + bytes > FLASH_STAGING_IMAGE_ADDR + FLASH_OTA_MAX_IMAGE_SIZE)
+    {
+        return false;                   // outside the staging area
+    }
+    const uint32_t offset = addr - FLASH_STAGING_IMAGE_ADDR;
+    for (uint32_t k = offset / FLASH_LAYOUT_PAGE_SIZE;
+         k <= (offset + bytes - 1) / FLASH_LAYOUT_PAGE_SIZE; k++)
+    {
+        if (!stagePageFresh[k])
+        {
+            hostCounters.flashStaleWrites++;
+            return false;
+        }
+    }
+    return programDoublewords(stageImage + offset, data, bytes);
+}
+
+// The CRC over this runs on the host CPU: the loop's measured time carries
+// it, the virtual clock does not.
+const uint8_t *flashHalRead(uint32_t addr)
+{
+    if (addr >= FLASH_APP_ADDR && addr < FLASH_STAGING_HEADER_ADDR)
+    {
+        return appSlot + (addr - FLASH_APP_ADDR);
+    }
+    if (addr >= FLASH_STAGING_HEADER_ADDR && addr < FLASH_STAGING_IMAGE_ADDR)
+    {
+        return stageHeader + (addr - FLASH_STAGING_HEADER_ADDR);
+    }
+    return stageImage + (addr - FLASH_STAGING_IMAGE_ADDR);
+}
+
+uint32_t flashHalAppSize()
+{
+    return appBytes;
+}
+
+// ---------------------------------------------------------------------------
+// Harness access
+// ---------------------------------------------------------------------------
+
+bool hostAppLoad(const std::string &path)
+{
+    FILE *f = fopen(path.c_str(), "rb");
+    if (!f)
+    {
+        return false;
+    }
+    appBytes = (uint32_t)fread(appSlot, 1, sizeof(appSlot), f);
+    const bool whole = fgetc(f) == EOF;
+    fclose(f);
+    return whole;
+}
+
+const uint8_t *hostStageImage()
+{
+    return stageImage;
+}
+
+bool hostStageHeaderCommitted(uint32_t &size, uint32_t &crc32)
+{
+    OtaStagingHeader hdr;
+    memcpy(&hdr, stageHeader, sizeof(hdr));
+    if (hdr.magic != FLASH_OTA_HEADER_MAGIC)
+    {
+        return false;
+    }
+    size = hdr.imageSize;
+    crc32 = hdr.imageCrc32;
+    return true;
+}
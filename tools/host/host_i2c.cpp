@@ -0,0 +1,280 @@
+#include "host.h"
+#include <Wire.h>
+
+#include <stdio.h>
+
+// I2C1 as the board has it: the AT24C32D at 0x50 and the two STS40 at 0x44 /
+// 0x46. The real drivers (drivers/eeprom_at24.cpp, drivers/temp_sensor.cpp)
+// run unchanged on top, so their chunking, ack-polling and CRC checks are
+// the ones exercised.
+
+TwoWire Wire;
+
+namespace {
+
+constexpr uint8_t  AT24_ADDR        = 0x50;
+constexpr uint16_t AT24_SIZE        = 4096;
+constexpr uint16_t AT24_PAGE        = 32;
+constexpr uint32_t AT24_WRITE_US    = 5000;     // tWR, datasheet maximum
+constexpr uint32_t STS40_CONVERT_US = 8300;     // high repeatability, maximum
+
+bool present[128];
+bool presentInit = false;
+
+uint8_t  at24[AT24_SIZE];
+uint16_t at24Pointer = 0;
+uint64_t at24BusyUntil = 0;
+
+struct Sts40
+{
+    uint8_t address;
+    int16_t centiC;             // what this one reads
+    uint64_t readyAt;           // conversion end; 0 = none started
+    bool hasData;
+};
+
+Sts40 sensors[2] =
+{
+    { 0x46, 2345, 0, false },   // room
+    { 0x44, 3120, 0, false },   // board
+};
+
+void initPresence()
+{
+    if (presentInit)
+    {
+        return;
+    }
+    presentInit = true;
+    present[AT24_ADDR] = true;
+    present[sensors[0].address] = true;
+    present[sensors[1].address] = true;
+    memset(at24, 0xFF, sizeof(at24));
+}
+
+Sts40 *sensorAt(uint8_t address)
+{
+    for (Sts40 &s : sensors)
+    {
+        if (s.address == address)
+        {
+            return &s;
+        }
+    }
+    return nullptr;
+}
+
+// Address byte + payload, 9 clocks each, plus start and stop.
+void busTime(uint32_t clockHz, size_t bytes)
+{
+    const uint64_t us = ((uint64_t)(bytes + 1) * 9 + 2) * 1000000ULL / clockHz;
+    hostCounters.i2cBusUs += us;
+    hostAdvanceUs(us);
+}
+
+uint8_t crc8(const uint8_t *data, uint8_t len)
+{
+    uint8_t crc = 0xFF;
+    for (uint8_t i = 0; i < len; i++)
+    {
+        crc ^= data[i];
+        for (uint8_t bit = 0; bit < 8; bit++)
+        {
+            crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0x31) : (uint8_t)(crc << 1);
+        }
+    }
+    return crc;
+}
+
+} // namespace
+
+// ---------------------------------------------------------------------------
+// Harness controls
+// ---------------------------------------------------------------------------
+
+void hostI2cSetPresent(uint8_t address, bool on)
+{
+    initPresence();
+    present[address & 0x7F] = on;
+}
+
+bool hostAt24Load(const std::string &path)
+{
+    initPresence();
+    FILE *f = fopen(path.c_str(), "rb");
+    if (!f)
+    {
+        return false;
+    }
+    const size_t n = fread(at24, 1, sizeof(at24), f);
+    fclose(f);
+    return n == sizeof(at24);
+}
+
+bool hostAt24Save(const std::string &path)
+{
+    FILE *f = fopen(path.c_str(), "wb");
+    if (!f)
+    {
+        return false;
+    }
+    const size_t n = fwrite(at24, 1, sizeof(at24), f);
+    fclose(f);
+    return n == sizeof(at24);
+}
+
+const uint8_t *hostAt24Bytes()
+{
+    initPresence();
+    return at24;
+}
+
+// ---------------------------------------------------------------------------
+// TwoWire
+// ---------------------------------------------------------------------------
+
+void TwoWire::beginTransmission(uint8_t address)
+{
+    _address = address;
+    _txLen = 0;
+}
+
+size_t TwoWire::write(uint8_t b)
+{
+    if (_txLen >= sizeof(_tx))
+    {
+        return 0;                       // the core's 32-byte buffer is full
+    }
+    _tx[_txLen++] = b;
+    return 1;
+}
+
+size_t TwoWire::write(const uint8_t *buf, size_t len)
+{
+    size_t n = 0;
+    while (n < len && write(buf[n]))
+    {
+        n++;
+    }
+    return n;
+}
+
+uint8_t TwoWire::endTransmission(bool sendStop)
+{
+    initPresence();
+    const uint64_t now = hostNowUs();
+    bool ack = present[_address & 0x7F];
+
+    if (ack && _address == AT24_ADDR && now < at24BusyUntil)
+    {
+        ack = false;                    // inside its write cycle
+    }
+    Sts40 *sensor = sensorAt(_address);
+    if (ack && sensor && sensor->readyAt > now)
+    {
+        ack = false;                    // converting
+    }
+    if (!ack)
+    {
+        busTime(_clockHz, 0);
+        return 2;                       // address NACK
+    }
+
+    busTime(_clockHz, _txLen);
+    if (_address == AT24_ADDR && _txLen >= 2)
+    {
+        at24Pointer = (uint16_t)(((_tx[0] << 8) | _tx[1]) % AT24_SIZE);
+        if (_txLen > 2)
+        {
+            // Page write: the address counter wraps inside the page.
+            const uint16_t page = at24Pointer & ~(AT24_PAGE - 1);
+            uint16_t offset = at24Pointer & (AT24_PAGE - 1);
+            for (uint8_t i = 2; i < _txLen; i++)
+            {
+                at24[page + offset] = _tx[i];
+                offset = (offset + 1) & (AT24_PAGE - 1);
+            }
+            at24Pointer = page + offset;
+            if (sendStop)
+            {
+                at24BusyUntil = hostNowUs() + AT24_WRITE_US;
+                hostCounters.at24WriteCycles++;
+                hostCounters.at24BytesWritten += _txLen - 2;
+            }
+        }
+    }
+    else if (sensor && _txLen == 1)
+    {
+        if (_tx[0] == 0xFD)
+        {
+            sensor->readyAt = hostNowUs() + STS40_CONVERT_US;
+            sensor->hasData = true;
+        }
+        else if (_tx[0] == 0x94)
+        {
+            sensor->readyAt = 0;
+            sensor->hasData = false;
+        }
+    }
+    return 0;
+}
+
+uint8_t TwoWire::requestFrom(uint8_t address, uint8_t quantity)
+{
+    initPresence();
+    _rxLen = 0;
+    _rxPos = 0;
+    const uint64_t now = hostNowUs();
+    Sts40 *sensor = sensorAt(address);
+
+    bool ack = present[address & 0x7F];
+    if (ack && address == AT24_ADDR && now < at24BusyUntil)
+    {
+        ack = false;
+    }
+    if (ack && sensor && (!sensor->hasData || sensor->readyAt > now))
+    {
+        ack = false;                    // nothing to read, or still converting
+    }
+    if (!ack || quantity > sizeof(_rx))
+    {
+        busTime(_clockHz, 0);
+        return 0;
+    }
+
+    if (address == AT24_ADDR)
+    {
+        for (uint8_t i = 0; i < quantity; i++)
+        {
+            _rx[i] = at24[at24Pointer];
+            at24Pointer = (uint16_t)((at24Pointer + 1) % AT24_SIZE);
+        }
+    }
+    else if (sensor)
+    {
+        // STS4x: degC = -45 + 175 * ticks / 65535, MSB first, CRC-8 per word.
+        // Rounded up so the driver's truncating conversion lands on centiC.
+        const uint16_t ticks = (uint16_t)((((int32_t)sensor->centiC + 4500) * 65535 + 17499) / 17500);
+        uint8_t word[3] = { (uint8_t)(ticks >> 8), (uint8_t)ticks, 0 };
+        word[2] = crc8(word, 2);
+        for (uint8_t i = 0; i < quantity; i++)
+        {
+            _rx[i] = (i < 3) ? word[i] : 0xFF;
+        }
+        sensor->hasData = false;
+        sensor->readyAt = 0;
+    }
+    _rxLen = quantity;
+    busTime(_clockHz, quantity);
+    return quantity;
+}
+
+int TwoWire::available()
+{
+    return _rxLen - _rxPos;
+}
+
+int TwoWire::read()
+{
+    return (_rxPos < _rxLen) ? _rx[_rxPos++] : -1;
+}
@@ -0,0 +1,284 @@
+#include "host.h"
+#include <ModbusRTUServer.h>
+
+// The RTU server the firmware links against, cut down to what the LGS map
+// needs. Receive mirrors libmodbus over a Stream: header first, then the
+// length the function code implies, each byte subject to the stream timeout
+// — so a frame cut short on the wire costs the loop that timeout, exactly
+// the stall modbusServerTick's frame-gap gate exists to avoid.
+
+namespace {
+
+constexpr uint8_t EX_ILLEGAL_FUNCTION     = 0x01;
+constexpr uint8_t EX_ILLEGAL_DATA_ADDRESS = 0x02;
+constexpr uint8_t EX_ILLEGAL_DATA_VALUE   = 0x03;
+
+constexpr uint32_t POLL_STEP_US = 100;
+
+int discreteInputCount = 0;
+int inputRegisterCount = 0;
+
+uint16_t crc16Modbus(const uint8_t *p, size_t len)
+{
+    uint16_t crc = 0xFFFF;
+    while (len--)
+    {
+        crc ^= *p++;
+        for (uint8_t i = 0; i < 8; i++)
+        {
+            crc = (crc & 1) ? (uint16_t)((crc >> 1) ^ 0xA001) : (uint16_t)(crc >> 1);
+        }
+    }
+    return crc;
+}
+
+// Stream::timedRead: wait up to the stream timeout for the next byte.
+int timedRead(RS485Class &port)
+{
+    const uint64_t deadline = hostNowUs() + (uint64_t)port.getTimeout() * 1000;
+    while (port.available() <= 0)
+    {
+        if (hostNowUs() >= deadline)
+        {
+            return -1;
+        }
+        hostAdvanceUs(POLL_STEP_US);
+    }
+    return port.read();
+}
+
+bool readInto(RS485Class &port, std::vector<uint8_t> &adu, size_t want)
+{
+    while (adu.size() < want)
+    {
+        const int b = timedRead(port);
+        if (b < 0)
+        {
+            return false;
+        }
+        adu.push_back((uint8_t)b);
+    }
+    return true;
+}
+
+uint16_t be16(const std::vector<uint8_t> &p, size_t at)
+{
+    return (uint16_t)((p[at] << 8) | p[at + 1]);
+}
+
+void send(RS485Class &port, std::vector<uint8_t> pdu)
+{
+    const uint16_t crc = crc16Modbus(pdu.data(), pdu.size());
+    pdu.push_back((uint8_t)crc);
+    pdu.push_back((uint8_t)(crc >> 8));
+    port.beginTransmission();
+    port.write(pdu.data(), pdu.size());
+    port.endTransmission();
+}
+
+} // namespace
+
+int ModbusRTUServerClass::begin(RS485Class &rs485, int id, unsigned long baudrate, uint16_t config)
+{
+    (void)config;
+    _port = &rs485;
+    _id = (uint8_t)id;
+    rs485.begin(baudrate);
+    return 1;
+}
+
+int ModbusRTUServerClass::configureCoils(int startAddress, int nb)
+{
+    (void)startAddress;
+    delete[] _coils;
+    _coils = new uint8_t[nb]();
+    _coilCount = nb;
+    return 1;
+}
+
+int ModbusRTUServerClass::configureDiscreteInputs(int startAddress, int nb)
+{
+    (void)startAddress;
+    discreteInputCount = nb;
+    return 1;
+}
+
+int ModbusRTUServerClass::configureHoldingRegisters(int startAddress, int nb)
+{
+    (void)startAddress;
+    delete[] _regs;
+    _regs = new uint16_t[nb]();
+    _regCount = nb;
+    return 1;
+}
+
+int ModbusRTUServerClass::configureInputRegisters(int startAddress, int nb)
+{
+    (void)startAddress;
+    inputRegisterCount = nb;
+    return 1;
+}
+
+int ModbusRTUServerClass::coilRead(int address)
+{
+    return (address >= 0 && address < _coilCount) ? _coils[address] : -1;
+}
+
+int ModbusRTUServerClass::coilWrite(int address, uint8_t value)
+{
+    if (address < 0 || address >= _coilCount)
+    {
+        return 0;
+    }
+    _coils[address] = value ? 1 : 0;
+    return 1;
+}
+
+long ModbusRTUServerClass::holdingRegisterRead(int address)
+{
+    return (address >= 0 && address < _regCount) ? _regs[address] : -1;
+}
+
+int ModbusRTUServerClass::holdingRegisterWrite(int address, uint16_t value)
+{
+    if (address < 0 || address >= _regCount)
+    {
+        return 0;
+    }
+    _regs[address] = value;
+    return 1;
+}
+
+int ModbusRTUServerClass::poll()
+{
+    RS485Class &port = *_port;
+    std::vector<uint8_t> adu;
+
+    if (!readInto(port, adu, 2))
+    {
+        return 0;
+    }
+    const uint8_t fc = adu[1];
+    size_t want = 0;
+    switch (fc)
+    {
+        case 0x01: case 0x02: case 0x03: case 0x04: case 0x05: case 0x06:
+            want = 8;
+            break;
+        case 0x0F: case 0x10:
+            if (!readInto(port, adu, 7))
+            {
+                return 0;
+            }
+            want = 9 + adu[6];
+            break;
+        default:
+            while (port.available() > 0)    // unknown length: libmodbus flushes
+            {
+                port.read();
+            }
+            return 0;
+    }
+    if (!readInto(port, adu, want))
+    {
+        return 0;
+    }
+    const uint16_t crc = crc16Modbus(adu.data(), want - 2);
+    if (adu[want - 2] != (uint8_t)crc || adu[want - 1] != (uint8_t)(crc >> 8))
+    {
+        return 0;
+    }
+    const uint8_t slave = adu[0];
+    if (slave != _id && slave != 0)
+    {
+        return 0;                           // another module's request
+    }
+
+    const uint16_t addr = be16(adu, 2);
+    const uint16_t qty = be16(adu, 4);
+    std::vector<uint8_t> reply = { slave, fc };
+    uint8_t exception = 0;
+
+    switch (fc)
+    {
+        case 0x01:
+        case 0x02:
+        {
+            const int count = (fc == 0x01) ? _coilCount : discreteInputCount;
+            if (qty < 1 || qty > 2000) { exception = EX_ILLEGAL_DATA_VALUE; break; }
+            if (addr + qty > count)    { exception = EX_ILLEGAL_DATA_ADDRESS; break; }
+            reply.push_back((uint8_t)((qty + 7) / 8));
+            for (uint16_t i = 0; i < qty; i += 8)
+            {
+                uint8_t bits = 0;
+                for (uint16_t b = 0; b < 8 && i + b < qty; b++)
+                {
+                    if (fc == 0x01 && _coils[addr + i + b])
+                    {
+                        bits |= (uint8_t)(1u << b);
+                    }
+                }
+                reply.push_back(bits);
+            }
+            break;
+        }
+        case 0x03:
+        case 0x04:
+        {
+            const int count = (fc == 0x03) ? _regCount : inputRegisterCount;
+            if (qty < 1 || qty > 125) { exception = EX_ILLEGAL_DATA_VALUE; break; }
+            if (addr + qty > count)   { exception = EX_ILLEGAL_DATA_ADDRESS; break; }
+            reply.push_back((uint8_t)(qty * 2));
+            for (uint16_t i = 0; i < qty; i++)
+            {
+                const uint16_t v = (fc == 0x03) ? _regs[addr + i] : 0;
+                reply.push_back((uint8_t)(v >> 8));
+                reply.push_back((uint8_t)v);
+            }
+            break;
+        }
+        case 0x05:
+            if (qty != 0xFF00 && qty != 0x0000) { exception = EX_ILLEGAL_DATA_VALUE; break; }
+            if (addr >= _coilCount)             { exception = EX_ILLEGAL_DATA_ADDRESS; break; }
+            _coils[addr] = (qty == 0xFF00);
+            reply.assign(adu.begin(), adu.begin() + 6);
+            break;
+        case 0x06:
+            if (addr >= _regCount) { exception = EX_ILLEGAL_DATA_ADDRESS; break; }
+            _regs[addr] = qty;
+            reply.assign(adu.begin(), adu.begin() + 6);
+            break;
+        case 0x0F:
+            if (qty < 1 || qty > 1968 || adu[6] != (qty + 7) / 8) { exception = EX_ILLEGAL_DATA_VALUE; break; }
+            if (addr + qty > _coilCount)                          { exception = EX_ILLEGAL_DATA_ADDRESS; break; }
+            for (uint16_t i = 0; i < qty; i++)
+            {
+                _coils[addr + i] = (adu[7 + i / 8] >> (i % 8)) & 1;
+            }
+            reply.assign(adu.begin(), adu.begin() + 6);
+            break;
+        case 0x10:
+            if (qty < 1 || qty > 123 || adu[6] != qty * 2) { exception = EX_ILLEGAL_DATA_VALUE; break; }
+            if (addr + qty > _regCount)                    { exception = EX_ILLEGAL_DATA_ADDRESS; break; }
+            for (uint16_t i = 0; i < qty; i++)
+            {
+                _regs[addr + i] = be16(adu, 7 + 2 * i);
+            }
+            reply.assign(adu.begin(), adu.begin() + 6);
+            break;
+        default:
+            exception = EX_ILLEGAL_FUNCTION;
+            break;
+    }
+
+    if (slave == 0)
+    {
+        return 1;                           // broadcast: applied, never answered
+    }
+    if (exception)
+    {
+        reply = { slave, (uint8_t)(fc | 0x80), exception };
+    }
+    send(port, reply);
+    return 1;
+}
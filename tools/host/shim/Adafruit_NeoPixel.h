@@ -0,0 +1,7 @@
+#ifndef HOST_SHIM_ADAFRUIT_NEOPIXEL_H
+#define HOST_SHIM_ADAFRUIT_NEOPIXEL_H
+
+// drivers/led_ring.h includes this for its own use; the host fakes the ring
+// (tools/host/host_drivers.cpp) and needs nothing from the library.
+
+#endif // HOST_SHIM_ADAFRUIT_NEOPIXEL_H
@@ -0,0 +1,7 @@
+#ifndef HOST_SHIM_ADAFRUIT_SSD1306_H
+#define HOST_SHIM_ADAFRUIT_SSD1306_H
+
+// drivers/oled.h includes this for its own use; the host fakes the OLED
+// (tools/host/host_drivers.cpp) and needs nothing from the library.
+
+#endif // HOST_SHIM_ADAFRUIT_SSD1306_H
@@ -0,0 +1,94 @@
+#ifndef HOST_SHIM_ARDUINO_H
+#define HOST_SHIM_ARDUINO_H
+
+/*  @file tools/host/shim/Arduino.h
+ *  @brief The slice of the Arduino core + STM32 HAL that src/svc and
+ *         src/app touch, backed by the host harness (tools/host/).
+ *
+ *  Time is virtual: millis()/micros() read the harness clock, which moves
+ *  only when the harness advances it between loops or when a fake device
+ *  models a blocking wait (an I2C transfer, a flash erase, a UART flush).
+ *  That is what lets a benchmark tell "this tick is slow on the CPU" apart
+ *  from "this tick waits on the bus".
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+uint32_t millis();
+uint32_t micros();
+void delay(uint32_t ms);
+void delayMicroseconds(uint32_t us);
+
+// newlib's integer-only printf; the host libc's is a superset.
+#define sniprintf snprintf
+
+#define SERIAL_8N1 0x06
+
+// --- STM32 HAL / CMSIS bits the app layer reads ----------------------------
+
+uint32_t HAL_GetUIDw0();
+uint32_t HAL_GetUIDw1();
+uint32_t HAL_GetUIDw2();
+
+// Throws HostReset (tools/host/host.h): the harness ends the run there, the
+// way the board ends it by rebooting.
+[[noreturn]] void NVIC_SystemReset();
+
+struct RCC_TypeDef
+{
+    volatile uint32_t CSR;
+};
+extern RCC_TypeDef hostRcc;
+#define RCC (&hostRcc)
+
+// RM0454 RCC_CSR bit positions.
+#define RCC_CSR_RMVF      (1UL << 23)
+#define RCC_CSR_OBLRSTF   (1UL << 25)
+#define RCC_CSR_PINRSTF   (1UL << 26)
+#define RCC_CSR_PWRRSTF   (1UL << 27)
+#define RCC_CSR_SFTRSTF   (1UL << 28)
+#define RCC_CSR_IWDGRSTF  (1UL << 29)
+#define RCC_CSR_WWDGRSTF  (1UL << 30)
+#define RCC_CSR_LPWRRSTF  (1UL << 31)
+
+// Pin names only ever reach the (faked) drivers; board.h just needs them to
+// exist.
+enum HostPinName : uint8_t
+{
+    PA2, PA3, PA5, PA6, PA7, PA8, PA9, PA10, PA12,
+    PB3, PB4, PB5, PB6, PB7, PB9, PB13,
+    PC6, PC7, PC13,
+};
+
+// --- Stream (the RS485 port is one) ----------------------------------------
+
+class Stream
+{
+public:
+    virtual ~Stream() {}
+    virtual int available() = 0;
+    virtual int read() = 0;
+    virtual int peek() = 0;
+    virtual size_t write(uint8_t b) = 0;
+    virtual size_t write(const uint8_t *buf, size_t len)
+    {
+        size_t n = 0;
+        while (len--)
+        {
+            n += write(*buf++);
+        }
+        return n;
+    }
+    virtual void flush() = 0;
+    void setTimeout(unsigned long ms) { _timeout = ms; }
+    unsigned long getTimeout() const { return _timeout; }
+
+protected:
+    unsigned long _timeout = 1000;
+};
+
+#endif // HOST_SHIM_ARDUINO_H
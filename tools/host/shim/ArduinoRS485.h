@@ -0,0 +1,31 @@
+#ifndef HOST_SHIM_ARDUINO_RS485_H
+#define HOST_SHIM_ARDUINO_RS485_H
+
+#include <Arduino.h>
+
+/*  @file tools/host/shim/ArduinoRS485.h
+ *  @brief RS485Class over the harness's UART model: an RX ring of
+ *         SERIAL_RX_BUFFER_SIZE - 1 bytes (as stm32duino keeps it) the
+ *         scripted master fills at the line rate, and a TX side whose flush
+ *         holds the caller for the frame's time on the wire, as
+ *         HardwareSerial::flush() does on the board.
+ */
+
+class RS485Class : public Stream
+{
+public:
+    void begin(unsigned long baud);
+    int available() override;
+    int read() override;
+    int peek() override;
+    size_t write(uint8_t b) override;
+    using Stream::write;
+    void flush() override;
+
+    void beginTransmission() {}
+    void endTransmission() { flush(); }
+    void receive() {}
+    void noReceive() {}
+};
+
+#endif // HOST_SHIM_ARDUINO_RS485_H
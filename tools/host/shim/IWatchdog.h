@@ -0,0 +1,25 @@
+#ifndef HOST_SHIM_IWATCHDOG_H
+#define HOST_SHIM_IWATCHDOG_H
+
+#include <Arduino.h>
+
+/*  @file tools/host/shim/IWatchdog.h
+ *  @brief The independent watchdog as a stopwatch: every reload records the
+ *         virtual time since the previous one, and a gap past the timeout is
+ *         counted as the reset the board would have taken.
+ */
+
+class IWatchdogClass
+{
+public:
+    void begin(uint32_t timeoutUs, uint32_t windowUs = 0);
+    void reload();
+    bool isEnabled() const { return _enabled; }
+
+private:
+    bool _enabled = false;
+};
+
+extern IWatchdogClass IWatchdog;
+
+#endif // HOST_SHIM_IWATCHDOG_H
@@ -0,0 +1,42 @@
+#ifndef HOST_SHIM_MODBUS_RTU_SERVER_H
+#define HOST_SHIM_MODBUS_RTU_SERVER_H
+
+#include <Arduino.h>
+#include <ArduinoRS485.h>
+
+/*  @file tools/host/shim/ModbusRTUServer.h
+ *  @brief ArduinoModbus's RTU server, reduced to the calls svc/modbus_server
+ *         makes and the function codes the LGS map uses (01, 03, 05, 06, 0F,
+ *         10). Receive behaves like libmodbus reading a Stream: it takes
+ *         exactly one ADU from the ring, waits out the stream timeout if the
+ *         ADU is short, ignores other slaves' frames and answers nothing to
+ *         a broadcast (tools/host/host_modbus.cpp).
+ */
+
+class ModbusRTUServerClass
+{
+public:
+    int begin(RS485Class &rs485, int id, unsigned long baudrate, uint16_t config = SERIAL_8N1);
+
+    int configureCoils(int startAddress, int nb);
+    int configureDiscreteInputs(int startAddress, int nb);
+    int configureHoldingRegisters(int startAddress, int nb);
+    int configureInputRegisters(int startAddress, int nb);
+
+    int poll();
+
+    int coilRead(int address);
+    int coilWrite(int address, uint8_t value);
+    long holdingRegisterRead(int address);
+    int holdingRegisterWrite(int address, uint16_t value);
+
+private:
+    RS485Class *_port = nullptr;
+    uint8_t _id = 0;
+    uint8_t *_coils = nullptr;
+    int _coilCount = 0;
+    uint16_t *_regs = nullptr;
+    int _regCount = 0;
+};
+
+#endif // HOST_SHIM_MODBUS_RTU_SERVER_H
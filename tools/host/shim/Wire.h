@@ -0,0 +1,41 @@
+#ifndef HOST_SHIM_WIRE_H
+#define HOST_SHIM_WIRE_H
+
+#include <Arduino.h>
+
+/*  @file tools/host/shim/Wire.h
+ *  @brief TwoWire over the harness's I2C1 bus model (AT24C32D + two STS40,
+ *         tools/host/host_i2c.cpp). Every transaction advances the virtual
+ *         clock by its time on the wire.
+ */
+
+class TwoWire
+{
+public:
+    void begin() {}
+    void setSDA(uint32_t) {}
+    void setSCL(uint32_t) {}
+    void setClock(uint32_t hz) { _clockHz = hz; }
+
+    void beginTransmission(uint8_t address);
+    size_t write(uint8_t b);
+    size_t write(const uint8_t *buf, size_t len);
+    uint8_t endTransmission(bool sendStop = true);
+
+    uint8_t requestFrom(uint8_t address, uint8_t quantity);
+    int available();
+    int read();
+
+private:
+    uint32_t _clockHz = 100000;
+    uint8_t _address = 0;
+    uint8_t _tx[32];
+    uint8_t _txLen = 0;
+    uint8_t _rx[32];
+    uint8_t _rxLen = 0;
+    uint8_t _rxPos = 0;
+};
+
+extern TwoWire Wire;
+
+#endif // HOST_SHIM_WIRE_H
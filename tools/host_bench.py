@@ -0,0 +1,1624 @@
+"""Host build of the firmware's svc/ and app/ layers, and a tick-pipeline
+benchmark on top of it.
+
+Nothing in src/svc or src/app can run off the board, so until now nobody
+could say what appRun() costs per tick, or check modbusServerTick,
+ledControlTick and latchControlTick against more traffic than a bench
+session produces. This builds those modules UNCHANGED with the host C++
+compiler, against:
+
+  tools/host/shim/     Arduino, Wire, IWatchdog, RS485 and ModbusRTUServer
+                       headers backed by the harness
+  tools/host/*.cpp     a virtual clock, a UART line with the board's 512 B
+                       RX ring, an I2C1 bus with an AT24C32D and two STS40
+                       (the real eeprom_at24 and temp_sensor drivers run on
+                       it), staging flash, board pins, a latch guard timer
+
+and drives appInit()/appRun() with scripted Modbus RTU traffic. Per tick
+stage (modbus, latch, led, ota, diag, mode) it reports host CPU time (for
+comparing code paths; it is not M0+ cycles) and the time the stage spent
+blocked on modelled hardware — I2C transfers, AT24 write cycles, flash
+erase/program, UART TX flushes, OLED draws — which is the figure that sets
+the board's worst-case loop time.
+
+Scenarios (each checks behaviour as well as timing; exit 1 on a failure):
+
+  idle          boot + 5 s at rest: identity, sensors, health
+  poll-storm    back-to-back reads of every register block, interleaved
+                with frames for other slaves that must go unanswered
+  preset-storm  FC16 writes of all 8 presets, radio-switching through them,
+                a global brightness fan-out, then coil 503 (persist + reset)
+                and a second boot from the same AT24 image
+  latch         safety trigger with the latch held, released mid-pulse, and
+                the force trigger: pulse widths against the 300/500 ms rules,
+                the timing histograms (810-839) before and after a reboot;
+                a loop stall across the cap takes no open sample
+  stats         a preset lit past its max-on-time and the hourly statistics
+                flush to the AT24
+  ota           a full broadcast OTA session with lost chunks and a repair
+                round, finalize, apply — staged bytes and header checked;
+                then the same with erase-ahead (reg 289) after a smaller
+                session, repair back to front: two erases at entry, no
+                program into a page the session did not erase
+  resume        tools/ota_sender.py against the build, the adapter "unplugged"
+                60 chunks in, 35 s of silence (the session times out), then
+                the same send again: it resumes from the board's bitmap,
+                streams only the missing chunks, no page erased twice
+  lz            tools/ota_sender.py with an assets/ G070 image raw, compressed
+                (--lz: src/util/lzss.c decodes on the build), and compressed
+                with every 29th chunk lost — staged image and header checked,
+                transfer times compared at 9600 baud
+  chunk         tools/ota_sender.py with an assets/ G070 image at 128 B
+                chunks (--max-chunk 128) and at the 232 B the build
+                advertises in reg 358 (the wide window, regs 690-809), at
+                9600 and 57600 baud, and at 232 B with every 29th chunk lost
+                — staged image and header checked, transfer times compared
+  fingerprint   the build "running" an assets/ image (--app: regs 390-395
+                carry its size and CRC32): tools/ota_sender.py with that
+                same file stops after the probe, nothing erased; with
+                another image it sends as usual; and two builds on one line
+                (BenchFleet), one current: only the stale one is flashed,
+                the other stays idle, staging untouched, no reboot
+  replay        a session recorded off the build's line (--capture) and
+                replayed into a fresh one: the same replies, byte for byte;
+                then with every 3rd request cut in two like the RS485 hub
+                does, and an hour of polling, both replayed in seconds with
+                every intact request answered (tools/lgs_capture.py)
+  sniff         tools/lgs_sniff.py on a recorded bus (polls, an exception, a
+                broadcast, an absent ID) read as a passive tap: sides,
+                counts and latency against the capture's own; one reply
+                damaged; 16 ms USB batches; 60 s of saturated 57600 baud
+  profile       the on-device loop profile (regs 460-547) against the
+                bench's own per-stage figures, and its reset coil 512;
+                then 100k+ loops at each of two rates: the histogram halves
+                rather than pinning both buckets at 65535
+  group         the group command window (regs 560-681): per-ID, group and
+                all-module entries, membership (reg 82), a repeated
+                sequence, a latch entry; then the bus time to light 10, 30
+                and 60 slots by unicast FC05 against one broadcast
+  client        tools/lgs_client driven interactively against the build:
+                typed ops, block-read planning, write coalescing (transaction
+                counts and bus time against one-register-at-a-time), solo
+                writes kept in order, async clients sharing the transport
+  sync          tools/lgs_sync.py against the build: dry run, a first sync
+                (minimal writes, verified), a second one that writes nothing,
+                a persist only when something changed; wire bytes against a
+                blind full push
+  baud          tools/lgs_baud.py against the build, rebooted from its AT24
+                image at every coil 503: 9600 -> 57600 (preflight, stage,
+                canary, re-discovery, poll cycle at both rates) and back;
+                then two modules, one missing every coil 503 — as one of
+                the rest (straggler retry, roll back) and as the canary
+                (un-stage): the line ends at 9600 either way
+
+Usage:
+    <python> tools/host_bench.py                  # all scenarios
+    <python> tools/host_bench.py ota latch        # some of them
+    <python> tools/host_bench.py --cxx clang++ --build-dir build/host
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import glob
+import os
+import random
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import zlib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(HERE, ".."))
+HOST = os.path.join(HERE, "host")
+
+# app.cpp is compiled with these so appRun() calls the timing wrappers in
+# tools/host/bench.cpp instead of the stages directly.
+STAGE_RENAMES = {
+    "modbusServerTick": "benchModbusServerTick",
+    "latchControlTick": "benchLatchControlTick",
+    "ledControlTick": "benchLedControlTick",
+    "otaControlTick": "benchOtaControlTick",
+    "diagControlTick": "benchDiagControlTick",
+}
+STAGES = ["modbus", "latch", "led", "ota", "diag", "mode", "loop"]
+
+DEFAULT_ID = 247
+HOLDING_CEILING = 840         # first register past the map: exception 02
+CHUNK = 128
+WIDE_CHUNK = 232              # what the build advertises in reg 358 (512 B RX ring)
+MAX_GROUP_ENTRIES = 60
+
+
+# --- build -------------------------------------------------------------------
+
+def find_cxx(requested: str | None) -> str | None:
+    for name in filter(None, [requested, os.environ.get("CXX"), "c++", "g++", "clang++"]):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def sources() -> list[str]:
+    out = [os.path.join(ROOT, "src", "util", "crc.c"),        # the software CRC32 off the part
+           os.path.join(ROOT, "src", "util", "lzss.c")]
+    out += sorted(glob.glob(os.path.join(ROOT, "src", "svc", "*.cpp")))
+    out += sorted(glob.glob(os.path.join(ROOT, "src", "app", "*.cpp")))
+    # Drivers that are pure Wire protocol run for real on the I2C model;
+    # the rest are register-level and replaced by tools/host/host_drivers.cpp.
+    # flash_stage.cpp keeps its page bookkeeping and runs on the flash model
+    # behind drivers/flash_stage_hal.h.
+    out += [os.path.join(ROOT, "src", "drivers", "eeprom_at24.cpp"),
+            os.path.join(ROOT, "src", "drivers", "flash_stage.cpp"),
+            os.path.join(ROOT, "src", "drivers", "temp_sensor.cpp")]
+    out += sorted(glob.glob(os.path.join(HOST, "*.cpp")))
+    return out
+
+
+def build(cxx: str, build_dir: str) -> str:
+    flags = ["-std=gnu++17", "-O2", "-Wall", "-Wno-narrowing",
+             "-D", "SERIAL_RX_BUFFER_SIZE=512",
+             "-I", os.path.join(HOST, "shim"), "-I", HOST,
+             "-I", os.path.join(ROOT, "include"), "-I", os.path.join(ROOT, "src")]
+
+    def compile_one(src: str) -> str:
+        rel = os.path.relpath(src, ROOT).replace(os.sep, "_")
+        obj = os.path.join(build_dir, rel + ".o")
+        extra = []
+        if src.endswith(os.path.join("app", "app.cpp")):
+            extra = [f"-D{k}={v}" for k, v in STAGE_RENAMES.items()]
+        subprocess.run([cxx, *flags, *extra, "-c", src, "-o", obj], check=True)
+        return obj
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+        objs = list(pool.map(compile_one, sources()))
+    exe = os.path.join(build_dir, "lgs_host_bench")
+    subprocess.run([cxx, *objs, "-o", exe], check=True)
+    return exe
+
+
+# --- Modbus RTU frames ---------------------------------------------------------
+
+def crc16_modbus(data: bytes) -> int:
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def adu(uid: int, pdu: bytes) -> bytes:
+    body = bytes([uid]) + pdu
+    return body + crc16_modbus(body).to_bytes(2, "little")
+
+
+def fc03(uid: int, addr: int, count: int) -> bytes:
+    return adu(uid, bytes([3]) + addr.to_bytes(2, "big") + count.to_bytes(2, "big"))
+
+
+def fc01(uid: int, addr: int, count: int) -> bytes:
+    return adu(uid, bytes([1]) + addr.to_bytes(2, "big") + count.to_bytes(2, "big"))
+
+
+def fc05(uid: int, addr: int, on: bool) -> bytes:
+    return adu(uid, bytes([5]) + addr.to_bytes(2, "big") + (b"\xff\x00" if on else b"\x00\x00"))
+
+
+def fc06(uid: int, addr: int, value: int) -> bytes:
+    return adu(uid, bytes([6]) + addr.to_bytes(2, "big") + value.to_bytes(2, "big"))
+
+
+def fc16(uid: int, addr: int, values: list[int]) -> bytes:
+    data = b"".join(v.to_bytes(2, "big") for v in values)
+    return adu(uid, bytes([16]) + addr.to_bytes(2, "big") + len(values).to_bytes(2, "big")
+               + bytes([len(data)]) + data)
+
+
+def crc16_ccitt(data: bytes) -> int:
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+    return crc
+
+
+def regs_of(reply: bytes | None) -> list[int] | None:
+    """FC03 reply -> register values; None for no reply, a bad CRC or an exception."""
+    if not reply or len(reply) < 5 or crc16_modbus(reply[:-2]) != int.from_bytes(reply[-2:], "little"):
+        return None
+    if reply[1] & 0x80:
+        return None
+    n = reply[2]
+    return [int.from_bytes(reply[3 + i:5 + i], "big") for i in range(0, n, 2)]
+
+
+def bits_of(reply: bytes | None, count: int) -> list[int] | None:
+    if not reply or crc16_modbus(reply[:-2]) != int.from_bytes(reply[-2:], "little") or reply[1] & 0x80:
+        return None
+    return [(reply[3 + i // 8] >> (i % 8)) & 1 for i in range(count)]
+
+
+# --- scripts -----------------------------------------------------------------
+
+class Script:
+    """Harness commands plus the checks to run on the replies they produce."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.lines: list[str] = []
+        self.checks: list = []          # (label, fn(reply bytes | None) -> str | None)
+
+    def cmd(self, line: str) -> None:
+        self.lines.append(line)
+
+    def section(self, name: str) -> None:
+        self.cmd(f"section {self.name}/{name}")
+
+    def run(self, ms: int) -> None:
+        self.cmd(f"run {ms}")
+
+    def send(self, frame: bytes, gap_us: int = 0) -> None:
+        self.cmd(f"send {gap_us} {frame.hex()}")
+
+    def request(self, frame: bytes, label: str, check=None, timeout_ms: int = 1000,
+                turnaround_us: int = 2000) -> None:
+        self.send(frame, turnaround_us)
+        self.cmd(f"recv {timeout_ms}")
+        self.checks.append((label, check))
+
+    def silence(self, frame: bytes, label: str, timeout_ms: int = 100) -> None:
+        """A frame that must NOT be answered (another slave's, a broadcast)."""
+        self.send(frame, 2000)
+        self.cmd(f"recv {timeout_ms}")
+        self.checks.append((label, lambda r: None if r is None else f"unexpected reply {r.hex()}"))
+
+    def expect_regs(self, uid: int, addr: int, want: list[int], label: str) -> None:
+        def check(r, want=want):
+            got = regs_of(r)
+            return None if got == want else f"regs {addr}+{len(want)}: got {got}, want {want}"
+        self.request(fc03(uid, addr, len(want)), label, check)
+
+    def expect_ok(self, frame: bytes, label: str) -> None:
+        def check(r, frame=frame):
+            return None if r is not None and r[:6] == frame[:6] else f"no echo: {r.hex() if r else None}"
+        self.request(frame, label, check)
+
+
+class Result:
+    def __init__(self, out: str) -> None:
+        self.replies: list[bytes | None] = []
+        self.stats: dict[str, dict[str, tuple]] = {}
+        self.counters: dict[str, dict[str, int]] = {}
+        self.resets: list[int] = []
+        self.dumps: dict[str, list[str]] = {}
+        self.boot_us = 0
+        for line in out.splitlines():
+            tag, _, rest = line.partition(" ")
+            if tag == "reply":
+                self.replies.append(None if rest == "-" else bytes.fromhex(rest))
+            elif tag == "stats":
+                section, stage, *nums = rest.split()
+                self.stats.setdefault(section, {})[stage] = tuple(int(n) for n in nums)
+            elif tag == "counters":
+                section, *pairs = rest.split()
+                self.counters[section] = {k: int(v) for k, v in (p.split("=") for p in pairs)}
+            elif tag == "reset":
+                self.resets.append(int(rest))
+            elif tag == "boot":
+                self.boot_us = int(rest.split()[1])
+            else:
+                self.dumps.setdefault(tag, []).append(rest)
+
+
+def execute(exe: str, script: Script, at24: str | None = None, args: list[str] = ()) -> tuple[Result, list[str]]:
+    cmd = [exe, *args] + (["--at24", at24] if at24 else [])
+    proc = subprocess.run(cmd, input="\n".join(script.lines) + "\n", capture_output=True,
+                          text=True, check=True)
+    res = Result(proc.stdout)
+    problems = []
+    if len(res.replies) != len(script.checks):
+        problems.append(f"{script.name}: {len(res.replies)} replies for {len(script.checks)} requests")
+    for (label, check), reply in zip(script.checks, res.replies):
+        msg = check(reply) if check else (None if reply is not None else "no reply")
+        if msg:
+            problems.append(f"{script.name}: {label}: {msg}")
+    return res, problems + counter_problems(res)
+
+
+def counter_problems(res: Result) -> list[str]:
+    problems = []
+    for section, c in res.counters.items():
+        if c["wdg_resets"]:
+            problems.append(f"{section}: {c['wdg_resets']} watchdog reset(s), "
+                            f"longest reload gap {c['wdg_max_gap_us'] / 1000:.0f} ms")
+        if c["rx_overflow"]:
+            problems.append(f"{section}: {c['rx_overflow']} byte(s) lost to a full RX ring")
+        if c["stale_writes"]:
+            problems.append(f"{section}: {c['stale_writes']} flash program(s) into a page "
+                            "not erased this session")
+    return problems
+
+
+# --- scenarios -----------------------------------------------------------------
+
+def second_board(exe: str, at24: str, uid: int) -> None:
+    """An AT24 image for another module on a bench line: slave ID `uid`
+    (reg 4), persisted with coil 503, which the next boot takes up."""
+    from lgs_client import BenchTransport, LgsClient
+
+    bus = BenchTransport(exe, ("--at24", at24), gap_s=0.025)
+    try:
+        bus.pause(0.5)
+        dev = LgsClient(bus, DEFAULT_ID)
+        dev.write_register(4, uid)
+        dev.persist()
+        bus.pause(0.5)
+    finally:
+        bus.close()
+    if not bus.resets:
+        raise RuntimeError(f"id {uid}: coil 503 did not persist the bench board")
+
+
+def fw_version() -> int:
+    text = open(os.path.join(ROOT, "include", "version.h"), encoding="utf-8").read()
+    return int(re.search(r"#define FW_VERSION\s+(\d+)", text).group(1))
+
+
+def scenario_idle(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    s = Script("idle")
+    s.section("rest")
+    s.run(5000)
+    s.expect_regs(DEFAULT_ID, 0, [20, fw_version(), 510, 9600, DEFAULT_ID], "identity")
+    s.expect_regs(DEFAULT_ID, 20, [2345, 3120], "STS40 readings")
+    s.request(fc03(DEFAULT_ID, 9, 1), "health: AT24, OLED and both sensors",
+              lambda r: None if regs_of(r) and regs_of(r)[0] & 0x0F == 0x0F else f"health {regs_of(r)}")
+    res, problems = execute(exe, s)
+    return [res], problems
+
+
+def scenario_poll_storm(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    s = Script("poll-storm")
+    s.section("9600")
+    s.run(200)
+    blocks = [(0, 23), (110, 75), (200, 82), (282, 8), (400, 52)]
+    for i in range(60):
+        for addr, count in blocks:
+            s.request(fc03(DEFAULT_ID, addr, count), f"round {i} read {addr}+{count}",
+                      lambda r, n=count: None if regs_of(r) is not None and len(regs_of(r)) == n
+                      else "bad or missing reply")
+        s.request(fc01(DEFAULT_ID, 1001, 38), f"round {i} coils",
+                  lambda r: None if bits_of(r, 38) is not None else "bad or missing reply")
+        s.silence(fc03(5, 0, 23), f"round {i} frame for id 5")
+    s.request(fc03(DEFAULT_ID, HOLDING_CEILING, 1), "past the map -> exception 02",
+              lambda r: None if r and r[1] == 0x83 and r[2] == 2 else f"got {r.hex() if r else None}")
+    res, problems = execute(exe, s)
+    return [res], problems
+
+
+def scenario_preset_storm(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    rng = random.Random(0x5E7)
+    at24 = os.path.join(tmp, "preset_storm.at24")
+    presets = {n: [rng.randrange(101), rng.randrange(256), rng.randrange(256),
+                   rng.randrange(256), rng.randrange(1, 7200)] for n in range(1, 9)}
+
+    s = Script("preset-storm")
+    s.run(500)
+    s.section("writes")
+    for n, fields in presets.items():
+        s.expect_ok(fc16(DEFAULT_ID, 100 + 10 * n, fields), f"write preset {n}")
+    for rnd in range(5):
+        for n in range(1, 9):
+            s.expect_ok(fc05(DEFAULT_ID, 1000 + n, True), f"enable preset {n}")
+            s.request(fc01(DEFAULT_ID, 1001, 8), f"round {rnd}: only preset {n} enabled",
+                      lambda r, n=n: None if bits_of(r, 8) == [int(i == n) for i in range(1, 9)]
+                      else f"enable coils {bits_of(r, 8)}")
+    s.run(1200)                       # reg 11 is republished once a second
+    s.expect_regs(DEFAULT_ID, 11, [8], "preset 8 active")
+    s.expect_ok(fc06(DEFAULT_ID, 190, 40), "global brightness 40")
+    for n in presets:
+        presets[n][0] = 40
+    s.run(50)
+    s.expect_regs(DEFAULT_ID, 110, sum(([*presets[n], 0, 0, 0, 0, 0] for n in range(1, 8)), [])
+                  + presets[8], "presets read back")
+    s.section("persist")
+    s.send(fc05(DEFAULT_ID, 503, True), 2000)    # persists, then resets
+    s.run(500)
+    first, problems = execute(exe, s, at24)
+    if not first.resets:
+        problems.append("preset-storm: coil 503 did not reset the board")
+
+    again = Script("preset-storm-reboot")
+    again.run(500)
+    again.expect_regs(DEFAULT_ID, 110, sum(([*presets[n], 0, 0, 0, 0, 0] for n in range(1, 8)), [])
+                      + presets[8], "presets survive the reboot")
+    again.request(fc03(DEFAULT_ID, 7, 1), "boot count moved",
+                  lambda r: None if regs_of(r) and regs_of(r)[0] >= 2 else f"boot count {regs_of(r)}")
+    second, more = execute(exe, again, at24)
+    return [first, second], problems + more
+
+
+def scenario_latch(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    s = Script("latch")
+    s.run(500)
+    s.section("pulses")
+    s.cmd("sense 1")
+    s.expect_ok(fc05(DEFAULT_ID, 1020, True), "safety trigger, latch held")
+    s.run(2500)
+    s.expect_ok(fc05(DEFAULT_ID, 1020, True), "safety trigger, latch opens at 350 ms")
+    s.run(350)
+    s.cmd("sense 0")
+    s.run(2500)
+    s.expect_ok(fc05(DEFAULT_ID, 1019, True), "force trigger, latch open")
+    s.run(2500)
+    s.expect_ok(fc05(DEFAULT_ID, 1020, True), "safety trigger, no latch -> no pulse")
+    s.run(200)
+    s.request(fc01(DEFAULT_ID, 1019, 2), "trigger coils self-clear",
+              lambda r: None if bits_of(r, 2) == [0, 0] else f"coils {bits_of(r, 2)}")
+    s.cmd("pulses")
+
+    # Timing histograms (810-839): three energized pulses, two of them
+    # sense-aware — one held to the cap, one opening at ~350 ms.
+    def timing(want_recent: bool):
+        def check(r: bytes) -> str | None:
+            v = regs_of(r)
+            if len(v) != 30:
+                return f"regs {v}"
+            energize, opened, width = v[2:10], v[12:20], v[22:30]
+            bad = []
+            if sum(energize) != 3 or sum(energize[:2]) != 3:
+                bad.append(f"energize {energize}")
+            if opened != [0] * 6 + [1, 1]:
+                bad.append(f"open {opened}")
+            if sum(width) != 2 or width[7] != 1 or width[2] + width[3] != 1:
+                bad.append(f"width {width}")
+            if want_recent and not (v[0] < 2 and 340 <= v[10] <= 360 and 340 <= v[20] <= 360):
+                bad.append(f"most recent {v[0]}/{v[10]}/{v[20]}")
+            return ", ".join(bad) or None
+        return check
+
+    s.request(fc03(DEFAULT_ID, 810, 30), "latch timing histograms", timing(True))
+    s.send(fc05(DEFAULT_ID, 504, True), 2000)    # a commanded reset flushes the stats
+    s.run(500)
+    at24 = os.path.join(tmp, "latch.at24")
+    res, problems = execute(exe, s, at24)
+    again = Script("latch-reboot")
+    again.run(500)
+    again.request(fc03(DEFAULT_ID, 810, 30), "histograms survive the reboot", timing(False))
+    second, more = execute(exe, again, at24)
+    problems += more
+
+    pulses = [tuple(int(v) / 1000 for v in p.split(":")) for p in res.dumps["pulses"][0].split()]
+    widths = [round(b - a, 1) for a, b in pulses]
+    print(f"  latch pulse widths (ms): {widths}")
+    want = [(500, 500), (300, 355), (500, 500)]
+    if len(widths) != len(want) or any(not lo - 1 <= w <= hi + 1 for w, (lo, hi) in zip(widths, want)):
+        problems.append(f"latch: pulse widths {widths}, want {want}")
+    if res.counters and any(c["guard_trips"] for c in res.counters.values()):
+        problems.append("latch: the hardware guard had to end a pulse")
+
+    # A loop stall across the cap: the latch opens meanwhile, but the first
+    # PULSE tick comes after the guard cut the drive. When it opened is
+    # unknown, so h=1 takes no sample; "never opened" would be a lie.
+    stall = Script("latch-stall")
+    stall.run(500)
+    stall.cmd("sense 1")
+    stall.expect_ok(fc05(DEFAULT_ID, 1020, True), "safety trigger, latch held")
+    stall.cmd("quantum 600000")       # charged after each pass: the next one stalls
+    stall.run(1)
+    stall.cmd("sense 0")
+    stall.run(1300)
+    stall.cmd("quantum 50")
+    stall.request(fc03(DEFAULT_ID, 810, 30), "stalled pulse: no open sample",
+                  lambda r: None if (v := regs_of(r)) and len(v) == 30 and sum(v[2:10]) == 1
+                  and v[12:20] == [0] * 8 and v[22:30] == [0] * 7 + [1]
+                  else f"histograms {v}")
+    third, more = execute(exe, stall)
+    problems += more
+    return [res, second, third], problems
+
+
+def scenario_stats(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    s = Script("stats")
+    s.run(500)
+    s.expect_ok(fc05(DEFAULT_ID, 1001, True), "light preset 1")
+    s.section("hour")
+    s.cmd("quantum 2000")             # an hour of loops: coarser steps, same stages
+    s.run(3_601_500)
+    s.cmd("quantum 50")
+    s.expect_regs(DEFAULT_ID, 11, [0], "max-on-time turned the ring off")
+    s.request(fc03(DEFAULT_ID, 211, 1), "preset 1 on-time recorded",
+              lambda r: None if regs_of(r) and 3595 <= regs_of(r)[0] <= 3605 else f"on-time {regs_of(r)}")
+    res, problems = execute(exe, s)
+    c = res.counters.get("stats/hour", {})
+    if not c.get("at24_cycles"):
+        problems.append("stats: the hourly flush wrote nothing to the AT24")
+    return [res], problems
+
+
+def ota_session(s: Script, image: bytes, lost: set[int], *, flags: int = 0,
+                repair_order=sorted, label: str = "") -> None:
+    """One broadcast OTA session up to "verified", as ota_sender.py runs it:
+    metadata, enter, the chunk stream (minus `lost`), a bitmap check, a
+    repair round in `repair_order`, finalize."""
+    crc = zlib.crc32(image)
+    chunks = (len(image) + CHUNK - 1) // CHUNK
+    gap_us = 25_000                   # ota_sender.py --gap default
+    counter = 0
+
+    def chunk_frame(idx: int) -> bytes:
+        nonlocal counter
+        counter += 1
+        payload = image[idx * CHUNK:(idx + 1) * CHUNK]
+        padded = payload + b"\xff" * (-len(payload) % 2)
+        data = [(padded[i] << 8) | padded[i + 1] for i in range(0, len(padded), 2)]
+        data += [0xFFFF] * (64 - len(data))
+        return fc16(0, 290, [idx, len(payload), crc16_ccitt(payload)] + data + [counter])
+
+    s.section(f"{label}enter")
+    s.send(fc16(0, 284, [len(image) >> 16, len(image) & 0xFFFF, crc >> 16, crc & 0xFFFF,
+                         chunks, flags]), gap_us)
+    s.send(fc05(0, 505, True), gap_us)
+    if flags & 1:
+        s.run(100)                    # header + first page: ~44 ms
+    else:
+        s.run(2000)
+    s.expect_regs(DEFAULT_ID, 282, [1, 0], f"{label}receiving")
+    s.section(f"{label}stream")
+    for idx in range(chunks):
+        frame = chunk_frame(idx)
+        if idx not in lost:
+            s.send(frame, gap_us)
+        s.run(1 + int(len(frame) * 10 / 9600 * 1000) + gap_us // 1000)
+    s.run(200)
+
+    def check_bitmap(r):
+        regs = regs_of(r)
+        if regs is None:
+            return "no bitmap"
+        missing = {i for i in range(chunks) if not (regs[i // 16] >> (i % 16)) & 1}
+        return None if missing == lost else f"missing {sorted(missing)}, lost {sorted(lost)}"
+    s.request(fc03(DEFAULT_ID, 360, 30), f"{label}bitmap shows exactly the lost chunks", check_bitmap)
+    s.section(f"{label}repair")
+    for idx in repair_order(lost):
+        s.send(chunk_frame(idx), gap_us)
+        s.run(200)
+    s.expect_regs(DEFAULT_ID, 283, [chunks], f"{label}all chunks in")
+    s.section(f"{label}finalize")
+    s.send(fc05(0, 506, True), gap_us)
+    s.run(1000)
+    s.expect_regs(DEFAULT_ID, 282, [2], f"{label}verified")
+
+
+def ota_apply(s: Script, image: bytes) -> None:
+    s.section("apply")
+    s.send(fc05(0, 507, True), 25_000)
+    s.run(1000)
+    s.cmd(f"stage {len(image)}")
+    s.cmd("header")
+
+
+def ota_applied(name: str, res: Result, image: bytes) -> list[str]:
+    problems = []
+    if bytes.fromhex(res.dumps["stage"][0]) != image:
+        problems.append(f"{name}: staged bytes differ from the image")
+    if res.dumps["header"][0] != f"{len(image)} {zlib.crc32(image):08x}":
+        problems.append(f"{name}: header {res.dumps['header'][0]!r}")
+    if not res.resets:
+        problems.append(f"{name}: apply did not reset into the bootloader")
+    return problems
+
+
+def scenario_ota(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    rng = random.Random(0x07A)
+    image = rng.randbytes(24_000)
+    pages = -(-len(image) // 2048)
+    lost = set(range(17, -(-len(image) // CHUNK), 40))
+
+    # Erase at entry (flags 0, every sender before reg 289): header plus the
+    # pages the image needs, not the whole 30-page area.
+    s = Script("ota")
+    s.run(500)
+    ota_session(s, image, lost)
+    ota_apply(s, image)
+    res, problems = execute(exe, s)
+    problems += ota_applied("ota", res, image)
+    if res.counters["ota/enter"]["erases"] != 1 + pages:
+        problems.append(f"ota: entry erased {res.counters['ota/enter']['erases']} pages, "
+                        f"want {1 + pages}")
+
+    # Erase-ahead: a small session first, so the big one has pages it must
+    # not trust, then the big one with its repair round back to front.
+    small = rng.randbytes(5_000)
+    s = Script("ota-ahead")
+    s.run(500)
+    ota_session(s, small, set(), flags=1, label="small/")
+    s.send(fc05(0, 508, True), 25_000)
+    s.run(100)
+    ota_session(s, image, lost, flags=1, repair_order=lambda ids: sorted(ids, reverse=True))
+    ota_apply(s, image)
+    ahead, more = execute(exe, s)
+    problems += more + ota_applied("ota-ahead", ahead, image)
+    erases = sum(c["erases"] for sec, c in ahead.counters.items()
+                 if sec.startswith("ota-ahead/") and "small/" not in sec)
+    if ahead.counters["ota-ahead/enter"]["erases"] != 2 or erases != 1 + pages:
+        problems.append(f"ota-ahead: {ahead.counters['ota-ahead/enter']['erases']} erases at entry "
+                        f"and {erases} in all, want 2 and {1 + pages}")
+    print(f"  entry erase: {res.counters['ota/enter']['erases']} pages at coil 505, "
+          f"{ahead.counters['ota-ahead/enter']['erases']} with erase-ahead "
+          f"(all 31 before sizing)")
+    return [res, ahead], problems
+
+
+def scenario_resume(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    import contextlib
+    import io
+    from unittest import mock
+    import ota_sender
+    from lgs_client import BenchTransport, LgsClient, LgsError
+
+    problems: list[str] = []
+
+    def expect(cond: bool, label: str) -> None:
+        if not cond:
+            problems.append(f"resume: {label}")
+
+    # Random bytes behind a vector table the sender accepts: initial SP at
+    # the top of RAM, reset handler in the app slot.
+    image = struct.pack("<2I", 0x20009000, 0x08001201) + random.Random(0x2E5).randbytes(23_992)
+    chunks, pages = -(-len(image) // WIDE_CHUNK), -(-len(image) // 2048)
+    path = os.path.join(tmp, "resume.bin")
+    with open(path, "wb") as f:
+        f.write(image)
+    checkpoint = path + ota_sender.CHECKPOINT_SUFFIX
+    first = cut = 60                  # chunks out before the adapter "unplugs"
+    sent: list[int] = []
+    real_send = ota_sender.OtaSession.send_chunk
+
+    def send_chunk(session, img, idx):
+        if len(sent) == cut:
+            raise LgsError("USB-RS485 adapter unplugged")
+        sent.append(idx)
+        real_send(session, img, idx)
+
+    def send() -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return ota_sender.action_send(bus, [DEFAULT_ID], path, repair_rounds=5,
+                                          broadcast_apply=False, yes=True)
+
+    bus = BenchTransport(exe, gap_s=0.025)     # ota_sender.py --gap default
+    try:
+        bus.command("section resume/first")
+        bus.pause(0.5)
+        with mock.patch.object(ota_sender.OtaSession, "send_chunk", send_chunk):
+            try:
+                send()
+            except LgsError:
+                pass
+        expect(len(sent) == cut and os.path.exists(checkpoint),
+               f"first send stopped after {len(sent)} chunks, checkpoint {os.path.exists(checkpoint)}")
+        bus.command("section resume/timeout")
+        bus.pause(35)                 # past OTA_SESSION_TIMEOUT_MS: the board gives up...
+        held = LgsClient(bus, DEFAULT_ID).read_registers(282, 2)
+        expect(held == [(4 << 8) | 3, cut], f"after the timeout: regs 282-283 {held}")
+        bus.command("section resume/resume")
+        sent.clear()
+        cut = chunks + 1
+        with mock.patch.object(ota_sender.OtaSession, "send_chunk", send_chunk):
+            rc = send()               # ...but holds the session for this
+        # rc 1: the bench does not come back from the apply reset to confirm.
+        expect(rc == 1 and bus.resets == 1, f"resumed send: rc {rc}, resets {bus.resets}")
+        expect(sorted(sent) == list(range(first, chunks)),
+               f"resumed send streamed {len(sent)} chunks, want the {chunks - first} missing")
+        expect(not os.path.exists(checkpoint), "checkpoint left after the devices verified")
+        staged = bytes.fromhex(bus.command(f"stage {len(image)}", "stage"))
+        header = bus.command("header", "header")
+        expect(staged == image and header == f"{len(image)} {zlib.crc32(image):08x}",
+               f"staged image intact {staged == image}, header {header!r}")
+    finally:
+        bus.close()
+    res = Result("\n".join(bus.lines))
+    erases = sum(c["erases"] for c in res.counters.values())
+    expect(erases == 1 + pages, f"{erases} page erases over both sends, want {1 + pages}")
+    print(f"  interrupted after {first} of {chunks} chunks, 35 s pause: resume streamed "
+          f"{len(sent)} chunks, {erases} erases in all")
+    return [res], problems + counter_problems(res)
+
+
+def scenario_lz(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    import contextlib
+    import io
+    import ota_sender
+    from lgs_client import BenchTransport
+
+    problems: list[str] = []
+    path = os.path.join(ROOT, "assets", "firmware_stm32g070_v3.3.0_2026-08-13.bin")
+    with open(path, "rb") as f:
+        image = f.read()
+    results = []
+    took = {}
+    for label, lz, drop in (("raw", False, 0), ("lz", True, 0), ("lz-lossy", True, 29)):
+        bus = BenchTransport(exe, gap_s=0.025)     # ota_sender.py --gap default
+        log = io.StringIO()
+        try:
+            bus.command(f"section lz/{label}")
+            bus.pause(0.5)
+            with contextlib.redirect_stdout(log):
+                rc = ota_sender.action_send(bus, [DEFAULT_ID], path, repair_rounds=5,
+                                            broadcast_apply=False, yes=True, drop_every=drop,
+                                            fresh=True, lz=lz)
+            # rc 1: verified and applied, but the bench does not come back to confirm.
+            staged = bytes.fromhex(bus.command(f"stage {len(image)}", "stage"))
+            header = bus.command("header", "header")
+        finally:
+            bus.close()
+        text = log.getvalue()
+        m = re.search(r"transfer took ([\d.]+)s", text)
+        took[label] = float(m.group(1)) if m else 0.0
+        chunks = re.search(r"streaming \d+ of (\d+) chunks", text)
+        resent = sum(int(n) for n in re.findall(r"re-sending (\d+) chunk", text))
+        if rc != 1 or staged != image or header != f"{len(image)} {zlib.crc32(image):08x}":
+            problems.append(f"lz/{label}: rc {rc}, staged image intact {staged == image}, "
+                            f"header {header!r}")
+        print(f"  {label:<9} {chunks.group(1) if chunks else '?':>4} chunks, "
+              f"{resent:>3} re-sent, transfer {took[label]:5.1f} s")
+        res = Result("\n".join(bus.lines))
+        results.append(res)
+        problems += counter_problems(res)
+    if not took["lz"] or took["lz"] >= took["raw"]:
+        problems.append(f"lz: compressed transfer {took['lz']} s, raw {took['raw']} s")
+    print(f"  {os.path.basename(path)}: {1 - took['lz'] / max(took['raw'], 1e-9):.0%} "
+          f"shorter compressed at 9600 baud")
+    return results, problems
+
+
+def scenario_chunk(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    import contextlib
+    import io
+    import ota_sender
+    from lgs_client import BenchTransport, LgsClient
+
+    problems: list[str] = []
+    path = os.path.join(ROOT, "assets", "firmware_stm32g070_v3.3.0_2026-08-13.bin")
+    with open(path, "rb") as f:
+        image = f.read()
+    at24 = os.path.join(tmp, "chunk_at24.bin")
+    results = []
+    took = {}
+    runs = [(9600, "128", CHUNK, 0), (9600, "232", WIDE_CHUNK, 0), (9600, "232-lossy", WIDE_CHUNK, 29),
+            (57600, "128", CHUNK, 0), (57600, "232", WIDE_CHUNK, 0)]
+    at = 9600
+    for baud, label, max_chunk, drop in runs:
+        if baud != at:
+            # Reg 3 + coil 503; the next process boots at the new rate from the AT24.
+            bus = BenchTransport(exe, ("--at24", at24), baud=at, gap_s=0.025)
+            try:
+                bus.pause(0.5)
+                dev = LgsClient(bus, DEFAULT_ID)
+                dev.write_register(3, baud)
+                dev.persist()
+                bus.pause(0.5)
+            finally:
+                bus.close()
+            at = baud
+        bus = BenchTransport(exe, ("--at24", at24), baud=baud, gap_s=0.025)
+        log = io.StringIO()
+        try:
+            bus.command(f"section chunk/{baud}/{label}")
+            bus.pause(0.5)
+            with contextlib.redirect_stdout(log):
+                rc = ota_sender.action_send(bus, [DEFAULT_ID], path, repair_rounds=5,
+                                            broadcast_apply=False, yes=True, drop_every=drop,
+                                            fresh=True, max_chunk=max_chunk)
+            # rc 1: verified and applied, but the bench does not come back to confirm.
+            staged = bytes.fromhex(bus.command(f"stage {len(image)}", "stage"))
+            header = bus.command("header", "header")
+        finally:
+            bus.close()
+        text = log.getvalue()
+        m = re.search(r"transfer took ([\d.]+)s", text)
+        took[baud, label] = float(m.group(1)) if m else 0.0
+        sized = re.search(r"(\d+) chunks of (\d+) B", text)
+        resent = sum(int(n) for n in re.findall(r"re-sending (\d+) chunk", text))
+        if rc != 1 or staged != image or header != f"{len(image)} {zlib.crc32(image):08x}":
+            problems.append(f"chunk/{baud}/{label}: rc {rc}, staged image intact {staged == image}, "
+                            f"header {header!r}")
+        if not sized or int(sized.group(2)) != max_chunk:
+            problems.append(f"chunk/{baud}/{label}: negotiated {sized.group(0) if sized else '?'}, "
+                            f"want {max_chunk} B")
+        print(f"  {baud:>5} {label:<9} {sized.group(1) if sized else '?':>4} chunks, "
+              f"{resent:>3} re-sent, transfer {took[baud, label]:5.1f} s")
+        res = Result("\n".join(bus.lines))
+        results.append(res)
+        problems += counter_problems(res)
+    for baud in (9600, 57600):
+        narrow, wide = took[baud, "128"], took[baud, "232"]
+        if not wide or wide >= narrow:
+            problems.append(f"chunk: {baud} baud, 232 B chunks {wide} s, 128 B {narrow} s")
+        print(f"  {os.path.basename(path)}: {1 - wide / max(narrow, 1e-9):.0%} shorter "
+              f"with 232 B chunks at {baud} baud")
+    return results, problems
+
+
+def scenario_fingerprint(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    import contextlib
+    import io
+    import ota_sender
+    from lgs_client import BenchFleet, BenchTransport, LgsClient, LgsError
+
+    problems: list[str] = []
+    running = os.path.join(ROOT, "assets", "firmware_stm32g070_v3.3.0_2026-08-13.bin")
+    other = os.path.join(ROOT, "assets", "firmware_stm32g070_v3.2.0_2026-08-06.bin")
+    with open(running, "rb") as f:
+        image = f.read()
+    with open(other, "rb") as f:
+        update = f.read()
+    crc = zlib.crc32(image)
+    results = []
+    for label, path in (("same", running), ("other", other)):
+        bus = BenchTransport(exe, ("--app", running), gap_s=0.025)
+        log = io.StringIO()
+        try:
+            bus.command(f"section fingerprint/{label}")
+            bus.pause(0.5)
+            regs = LgsClient(bus, DEFAULT_ID).read_registers(390, 6)
+            want = [len(image) >> 16, len(image) & 0xFFFF, crc >> 16, crc & 0xFFFF, 0, 0]
+            if regs != want:
+                problems.append(f"fingerprint/{label}: regs 390-395 {regs}, want {want}")
+            with contextlib.redirect_stdout(log):
+                rc = ota_sender.action_send(bus, [DEFAULT_ID], path, repair_rounds=5,
+                                            broadcast_apply=False, yes=True, fresh=True)
+            state = LgsClient(bus, DEFAULT_ID).read_registers(282, 1) if label == "same" else None
+            staged = bytes.fromhex(bus.command(f"stage {len(update)}", "stage"))
+        finally:
+            bus.close()
+        text = log.getvalue()
+        res = Result("\n".join(bus.lines))
+        results.append(res)
+        problems += counter_problems(res)
+        erases = sum(c["erases"] for c in res.counters.values())
+        if label == "same":
+            # Probe only: no metadata, no coil 505, nothing erased.
+            if rc != 0 or "already running this image" not in text or state != [0] or erases:
+                problems.append(f"fingerprint/same: rc {rc}, state {state}, {erases} erases")
+            print(f"  board runs {os.path.basename(running)}: send of the same file skipped "
+                  f"after the probe ({erases} erases)")
+        else:
+            # rc 1: verified and applied, but the bench does not come back to confirm.
+            if rc != 1 or "already running" in text or staged != update:
+                problems.append(f"fingerprint/other: rc {rc}, staged image intact {staged == update}")
+            print(f"  send of {os.path.basename(other)}: full session, {erases} erases")
+
+    # Both on one line: 247 runs the file, 21 an older image. Only 21 may
+    # see the session — --broadcast-apply included, which would leave error
+    # 6 (apply while not verified) in 247's reg 282.
+    stale = 21
+    at24 = os.path.join(tmp, "fingerprint_21.at24")
+    second_board(exe, at24, stale)
+    fleet = BenchFleet(exe, {DEFAULT_ID: ("--app", running), stale: ("--at24", at24, "--app", other)},
+                       gap_s=0.025)
+    log = io.StringIO()
+    try:
+        fleet.command("section fingerprint/fleet")
+        fleet.pause(0.5)
+        current = fleet.boards[DEFAULT_ID]
+        before = current.command(f"stage {len(image)}", "stage")
+        with contextlib.redirect_stdout(log):
+            rc = ota_sender.action_send(fleet, [DEFAULT_ID, stale], running, repair_rounds=5,
+                                        broadcast_apply=True, yes=True, fresh=True)
+        try:
+            state = LgsClient(fleet, DEFAULT_ID).read_registers(282, 1)
+        except LgsError:
+            state = None                # rebooted by the apply
+        untouched = current.command(f"stage {len(image)}", "stage") == before
+        staged = bytes.fromhex(fleet.boards[stale].command(f"stage {len(image)}", "stage"))
+        resets = {uid: fleet.resets(uid) for uid in (DEFAULT_ID, stale)}
+    finally:
+        fleet.close()
+    text = log.getvalue()
+    for uid in (DEFAULT_ID, stale):
+        res = Result("\n".join(fleet.lines[uid]))
+        results.append(res)
+        problems += counter_problems(res)
+    erases = sum(c["erases"] for c in results[-2].counters.values())
+    if (rc != 1 or f"skipping [{DEFAULT_ID}]" not in text or state != [0] or erases
+            or not untouched or resets != {DEFAULT_ID: 0, stale: 1} or staged != image):
+        problems.append(f"fingerprint/fleet: rc {rc}, id {DEFAULT_ID} state {state}, {erases} erases, "
+                        f"staging untouched {untouched}, resets {resets}, "
+                        f"id {stale} staged the image {staged == image}")
+    print(f"  two boards, one current: id {stale} updated; id {DEFAULT_ID} {erases} erases, "
+          f"staging untouched: {untouched}, {resets[DEFAULT_ID]} resets")
+    return results, problems
+
+
+def scenario_replay(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    import time
+    from lgs_capture import compare, cut, replay_bench
+    from lgs_client import BenchTransport, LgsClient, rtu
+    from lgs_client.capture import DEVICE, MASTER, Run, read_capture
+
+    problems: list[str] = []
+
+    def expect(cond: bool, label: str) -> None:
+        if not cond:
+            problems.append(f"replay: {label}")
+
+    def replayed(label: str, runs: list[Run], answered: bool = False) -> list[str]:
+        lines: list[str] = []
+        ok = compare(runs, replay_bench(exe, runs, DEFAULT_ID), DEFAULT_ID, answered, out=lines.append)
+        expect(ok, f"{label}: " + "; ".join(lines))
+        print(f"  {label}: {lines[0].split(': ', 1)[1]}; {lines[1].split(': ', 1)[1]}")
+        return lines
+
+    # Recorded: a poll-and-configure session on the build's own line.
+    path = os.path.join(tmp, "session.lgscap")
+    bus = BenchTransport(exe, gap_s=0.025, capture=path)
+    try:
+        bus.command("section replay/record")
+        bus.pause(0.5)
+        dev = LgsClient(bus, DEFAULT_ID)
+        for i in range(16):
+            dev.info()
+            dev.read_stats()
+            dev.set_preset(1 + i % 8, rgb=(i, 2 * i, 3 * i), brightness=40 + i)
+            dev.light(1 + i % 8)
+            bus.pause(0.3)
+    finally:
+        bus.close()
+    res = Result("\n".join(bus.lines))
+    _, runs = read_capture(path)
+    sent = sum(len(r.data) for r in runs if r.kind == MASTER)
+    got = sum(len(r.data) for r in runs if r.kind == DEVICE)
+    expect((sent, got) == (bus.stats.tx_bytes, bus.stats.rx_bytes),
+           f"capture holds {sent}/{got} B, the transport counted "
+           f"{bus.stats.tx_bytes}/{bus.stats.rx_bytes}")
+    print(f"  {bus.stats.transactions} transactions, {sent + got} B on the line -> "
+          f"{os.path.getsize(path)} B capture")
+
+    # The same build, the same bytes at the same times: the same replies.
+    lines = replayed("replayed", runs)
+    expect(lines[1].split(": ")[1].startswith(f"{bus.stats.transactions} same"), lines[1])
+
+    # The hub: every 3rd request cut after 3 bytes, the rest 30 ms later.
+    # The halves go unanswered and leave nothing behind (modbusServerTick
+    # drops them after two gaps): every intact request still answered.
+    hub, made = cut(runs, 3, 3, 30_000)
+    replayed(f"{made} cut", hub, answered=True)
+
+    # An hour of 1 Hz polling, in seconds.
+    poll = rtu.adu(DEFAULT_ID, rtu.read_registers(0, 23))
+    hour = [Run(1_000_000 + i * 1_000_000, MASTER, poll, 9600) for i in range(3600)]
+    t0 = time.perf_counter()
+    replayed("1 h of polling", hour, answered=True)
+    wall = time.perf_counter() - t0
+    expect(wall < 60, f"an hour of bus took {wall:.1f} s to replay")
+    return [res], problems + counter_problems(res)
+
+
+def scenario_sniff(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    import time
+    from dataclasses import replace
+    from lgs_capture import exchanges
+    from lgs_client import BenchTransport, LgsClient, rtu
+    from lgs_client.capture import DEVICE, byte_us, frame_gap_us, frames, read_capture
+    from lgs_sniff import Analyzer, percentile
+
+    problems: list[str] = []
+
+    def expect(cond: bool, label: str) -> None:
+        if not cond:
+            problems.append(f"sniff: {label}")
+
+    # A bus with some of everything: polls and writes to the build, an
+    # exception, a broadcast, requests for an ID nobody has.
+    path = os.path.join(tmp, "bus.lgscap")
+    bus = BenchTransport(exe, gap_s=0.025, capture=path)
+    try:
+        bus.command("section sniff/record")
+        bus.pause(0.5)
+        dev, ghost, everyone = LgsClient(bus, DEFAULT_ID), LgsClient(bus, 9), LgsClient(bus, 0)
+        for i in range(8):
+            dev.info()
+            dev.read_stats()
+            dev.set_preset(1 + i % 8, rgb=(i, 2 * i, 3 * i), brightness=40 + i)
+            everyone.write_registers(60, [i])
+            for client, addr in ((dev, 9000), (ghost, 0)):
+                try:
+                    client.read_registers(addr, 1)
+                except rtu.LgsError:
+                    pass
+            bus.pause(0.3)
+    finally:
+        bus.close()
+    res = Result("\n".join(bus.lines))
+    _, runs = read_capture(path)
+
+    # What the capture's recorded sides say, against what the tap works out.
+    truth = exchanges(runs)
+    want = {"frames": len(frames(runs)), "broadcasts": sum(ex.request.data[0] == 0 for ex in truth)}
+    for uid in (DEFAULT_ID, 9):
+        mine = [ex for ex in truth if ex.request.data[0] == uid]
+        want[uid] = (len(mine), sum(ex.reply is not None for ex in mine),
+                     sum(bool(ex.reply and ex.reply[1] & 0x80) for ex in mine),
+                     sum(ex.reply is None for ex in mine))
+    latencies = [ex.latency_us for ex in truth if ex.latency_us is not None]
+
+    def sniffed(label: str, feed, bad_crc: int = 0, jitter_us: float = 0) -> Analyzer:
+        sides: list[int] = []
+        an = Analyzer(runs[0].baud, jitter_us=jitter_us, on_frame=lambda f, gap: sides.append(f.kind))
+        feed(an)
+        an.finish()
+        r = an.report()
+        got = {"frames": r["frames"], "broadcasts": r["broadcasts"]}
+        for uid in (DEFAULT_ID, 9):
+            s = r["slaves"].get(uid, {})
+            got[uid] = tuple(s.get(k, 0) for k in ("requests", "replies", "exceptions", "unanswered"))
+        if bad_crc:
+            want_here = {**want, DEFAULT_ID: (want[DEFAULT_ID][0], want[DEFAULT_ID][1] - bad_crc,
+                                              *want[DEFAULT_ID][2:])}
+        else:
+            want_here = want
+            expect(sides == [f.kind for f in frames(runs)], f"{label}: sides guessed wrong")
+        expect(got == want_here, f"{label}: {got} against the capture's {want_here}")
+        expect(r["bad_crc"] == bad_crc, f"{label}: {r['bad_crc']} bad CRC, {bad_crc} made")
+        print(f"  {label}: {r['frames']} frames, util {r['utilization']:.1%}, "
+              f"id {DEFAULT_ID} p50 {r['slaves'][DEFAULT_ID]['p50_ms']} ms, bad CRC {r['bad_crc']}")
+        return an
+
+    def exact(an: Analyzer) -> None:
+        for r in runs:
+            an.feed(r.data, r.t_us)
+
+    an = sniffed("recorded sides", exact)
+    p50 = percentile(an.slaves[DEFAULT_ID].latency, 0.5)
+    true_p50 = sorted(latencies)[(len(latencies) - 1) // 2] / 1000
+    expect(p50 is not None and abs(p50 - true_p50) <= 0.1,
+           f"latency p50 {p50} ms, the capture says {true_p50:.2f} ms")
+
+    # One reply damaged: a bad CRC for the ID, its request settled, not unanswered.
+    hit = next(i for i, r in enumerate(runs) if r.kind == DEVICE and r.data[0] == DEFAULT_ID)
+    damaged = list(runs)
+    damaged[hit] = replace(runs[hit], data=runs[hit].data[:-1] + bytes([runs[hit].data[-1] ^ 0xFF]))
+    sniffed("one reply damaged", lambda an: [an.feed(r.data, r.t_us) for r in damaged], bad_crc=1)
+
+    # A USB adapter's batches: what arrived in each 16 ms, timestamped when
+    # read. The silences inside a batch are gone and false ones open between
+    # batches; past the live --jitter the splitter goes by length and CRC.
+    def batched(an: Analyzer) -> None:
+        step = byte_us(runs[0].baud)
+        timeline = [(r.t_us + (i + 1) * step, b) for r in runs for i, b in enumerate(r.data)]
+        i, t = 0, 0.0
+        while i < len(timeline):
+            t += 16_000
+            j = i
+            while j < len(timeline) and timeline[j][0] <= t:
+                j += 1
+            if j > i:
+                an.feed(bytes(b for _, b in timeline[i:j]), t - (j - i) * step)
+            an.idle(t)
+            i = j
+
+    sniffed("16 ms USB batches", batched, jitter_us=20_000)
+
+    # Throughput: a saturated 57600 line — request, reply, 3.5 characters
+    # apart, back to back — in the 2 ms reads the live loop makes, with its
+    # jitter: no silence is long enough, every frame is cut out by length.
+    baud, step = 57600, byte_us(57600)
+    pair = [rtu.adu(DEFAULT_ID, rtu.read_registers(0, 23)), rtu.adu(DEFAULT_ID, bytes([3, 46]) + bytes(46))]
+    t_line = 0.0
+    reads: list[tuple[bytes, float]] = []
+    while t_line < 60e6:
+        for f in pair:
+            reads.append((f, t_line))
+            t_line += len(f) * step + frame_gap_us(baud)
+    an = Analyzer(baud, jitter_us=20_000)
+    t0 = time.perf_counter()
+    pending, due = bytearray(), 2000.0
+    for f, t in reads:
+        if t >= due:
+            an.feed(bytes(pending), due - len(pending) * step)
+            pending.clear()
+            due = (t // 2000 + 1) * 2000
+        pending += f
+    an.feed(bytes(pending), due - len(pending) * step)
+    an.finish()
+    wall = time.perf_counter() - t0
+    r = an.report()
+    expect(r["slaves"][DEFAULT_ID]["replies"] == len(reads) // 2,
+           f"saturated line: {r['slaves'][DEFAULT_ID]['replies']} of {len(reads) // 2} exchanges")
+    print(f"  60 s of saturated 57600 baud ({r['bytes']:,} B, util {r['utilization']:.1%}) "
+          f"decoded in {wall:.2f} s ({60 / wall:.0f}x real time)")
+    expect(wall < 20, f"60 s of 57600 baud took {wall:.1f} s to decode")
+    return [res], problems + counter_problems(res)
+
+
+def scenario_profile(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    prof_first, prof_count, stride = 460, 88, 12
+    s = Script("profile")
+    s.run(1500)
+    s.section("traffic")
+    for i in range(10):
+        s.request(fc03(DEFAULT_ID, 400, 52), f"statistics read {i}")
+        s.request(fc01(DEFAULT_ID, 1001, 38), f"coil read {i}")
+    s.run(1200)                       # let the block republish
+    s.request(fc03(DEFAULT_ID, prof_first, prof_count), "profile after traffic")
+    s.section("reset")
+    s.expect_ok(fc05(DEFAULT_ID, 512, True), "coil 512 resets the profile")
+    s.run(1500)
+    s.request(fc03(DEFAULT_ID, prof_first, prof_count), "profile after reset")
+    s.request(fc01(DEFAULT_ID, 512, 1), "coil 512 self-clears",
+              lambda r: None if bits_of(r, 1) == [0] else f"coil {bits_of(r, 1)}")
+    res, problems = execute(exe, s)
+
+    def decode(reply):
+        regs = regs_of(reply)
+        if regs is None or len(regs) != prof_count:
+            return None
+        loops = (regs[0] << 16) | regs[1]
+        stages = []
+        for st in range(len(STAGES)):
+            r = regs[4 + stride * st:4 + stride * (st + 1)]
+            stages.append(((r[0] << 16) | r[1], r[2], r[4:12]))
+        return loops, stages
+
+    before, after = decode(res.replies[20]), decode(res.replies[22])
+    if before is None or after is None:
+        return [res], problems + ["profile: block unreadable"]
+    for label, (loops, stages) in (("traffic", before), ("reset", after)):
+        for name, (peak, avg, buckets) in zip(STAGES, stages):
+            want = loops - 1 if name == "loop" else loops
+            if sum(buckets) != want:
+                problems.append(f"profile/{label}: {name} histogram holds {sum(buckets)} loops, want {want}")
+            if avg > peak:
+                problems.append(f"profile/{label}: {name} average {avg} us above its max {peak} us")
+    loops, stages = before
+    modbus_peak, period_peak = stages[0][0], stages[-1][0]
+    bench_peak = res.stats["profile/traffic"]["modbus"][4]
+    print(f"  on-device: {loops} loops, modbus max {modbus_peak} us, loop max {period_peak} us "
+          f"(bench saw {bench_peak} us)")
+    if not 100_000 <= modbus_peak <= bench_peak:
+        problems.append(f"profile: modbus max {modbus_peak} us, bench measured {bench_peak} us")
+    if period_peak < modbus_peak:
+        problems.append("profile: loop period max below a stage max")
+    if after[0] == 0 or after[1][0][0] >= 1000:
+        problems.append(f"profile: coil 512 left {after[0]} loops, modbus max {after[1][0][0]} us")
+
+    # Past the u16 ceiling: ~150k loops with a period under 256 us, then as
+    # many under 4 ms. Each full bucket halves the stage, so the recent rate
+    # dominates; a saturating counter would read 65535 in both.
+    long = Script("profile-long")
+    long.run(500)
+    long.cmd("quantum 100")
+    long.run(15_000)
+    long.cmd("quantum 2000")
+    long.run(300_000)
+    long.cmd("quantum 50")
+    long.run(1200)
+    long.request(fc03(DEFAULT_ID, prof_first, prof_count), "profile after 300k loops")
+    third, more = execute(exe, long)
+    problems += more
+    decoded = decode(third.replies[0]) if third.replies else None
+    if decoded is None:
+        problems.append("profile-long: block unreadable")
+    else:
+        period = decoded[1][-1][2]
+        if not (period[3] >= 32768 and 0 < period[1] <= period[3] // 2):
+            problems.append(f"profile-long: loop period histogram {period}, want <4ms "
+                            f"dominant and <256us halved but kept")
+    return [res, third], problems
+
+
+def group_entries(*pairs: tuple[int, int]) -> list[int]:
+    return [v for pair in pairs for v in pair]
+
+
+def scenario_group(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    group_seq, group_mask, target_all, coil_off, show_number = 560, 82, 0x100, 0x8000, 0x4000
+    seq = 0
+
+    def broadcast(*pairs: tuple[int, int], same_seq: bool = False) -> bytes:
+        nonlocal seq
+        seq += 0 if same_seq else 1
+        return fc16(0, group_seq, [seq, len(pairs), *group_entries(*pairs)])
+
+    s = Script("group")
+    s.run(500)
+    s.expect_ok(fc16(DEFAULT_ID, 110, [60, 255, 0, 0, 600]), "preset 1 red")
+    s.expect_ok(fc16(DEFAULT_ID, 120, [60, 0, 255, 0, 600]), "preset 2 green")
+    s.expect_ok(fc06(DEFAULT_ID, group_mask, 0b101), "member of groups 1 and 3")
+    s.section("apply")
+    checks = [
+        (broadcast((5, 1001), (target_all + 2, 1002), (DEFAULT_ID, 1001)),
+         [1, 0, 0, 0, 0, 0, 0, 0], "own ID applies; another ID and group 2 do not"),
+        (broadcast((target_all + 3, 1002)), [0, 1, 0, 0, 0, 0, 0, 0], "group 3 member"),
+        (broadcast((target_all, 511)), [0] * 8, "all-modules All Off"),
+        (broadcast((DEFAULT_ID, 1001), same_seq=True), [0] * 8, "same sequence ignored"),
+        (broadcast((DEFAULT_ID, 1003), (target_all + 1, coil_off | 1003)), [0] * 8,
+         "later entry (group 1, off) wins"),
+        (broadcast((DEFAULT_ID, 1004), (target_all + 16, coil_off | 1004)), [0, 0, 0, 1, 0, 0, 0, 0],
+         "group 16 not a member"),
+    ]
+    for frame, want, label in checks:
+        s.send(frame, 2000)
+        s.run(50)
+        s.request(fc01(DEFAULT_ID, 1001, 8), label,
+                  lambda r, want=want: None if bits_of(r, 8) == want else f"enable coils {bits_of(r, 8)}")
+    s.send(broadcast((DEFAULT_ID, show_number + 12), (target_all + 1, 1011)), 2000)
+    s.run(50)
+    s.expect_regs(DEFAULT_ID, 60, [12], "quantity on the display")
+    s.request(fc01(DEFAULT_ID, 1010, 2), "display preset 1 lit with the display on",
+              lambda r: None if bits_of(r, 2) == [1, 1] else f"coils {bits_of(r, 2)}")
+    s.cmd("sense 1")
+    s.send(broadcast((target_all + 3, 1021)), 2000)
+    s.run(700)
+    s.cmd("sense 0")
+    s.cmd("pulses")
+    s.expect_ok(fc05(DEFAULT_ID, 1011, False), "preset 1 off")
+    s.run(50)
+    s.cmd("ring")
+
+    # Bus time to light N slots. Unicast: one FC05 per module, each waiting
+    # for its echo. Group: one broadcast carrying all N entries, timed from
+    # the end of the previous frame to this module's ring being redrawn with
+    # its entry last in the list (the worst case on the bus).
+    sizes = (10, 30, MAX_GROUP_ENTRIES)
+    for n in sizes:
+        s.section(f"unicast-{n}")
+        s.cmd("clock")
+        for i in range(n):
+            s.request(fc05(DEFAULT_ID, 1001 + i % 2, True), f"unicast {n}: slot {i}")
+        s.cmd("clock")
+        s.section(f"group-{n}")
+        s.cmd("clock")
+        s.send(broadcast(*[(i + 1, 1001 + n % 2) for i in range(n - 1)],
+                         (DEFAULT_ID, 1001 + (n + 1) % 2)), 2000)
+        s.cmd("settle 500")
+    res, problems = execute(exe, s)
+
+    pulses = res.dumps.get("pulses", [""])[0].split()
+    if len(pulses) != 1:
+        problems.append(f"group: latch entry gave pulses {pulses}, want one")
+    if not res.dumps.get("ring", ["x"])[0].startswith("000000"):
+        problems.append(f"group: ring {res.dumps.get('ring')} after the last preset went off")
+    clocks = [int(c) for c in res.dumps.get("clock", [])]
+    settles = res.dumps.get("settle", [])
+    if len(clocks) != 3 * len(sizes) or len(settles) != len(sizes) or "-" in settles:
+        return [res], problems + [f"group: timing incomplete (clock {clocks}, settle {settles})"]
+    for k, n in enumerate(sizes):
+        unicast_us = clocks[3 * k + 1] - clocks[3 * k]
+        group_us = int(settles[k]) - clocks[3 * k + 2]
+        print(f"  {n:>2} slots: unicast {unicast_us / 1000:7.1f} ms, "
+              f"group broadcast {group_us / 1000:6.1f} ms ({unicast_us / group_us:4.1f}x)")
+        if group_us >= unicast_us:
+            problems.append(f"group: {n} slots took {group_us} us as a broadcast, "
+                            f"{unicast_us} us unicast")
+    return [res], problems
+
+
+def scenario_client(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    import asyncio
+    from lgs_client import AsyncLgsClient, BenchTransport, LgsClient, Preset, plan_reads
+
+    problems: list[str] = []
+
+    def expect(cond: bool, label: str) -> None:
+        if not cond:
+            problems.append(f"client: {label}")
+
+    bus = BenchTransport(exe, gap_s=0.025)     # the tools' inter-frame gap
+    try:
+        bus.command("section client/ops")
+        bus.pause(0.5)
+        dev = LgsClient(bus, DEFAULT_ID)
+
+        def cost(fn) -> tuple[int, int]:
+            """(transactions, bus us) spent by fn."""
+            n, t = bus.stats.transactions, bus.clock_us()
+            fn()
+            return bus.stats.transactions - n, bus.clock_us() - t
+
+        info = dev.info()
+        expect(info.fw_version == fw_version() and info.identifier == DEFAULT_ID,
+               f"info {info.fw_version}/{info.identifier}")
+
+        sweep = list(range(0, 23)) + [40, 41, 60, 80, 82, 190, 194] + list(range(200, 282)) \
+            + list(range(400, 452)) + list(range(460, 548))
+        n, _ = cost(lambda: dev.read_map(sweep))
+        expect(n == len(plan_reads(sweep)), f"sweep of {len(sweep)} registers took {n} reads")
+        got = dev.read_map([3, HOLDING_CEILING])
+        expect(got == {3: 9600, HOLDING_CEILING: None}, f"read past the map: {got}")
+
+        # The eight-brightness restore test_modbus_rtu used to do with eight
+        # FC06s: one FC03 snapshot, then one FC16 bridged by the snapshot.
+        snapshot = dev.preset_registers()
+        dev.write_register(190, 37)
+        brightness = [110 + 10 * i for i in range(8)]
+
+        def one_by_one() -> None:
+            for a in brightness:
+                dev.write_register(a, snapshot[a])
+
+        def batched() -> None:
+            with dev.batch(fill=snapshot) as b:
+                for a in brightness:
+                    b.write(a, snapshot[a])
+
+        n_single, us_single = cost(one_by_one)
+        dev.write_register(190, 37)
+        n_batch, us_batch = cost(batched)
+        expect(n_batch == 1 and us_batch < us_single and dev.preset_registers() == snapshot,
+               f"brightness restore took {n_batch} transactions, {us_batch} us")
+        print(f"  8-brightness restore: {n_single} FC06 {us_single / 1000:.1f} ms, "
+              f"{n_batch} FC16 {us_batch / 1000:.1f} ms")
+
+        scheme = {k: Preset(40 + k, 10 * k, 255 - 10 * k, k, 600 + k) for k in range(1, 9)}
+        n, _ = cost(lambda: dev.set_presets(scheme, fill=snapshot))
+        expect(n == 1 and dev.presets() == scheme, f"eight presets took {n} transactions")
+        n, _ = cost(lambda: dev.set_preset(3, rgb=(1, 2, 3), brightness=55))
+        expect(n == 1 and dev.preset(3) == Preset(55, 1, 2, 3, 603), f"set_preset took {n}")
+
+        # A solo register splits the batch and keeps its place in the order:
+        # 110 lands, the fan-out overwrites it, then 111 lands.
+        with dev.batch() as b:
+            b.write(110, 11)
+            b.write(190, 66)
+            b.write(111, 99)
+        p1 = dev.preset(1)
+        expect((p1.brightness, p1.r) == (66, 99), f"solo write order: preset 1 {p1}")
+
+        dev.light(2)
+        expect(dev.enabled_presets() == [2], "light(2)")
+        dev.all_off()
+        stats = dev.read_stats()
+        expect(stats.v2 and stats.presets[2][0] == 1, f"stats {stats}")
+
+        async def together() -> list:
+            clients = [AsyncLgsClient(bus, DEFAULT_ID) for _ in range(4)]
+            return await asyncio.gather(*(c.preset(k + 1) for k, c in enumerate(clients)))
+
+        got = asyncio.run(together())
+        expect(got[:2] == [Preset(66, 99, 245, 1, 601), Preset(66, 20, 235, 2, 602)],
+               f"async reads over one transport: {got[:2]}")
+        bus.command("section client/end")
+    finally:
+        bus.close()
+    res = Result("\n".join(bus.lines))
+    print(f"  {bus.stats.transactions} transactions, {bus.stats.tx_bytes + bus.stats.rx_bytes} bytes")
+    return [res], problems + counter_problems(res)
+
+
+def scenario_sync(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    from lgs_client import BenchTransport, LgsClient, Preset
+    from lgs_sync import FleetConfig, sync_fleet
+
+    problems: list[str] = []
+
+    def expect(cond: bool, label: str) -> None:
+        if not cond:
+            problems.append(f"sync: {label}")
+
+    # Presets 1-7 as the firmware ships them, so only the rest differ.
+    factory = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 215, 0),
+               (0, 255, 255), (255, 0, 255), (255, 60, 0)]
+    doc = {
+        "defaults": {"presets": {str(n + 1): {"rgb": list(rgb)} for n, rgb in enumerate(factory)}
+                     | {"8": {"rgb": [10, 20, 30], "max_on_s": 900}},
+                     "unlock_delay_ms": 300},
+        "groups": {"2": {"presets": {"1": {"rgb": [0, 0, 255], "brightness": 40}}}},
+        "devices": {str(DEFAULT_ID): {"groups": [2]}},
+    }
+    config = FleetConfig(doc)
+    bus = BenchTransport(exe, gap_s=0.025)
+    try:
+        bus.command("section sync/run")
+        bus.pause(0.5)
+        quiet = lambda line: None
+
+        def run(**kw):
+            n = bus.stats.transactions
+            results, used = sync_fleet(bus, config, [DEFAULT_ID], out=quiet, **kw)
+            return results[0], used, bus.stats.transactions - n
+
+        r, _, _ = run(dry_run=True)
+        expect(r.status == "dry-run" and len(r.changed) == 9, f"dry run: {r.status}, {r.changed}")
+        r, used_first, n_first = run()
+        # 110-113 (112 bridged from the snapshot), 181-184, 80, 82: reg 81
+        # is not managed, so it is never re-written to join the last two.
+        expect(r.status == "ok" and r.writes == 4,
+               f"first sync: {r.status} {r.note}, {r.writes} write(s)")
+        dev = LgsClient(bus, DEFAULT_ID)
+        expect(dev.preset(1) == Preset(40, 0, 0, 255, 3600) and dev.preset(8) == Preset(80, 10, 20, 30, 900)
+               and dev.read_register(80) == 300 and dev.read_register(82) == 0b10,
+               "device state after the first sync")
+        r, used_again, n_again = run(persist=True)
+        expect(r.status == "unchanged" and not r.persisted and bus.resets == 0,
+               f"second sync: {r.status}, persisted {r.persisted}")
+        blind = r.blind_bytes
+        print(f"  first sync {n_first} transactions {used_first} B, in-sync rerun {n_again} "
+              f"transactions {used_again} B; blind full push {blind} B")
+        expect(used_again < blind, f"in-sync rerun used {used_again} B, blind push {blind} B")
+
+        doc["defaults"]["unlock_delay_ms"] = 450
+        config = FleetConfig(doc)
+        r, _, _ = run(persist=True)
+        expect(r.status == "ok" and r.persisted and bus.resets == 1,
+               f"changed + persist: {r.status}, resets {bus.resets}")
+    finally:
+        bus.close()
+    res = Result("\n".join(bus.lines))
+    return [res], problems + counter_problems(res)
+
+
+def scenario_baud(exe: str, tmp: str) -> tuple[list[Result], list[str]]:
+    from lgs_baud import Migration
+    from lgs_client import BenchFleet, BenchTransport, LgsClient
+    from lgs_client import regmap as rm
+
+    problems: list[str] = []
+    buses: list[BenchTransport] = []
+    at24 = os.path.join(tmp, "baud_at24.bin")
+
+    def expect(cond: bool, label: str) -> None:
+        if not cond:
+            problems.append(f"baud: {label}")
+
+    def open_bus(baud: int) -> BenchTransport:
+        # A fresh process per rate: the bench does not reboot, but the next
+        # one boots from the AT24 image the last one saved on exit.
+        bus = BenchTransport(exe, ("--at24", at24), baud=baud, gap_s=0.025)
+        buses.append(bus)
+        bus.command(f"section baud/{baud}#{len(buses)}")
+        bus.pause(0.5)
+        return bus
+
+    lines: list[str] = []
+    m = Migration(open_bus, [DEFAULT_ID], 9600, 57600, cycles=2, out=lines.append)
+    expect(m.run(dry_run=True) == 0 and len(buses) == 1 and buses[0].resets == 0,
+           f"dry run: {lines}")
+    lines.clear()
+    m = Migration(open_bus, [DEFAULT_ID], 9600, 57600, cycles=2, out=lines.append)
+    rc = m.run()
+    dev = m.devices[0]
+    expect(rc == 0 and dev.status == "moved" and dev.at == 57600, f"9600 -> 57600: {lines}")
+    slow, fast = m.poll_s.get(9600), m.poll_s.get(57600)
+    expect(bool(slow and fast and fast < slow), f"poll cycle {slow} s -> {fast} s")
+    if slow and fast:
+        print(f"  poll cycle 9600 {slow * 1000:.1f} ms -> 57600 {fast * 1000:.1f} ms "
+              f"({slow / fast:.1f}x)")
+
+    bus = open_bus(57600)
+    try:
+        info = LgsClient(bus, DEFAULT_ID).info()
+        expect(info.baud == 57600, f"after the move: reg 3 {info.baud}")
+    finally:
+        bus.close()
+
+    lines.clear()
+    m = Migration(open_bus, [DEFAULT_ID], 57600, 9600, cycles=1, out=lines.append)
+    expect(m.run() == 0 and m.devices[0].at == 9600, f"57600 -> 9600: {lines}")
+    results = [Result("\n".join(b.lines)) for b in buses]
+
+    # Two modules on one line, one of which never takes the new rate: it
+    # misses every coil 503 (as the canary, then as one of the rest).
+    # Either way the bus must end on one rate, the old one.
+    fleets: list[BenchFleet] = []
+    for case, refuses in (("straggler", DEFAULT_ID), ("canary", 21)):
+        boards = {uid: ("--at24", os.path.join(tmp, f"baud_{case}_{uid}.at24"))
+                  for uid in (DEFAULT_ID, 21)}
+        second_board(exe, boards[21][1], 21)
+
+        def open_fleet(baud: int, boards=boards, refuses=refuses) -> BenchFleet:
+            fleet = BenchFleet(exe, boards, baud=baud, gap_s=0.025,
+                               lose=lambda uid, f: uid == refuses and f[1] == 5
+                               and f[2:4] == rm.COIL_WRITE_TO_EEPROM.to_bytes(2, "big"))
+            fleets.append(fleet)
+            fleet.pause(0.5)
+            return fleet
+
+        lines.clear()
+        m = Migration(open_fleet, [21, DEFAULT_ID], 9600, 57600, cycles=1,
+                      out=lines.append)       # canary: 21, the lowest
+        rc = m.run()
+        status = {d.uid: d.status for d in m.devices}
+        want = ({21: "rolled back", DEFAULT_ID: "not moved"} if case == "straggler"
+                else {21: "not moved", DEFAULT_ID: "not moved"})
+        expect(rc == 1 and status == want, f"{case}: rc {rc}, {status}: {lines}")
+        for baud in rm.BAUD_RATES:
+            fleet = open_fleet(baud)
+            try:
+                here = {uid: LgsClient(fleet, uid).read_register(rm.REG_BAUD_RATE)
+                        for uid in fleet.boards}
+            finally:
+                fleet.close()
+            want_here = {21: 9600, DEFAULT_ID: 9600} if baud == 9600 else {}
+            expect(here == want_here, f"{case}: at {baud} reg 3 reads {here}, want {want_here}")
+    results += [Result("\n".join(out)) for fleet in fleets for out in fleet.lines.values()]
+    return results, problems + [p for res in results for p in counter_problems(res)]
+
+
+SCENARIOS = {
+    "idle": scenario_idle,
+    "poll-storm": scenario_poll_storm,
+    "preset-storm": scenario_preset_storm,
+    "latch": scenario_latch,
+    "stats": scenario_stats,
+    "ota": scenario_ota,
+    "resume": scenario_resume,
+    "lz": scenario_lz,
+    "chunk": scenario_chunk,
+    "fingerprint": scenario_fingerprint,
+    "replay": scenario_replay,
+    "sniff": scenario_sniff,
+    "profile": scenario_profile,
+    "group": scenario_group,
+    "client": scenario_client,
+    "sync": scenario_sync,
+    "baud": scenario_baud,
+}
+
+
+# --- report --------------------------------------------------------------------
+
+def report(results: list[Result]) -> None:
+    print(f"\n{'section':<26}{'stage':<8}{'ticks':>9}{'cpu ns':>9}{'max ns':>9}"
+          f"{'wait ms':>10}{'max wait ms':>13}")
+    for res in results:
+        for section, stages in res.stats.items():
+            if not stages.get("loop", (0,))[0]:
+                continue
+            for stage in STAGES:
+                count, mean, peak, wait, wait_max = stages[stage]
+                if stage != "loop" and not wait and peak < 20_000 and stage != "modbus":
+                    continue            # keep the table to what matters
+                print(f"{section:<26}{stage:<8}{count:>9}{mean:>9}{peak:>9}"
+                      f"{wait / 1000:>10.1f}{wait_max / 1000:>13.1f}")
+            c = res.counters[section]
+            print(f"{'':<26}at24 {c['at24_cycles']} cycles/{c['at24_bytes']} B, "
+                  f"i2c {c['i2c_us'] / 1000:.1f} ms, uart tx {c['tx_us'] / 1000:.1f} ms, "
+                  f"erases {c['erases']}, oled {c['oled']}, "
+                  f"longest watchdog gap {c['wdg_max_gap_us'] / 1000:.1f} ms")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("scenarios", nargs="*", choices=[[], *SCENARIOS], help="default: all")
+    ap.add_argument("--cxx", help="host C++ compiler")
+    ap.add_argument("--build-dir", help="keep the objects and binary here")
+    args = ap.parse_args()
+
+    cxx = find_cxx(args.cxx)
+    if not cxx:
+        print("no host C++ compiler found (set --cxx or $CXX)")
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_dir = args.build_dir or tmp
+        os.makedirs(build_dir, exist_ok=True)
+        exe = build(cxx, build_dir)
+        print(f"built {len(sources())} translation units -> {os.path.relpath(exe, ROOT) if args.build_dir else 'lgs_host_bench'}")
+
+        results, failures = [], []
+        for name in args.scenarios or SCENARIOS:
+            print(f"scenario {name}")
+            res, problems = SCENARIOS[name](exe, tmp)
+            results += res
+            failures += problems
+
+    report(results)
+    print()
+    if failures:
+        for f in failures:
+            print("FAIL", f)
+        return 1
+    print("all scenarios passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
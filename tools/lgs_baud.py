@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LGS R5.0 - move a whole bus to another baud rate
+================================================
+A bus at 9600 spends six times as long on every poll and OTA chunk as the
+same bus at 57600, which every module already accepts (reg 3, whitelist
+9600/19200/38400/57600). The rate only changes at the coil 503 reset, and a
+module that misses it answers at the old rate while the rest have moved on:
+a split bus. This does the change for the whole bus, in steps that can be
+checked, and leaves it on one rate either way.
+
+  1. preflight  at the current rate, every listed ID must answer with its
+                own ID, run in RUN or DEMO mode (SET_ID and FACTORY_RESET
+                boot at 9600 whatever reg 3 says) and have no OTA session
+                open (a reset would drop it). Anything wrong: stop here,
+                nothing written.
+  2. measure    a poll cycle (the info block of every module) at the
+                current rate.
+  3. stage      reg 3 := new rate on every module, read back. Nothing has
+                changed on the wire yet; a failure writes the old rate back.
+  4. canary     coil 503 to the first ID (or --canary) alone, then look for
+                it at the new rate. Not there: un-stage the rest and stop.
+  5. the rest   coil 503 to each remaining ID, in ascending order, then
+                re-discover all of them at the new rate.
+  6. stragglers each module missing at the new rate is searched for at the
+                other rates. Found: staged again and reset once more. Still
+                apart after that: the modules already moved are rolled back
+                to the old rate, so the bus ends on one rate (--no-rollback
+                leaves it split and says so). A module found at no rate is
+                reported and left alone.
+  7. measure    the same poll cycle at the new rate.
+
+  ... tools/lgs_baud.py -p COM30 --ids 21-40 --to 57600
+  ... tools/lgs_baud.py -p COM30 --ids 21-40 --to 57600 --dry-run   # 1-2 only
+  ... tools/lgs_baud.py -p COM30 --ids 21-40 --from 57600 --to 9600
+
+The poll cycle counts the master's inter-frame gap (--gap) too, so the
+speed-up is less than the ratio of the rates. Exit status: 0 when every
+module answers at the new rate, 1 when the run stopped or rolled back, 2 on
+bad arguments. Transactions go through tools/lgs_client. Requirements:
+pyserial.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from dataclasses import dataclass
+
+from lgs_client import PERSIST_SETTLE_S, LgsClient, LgsError, SerialTransport, parse_ids
+from lgs_client import regmap as rm
+
+FIND_TRIES = 3            # probes at the new rate before a module counts as missing
+SAFE_MODES = {0: "RUN", 1: "DEMO"}
+BUSY_OTA_STATES = {1: "receiving", 2: "verified"}
+
+
+@dataclass
+class Device:
+    uid: int
+    fw: int = 0
+    stored_baud: int = 0      # reg 3 at preflight
+    status: str = "pending"   # pending / staged / moved / not moved / straggler / rolled back / lost
+    at: int | None = None     # rate it last answered at
+    note: str = ""
+
+
+class Migration:
+    """One bus, one rate change. open_bus(baud) returns a Transport at
+    that rate; the migration closes it again when it needs another."""
+
+    def __init__(self, open_bus, ids, old, new, *, canary=None, rollback=True,
+                 settle_s=PERSIST_SETTLE_S, cycles=3, out=print):
+        order = sorted(ids)
+        if canary is not None:
+            order.remove(canary)
+            order.insert(0, canary)
+        self.devices = [Device(uid) for uid in order]
+        self.open_bus, self.old, self.new = open_bus, old, new
+        self.rollback, self.settle_s, self.cycles, self.out = rollback, settle_s, cycles, out
+        self.bus, self.bus_baud = None, None
+        self.poll_s = {}          # baud: seconds for one poll cycle
+
+    # --- the line ------------------------------------------------------------------
+    def at(self, baud):
+        if self.bus_baud != baud:
+            self.close()
+            self.bus, self.bus_baud = self.open_bus(baud), baud
+        return self.bus
+
+    def close(self):
+        if self.bus is not None:
+            self.bus.close()
+        self.bus, self.bus_baud = None, None
+
+    def client(self, uid, baud):
+        return LgsClient(self.at(baud), uid)
+
+    def probe(self, uid, baud, tries=1):
+        """(reg 3, reg 4) if uid answers at baud, else None."""
+        for _ in range(tries):
+            try:
+                stored, identifier = self.client(uid, baud).read_registers(rm.REG_BAUD_RATE, 2)
+                return stored, identifier
+            except LgsError:
+                continue
+        return None
+
+    def search(self, uid, skip=()):
+        """The rate uid answers at, old rate first; None if it answers at none."""
+        for baud in [self.old] + [b for b in rm.BAUD_RATES if b != self.old]:
+            if baud not in skip and self.probe(uid, baud):
+                return baud
+        return None
+
+    def stage(self, dev, baud, value):
+        """Write reg 3 := value on dev (answering at baud) and read it back."""
+        dev_client = self.client(dev.uid, baud)
+        dev_client.write_register(rm.REG_BAUD_RATE, value)
+        back = dev_client.read_register(rm.REG_BAUD_RATE)
+        if back != value:
+            raise LgsError(f"id {dev.uid}: reg 3 reads {back} after writing {value}")
+
+    def persist(self, dev, baud):
+        self.client(dev.uid, baud).persist()
+
+    def settle(self):
+        self.bus.pause(self.settle_s)
+
+    # --- steps ---------------------------------------------------------------------
+    def preflight(self):
+        problems = []
+        for dev in self.devices:
+            try:
+                client = self.client(dev.uid, self.old)
+                info = client.info()
+                ota = client.read_map([rm.REG_OTA_STATE])[rm.REG_OTA_STATE]
+            except LgsError as e:
+                problems.append(str(e))
+                continue
+            dev.fw, dev.stored_baud, dev.at = info.fw_version, info.baud, self.old
+            if info.identifier != dev.uid:
+                problems.append(f"id {dev.uid}: answers but reg 4 reads {info.identifier}")
+            if info.mode not in SAFE_MODES:
+                problems.append(f"id {dev.uid}: function mode {info.mode} boots at 9600 regardless")
+            if ota is not None and (ota & 0xFF) in BUSY_OTA_STATES:
+                problems.append(f"id {dev.uid}: OTA session {BUSY_OTA_STATES[ota & 0xFF]}; "
+                                "finish or abort it first")
+            if info.baud not in (self.old, self.new):
+                dev.note = f"reg 3 held {info.baud}"
+        return problems
+
+    def poll_cycle(self, baud, devices):
+        """Median seconds to read every module's info block once."""
+        bus = self.at(baud)
+        times = []
+        for _ in range(self.cycles):
+            start = bus.now()
+            for dev in devices:
+                try:
+                    LgsClient(bus, dev.uid).info()
+                except LgsError:
+                    return None
+            times.append(bus.now() - start)
+        self.poll_s[baud] = statistics.median(times)
+        return self.poll_s[baud]
+
+    def unstage(self, devices):
+        for dev in devices:
+            try:
+                self.stage(dev, self.old, self.old)
+                dev.status = "not moved"
+            except LgsError as e:
+                dev.note = f"could not un-stage: {e}"
+
+    def move(self, devices):
+        """Coil 503 to each (answering at the old rate), then look for them
+        at the new one. Returns the ones that are not there."""
+        for dev in devices:
+            self.persist(dev, self.old)
+        self.settle()
+        missing = []
+        for dev in devices:
+            got = self.probe(dev.uid, self.new, FIND_TRIES)
+            if got and got[0] == self.new:
+                dev.status, dev.at = "moved", self.new
+            else:
+                missing.append(dev)
+        return missing
+
+    def retry(self, stragglers):
+        """Find each straggler, stage and reset it once more. Returns the
+        ones still not at the new rate."""
+        still = []
+        for dev in stragglers:
+            dev.at = self.search(dev.uid, skip=(self.new,))
+            if dev.at is None:
+                dev.status, dev.note = "lost", "answers at no whitelisted rate"
+                continue
+            try:
+                self.stage(dev, dev.at, self.new)
+                self.persist(dev, dev.at)
+            except LgsError as e:
+                dev.status, dev.note = "straggler", str(e)
+                still.append(dev)
+                continue
+            self.settle()
+            got = self.probe(dev.uid, self.new, FIND_TRIES)
+            if got and got[0] == self.new:
+                dev.status, dev.at, dev.note = "moved", self.new, "moved on the second reset"
+            else:
+                dev.at = self.search(dev.uid, skip=(self.new,))
+                dev.status = "straggler" if dev.at else "lost"
+                dev.note = "did not take the new rate on a second reset"
+                still.append(dev)
+        return still
+
+    def roll_back(self):
+        """Every module at the new rate, and every straggler found elsewhere,
+        back to the old rate."""
+        movers = [d for d in self.devices if d.at is not None and d.at != self.old]
+        # Stragglers still at the old rate hold the new one staged in reg 3:
+        # take it back, or the next coil 503 for any reason would move them.
+        self.unstage([d for d in self.devices if d.status == "straggler" and d.at == self.old])
+        for dev in movers:
+            try:
+                self.stage(dev, dev.at, self.old)
+                self.persist(dev, dev.at)
+            except LgsError as e:
+                dev.note = f"roll back failed: {e}"
+        if movers:
+            self.settle()
+        for dev in movers:
+            got = self.probe(dev.uid, self.old, FIND_TRIES)
+            if got and got[0] == self.old:
+                dev.status, dev.at = "rolled back", self.old
+            else:
+                dev.status = "straggler"
+                dev.note = dev.note or "did not come back at the old rate"
+
+    def run(self, dry_run=False):
+        out = self.out
+        try:
+            out(f"preflight: {len(self.devices)} module(s) at {self.old} baud")
+            problems = self.preflight()
+            if problems:
+                for p in problems:
+                    out(f"  [FAIL] {p}")
+                out("stopped before writing anything")
+                return 1
+            before = self.poll_cycle(self.old, self.devices)
+            if before is None:
+                out("  [FAIL] a module stopped answering while the poll cycle was timed")
+                return 1
+            out(f"  all answer; poll cycle {before * 1000:.0f} ms at {self.old}")
+            if dry_run:
+                return 0
+
+            staged = []
+            for dev in self.devices:
+                try:
+                    self.stage(dev, self.old, self.new)
+                except LgsError as e:
+                    out(f"  [FAIL] staging id {dev.uid}: {e}; writing {self.old} back")
+                    self.unstage(staged)
+                    return 1
+                dev.status = "staged"
+                staged.append(dev)
+            out(f"staged reg 3 = {self.new} on all")
+
+            canary, rest = self.devices[0], self.devices[1:]
+            if self.move([canary]):
+                canary.at = self.search(canary.uid, skip=(self.new,))
+                canary.status = "straggler" if canary.at else "lost"
+                canary.note = f"not at {self.new} after coil 503"
+                out(f"  [FAIL] canary id {canary.uid} not found at {self.new} "
+                    f"(answers at {canary.at}); un-staging the rest")
+                self.unstage(rest + ([canary] if canary.at == self.old else []))
+                return 1
+            out(f"canary id {canary.uid} answers at {self.new}")
+
+            stragglers = self.retry(self.move(rest)) if rest else []
+            split = [d for d in stragglers if d.at is not None]
+            if split and self.rollback:
+                out(f"  [FAIL] {len(split)} module(s) stayed off {self.new}: "
+                    f"rolling the bus back to {self.old}")
+                self.roll_back()
+            elif split:
+                out(f"  [WARN] {len(split)} module(s) stayed off {self.new}: the bus is split")
+            return 0 if all(d.status == "moved" for d in self.devices) else 1
+        except LgsError as e:
+            out(f"  [ERR] {e}")
+            return 1
+        finally:
+            self.report()
+            self.close()
+
+    def report(self):
+        out = self.out
+        out("")
+        for dev in self.devices:
+            at = f"@ {dev.at}" if dev.at else "@ ?"
+            out(f"  id {dev.uid:>3}: {dev.status:<11} {at:<8}" + (f" ({dev.note})" if dev.note else ""))
+        moved = [d for d in self.devices if d.status == "moved"]
+        if moved and len(moved) == len(self.devices):
+            after = self.poll_cycle(self.new, moved)
+            before = self.poll_s.get(self.old)
+            if after is not None and before:
+                out(f"poll cycle, {len(moved)} module(s): {before * 1000:.0f} ms at {self.old} -> "
+                    f"{after * 1000:.0f} ms at {self.new} ({before / after:.1f}x)")
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="LGS R5.0 bus baud migration: stage, canary, move, re-discover, roll back stragglers.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    ap.add_argument("-p", "--port", default="COM30", help="USB-RS485 serial port")
+    ap.add_argument("--ids", required=True, help="every module on the bus, e.g. 21,22,30-40")
+    ap.add_argument("--from", dest="old", type=int, default=9600, choices=rm.BAUD_RATES,
+                    help="the rate the bus runs at now")
+    ap.add_argument("--to", dest="new", type=int, required=True, choices=rm.BAUD_RATES,
+                    help="the rate to move it to")
+    ap.add_argument("--canary", type=int, help="ID to move first (default: the lowest)")
+    ap.add_argument("--no-rollback", action="store_true",
+                    help="leave stragglers where they are instead of rolling the bus back")
+    ap.add_argument("--cycles", type=int, default=3, help="poll cycles timed at each rate")
+    ap.add_argument("--dry-run", action="store_true", help="preflight and time the current rate only")
+    ap.add_argument("--gap", type=float, default=25.0, help="inter-frame gap in ms")
+    args = ap.parse_args()
+
+    try:
+        ids = parse_ids(args.ids)
+    except ValueError as e:
+        print(f"[ERR] --ids: {e}")
+        return 2
+    if args.old == args.new:
+        print(f"[ERR] the bus is already at {args.new}")
+        return 2
+    if args.canary is not None and args.canary not in ids:
+        print(f"[ERR] --canary {args.canary} is not in --ids")
+        return 2
+
+    def open_bus(baud):
+        return SerialTransport(args.port, baud, timeout=1.0, retries=1, gap_s=args.gap / 1000.0)
+
+    try:
+        open_bus(args.old).close()
+    except LgsError as e:
+        print(f"[ERR] {e}")
+        return 2
+    migration = Migration(open_bus, ids, args.old, args.new, canary=args.canary,
+                          rollback=not args.no_rollback, cycles=args.cycles)
+    return migration.run(dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LGS R5.0 - show, cut and replay bus captures
+============================================
+When a bus misbehaves during an OTA or a poll there was nothing to look at
+afterwards, and nothing to run the firmware against: the RS485 hub that
+cuts frames in half (the modbusServerTick comment) could only be seen on
+the cabinet. A capture (tools/lgs_client/capture.py) is every byte on the
+line, which side sent it and when, to the microsecond. Recording one:
+
+  ... tools/ota_sender.py ... --capture ota.lgscap          # any run of it
+  ... tools/test_modbus_rtu.py ... --capture sweep.lgscap
+  SerialTransport(port, capture=path) / BenchTransport(exe, capture=path)
+
+and then:
+
+  show     the capture as frames: time, gap, side, decoded request/reply,
+           bad CRCs, frames that stalled mid-way
+  cut      a copy with every Nth request cut in two, the rest GAP ms later
+           (what the hub does when it changes channel)
+  replay   the master's bytes, at their recorded times, into
+             the host build (default)  the firmware's svc/ and app/ layers
+                        on tools/host_bench.py's virtual line, commissioned
+                        to the captured ID and baud. Virtual time: an hour of
+                        bus in seconds (a coarse loop quantum across the
+                        silences, the bench's 50 us around every frame).
+             a module (--port)  in real time on a USB-RS485 adapter
+           and every reply to the replayed ID compared with the recorded
+           one: same bytes, same shape (ID, function, length; other data),
+           or diverged (missing, extra, exception against data). With
+           --answered the check is instead that every intact request was
+           answered — the regression test once an incident is fixed.
+           --speed N shrinks silences over 20 ms N times (never below 20
+           ms); in-frame stalls and turnarounds keep their timing.
+
+  ... tools/lgs_capture.py show ota.lgscap
+  ... tools/lgs_capture.py cut poll.lgscap hub.lgscap --every 5 --at 3 --gap 30
+  ... tools/lgs_capture.py replay hub.lgscap --answered
+  ... tools/lgs_capture.py replay ota.lgscap --speed 10 -o replayed.lgscap
+  ... tools/lgs_capture.py replay poll.lgscap --port COM30
+
+Exit status: 0 when the replay matched (or, --answered, every intact request
+was answered) and the build neither reset nor overran its watchdog or RX
+ring; 1 otherwise; 2 on bad arguments. The host build needs a C++
+compiler; --port needs pyserial.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
+
+from lgs_client import rtu
+from lgs_client.capture import (BAUD, DEVICE, MASTER, CaptureWriter, Frame, Run, byte_us, frames,
+                                read_capture, write_capture)
+
+DEFAULT_ID = 247
+LEAD_IN_US = 500_000        # the host build boots before the first replayed byte
+WINDOW_LEAD_US = 2_000      # fine quantum from this far before each request...
+WINDOW_TAIL_US = 10_000     # ...to this long after its recorded reply (or the request)
+SILENCE_FLOOR_US = 20_000   # --speed leaves silences shorter than this alone
+FINE_QUANTUM_US = 50        # tools/host/bench.cpp's own default
+IDLE_QUANTUM_US = 5_000
+
+
+def describe(f: Frame, name=None) -> str:
+    """One frame as the master or the module meant it; name(fc, addr), if
+    given, adds what the address is called (lgs_sniff.py: the map's names)."""
+    pdu = rtu.check_adu(f.data)
+    if pdu is None:
+        return f"{len(f.data)} B, bad CRC" if len(f.data) >= 4 else f"{len(f.data)} B fragment"
+    uid, fc = f.data[0], pdu[0]
+    who = "broadcast" if uid == 0 else f"id {uid}"
+    if fc & 0x80:
+        return f"{who} FC{fc & 0x7F:02d} exception {pdu[1] if len(pdu) > 1 else 0:02d}"
+    if f.kind == DEVICE:
+        return f"{who} FC{fc:02d} reply" + (f", {pdu[1]} B" if fc in (rtu.FC_READ_COILS, rtu.FC_READ_HOLDING) else "")
+    if len(pdu) < 5:
+        return f"{who} FC{fc:02d}"
+    addr, value = int.from_bytes(pdu[1:3], "big"), int.from_bytes(pdu[3:5], "big")
+    called = f"  {name(fc, addr)}" if name else ""
+    if fc in (rtu.FC_WRITE_COIL, rtu.FC_WRITE_REGISTER):
+        return f"{who} FC{fc:02d} @{addr} = 0x{value:04x}{called}"
+    return f"{who} FC{fc:02d} @{addr}+{value}{called}"
+
+
+def intact(f: Frame) -> bool:
+    return rtu.check_adu(f.data) is not None
+
+
+def rescale(runs: list[Run], speed: float, floor_us: int = SILENCE_FLOOR_US) -> list[Run]:
+    """Runs with every silence over floor_us shrunk `speed` times, never
+    below floor_us: what is quick stays exactly as recorded."""
+    if speed == 1:
+        return runs
+    out, shift, quiet = [], 0.0, None
+    for r in runs:
+        if quiet is not None and r.t_us - quiet > floor_us:
+            s = r.t_us - quiet
+            shift += s - max(floor_us, s / speed)
+        out.append(replace(r, t_us=int(r.t_us - shift)))
+        quiet = max(quiet or 0, r.end_us())
+    return out
+
+
+def cut(runs: list[Run], every: int, at: int, gap_us: int) -> tuple[list[Run], int]:
+    """Every `every`th master run longer than `at` bytes split after byte
+    `at`, the rest — and everything after it — gap_us later."""
+    out, shift, seen, made = [], 0, 0, 0
+    for r in runs:
+        r = replace(r, t_us=r.t_us + shift)
+        if r.kind == MASTER and len(r.data) > at:
+            seen += 1
+            if seen % every == 0:
+                head = replace(r, data=r.data[:at])
+                shift += gap_us
+                out += [head, replace(r, t_us=int(head.end_us()) + gap_us, data=r.data[at:])]
+                made += 1
+                continue
+        out.append(r)
+    return out, made
+
+
+@dataclass
+class Exchange:
+    request: Frame
+    reply: bytes | None = None
+    latency_us: float | None = None     # request's last byte to the reply's first
+    reply_end_us: float | None = None
+
+
+def pair(requests: list[Frame], replies: list[Frame]) -> list[Exchange]:
+    """Each request with what the modules sent after it and before the next
+    request: one reply, or nothing (a broadcast, another ID's, a lost one)."""
+    out, j = [], 0
+    for i, req in enumerate(requests):
+        nxt = requests[i + 1].t_us if i + 1 < len(requests) else float("inf")
+        while j < len(replies) and replies[j].t_us < req.end_us:
+            j += 1                      # started under the request: a collision, not an answer
+        ex = Exchange(req)
+        while j < len(replies) and replies[j].t_us < nxt:
+            if ex.reply is None:
+                ex.reply, ex.latency_us = b"", replies[j].t_us - req.end_us
+            ex.reply += replies[j].data
+            ex.reply_end_us = replies[j].end_us
+            j += 1
+        out.append(ex)
+    return out
+
+
+def exchanges(runs: list[Run], device_runs: list[Run] | None = None) -> list[Exchange]:
+    """The capture's requests, each with the reply recorded for it — or,
+    given device_runs, the reply a replay got instead."""
+    fr = frames(runs)
+    requests = [f for f in fr if f.kind == MASTER]
+    replies = [f for f in (frames(device_runs) if device_runs is not None else fr) if f.kind == DEVICE]
+    return pair(requests, replies)
+
+
+def shape(reply: bytes | None) -> tuple | None:
+    """What a reply keeps when only the device's data differs: ID, function
+    (exception bit included) and length."""
+    return None if reply is None else (reply[:2], len(reply))
+
+
+def most_addressed(runs: list[Run]) -> int:
+    ids = Counter(f.data[0] for f in frames(runs) if f.kind == MASTER and intact(f) and f.data[0])
+    return ids.most_common(1)[0][0] if ids else DEFAULT_ID
+
+
+# --- the targets ------------------------------------------------------------------
+
+@dataclass
+class Replay:
+    target: str
+    replies: list[Run]                  # what the device sent, on the capture's clock
+    wall_s: float
+    problems: list[str] = field(default_factory=list)
+
+
+def commission(exe: str, at24: str, uid: int, baud: int) -> None:
+    """Give the host build's AT24 image the captured ID and baud: written at
+    247/9600 and persisted, as on a new module."""
+    from lgs_client import PERSIST_SETTLE_S, BenchTransport, LgsClient
+    from lgs_client import regmap as rm
+
+    with BenchTransport(exe, ("--at24", at24), gap_s=0.025) as bus:
+        bus.pause(0.5)
+        dev = LgsClient(bus, DEFAULT_ID)
+        dev.write_registers(rm.REG_BAUD_RATE, [baud, uid])
+        dev.persist()
+        bus.pause(PERSIST_SETTLE_S)     # acted on before the bench exits and saves the image
+
+
+def bench_script(masters: list[Run], recorded: list[Exchange], offset_us: int,
+                 quantum_us: int, idle_quantum_us: int) -> list[str]:
+    """The master's runs as "line" commands, the loop at quantum_us from
+    just before each request to just after its recorded reply and at
+    idle_quantum_us across the silences between."""
+    windows: list[list[int]] = []
+    for ex in recorded:
+        lo = ex.request.t_us - WINDOW_LEAD_US - idle_quantum_us     # the last idle pass may overrun
+        hi = int(max(ex.request.end_us, ex.reply_end_us or 0)) + WINDOW_TAIL_US
+        if windows and lo <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], hi)
+        else:
+            windows.append([lo, hi])
+    lines, i = [], 0
+    for lo, hi in windows:
+        lines += [f"quantum {idle_quantum_us}", f"until {lo + offset_us}", f"quantum {quantum_us}"]
+        while i < len(masters) and masters[i].t_us < hi:
+            lines.append(f"line {masters[i].t_us + offset_us} {masters[i].data.hex()}")
+            i += 1
+        lines += [f"until {hi + offset_us}", "replies"]
+    end = windows[-1][1] if windows else 0
+    return lines + [f"quantum {idle_quantum_us}", f"until {end + offset_us + LEAD_IN_US}", "replies"]
+
+
+def replay_bench(exe: str, runs: list[Run], uid: int, *, at24: str | None = None,
+                 capture: str | None = None, quantum_us: int = FINE_QUANTUM_US,
+                 idle_quantum_us: int = IDLE_QUANTUM_US) -> Replay:
+    """The master's bytes into the host build (tools/host_bench.py builds it)."""
+    from host_bench import Result, counter_problems
+
+    masters = [r for r in runs if r.kind == MASTER]
+    baud = masters[0].baud
+    offset = max(0, LEAD_IN_US - masters[0].t_us)
+    script = bench_script(masters, exchanges(runs), offset, quantum_us, idle_quantum_us)
+    with tempfile.TemporaryDirectory() as tmp:
+        image = os.path.join(tmp, "at24.bin")
+        if at24:
+            shutil.copyfile(at24, image)
+        elif (uid, baud) != (DEFAULT_ID, 9600):
+            commission(exe, image, uid, baud)
+        t0 = time.perf_counter()
+        out = subprocess.run([exe, "--at24", image, *(["--capture", capture] if capture else [])],
+                             input="\n".join(script) + "\n", capture_output=True, text=True,
+                             check=True).stdout
+        wall = time.perf_counter() - t0
+    res = Result(out)
+    replies = []
+    for line in res.dumps.get("tx", []):
+        done, hexed = line.split()
+        data = bytes.fromhex(hexed)
+        replies.append(Run(int(int(done) - offset - len(data) * byte_us(baud)), DEVICE, data, baud))
+    problems = [f"the build reset at {(t - offset) / 1e6:.3f} s of the capture; nothing after "
+                "that was replayed" for t in res.resets]
+    changes = [r for r in runs if r.kind == BAUD and r.t_us > masters[0].t_us]
+    if changes:
+        problems.append(f"the line changes rate at {changes[0].t_us / 1e6:.3f} s; the build "
+                        f"stayed at {baud}")
+    return Replay(f"the host build as id {uid} @ {baud}", replies, wall,
+                  problems + counter_problems(res))
+
+
+def replay_port(port: str, runs: list[Run], capture: str | None = None) -> Replay:
+    """The master's bytes onto a serial port in real time, and what came back."""
+    try:
+        import serial
+    except ImportError as e:
+        raise rtu.LgsError("pyserial not installed.  Run:  pip install pyserial") from e
+    masters = [r for r in runs if r.kind == MASTER]
+    baud = masters[0].baud
+    try:
+        ser = serial.Serial(port, baud, bytesize=8, parity="N", stopbits=1, timeout=0)
+    except (serial.SerialException, OSError) as e:
+        raise rtu.LgsError(f"cannot open {port}: {e}") from e
+    writer = CaptureWriter(capture, baud) if capture else None
+    replies: list[Run] = []
+    # The capture's clock, started so its first request goes out in 100 ms.
+    t0 = time.perf_counter() - (masters[0].t_us - 100_000) / 1e6
+
+    def now_us() -> int:
+        return int((time.perf_counter() - t0) * 1e6)
+
+    def take() -> None:
+        n = ser.in_waiting
+        if n:
+            data = ser.read(n)
+            t = now_us() - int(len(data) * byte_us(baud))
+            replies.append(Run(t, DEVICE, data, baud))
+            if writer:
+                writer.write(DEVICE, data, t)
+
+    start = time.perf_counter()
+    try:
+        for r in [*masters, None]:
+            due = r.t_us if r else int(masters[-1].end_us()) + LEAD_IN_US
+            while (left := due - now_us()) > 0:
+                take()
+                if left > 2_000:
+                    time.sleep((left - 1_000) / 2e6)    # sleep coarse, then spin
+            if r:
+                ser.write(r.data)
+                if writer:
+                    writer.write(MASTER, r.data, now_us())
+        take()
+    finally:
+        ser.close()
+        if writer:
+            writer.close()
+    return Replay(f"{port} @ {baud}", replies, time.perf_counter() - start)
+
+
+# --- report -------------------------------------------------------------------------
+
+def reply_text(reply: bytes | None) -> str:
+    return "nothing" if reply is None else describe(Frame(0, 0, DEVICE, reply))
+
+
+def percentiles(values: list[float]) -> str:
+    if not values:
+        return "-"
+    return f"p50 {statistics.median(values) / 1000:.1f} ms, max {max(values) / 1000:.1f} ms"
+
+
+def compare(runs: list[Run], replay: Replay, uid: int, answered: bool,
+            out=print, limit: int = 20) -> bool:
+    """Recorded against replayed, per request to `uid`, broadcast, or too
+    damaged to say; True when nothing diverged and the target had no
+    problem."""
+    recorded, replayed = exchanges(runs), exchanges(runs, replay.replies)
+    counts: Counter = Counter()
+    diverged: list[str] = []
+    latency = {"recorded": [], "replayed": []}
+    for rec, rep in zip(recorded, replayed):
+        req = rec.request
+        if intact(req) and req.data[0] not in (uid, 0):
+            counts["other"] += 1
+            continue
+        for name, ex in (("recorded", rec), ("replayed", rep)):
+            if ex.latency_us is not None:
+                latency[name].append(ex.latency_us)
+        if answered:
+            ok = rep.reply is not None or not intact(req) or req.data[0] == 0
+            verdict = "answered" if ok else "diverged"
+        elif rec.reply == rep.reply:
+            verdict = "same"
+        else:
+            verdict = "data" if shape(rec.reply) == shape(rep.reply) else "diverged"
+        counts[verdict] += 1
+        if verdict == "diverged":
+            diverged.append(f"  {req.t_us / 1e6:12.6f} s  {describe(req)}: recorded "
+                            f"{reply_text(rec.reply)}, replayed {reply_text(rep.reply)}")
+
+    span = (runs[-1].end_us() - runs[0].t_us) / 1e6 if runs else 0.0
+    out(f"replayed into {replay.target}: {span:.1f} s of bus in {replay.wall_s:.2f} s"
+        + (f" ({span / replay.wall_s:.0f}x)" if replay.wall_s else ""))
+    if answered:
+        out(f"id {uid}: {counts['answered']} request(s) answered or not meant to be, "
+            f"{counts['diverged']} intact one(s) unanswered")
+    else:
+        out(f"id {uid}: {counts['same']} same reply, {counts['data']} same shape/other data, "
+            f"{counts['diverged']} diverged")
+    if counts["other"]:
+        out(f"  ({counts['other']} request(s) for other IDs not compared)")
+    out(f"reply latency: recorded {percentiles(latency['recorded'])}; "
+        f"replayed {percentiles(latency['replayed'])}")
+    for line in diverged[:limit]:
+        out(line)
+    if len(diverged) > limit:
+        out(f"  ... {len(diverged) - limit} more")
+    for p in replay.problems:
+        out(f"[PROBLEM] {p}")
+    return not diverged and not replay.problems
+
+
+def summary(baud: int, runs: list[Run]) -> str:
+    fr = frames(runs)
+    requests = [f for f in fr if f.kind == MASTER]
+    span = (runs[-1].end_us() - runs[0].t_us) / 1e6 if runs else 0.0
+    rates = sorted({r.baud for r in runs if r.kind != BAUD} or {baud})
+    return (f"{span:.1f} s at {'/'.join(map(str, rates))} baud: {len(requests)} request(s), "
+            f"{sum(f.kind == DEVICE for f in fr)} reply frame(s), "
+            f"{sum(f.runs > 1 for f in fr)} stalled mid-frame, "
+            f"{sum(not intact(f) for f in fr)} bad CRC or fragment")
+
+
+def show(runs: list[Run], out=print) -> None:
+    rows: list[tuple[float, str]] = []
+    prev = None
+    for f in frames(runs):
+        gap = "" if prev is None else f"{(f.t_us - prev) / 1000:.3f}"
+        side = "M" if f.kind == MASTER else "D"
+        stalled = f"  ({f.runs} runs)" if f.runs > 1 else ""
+        rows.append((f.t_us, f"{f.t_us / 1000:12.3f} {gap:>10} {side} {len(f.data):4}  "
+                             f"{describe(f)}{stalled}"))
+        prev = f.end_us
+    rows += [(r.t_us, f"{r.t_us / 1000:12.3f} {'':>10} - baud {r.baud}") for r in runs if r.kind == BAUD]
+    out(f"{'t ms':>12} {'gap ms':>10} S {'B':>4}  frame")
+    for _, line in sorted(rows, key=lambda row: row[0]):
+        out(line)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="LGS R5.0 bus captures: show, cut, replay into the host build or a module.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("show", help="the capture frame by frame")
+    p.add_argument("capture")
+    p = sub.add_parser("cut", help="a copy with every Nth request cut in two")
+    p.add_argument("capture")
+    p.add_argument("out")
+    p.add_argument("--every", type=int, default=5, help="cut every Nth master run")
+    p.add_argument("--at", type=int, default=3, help="bytes before the cut")
+    p.add_argument("--gap", type=float, default=30.0, help="ms between the two halves")
+    p = sub.add_parser("replay", help="the master's bytes into the host build or a module")
+    p.add_argument("capture")
+    p.add_argument("-p", "--port", help="replay onto this USB-RS485 port in real time")
+    p.add_argument("--id", type=int, help="the device replayed (default: the ID most addressed)")
+    p.add_argument("--speed", type=float, default=1.0, help="shrink silences over 20 ms N times")
+    p.add_argument("--answered", action="store_true",
+                   help="check every intact request is answered, not the recorded replies")
+    p.add_argument("-o", "--out", help="write a capture of the replay")
+    p.add_argument("--exe", help="an lgs_host_bench already built (default: build one)")
+    p.add_argument("--at24", help="AT24 image for the host build (default: commissioned to --id)")
+    p.add_argument("--cxx", help="host C++ compiler")
+    p.add_argument("--build-dir", help="keep the host build here")
+    p.add_argument("--quantum", type=int, default=FINE_QUANTUM_US, help="loop us around frames")
+    p.add_argument("--idle-quantum", type=int, default=IDLE_QUANTUM_US, help="loop us in silences")
+    args = ap.parse_args()
+
+    try:
+        baud, runs = read_capture(args.capture)
+    except (OSError, ValueError) as e:
+        print(f"[ERR] {args.capture}: {e}")
+        return 2
+    print(f"{args.capture}: {summary(baud, runs)}")
+    if args.cmd == "show":
+        show(runs)
+        return 0
+    if args.cmd == "cut":
+        if args.every < 1 or args.at < 1:
+            print("[ERR] --every and --at start at 1")
+            return 2
+        edited, made = cut(runs, args.every, args.at, int(args.gap * 1000))
+        write_capture(args.out, baud, edited)
+        print(f"{args.out}: {made} request(s) cut after byte {args.at}, {args.gap:g} ms apart")
+        return 0
+
+    if not any(r.kind == MASTER for r in runs):
+        print("[ERR] nothing the master sent in this capture")
+        return 2
+    if args.speed < 1:
+        print("[ERR] --speed below 1 would stretch the bus")
+        return 2
+    uid = args.id if args.id is not None else most_addressed(runs)
+    runs = rescale(runs, args.speed)
+    try:
+        if args.port:
+            replay = replay_port(args.port, runs, args.out)
+        else:
+            exe = args.exe
+            with tempfile.TemporaryDirectory() as tmp:
+                if not exe:
+                    from host_bench import build, find_cxx
+                    cxx = find_cxx(args.cxx)
+                    if not cxx:
+                        print("[ERR] no host C++ compiler found (set --cxx or $CXX)")
+                        return 2
+                    os.makedirs(args.build_dir or tmp, exist_ok=True)
+                    exe = build(cxx, args.build_dir or tmp)
+                replay = replay_bench(exe, runs, uid, at24=args.at24, capture=args.out,
+                                      quantum_us=args.quantum, idle_quantum_us=args.idle_quantum)
+    except rtu.LgsError as e:
+        print(f"[ERR] {e}")
+        return 2
+    return 0 if compare(runs, replay, uid, args.answered) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
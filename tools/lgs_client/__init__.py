@@ -0,0 +1,28 @@
+"""lgs_client - typed access to LGS R5.0 modules over Modbus RTU.
+
+    from lgs_client import SerialTransport, LgsClient
+
+    with SerialTransport("COM30", 9600) as bus:
+        dev = LgsClient(bus, 21)
+        dev.set_preset(3, rgb=(255, 0, 0), brightness=60)   # one FC16
+        dev.light(3)
+        print(dev.read_stats())
+
+Run from tools/ (or put tools/ on sys.path). Needs pyserial for a real
+port; the host bench transport needs nothing beyond the standard library.
+"""
+
+from . import capture, regmap
+from .aio import AsyncLgsClient
+from .client import (MERGE_GAP, PERSIST_SETTLE_S, DeviceInfo, LgsClient, Preset, Stats, WriteBatch,
+                     plan_reads)
+from .ids import parse_ids
+from .rtu import LgsError, ModbusError, NoResponse
+from .transport import BenchFleet, BenchTransport, SerialTransport, Transport, TransportStats
+
+__all__ = [
+    "AsyncLgsClient", "BenchFleet", "BenchTransport", "DeviceInfo", "LgsClient", "LgsError",
+    "MERGE_GAP", "ModbusError", "NoResponse", "PERSIST_SETTLE_S", "Preset", "SerialTransport",
+    "Stats", "Transport", "TransportStats", "WriteBatch", "capture", "parse_ids", "plan_reads",
+    "regmap",
+]
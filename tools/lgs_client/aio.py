@@ -0,0 +1,73 @@
+"""AsyncLgsClient: the same operations for asyncio code.
+
+A serial line is a blocking device and RTU is strictly one transaction at a
+time, so there is nothing to gain from a second, native-async protocol
+stack: each call runs the sync client in a worker thread, and the
+transport's lock keeps concurrent tasks' frames apart. Sync and async
+clients may share one transport.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Mapping
+
+from .client import LgsClient, WriteBatch
+from .transport import Transport
+
+
+class AsyncBatch:
+    """WriteBatch for `async with`: flushes in a worker thread on exit."""
+
+    def __init__(self, batch: WriteBatch) -> None:
+        self.batch = batch
+
+    def write(self, addr: int, value: int) -> None:
+        # Solo registers go out immediately — they block like any call.
+        self.batch.write(addr, value)
+
+    def write_many(self, addr: int, values) -> None:
+        self.batch.write_many(addr, values)
+
+    async def flush(self) -> int:
+        return await asyncio.to_thread(self.batch.flush)
+
+    async def __aenter__(self) -> "AsyncBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.flush()
+
+
+class AsyncLgsClient:
+    """Every public LgsClient method, as a coroutine."""
+
+    def __init__(self, transport: Transport, uid: int) -> None:
+        self.sync = LgsClient(transport, uid)
+
+    @property
+    def uid(self) -> int:
+        return self.sync.uid
+
+    def __repr__(self) -> str:
+        return f"AsyncLgsClient(id {self.uid})"
+
+    def batch(self, fill: Mapping[int, int] | None = None) -> AsyncBatch:
+        return AsyncBatch(self.sync.batch(fill))
+
+    async def pause(self, seconds: float) -> None:
+        # A virtual-time transport (the host bench) has to be told; on a real
+        # line this is just a sleep that does not hold the bus.
+        await asyncio.to_thread(self.sync.pause, seconds)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(attr, *args, **kwargs)
+        return call
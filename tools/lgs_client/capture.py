@@ -0,0 +1,191 @@
+"""Bus captures: every byte on the line, which side sent it, and when.
+
+A compact binary file. SerialTransport(capture=...) writes one on the bench
+rig, the host bench writes one of its virtual line (--capture FILE, or
+BenchTransport(capture=...)), and tools/lgs_capture.py shows, edits and
+replays them:
+
+  header   b"LGSCAP", version 1, flags 0, baud (u32 LE)            12 bytes
+  record   varint(dt_us << 2 | kind), then
+             kind 0 MASTER   varint(n), the n bytes the master sent
+             kind 1 DEVICE   varint(n), the n bytes a module sent
+             kind 2 BAUD     varint(rate): the line changed rate
+
+dt_us is from the previous record (the first: from the start of the
+capture); varints are LEB128. A run of bytes is back to back at the line
+rate from t, its first start bit: byte i is complete at
+t + (i + 1) * 10e6 / baud. A gap inside a frame — the RS485 hub switching
+channel mid-frame — splits it into two runs, so the line's timing survives
+to the microsecond at 2-4 bytes of overhead per run.
+
+Timestamps from a serial port are the host's: the USB adapter hands bytes
+over in batches, so a batch reads as one run ending when it was read. The
+host bench's are exact.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from dataclasses import dataclass
+
+MAGIC = b"LGSCAP"
+VERSION = 1
+MASTER, DEVICE, BAUD = 0, 1, 2
+
+
+def byte_us(baud: int) -> float:
+    """One 8N1 character on the line."""
+    return 10e6 / baud
+
+
+def frame_gap_us(baud: int) -> float:
+    """The silence that ends an RTU frame: 3.5 characters, or the Modbus
+    spec's fixed 1750 us above 19200 baud."""
+    return 3.5 * byte_us(baud) if baud <= 19200 else 1750.0
+
+
+@dataclass
+class Run:
+    t_us: int                   # first start bit (kind BAUD: when the rate changed)
+    kind: int
+    data: bytes = b""
+    baud: int = 0               # the line rate from here on
+
+    def end_us(self) -> float:
+        """When the last byte is complete."""
+        return self.t_us + len(self.data) * byte_us(self.baud)
+
+
+@dataclass
+class Frame:
+    """Runs of one side with less than a frame gap between them: what the
+    receiver takes as one RTU frame."""
+    t_us: int
+    end_us: float
+    kind: int
+    data: bytes
+    runs: int = 1               # > 1: the frame stalled mid-way and went on
+
+
+def _varint(v: int) -> bytes:
+    out = bytearray()
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+    return bytes(out)
+
+
+class CaptureWriter:
+    """Appends records to a capture file. Times are microseconds from when
+    the writer was opened (now_us()), or whatever clock the caller keeps —
+    they only have to go forward; one that does not is held at the last."""
+
+    def __init__(self, path: str, baud: int) -> None:
+        self.f = open(path, "wb")
+        self.f.write(MAGIC + bytes([VERSION, 0]) + struct.pack("<I", baud))
+        self.baud = baud
+        self._t0 = time.perf_counter()
+        self._last = 0
+
+    def now_us(self) -> int:
+        return int((time.perf_counter() - self._t0) * 1e6)
+
+    def _record(self, kind: int, t_us: int, n: int, data: bytes = b"") -> None:
+        t_us = max(int(t_us), self._last)
+        self.f.write(_varint((t_us - self._last) << 2 | kind) + _varint(n) + data)
+        self._last = t_us
+
+    def write(self, kind: int, data: bytes, t_us: int) -> None:
+        """A run of bytes from one side, the first start bit at t_us."""
+        if data:
+            self._record(kind, t_us, len(data), bytes(data))
+
+    def received(self, kind: int, data: bytes, t_us: int | None = None) -> None:
+        """A run handed over when its last byte was in (t_us, default now):
+        recorded from when it must have started."""
+        t_us = self.now_us() if t_us is None else t_us
+        self.write(kind, data, t_us - int(len(data) * byte_us(self.baud)))
+
+    def set_baud(self, baud: int, t_us: int | None = None) -> None:
+        self._record(BAUD, self.now_us() if t_us is None else t_us, baud)
+        self.baud = baud
+
+    def close(self) -> None:
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def parse_capture(blob: bytes) -> tuple[int, list[Run]]:
+    """(baud at the start, runs in time order, BAUD records included)."""
+    if len(blob) < 12 or blob[:6] != MAGIC or blob[6] != VERSION:
+        raise ValueError("not an LGS capture (or a newer version of one)")
+    baud = start = struct.unpack_from("<I", blob, 8)[0]
+    runs: list[Run] = []
+    pos, t = 12, 0
+
+    def varint() -> int:
+        nonlocal pos
+        v = shift = 0
+        while True:
+            if pos >= len(blob):
+                raise ValueError(f"capture truncated at byte {pos}")
+            b = blob[pos]
+            pos += 1
+            v |= (b & 0x7F) << shift
+            shift += 7
+            if not b & 0x80:
+                return v
+
+    while pos < len(blob):
+        head = varint()
+        t += head >> 2
+        kind, n = head & 3, varint()
+        if kind == BAUD:
+            baud = n
+            runs.append(Run(t, BAUD, baud=baud))
+            continue
+        if kind not in (MASTER, DEVICE) or pos + n > len(blob):
+            raise ValueError(f"capture damaged at byte {pos}")
+        runs.append(Run(t, kind, blob[pos:pos + n], baud))
+        pos += n
+    return start, runs
+
+
+def read_capture(path: str) -> tuple[int, list[Run]]:
+    with open(path, "rb") as f:
+        return parse_capture(f.read())
+
+
+def write_capture(path: str, baud: int, runs: list[Run]) -> None:
+    """A whole capture at once (an edited or a synthesised one)."""
+    with CaptureWriter(path, baud) as w:
+        for r in runs:
+            if r.kind == BAUD:
+                w.set_baud(r.baud, r.t_us)
+            else:
+                w.write(r.kind, r.data, r.t_us)
+
+
+def frames(runs: list[Run]) -> list[Frame]:
+    """Runs joined into frames by the 3.5-character rule: a run that starts
+    within a frame gap of the end of the same side's last one continues it.
+    A run of the other side in between ends the frame either way."""
+    out: list[Frame] = []
+    for r in runs:
+        if r.kind == BAUD:
+            continue
+        last = out[-1] if out else None
+        if last and last.kind == r.kind and r.t_us - last.end_us < frame_gap_us(r.baud):
+            last.data += r.data
+            last.end_us = r.end_us()
+            last.runs += 1
+        else:
+            out.append(Frame(r.t_us, r.end_us(), r.kind, r.data))
+    return out
@@ -0,0 +1,415 @@
+"""LgsClient: typed operations on one module, over a shared transport.
+
+The saving is in the transaction count, not the bytes: at 9600 baud every
+request/reply pays ~35 ms of framing, turnaround and inter-frame gap before
+its first data byte. So the client
+
+  - reads through a planner that turns any set of addresses into as few
+    block FC03s as the map allows (gaps of up to MERGE_GAP registers are
+    read and dropped; feature fences are never crossed);
+  - writes through WriteBatch, which merges adjacent registers into one
+    FC16 and, given a snapshot of the registers in between, bridges gaps
+    too — restoring all eight preset blocks is one FC16, not 40 FC06s.
+
+Slave ID 0 gives a broadcast client: writes go out unanswered, reads raise.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+from . import regmap as rm
+from . import rtu
+from .transport import Transport
+
+# Registers a block read may fetch and throw away (or a write re-send from
+# its snapshot) rather than start a new transaction: one transaction's
+# overhead is ~36 bytes of line time at 9600 baud (request and reply
+# framing, silent intervals, turnaround), the same as 18 registers — and
+# more again with the master's inter-frame gap on top.
+MERGE_GAP = 16
+
+# Coil 503: the module saves to the AT24, resets and is back on the bus
+# within this. persist() does not wait; the caller pauses its own bus.
+PERSIST_SETTLE_S = 1.5
+
+
+@dataclass(frozen=True)
+class Preset:
+    brightness: int = 80          # percent
+    r: int = 0
+    g: int = 0
+    b: int = 0
+    max_on_s: int = 3600          # 0 = unlimited
+
+    @property
+    def rgb(self) -> tuple[int, int, int]:
+        return self.r, self.g, self.b
+
+    def registers(self) -> list[int]:
+        return [self.brightness, self.r, self.g, self.b, self.max_on_s]
+
+    @classmethod
+    def from_registers(cls, regs: list[int]) -> "Preset":
+        return cls(*regs[:rm.PRESET_FIELDS])
+
+
+@dataclass
+class DeviceInfo:
+    device_type: int
+    fw_version: int
+    hw_version: int
+    baud: int
+    identifier: int
+    uptime_s: int
+    boot_count: int
+    reset_cause: int
+    health: int
+    mode: int
+    active_preset: int
+    serial: str
+    button_presses: int
+    room_temp_c: float | None
+    board_temp_c: float | None
+    input_current_ma: int
+    seconds_since_unlock: int
+    latch_locked: bool
+
+
+@dataclass
+class Stats:
+    v2: bool                       # u32 block (fw >= v3.3.0); False = legacy, u16 clamped
+    total_on_count: int
+    total_on_s: int
+    presets: dict[int, tuple[int, int]] = field(default_factory=dict)  # n -> (count, seconds)
+    latch_fires: int | None = None
+    button_presses: int | None = None
+    operating_s: int | None = None
+    iwdg_resets: int | None = None
+
+
+def plan_reads(addrs: Iterable[int], max_gap: int = MERGE_GAP,
+               fences: Iterable[int] = rm.READ_FENCES) -> list[tuple[int, int]]:
+    """Sorted (first, count) blocks covering addrs."""
+    fences = sorted(fences)
+    blocks: list[list[int]] = []
+    for a in sorted(set(addrs)):
+        if blocks:
+            first, last = blocks[-1]
+            crosses = any(first < f <= a for f in fences)
+            if not crosses and a - last - 1 <= max_gap and a - first < rtu.MAX_READ_REGS:
+                blocks[-1][1] = a
+                continue
+        blocks.append([a, a])
+    return [(first, last - first + 1) for first, last in blocks]
+
+
+def _spans(addrs: list[int]) -> list[tuple[int, int]]:
+    """Contiguous runs of addrs as (first, count)."""
+    return plan_reads(addrs, max_gap=0, fences=())
+
+
+class WriteBatch:
+    """Buffered register writes, sent as few transactions as possible.
+
+    Adjacent registers share an FC16; a hole of up to MERGE_GAP registers
+    is bridged too when `fill` (a snapshot) says what the hole holds.
+
+    Later writes to the same register replace earlier ones. A solo register
+    (regmap.SOLO_WRITES), a coil write or flush() sends what is pending
+    first, so order is kept wherever it can matter. Usable as a context
+    manager: leaving the block flushes.
+    """
+
+    def __init__(self, client: "LgsClient", fill: Mapping[int, int] | None = None) -> None:
+        self.client = client
+        self.fill = dict(fill or {})
+        self.pending: dict[int, int] = {}
+
+    def write(self, addr: int, value: int) -> None:
+        if addr in rm.SOLO_WRITES:
+            self.flush()
+            self.client.write_register(addr, value)
+            return
+        self.pending[addr] = value & 0xFFFF
+
+    def write_many(self, addr: int, values: Iterable[int]) -> None:
+        for i, v in enumerate(values):
+            self.write(addr + i, v)
+
+    def coil(self, addr: int, on: bool) -> None:
+        self.flush()
+        self.client.write_coil(addr, on)
+
+    def plan(self) -> list[tuple[int, list[int]]]:
+        """(first, values) per transaction, gaps bridged from `fill`."""
+        runs: list[tuple[int, list[int]]] = []
+        for a in sorted(self.pending):
+            if runs:
+                first, values = runs[-1]
+                nxt = first + len(values)
+                hole = range(nxt, a)
+                if (len(hole) <= MERGE_GAP and a - first < rtu.MAX_WRITE_REGS
+                        and all(h in self.fill for h in hole)):
+                    values += [self.fill[h] for h in hole] + [self.pending[a]]
+                    continue
+            runs.append((a, [self.pending[a]]))
+        return runs
+
+    def flush(self) -> int:
+        """Send what is pending; returns the number of transactions."""
+        runs = self.plan()
+        self.pending.clear()
+        for first, values in runs:
+            if len(values) == 1:
+                self.client.write_register(first, values[0])
+            else:
+                self.client.write_registers(first, values)
+            self.fill.update((first + i, v) for i, v in enumerate(values))
+        return len(runs)
+
+    def __enter__(self) -> "WriteBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+
+class LgsClient:
+    """One LGS module (or, with slave ID 0, all of them)."""
+
+    def __init__(self, transport: Transport, uid: int) -> None:
+        self.transport = transport
+        self.uid = uid
+
+    def __repr__(self) -> str:
+        return f"LgsClient(id {self.uid})"
+
+    @property
+    def is_broadcast(self) -> bool:
+        return self.uid == rm.BROADCAST
+
+    # --- raw transactions ----------------------------------------------------------
+    def _request(self, pdu: bytes) -> bytes | None:
+        if self.is_broadcast:
+            if pdu[0] in (rtu.FC_READ_COILS, rtu.FC_READ_HOLDING):
+                raise rtu.LgsError("a broadcast cannot read")
+            self.transport.broadcast(pdu)
+            return None
+        return self.transport.transact(self.uid, pdu)
+
+    def read_registers(self, addr: int, count: int = 1) -> list[int]:
+        return rtu.registers_of(self._request(rtu.read_registers(addr, count)))
+
+    def read_register(self, addr: int) -> int:
+        return self.read_registers(addr, 1)[0]
+
+    def read_coils(self, addr: int, count: int = 1) -> list[bool]:
+        return rtu.bits_of(self._request(rtu.read_coils(addr, count)), count)
+
+    def read_coil(self, addr: int) -> bool:
+        return self.read_coils(addr, 1)[0]
+
+    def write_register(self, addr: int, value: int) -> None:
+        self._request(rtu.write_register(addr, value))
+
+    def write_registers(self, addr: int, values: list[int]) -> None:
+        for i in range(0, len(values), rtu.MAX_WRITE_REGS):
+            self._request(rtu.write_registers(addr + i, values[i:i + rtu.MAX_WRITE_REGS]))
+
+    def write_coil(self, addr: int, on: bool) -> None:
+        self._request(rtu.write_coil(addr, on))
+
+    def send_coil(self, addr: int, on: bool = True) -> None:
+        """Coil write that expects no reply (the module resets first)."""
+        self.transport.send(self.uid, rtu.write_coil(addr, on))
+
+    def read_map(self, addrs: Iterable[int]) -> dict[int, int | None]:
+        """Any set of registers in as few FC03s as the planner allows. A
+        block refused with exception 02 (an older map) is retried one
+        contiguous span at a time; what is still refused reads None."""
+        return self._read_planned(addrs, self.read_registers, rm.READ_FENCES)
+
+    def read_coil_map(self, addrs: Iterable[int]) -> dict[int, bool | None]:
+        """read_map for coils (FC01)."""
+        return self._read_planned(addrs, self.read_coils, ())
+
+    def _read_planned(self, addrs, reader, fences) -> dict:
+        addrs = sorted(set(addrs))
+        out: dict = {}
+        for first, count in plan_reads(addrs, fences=fences):
+            wanted = [a for a in addrs if first <= a < first + count]
+            try:
+                values = reader(first, count)
+                out.update((a, values[a - first]) for a in wanted)
+                continue
+            except rtu.ModbusError as e:
+                if e.code != 2:
+                    raise
+            for span_first, span_count in _spans(wanted):
+                try:
+                    values = reader(span_first, span_count)
+                    out.update((span_first + i, v) for i, v in enumerate(values))
+                except rtu.ModbusError as e:
+                    if e.code != 2:
+                        raise
+                    out.update((span_first + i, None) for i in range(span_count))
+        return out
+
+    def batch(self, fill: Mapping[int, int] | None = None) -> WriteBatch:
+        return WriteBatch(self, fill)
+
+    def pause(self, seconds: float) -> None:
+        self.transport.pause(seconds)
+
+    # --- identity and state ------------------------------------------------------------
+    def info(self) -> DeviceInfo:
+        r = self.read_map(list(range(rm.REG_DEVICE_TYPE, rm.REG_INPUT_CURRENT + 1))
+                          + [rm.REG_TIME_AFTER_UNLOCK, rm.REG_LATCH_LOCKED])
+
+        def temp(raw: int) -> float | None:
+            return None if raw == 0x8000 else (raw - 0x10000 if raw & 0x8000 else raw) / 100
+
+        uid = rm.REG_UID_BASE
+        return DeviceInfo(
+            device_type=r[rm.REG_DEVICE_TYPE], fw_version=r[rm.REG_FW_VERSION],
+            hw_version=r[rm.REG_HW_VERSION], baud=r[rm.REG_BAUD_RATE],
+            identifier=r[rm.REG_IDENTIFIER],
+            uptime_s=(r[rm.REG_UPTIME_HI] << 16) | r[rm.REG_UPTIME_HI + 1],
+            boot_count=r[rm.REG_BOOT_COUNT], reset_cause=r[rm.REG_RESET_CAUSE],
+            health=r[rm.REG_HEALTH], mode=r[rm.REG_FUNCTION_MODE],
+            active_preset=r[rm.REG_ACTIVE_PRESET],
+            serial="".join(f"{r[uid + i]:04X}" for i in range(6)),
+            button_presses=r[rm.REG_BUTTON_PRESSES],
+            room_temp_c=temp(r[rm.REG_ROOM_TEMP]), board_temp_c=temp(r[rm.REG_BOARD_TEMP]),
+            input_current_ma=r[rm.REG_INPUT_CURRENT],
+            seconds_since_unlock=r[rm.REG_TIME_AFTER_UNLOCK],
+            latch_locked=bool(r[rm.REG_LATCH_LOCKED]))
+
+    def enabled_presets(self) -> list[int]:
+        """Presets whose enable coil reads 1 (radio switching: at most one)."""
+        bits = self.read_coils(rm.coil_enable(1), rm.PRESET_COUNT)
+        return [n for n in range(1, rm.PRESET_COUNT + 1) if bits[n - 1]]
+
+    # --- presets -----------------------------------------------------------------------
+    def preset_registers(self) -> dict[int, int]:
+        """Registers 110-184 in one FC03 — also the `fill` that lets a
+        batch write any mix of preset fields as a single FC16."""
+        first, last = rm.REG_PRESETS_FIRST, rm.REG_PRESETS_LAST
+        regs = self.read_registers(first, last - first + 1)
+        return {first + i: v for i, v in enumerate(regs)}
+
+    def presets(self) -> dict[int, Preset]:
+        regs = self.preset_registers()
+        return {n: Preset.from_registers([regs[rm.reg_preset(n) + k] for k in range(rm.PRESET_FIELDS)])
+                for n in range(1, rm.PRESET_COUNT + 1)}
+
+    def preset(self, n: int) -> Preset:
+        return Preset.from_registers(self.read_registers(rm.reg_preset(n), rm.PRESET_FIELDS))
+
+    def set_preset(self, n: int, rgb: tuple[int, int, int] | None = None,
+                   brightness: int | None = None, max_on_s: int | None = None,
+                   batch: WriteBatch | None = None) -> None:
+        """Change some fields of preset n; adjacent fields go in one FC16.
+        Not persisted until persist()."""
+        if not 1 <= n <= rm.PRESET_COUNT:
+            raise ValueError(f"preset {n} outside 1-{rm.PRESET_COUNT}")
+        b = batch or self.batch()
+        base = rm.reg_preset(n)
+        if brightness is not None:
+            b.write(base, brightness)
+        if rgb is not None:
+            b.write_many(base + 1, rgb)
+        if max_on_s is not None:
+            b.write(base + 4, max_on_s)
+        if batch is None:
+            b.flush()
+
+    def set_presets(self, presets: Mapping[int, Preset], fill: Mapping[int, int] | None = None) -> int:
+        """Write whole presets; with `fill` (preset_registers()) the lot is
+        one FC16. Returns the transaction count."""
+        b = self.batch(fill)
+        for n, p in presets.items():
+            b.write_many(rm.reg_preset(n), p.registers())
+        return b.flush()
+
+    # --- actions ----------------------------------------------------------------------
+    def light(self, n: int, display: bool = False) -> None:
+        """Light preset n (radio: the previous one goes off)."""
+        self.write_coil(rm.coil_display(n) if display else rm.coil_enable(n), True)
+
+    def unlight(self, n: int) -> None:
+        self.write_coil(rm.coil_enable(n), False)
+
+    def all_off(self) -> None:
+        self.write_coil(rm.COIL_ALL_OFF, True)
+
+    def show_number(self, value: int, display: bool | None = None) -> None:
+        self.write_register(rm.REG_SET_NUM_DISPLAY, value)
+        if display is not None:
+            self.write_coil(rm.COIL_DISPLAY_ENABLE, display)
+
+    def fire_latch(self, force: bool = False, preset: int | None = None,
+                   display: bool = False) -> None:
+        """Unlock. force = coil 1019 (ignore sense, fixed 500 ms); else the
+        sense-aware safety trigger, optionally lighting a preset (1020+n)
+        and the display (1030+n) in the same command."""
+        if force:
+            self.write_coil(rm.COIL_LATCH_FORCE, True)
+        elif preset is None:
+            self.write_coil(rm.COIL_LATCH_TRIGGER, True)
+        else:
+            self.write_coil(rm.coil_latch_display(preset) if display else rm.coil_latch(preset), True)
+
+    def identify(self) -> None:
+        self.write_coil(rm.COIL_IDENTIFY, True)
+
+    def set_unlock_delay(self, ms: int) -> None:
+        self.write_register(rm.REG_UNLOCK_DELAY, ms)
+
+    def set_groups(self, groups: Iterable[int]) -> None:
+        mask = 0
+        for g in groups:
+            if not 1 <= g <= rm.GROUP_COUNT:
+                raise ValueError(f"group {g} outside 1-{rm.GROUP_COUNT}")
+            mask |= 1 << (g - 1)
+        self.write_register(rm.REG_GROUP_MASK, mask)
+
+    def persist(self) -> None:
+        """Coil 503: save the (F) registers to the AT24 and reset. The
+        module answers nothing and is back on the bus within
+        PERSIST_SETTLE_S."""
+        self.send_coil(rm.COIL_WRITE_TO_EEPROM)
+
+    # --- statistics --------------------------------------------------------------------
+    def read_stats(self) -> Stats:
+        """Lifetime counters: the u32 block 400-451 when the firmware has it,
+        else the legacy u16 block 200-281."""
+        try:
+            r = self.read_registers(rm.REG_S2_FIRST, rm.REG_S2_LAST - rm.REG_S2_FIRST + 1)
+        except rtu.ModbusError as e:
+            if e.code != 2:
+                raise
+            r = None
+        if r is not None:
+            def u32(addr: int) -> int:
+                i = addr - rm.REG_S2_FIRST
+                return (r[i] << 16) | r[i + 1]
+            return Stats(
+                v2=True, total_on_count=u32(rm.REG_S2_TOTAL_ON_COUNT),
+                total_on_s=u32(rm.REG_S2_TOTAL_ON_TIME), latch_fires=u32(rm.REG_S2_LATCH_FIRES),
+                button_presses=u32(rm.REG_S2_BUTTON_PRESSES), operating_s=u32(rm.REG_S2_OPERATING_S),
+                iwdg_resets=r[rm.REG_S2_IWDG_RESETS - rm.REG_S2_FIRST],
+                presets={n: (u32(rm.reg_s2_preset(n)), u32(rm.reg_s2_preset(n) + 2))
+                         for n in range(1, rm.PRESET_COUNT + 1)})
+        last = rm.reg_preset_on_count(rm.PRESET_COUNT) + 1
+        regs = self.read_registers(rm.REG_TOTAL_ON_COUNT, last - rm.REG_TOTAL_ON_COUNT + 1)
+
+        def u16(addr: int) -> int:
+            return regs[addr - rm.REG_TOTAL_ON_COUNT]
+        return Stats(v2=False, total_on_count=u16(rm.REG_TOTAL_ON_COUNT),
+                     total_on_s=u16(rm.REG_TOTAL_ON_TIME),
+                     presets={n: (u16(rm.reg_preset_on_count(n)), u16(rm.reg_preset_on_count(n) + 1))
+                              for n in range(1, rm.PRESET_COUNT + 1)})
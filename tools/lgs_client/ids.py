@@ -0,0 +1,44 @@
+"""Slave ID lists as the tools take them on the command line: "21,22,30-40".
+
+One parser for every tool, so a typo is an error everywhere rather than a
+bus run over fewer modules than asked for (a backwards "9-3" used to read
+as no IDs at all).
+"""
+
+from __future__ import annotations
+
+import re
+
+from . import regmap as rm
+
+ID_MIN, ID_MAX = 1, rm.DEFAULT_ID      # 0 is broadcast; 248-255 are reserved
+
+_ID = re.compile(r"[0-9]+")
+
+
+def parse_ids(text: str, lo: int = ID_MIN, hi: int = ID_MAX) -> list[int]:
+    """"1-200" or "21,22,30-40", in the order given.
+
+    ValueError, naming the offending part, for anything that is not an ID
+    or a low-high range, an ID outside lo-hi, a repeat, or no IDs at all.
+    """
+    ids: list[int] = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            first, _, last = (x.strip() for x in part.partition("-"))
+            if not (_ID.fullmatch(first) and _ID.fullmatch(last)):
+                raise ValueError(f"{part!r} is not a range like 30-40")
+            if int(first) > int(last):
+                raise ValueError(f"{part!r} runs backwards (low-high)")
+            ids += range(int(first), int(last) + 1)
+        elif part:
+            if not _ID.fullmatch(part):
+                raise ValueError(f"{part!r} is not an ID")
+            ids.append(int(part))
+    bad = [i for i in ids if not lo <= i <= hi]
+    dupes = sorted({i for i in ids if ids.count(i) > 1})
+    why = [f"out of {lo}-{hi}: {bad}"] * bool(bad) + [f"repeated: {dupes}"] * bool(dupes)
+    if why or not ids:
+        raise ValueError("; ".join(why) or "no IDs given")
+    return ids
@@ -0,0 +1,167 @@
+"""The R5.0 address map, host side — mirrors src/svc/modbus_map.h.
+
+The tools used to spell addresses inline, each with its own copy. This is
+now the one place on the host that does; keep it in lock-step with the
+firmware header (one name here per constant there).
+"""
+
+# --- Device / diagnostics (holding registers) --------------------------------
+REG_DEVICE_TYPE = 0
+REG_FW_VERSION = 1
+REG_HW_VERSION = 2
+REG_BAUD_RATE = 3             # (F)
+REG_IDENTIFIER = 4            # (F)
+REG_UPTIME_HI = 5             # 6 = lo
+REG_BOOT_COUNT = 7
+REG_RESET_CAUSE = 8
+REG_HEALTH = 9
+REG_FUNCTION_MODE = 10
+REG_ACTIVE_PRESET = 11
+REG_UID_BASE = 12             # 6 registers
+REG_BUTTON_PRESSES = 18
+REG_BUTTON_HELD = 19
+REG_ROOM_TEMP = 20            # deg C x100, signed; 0x8000 = sensor fault
+REG_BOARD_TEMP = 21
+REG_INPUT_CURRENT = 22
+REG_TIME_AFTER_UNLOCK = 40
+REG_LATCH_LOCKED = 41
+
+# --- Configuration -----------------------------------------------------------
+REG_SET_NUM_DISPLAY = 60      # 0-99 rendered (clamped)
+REG_OLED_RENDER_US = 61
+REG_UNLOCK_DELAY = 80         # ms 0-8000, (F)
+REG_GROUP_MASK = 82           # bit g-1 = group g, (F)
+PRESET_COUNT = 8
+PRESET_FIELDS = 5             # brightness, r, g, b, max-on-time
+
+
+def reg_preset(n: int) -> int:
+    """First register of preset n (1-8): brightness, r, g, b, max-on-time."""
+    return 100 + 10 * n
+
+
+REG_PRESETS_FIRST = reg_preset(1)                               # 110
+REG_PRESETS_LAST = reg_preset(PRESET_COUNT) + PRESET_FIELDS - 1  # 184
+REG_GLOBAL_BRIGHTNESS = 190   # fan-out to every preset's brightness
+REG_GLOBAL_MAX_ON_TIME = 194  # fan-out to every preset's max-on-time
+
+# --- Statistics (legacy, u16 clamped) -----------------------------------------
+REG_TOTAL_ON_COUNT = 200
+REG_TOTAL_ON_TIME = 201
+
+
+def reg_preset_on_count(n: int) -> int:
+    return 200 + 10 * n       # 201 + 10n = on time
+
+
+# --- OTA ------------------------------------------------------------------------
+REG_OTA_STATE = 282           # lo = state, hi = error
+REG_OTA_CHUNKS_RX = 283
+REG_OTA_META_FIRST = 284      # size hi/lo, crc hi/lo, total chunks, flags
+REG_OTA_FLAGS = 289           # session options, read and cleared at coil 505
+OTA_FLAG_ERASE_AHEAD = 0x0001  # erase pages as the stream reaches them
+OTA_FLAG_RESUME = 0x0002       # same image as the held session: keep staging + bitmap
+OTA_FLAG_LZ = 0x0004           # chunks are compressed (tools/ota_lz.py)
+OTA_FLAGS_CHUNK_SHIFT = 8      # bits 8-15: chunk size / 8, 0 = 128
+REG_OTA_CHUNK_FIRST = 290     # index, len, crc16, data x64, commit
+REG_OTA_MAX_CHUNK = 358       # largest chunk the board takes; 0 = older firmware: 128
+REG_OTA_BITMAP_FIRST = 360
+OTA_BITMAP_REGS = 30
+REG_OTA_FINGERPRINT = 390     # running image size, CRC32, build ID (u32 hi/lo each); 0 = unknown
+OTA_FINGERPRINT_REGS = 6
+REG_OTA_WIDE_FIRST = 690      # index, len, crc16, data x116, commit: chunks over 128 B
+OTA_WIDE_CHUNK_SIZE = 232
+
+# --- Statistics v2 (u32 hi/lo, fw >= v3.3.0) -------------------------------------
+REG_S2_FIRST = 400
+REG_S2_TOTAL_ON_COUNT = 400   # each u32 is hi, lo
+REG_S2_TOTAL_ON_TIME = 402
+REG_S2_LATCH_FIRES = 404
+REG_S2_BUTTON_PRESSES = 406
+REG_S2_OPERATING_S = 408
+REG_S2_IWDG_RESETS = 410      # u16, saturating
+REG_S2_LAST = 451
+
+
+def reg_s2_preset(n: int) -> int:
+    """Preset n's on count (hi/lo), then its on time (hi/lo)."""
+    return 420 + 4 * (n - 1)
+
+
+# --- Loop profile -------------------------------------------------------------------
+REG_PROF_FIRST = 460
+REG_PROF_LAST = 547
+
+# --- Group command window -------------------------------------------------------------
+REG_GROUP_SEQ = 560
+REG_GROUP_LAST = 681
+GROUP_MAX_ENTRIES = 60
+GROUP_TARGET_ALL = 0x100
+GROUP_COUNT = 16
+GROUP_COIL_OFF = 0x8000
+GROUP_SHOW_NUMBER = 0x4000
+
+# --- Latch timing ---------------------------------------------------------------------
+REG_LATCH_TIMING_FIRST = 810
+REG_LATCH_TIMING_LAST = 839
+LATCH_TIMING_BUCKETS = 8
+LATCH_TIMING_NOT_OPEN = 0xFFFF
+
+
+def reg_latch_timing(h: int) -> int:
+    """Histogram h (0 energize, 1 open, 2 width): most recent ms, reserved,
+    then the eight buckets."""
+    return 810 + 10 * h
+
+# --- Coils ---------------------------------------------------------------------------
+COIL_FACTORY_RESET = 500
+COIL_RESET_KEEP_ID = 501
+COIL_RESET_ALL_DATA = 502
+COIL_WRITE_TO_EEPROM = 503    # persist + reset (no reply)
+COIL_SOFTWARE_RESET = 504
+COIL_OTA_ENTER = 505
+COIL_OTA_FINALIZE = 506
+COIL_OTA_APPLY = 507
+COIL_OTA_ABORT = 508
+COIL_IDENTIFY = 509
+COIL_CLEAR_STATS = 510
+COIL_ALL_OFF = 511
+COIL_LOOP_PROFILE_RESET = 512
+COIL_DISPLAY_ENABLE = 1010
+COIL_LATCH_FORCE = 1019
+COIL_LATCH_TRIGGER = 1020
+
+
+def coil_enable(n: int) -> int:
+    return 1000 + n
+
+
+def coil_display(n: int) -> int:
+    return 1010 + n
+
+
+def coil_latch(n: int) -> int:
+    return 1020 + n
+
+
+def coil_latch_display(n: int) -> int:
+    return 1030 + n
+
+
+# --- Transaction planning --------------------------------------------------------------
+# A block read never crosses these: each starts a feature block that older
+# firmware answers with exception 02, and that exception is how a master
+# learns the feature is missing — merged into a neighbour, it would take the
+# neighbour's registers down with it.
+READ_FENCES = (REG_OTA_STATE, REG_S2_FIRST, REG_PROF_FIRST, REG_GROUP_SEQ, REG_LATCH_TIMING_FIRST)
+
+# Writes to these have side effects on other registers (fan-out) or act on
+# the value written (display re-render, group command); a write batch sends
+# them on their own, in order, never merged with neighbours.
+SOLO_WRITES = frozenset({REG_SET_NUM_DISPLAY, REG_GLOBAL_BRIGHTNESS,
+                         REG_GLOBAL_MAX_ON_TIME, REG_GROUP_SEQ})
+
+BAUD_RATES = (9600, 19200, 38400, 57600)
+DEVICE_TYPES = {10: "STANDARD", 20: "NARCOTIC", 30: "LITE", 40: "DELIVERY"}
+BROADCAST = 0
+DEFAULT_ID = 247
@@ -0,0 +1,154 @@
+"""Modbus RTU framing: the PDUs the LGS map uses, CRC, reply lengths.
+
+Only what the firmware's server answers (src/svc/modbus_server.cpp):
+FC01 coils, FC03 holding registers, FC05/FC06 single writes, FC15/FC16
+multiple writes. Everything here is pure bytes in / bytes out so the
+transports stay thin and the host bench can reuse it.
+"""
+
+from __future__ import annotations
+
+FC_READ_COILS = 0x01
+FC_READ_HOLDING = 0x03
+FC_WRITE_COIL = 0x05
+FC_WRITE_REGISTER = 0x06
+FC_WRITE_COILS = 0x0F
+FC_WRITE_REGISTERS = 0x10
+
+MAX_READ_REGS = 125        # FC03 quantity limit (reply = 250 data bytes)
+MAX_WRITE_REGS = 123       # FC16 quantity limit (request = 246 data bytes)
+MAX_READ_COILS = 2000
+
+EXCEPTION_NAMES = {
+    1: "illegal function",
+    2: "illegal data address",
+    3: "illegal data value",
+    4: "server device failure",
+    6: "server busy",
+}
+
+
+class LgsError(Exception):
+    """Any failed transaction."""
+
+
+class NoResponse(LgsError):
+    """Timeout, a truncated reply or a bad CRC — the request may or may not
+    have been acted on."""
+
+
+class ModbusError(LgsError):
+    """The device answered with an exception code."""
+
+    def __init__(self, function: int, code: int) -> None:
+        self.function = function
+        self.code = code
+        super().__init__(f"FC{function:02d} exception {code} "
+                         f"({EXCEPTION_NAMES.get(code, 'unknown')})")
+
+
+def _crc_table() -> list[int]:
+    table = []
+    for b in range(256):
+        crc = b
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data: bytes) -> int:
+    """Modbus CRC16, a table step per byte: lgs_sniff.py checks every frame
+    on a busy line, and candidate splits of the ones that ran together."""
+    crc = 0xFFFF
+    for b in data:
+        crc = (crc >> 8) ^ _CRC_TABLE[(crc ^ b) & 0xFF]
+    return crc
+
+
+def adu(uid: int, pdu: bytes) -> bytes:
+    """Slave ID + PDU + CRC, ready for the wire."""
+    body = bytes([uid]) + pdu
+    return body + crc16(body).to_bytes(2, "little")
+
+
+def check_adu(frame: bytes) -> bytes | None:
+    """The PDU of a well-formed frame, None if it is short or its CRC fails."""
+    if len(frame) < 4 or crc16(frame[:-2]) != int.from_bytes(frame[-2:], "little"):
+        return None
+    return frame[1:-2]
+
+
+# --- request PDUs -------------------------------------------------------------
+
+def _u16(v: int) -> bytes:
+    return (v & 0xFFFF).to_bytes(2, "big")
+
+
+def read_coils(addr: int, count: int) -> bytes:
+    return bytes([FC_READ_COILS]) + _u16(addr) + _u16(count)
+
+
+def read_registers(addr: int, count: int) -> bytes:
+    return bytes([FC_READ_HOLDING]) + _u16(addr) + _u16(count)
+
+
+def write_coil(addr: int, on: bool) -> bytes:
+    return bytes([FC_WRITE_COIL]) + _u16(addr) + (b"\xff\x00" if on else b"\x00\x00")
+
+
+def write_register(addr: int, value: int) -> bytes:
+    return bytes([FC_WRITE_REGISTER]) + _u16(addr) + _u16(value)
+
+
+def write_registers(addr: int, values: list[int]) -> bytes:
+    data = b"".join(_u16(v) for v in values)
+    return bytes([FC_WRITE_REGISTERS]) + _u16(addr) + _u16(len(values)) + bytes([len(data)]) + data
+
+
+def write_coils(addr: int, bits: list[bool]) -> bytes:
+    packed = bytearray((len(bits) + 7) // 8)
+    for i, on in enumerate(bits):
+        if on:
+            packed[i // 8] |= 1 << (i % 8)
+    return bytes([FC_WRITE_COILS]) + _u16(addr) + _u16(len(bits)) + bytes([len(packed)]) + packed
+
+
+# --- replies ------------------------------------------------------------------
+
+def reply_length(request: bytes) -> int:
+    """Bytes of the normal reply ADU (slave ID + PDU + CRC) to a request PDU."""
+    fc = request[0]
+    count = int.from_bytes(request[3:5], "big")
+    if fc == FC_READ_HOLDING:
+        return 5 + 2 * count
+    if fc == FC_READ_COILS:
+        return 5 + (count + 7) // 8
+    return 8                                    # the write echoes
+
+
+def parse_reply(request: bytes, pdu: bytes) -> bytes:
+    """Check a reply PDU against its request; raise ModbusError on an
+    exception reply, NoResponse on anything malformed. Returns the PDU."""
+    fc = request[0]
+    if pdu and pdu[0] == (fc | 0x80) and len(pdu) == 2:
+        raise ModbusError(fc, pdu[1])
+    if not pdu or pdu[0] != fc:
+        raise NoResponse(f"FC{fc:02d}: reply for another function ({pdu.hex()})")
+    if fc in (FC_READ_HOLDING, FC_READ_COILS):
+        if len(pdu) < 2 or pdu[1] != len(pdu) - 2:
+            raise NoResponse(f"FC{fc:02d}: reply length {len(pdu)} does not match its byte count")
+    elif pdu[1:5] != request[1:5]:
+        raise NoResponse(f"FC{fc:02d}: echo {pdu.hex()} does not match the request")
+    return pdu
+
+
+def registers_of(pdu: bytes) -> list[int]:
+    return [int.from_bytes(pdu[2 + i:4 + i], "big") for i in range(0, pdu[1], 2)]
+
+
+def bits_of(pdu: bytes, count: int) -> list[bool]:
+    return [bool((pdu[2 + i // 8] >> (i % 8)) & 1) for i in range(count)]
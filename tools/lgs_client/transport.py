@@ -0,0 +1,319 @@
+"""Transports: one RS485 bus, shared by every client talking over it.
+
+A transport owns the line. It frames and checks RTU ADUs (rtu.py), keeps
+the inter-frame gap the modules need between transactions, retries a lost
+reply, and serialises callers with a lock — so sync clients on several
+threads, or async clients (aio.py runs each call in a worker thread), can
+share one bus without interleaving frames.
+
+  SerialTransport   a USB-RS485 adapter through pyserial (the bench rig)
+  BenchTransport    the firmware's host build (tools/host_bench.py) on a
+                    virtual line — the same client code, no hardware
+  BenchFleet        several host builds on one virtual line, one per module
+
+Either records the line when given capture=PATH (capture.py): every byte
+each side sent, timestamped, for tools/lgs_capture.py to show and replay.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+
+from . import rtu
+from .capture import DEVICE, MASTER, CaptureWriter
+
+
+@dataclass
+class TransportStats:
+    transactions: int = 0        # request/reply exchanges, retries included
+    broadcasts: int = 0          # requests sent without a reply
+    retries: int = 0
+    tx_bytes: int = 0
+    rx_bytes: int = 0
+
+    def wire_seconds(self, baud: int) -> float:
+        """Time the bytes themselves occupied the line (8N1)."""
+        return (self.tx_bytes + self.rx_bytes) * 10 / baud
+
+
+class Transport:
+    """Base: framing, retries, gap, lock and counters. Subclasses move bytes."""
+
+    def __init__(self, baud: int, retries: int = 1, gap_s: float = 0.02) -> None:
+        self.baud = baud
+        self.retries = retries
+        self.gap_s = gap_s
+        self.stats = TransportStats()
+        self.lock = threading.RLock()
+
+    # --- what subclasses provide ----------------------------------------------
+    def _exchange(self, frame: bytes, reply_len: int) -> bytes | None:
+        """Send one ADU; return the reply ADU (reply_len bytes, or 5 for an
+        exception), None when nothing usable came back. reply_len 0 = a
+        broadcast: send, wait out the turnaround, return None."""
+        raise NotImplementedError
+
+    def pause(self, seconds: float) -> None:
+        """Let the bus (and the modules) run for a while."""
+        time.sleep(seconds)
+
+    def now(self) -> float:
+        """Seconds on the bus's clock, for timing a run of transactions."""
+        return time.monotonic()
+
+    def close(self) -> None:
+        pass
+
+    # --- API used by the clients ------------------------------------------------
+    def transact(self, uid: int, pdu: bytes) -> bytes:
+        """One request/reply; returns the checked reply PDU."""
+        frame = rtu.adu(uid, pdu)
+        with self.lock:
+            for attempt in range(self.retries + 1):
+                self.stats.transactions += 1
+                self.stats.tx_bytes += len(frame)
+                reply = self._exchange(frame, rtu.reply_length(pdu))
+                if reply:
+                    self.stats.rx_bytes += len(reply)
+                body = rtu.check_adu(reply) if reply else None
+                if body is not None and reply[0] == uid:
+                    return rtu.parse_reply(pdu, body)
+                if attempt < self.retries:
+                    self.stats.retries += 1
+            raise rtu.NoResponse(f"id {uid}: no reply to FC{pdu[0]:02d} "
+                                 f"@{int.from_bytes(pdu[1:3], 'big')}")
+
+    def send(self, uid: int, pdu: bytes) -> None:
+        """A request that gets no reply: a broadcast (slave ID 0), or a
+        command that resets the module before it can answer (coil 503)."""
+        frame = rtu.adu(uid, pdu)
+        with self.lock:
+            self.stats.broadcasts += 1
+            self.stats.tx_bytes += len(frame)
+            self._exchange(frame, 0)
+
+    def broadcast(self, pdu: bytes) -> None:
+        """Slave ID 0: every module acts, none answers."""
+        self.send(0, pdu)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SerialTransport(Transport):
+    """RTU master on a serial port. Needs pyserial (imported on open)."""
+
+    def __init__(self, port: str, baud: int = 9600, timeout: float = 1.0,
+                 retries: int = 1, gap_s: float = 0.02, capture: str | None = None) -> None:
+        super().__init__(baud, retries, gap_s)
+        try:
+            import serial
+        except ImportError as e:
+            raise rtu.LgsError("pyserial not installed.  Run:  pip install pyserial") from e
+        try:
+            self.ser = serial.Serial(port, baud, bytesize=8, parity="N", stopbits=1,
+                                     timeout=timeout)
+        except (serial.SerialException, OSError) as e:
+            raise rtu.LgsError(f"cannot open {port}: {e}") from e
+        self.port = port
+        self._quiet_at = 0.0
+        self.capture = CaptureWriter(capture, baud) if capture else None
+
+    def _read(self, n: int) -> bytes:
+        data = self.ser.read(n)
+        if self.capture and data:
+            self.capture.received(DEVICE, data)
+        return data
+
+    def _exchange(self, frame: bytes, reply_len: int) -> bytes | None:
+        wait = self._quiet_at + self.gap_s - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        # Whatever is left in the buffer is a late reply to an earlier,
+        # timed-out request; reading it as this one's would misalign all
+        # that follow. (Recording, it is read out instead: it was on the line.)
+        if self.capture and self.ser.in_waiting:
+            self._read(self.ser.in_waiting)
+        self.ser.reset_input_buffer()
+        if self.capture:
+            self.capture.write(MASTER, frame, self.capture.now_us())
+        self.ser.write(frame)
+        self.ser.flush()
+        try:
+            if reply_len == 0:
+                return None
+            head = self._read(2)
+            if len(head) < 2:
+                return None
+            rest = self._read(3 if head[1] & 0x80 else reply_len - 2)
+            return head + rest
+        finally:
+            self._quiet_at = time.monotonic()
+
+    def close(self) -> None:
+        self.ser.close()
+        if self.capture:
+            self.capture.close()
+
+
+class BenchTransport(Transport):
+    """The firmware's host build, driven over its script protocol
+    (tools/host/bench.cpp). Time is virtual: pauses and gaps cost nothing
+    real, and the bench reports what they would have cost the board.
+    With capture=PATH the bench records its own line, to the microsecond."""
+
+    def __init__(self, exe: str, args: tuple[str, ...] = (), baud: int = 9600,
+                 timeout: float = 1.0, retries: int = 0, gap_s: float = 0.002,
+                 capture: str | None = None) -> None:
+        super().__init__(baud, retries, gap_s)
+        self.timeout_ms = int(timeout * 1000)
+        if capture:
+            args = (*args, "--capture", capture)
+        self.proc = subprocess.Popen([exe, *args], stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE, text=True, bufsize=1)
+        self.resets = 0
+        self.dead_s = 0.0            # paused after a reset: the master's clock runs on
+        self.lines: list[str] = []   # everything that was not a reply, in order
+        self._readline()             # "boot ..."
+
+    def _readline(self) -> str:
+        line = self.proc.stdout.readline()
+        if not line:
+            raise rtu.LgsError("host bench exited")
+        line = line.rstrip("\n")
+        if line.startswith("reset"):
+            self.resets += 1
+        return line
+
+    def command(self, line: str, answer: str | None = None) -> str | None:
+        """One script line; with `answer`, wait for the output line that
+        starts with it and return its remainder."""
+        self.proc.stdin.write(line + "\n")
+        self.proc.stdin.flush()
+        while answer is not None:
+            out = self._readline()
+            tag, _, rest = out.partition(" ")
+            if tag == answer:
+                return rest
+            self.lines.append(out)
+        return None
+
+    def _run(self, ms: int) -> None:
+        # "clock" answers once the run is over, so a "reset" it caused has
+        # been read (and counted) before the next request goes out.
+        self.command(f"run {ms}")
+        self.command("clock", "clock")
+
+    def _exchange(self, frame: bytes, reply_len: int) -> bytes | None:
+        if self.resets:
+            return None              # the bench does not reboot: the module is gone
+        gap_us = int(self.gap_s * 1e6)
+        self.command(f"send {gap_us} {frame.hex()}")
+        if reply_len == 0:
+            # A real master waits out the turnaround before the next frame.
+            self._run(1 + len(frame) * 10_000 // self.baud + gap_us // 1000)
+            return None
+        rest = self.command(f"recv {self.timeout_ms}", "reply")
+        return None if rest == "-" else bytes.fromhex(rest)
+
+    def pause(self, seconds: float) -> None:
+        if not self.resets:
+            self._run(int(seconds * 1000))
+        else:
+            self.dead_s += seconds
+
+    def clock_us(self) -> int:
+        return int(self.command("clock", "clock"))
+
+    def now(self) -> float:
+        return self.clock_us() / 1e6 + self.dead_s
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.lines += [l.rstrip("\n") for l in self.proc.stdout]
+            self.proc.wait()
+
+
+class BenchFleet(Transport):
+    """Several host builds on one virtual line: `boards` maps each module's
+    slave ID to its bench arguments (its own --at24, --app). Every module
+    hears every frame; the one addressed answers. Each process keeps its
+    own virtual clock, so after each transaction the others run up to the
+    one that went furthest — the modules share one timeline.
+
+    A module whose UART came up at another rate than `baud` (reg 3 at its
+    last boot) is off this line: it would hear nothing of it, so it is not
+    kept running. `lose(uid, frame)` returning True drops a frame before
+    that module hears it — noise, a module that misses its coil 503."""
+
+    def __init__(self, exe: str, boards: dict[int, tuple[str, ...]], baud: int = 9600,
+                 timeout: float = 1.0, retries: int = 0, gap_s: float = 0.002,
+                 lose=None) -> None:
+        super().__init__(baud, retries, gap_s)
+        self.lose = lose
+        self.boards: dict[int, BenchTransport] = {}
+        self.off_line: dict[int, int] = {}      # uid -> the rate it runs at instead
+        self.lines: dict[int, list[str]] = {}   # uid -> its bench output, closed boards too
+        self._t = 0.0
+        for uid, args in boards.items():
+            bench = BenchTransport(exe, args, baud, timeout, 0, gap_s)
+            rate = int(bench.command("baud", "baud"))
+            if rate == baud:
+                self.boards[uid] = bench
+            else:
+                self.off_line[uid] = rate
+                bench.close()
+                self.lines[uid] = bench.lines
+        self._align()
+
+    def _align(self) -> None:
+        live = [b for b in self.boards.values() if not b.resets]
+        if live:
+            t = max(b.clock_us() for b in live)
+            for b in live:
+                b.command(f"until {t}")
+            self._t = max(self._t, t / 1e6)
+
+    def _exchange(self, frame: bytes, reply_len: int) -> bytes | None:
+        reply = None
+        for uid, bench in self.boards.items():
+            if bench.resets or (self.lose and self.lose(uid, frame)):
+                continue
+            if reply_len and uid == frame[0]:
+                reply = bench._exchange(frame, reply_len)
+            elif reply_len:
+                bench.command(f"send {int(self.gap_s * 1e6)} {frame.hex()}")
+            else:
+                bench._exchange(frame, 0)
+        self._align()
+        return reply
+
+    def resets(self, uid: int) -> int:
+        return self.boards[uid].resets if uid in self.boards else 0
+
+    def command(self, line: str) -> None:
+        """A script line (section, sense, ...) for every module on the line."""
+        for bench in self.boards.values():
+            bench.command(line)
+
+    def pause(self, seconds: float) -> None:
+        for bench in self.boards.values():
+            bench.pause(seconds)
+        self._t += seconds
+        self._align()
+
+    def now(self) -> float:
+        return self._t
+
+    def close(self) -> None:
+        for uid, bench in self.boards.items():
+            bench.close()
+            self.lines[uid] = bench.lines
+        self.boards = {}
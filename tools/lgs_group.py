@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LGS R5.0 - group commands over RS485 (one broadcast lights a pick list)
+=======================================================================
+Lighting a pick list used to cost one unicast FC05 per module, each waiting
+for its echo (~23 ms a slot at 9600 baud). The group command window
+(regs 560-681, device side: src/app/group_control.cpp) takes the whole list
+in ONE broadcast FC16: every module applies the entries addressed to its
+slave ID, to a group it belongs to (reg 82) or to everyone.
+
+  ... tools/lgs_group.py -p COM30 21=p3 22=p3 35=d1+n12
+  ... tools/lgs_group.py -p COM30 g2=off
+  ... tools/lgs_group.py -p COM30 --set-groups 21,22,23 --groups 2,5 --persist
+  ... tools/lgs_group.py -p COM30 --show-groups 21,22,23
+
+Entry syntax  TARGET=ACTION[+ACTION...]
+  TARGET  a slave ID (1-247), gN (group N, 1-16) or all
+  ACTION  pN  enable preset N            (coil 1000+N)
+          dN  enable preset N + display  (coil 1010+N)
+          lN  trigger preset N + latch   (coil 1020+N)
+          ldN trigger + latch + display  (coil 1030+N)
+          xN  disable preset N           (coil 1000+N written 0)
+          nV  show number V (0-99) on the display (reg 60)
+          off All Off                    (coil 511)
+
+Broadcasts are never answered: add --verify to read each addressed ID's
+enable coils back afterwards. Transactions go through tools/lgs_client.
+Requirements: pyserial.
+"""
+
+import argparse
+import random
+import sys
+
+from lgs_client import LgsClient, LgsError, SerialTransport
+from lgs_client import regmap as rm
+
+# --- Wire contract (addresses: lgs_client/regmap.py) ------------------------
+REG_GROUP_SEQ     = rm.REG_GROUP_SEQ      # frame sequence: the device acts when it changes
+MAX_ENTRIES       = rm.GROUP_MAX_ENTRIES  # {target, coil word} pairs from reg 562
+TARGET_ALL        = rm.GROUP_TARGET_ALL   # 0x100 + g = group g
+GROUP_COUNT       = rm.GROUP_COUNT
+COIL_OFF          = rm.GROUP_COIL_OFF     # write 0 instead of 1
+SHOW_NUMBER       = rm.GROUP_SHOW_NUMBER  # 0x4000 + v = reg 60 := v
+COIL_ALL_OFF      = rm.COIL_ALL_OFF
+BAUD_CHOICES      = rm.BAUD_RATES
+
+ACTION_BASES = {"p": 1000, "d": 1010, "l": 1020, "ld": 1030}
+
+
+def parse_target(text):
+    text = text.strip().lower()
+    if text == "all":
+        return TARGET_ALL
+    if text.startswith("g"):
+        g = int(text[1:])
+        if not 1 <= g <= GROUP_COUNT:
+            raise ValueError(f"group {g} outside 1-{GROUP_COUNT}")
+        return TARGET_ALL + g
+    uid = int(text)
+    if not 1 <= uid <= 247:
+        raise ValueError(f"slave ID {uid} outside 1-247")
+    return uid
+
+
+def parse_action(text):
+    text = text.strip().lower()
+    if text == "off":
+        return COIL_ALL_OFF
+    if text.startswith("n"):
+        v = int(text[1:])
+        if not 0 <= v <= 99:
+            raise ValueError(f"display number {v} outside 0-99")
+        return SHOW_NUMBER + v
+    if text.startswith("x"):
+        n = int(text[1:])
+        if not 1 <= n <= 8:
+            raise ValueError(f"preset {n} outside 1-8")
+        return COIL_OFF | (1000 + n)
+    prefix = text.rstrip("0123456789")
+    if prefix not in ACTION_BASES or prefix == text:
+        raise ValueError(f"unknown action {text!r}")
+    n = int(text[len(prefix):])
+    if not 1 <= n <= 8:
+        raise ValueError(f"preset {n} outside 1-8")
+    return ACTION_BASES[prefix] + n
+
+
+def parse_entries(specs):
+    """['21=p3', 'g2=off', ...] -> [(target, coil word), ...] in order."""
+    entries = []
+    for spec in specs:
+        target, sep, actions = spec.partition("=")
+        if not sep or not actions:
+            raise ValueError(f"{spec!r}: expected TARGET=ACTION")
+        t = parse_target(target)
+        entries += [(t, parse_action(a)) for a in actions.split("+")]
+    return entries
+
+
+def group_frames(entries, seq):
+    """Split entries into window frames: [(seq, [regs from 560]), ...].
+
+    Each frame takes the next sequence number, skipping 0 (every module
+    boots with 0 in reg 560, so a frame carrying 0 would be ignored)."""
+    frames = []
+    for start in range(0, max(len(entries), 1), MAX_ENTRIES):
+        part = entries[start:start + MAX_ENTRIES]
+        seq = (seq + 1) & 0xFFFF or 1
+        frames.append((seq, [seq, len(part)] + [v for pair in part for v in pair]))
+    return frames
+
+
+def mask_of(groups):
+    mask = 0
+    for g in groups:
+        if not 1 <= g <= GROUP_COUNT:
+            raise ValueError(f"group {g} outside 1-{GROUP_COUNT}")
+        mask |= 1 << (g - 1)
+    return mask
+
+
+def groups_of(mask):
+    return [g for g in range(1, GROUP_COUNT + 1) if mask & (1 << (g - 1))]
+
+
+# ---------------------------------------------------------------------------
+# Actions (bus = an lgs_client transport)
+# ---------------------------------------------------------------------------
+
+def action_send(bus, entries, verify):
+    # A fresh random start: a master restarted mid-shift must not reuse the
+    # sequence number the modules last saw, or its first list is ignored.
+    seq = random.randrange(1, 0x10000)
+    everyone = LgsClient(bus, rm.BROADCAST)
+    for seq, regs in group_frames(entries, seq):
+        everyone.write_registers(REG_GROUP_SEQ, regs)
+        print(f"  broadcast seq {seq}: {regs[1]} entries")
+    if not verify:
+        return 0
+    failed = 0
+    for uid in sorted({t for t, _ in entries if t < TARGET_ALL}):
+        try:
+            lit = LgsClient(bus, uid).enabled_presets()
+        except LgsError as e:
+            print(f"  id {uid}: {e}")
+            failed += 1
+            continue
+        print(f"  id {uid}: enabled presets {lit or '-'}")
+    return 1 if failed else 0
+
+
+def action_set_groups(bus, ids, mask, persist):
+    failed = 0
+    for uid in ids:
+        dev = LgsClient(bus, uid)
+        try:
+            dev.write_register(rm.REG_GROUP_MASK, mask)
+        except LgsError as e:
+            print(f"  id {uid}: {e}")
+            failed += 1
+            continue
+        if persist:
+            dev.persist()      # saves and resets the module; no echo comes back
+        print(f"  id {uid}: groups {groups_of(mask) or '-'}" + (" (saved)" if persist else ""))
+    return 1 if failed else 0
+
+
+def action_show_groups(bus, ids):
+    failed = 0
+    for uid in ids:
+        try:
+            mask = LgsClient(bus, uid).read_register(rm.REG_GROUP_MASK)
+        except LgsError as e:
+            print(f"  id {uid}: {e}")
+            failed += 1
+        else:
+            print(f"  id {uid}: groups {groups_of(mask) or '-'}")
+    return 1 if failed else 0
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="LGS R5.0 group commands: one Modbus broadcast for a whole pick list.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    ap.add_argument("entries", nargs="*", help="TARGET=ACTION[+ACTION...] (see the module docstring)")
+    ap.add_argument("-p", "--port", default="COM30", help="USB-RS485 serial port")
+    ap.add_argument("-b", "--baud", type=int, default=9600,
+                    choices=BAUD_CHOICES, help="bus baud rate")
+    ap.add_argument("--gap", type=float, default=25.0, help="inter-frame gap in ms")
+    ap.add_argument("--verify", action="store_true",
+                    help="read the enable coils of every addressed ID afterwards")
+    ap.add_argument("--set-groups", metavar="IDS", help="comma-separated IDs to write reg 82 on")
+    ap.add_argument("--groups", default="", help="with --set-groups: comma-separated groups 1-16")
+    ap.add_argument("--persist", action="store_true",
+                    help="with --set-groups: save with coil 503 (the module resets)")
+    ap.add_argument("--show-groups", metavar="IDS", help="comma-separated IDs to read reg 82 from")
+    args = ap.parse_args()
+
+    try:
+        entries = parse_entries(args.entries)
+        mask = mask_of(int(g) for g in args.groups.split(",") if g.strip())
+    except ValueError as e:
+        print(f"[ERR] {e}")
+        return 2
+    if not (entries or args.set_groups or args.show_groups):
+        ap.print_usage()
+        return 2
+
+    try:
+        bus = SerialTransport(args.port, args.baud, timeout=1.0, retries=1,
+                              gap_s=args.gap / 1000.0)
+    except LgsError as e:
+        print(f"[ERR] {e}")
+        return 2
+    with bus:
+        ids_of = lambda text: [int(x) for x in text.split(",") if x.strip()]
+        if args.show_groups:
+            return action_show_groups(bus, ids_of(args.show_groups))
+        if args.set_groups:
+            return action_set_groups(bus, ids_of(args.set_groups), mask, args.persist)
+        return action_send(bus, entries, args.verify)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
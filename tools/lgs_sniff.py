@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LGS R5.0 - passive RS485 bus analyzer
+=====================================
+Nobody could say how busy a cabinet's bus is or which module answers
+slowly: the master only sees its own timeouts. This listens — a second
+USB-RS485 adapter on the same A/B pair, receive only, never driving the
+line — or reads a capture (tools/lgs_client/capture.py), and works out:
+
+  frames   by the 3.5-character rule (1750 us above 19200 baud). A live
+           tap cannot time that: the adapter hands bytes over in batches,
+           hiding real gaps inside a read and making false ones between
+           reads. There a silence must also outlast --jitter, and a stretch
+           holding several frames is split where a length its function
+           code allows ends on a good CRC. Incremental: each read is taken
+           as it comes, and a stretch past 256 bytes (no RTU frame is
+           longer) is split or its head given up as damaged, so the buffer
+           never holds more than a frame plus one read.
+  sides    a tap has no direction. A frame is the reply when it comes from
+           the ID the last request went to, with that request's function
+           (or its exception) and the length the request asks for, within
+           --reply-window; anything else is a request. A capture's recorded
+           sides are not used: the file is read as the tap would hear it.
+  names    each address as src/svc/modbus_map.h spells it: the constant,
+           the family member (mbRegLedBase(3)), or the nearest name below
+           plus an offset.
+  report   per --interval: bus utilization (the share of time the line
+           carried bytes), frames, requests, broadcasts, bad CRCs,
+           unanswered requests. At the end, per slave ID: requests,
+           replies, exceptions, unanswered, bad CRC and reply latency
+           (request's last byte to the reply's first) p50/p90/p99/max;
+           broadcast load; bytes that made no frame.
+
+  ... tools/lgs_sniff.py --port COM31 --baud 57600           # a line a second
+  ... tools/lgs_sniff.py --port /dev/ttyUSB1 --frames         # and every frame
+  ... tools/lgs_sniff.py --port COM31 --capture cabinet.lgscap --duration 600
+  ... tools/lgs_sniff.py ota.lgscap --interval 10 --json ota_bus.json
+
+A live tap's times are the host's: an FTDI adapter holds what it received
+for up to its latency timer (16 ms by default; 1 ms in the driver's
+advanced settings or /sys/bus/usb-serial/devices/ttyUSB*/latency_timer),
+so that is how far a live latency figure can be trusted. A capture from the
+host bench is exact. --capture records what the tap heard, the sides as
+guessed, for tools/lgs_capture.py show/replay.
+
+The decoder keeps up with a saturated 57600 baud line many times over;
+tools/host_bench.py sniff measures it, and checks the guessed sides and
+counts against a recorded capture.
+
+Exit status: 0 after a report, 2 on bad arguments or an unreadable input.
+Live listening needs pyserial.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field, replace
+
+from lgs_capture import describe
+from lgs_client import rtu
+from lgs_client.capture import BAUD, DEVICE, MASTER, CaptureWriter, Frame, byte_us, frame_gap_us, read_capture
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MAP_HEADER = os.path.normpath(os.path.join(HERE, "..", "src", "svc", "modbus_map.h"))
+
+MAX_ADU = 256                   # the longest RTU frame
+JITTER_US = 20_000              # live: an FTDI latency timer's 16 ms, and some
+REPLY_WINDOW_US = 1_000_000     # lgs_client's timeout: a retry comes later than this
+LATENCY_STEP_US = 100           # latency histogram buckets
+NAME_SPAN = 64                  # furthest "NAME+k" reaches past a named address
+READ_SIZE = 4096
+READ_TIMEOUT_S = 0.002
+
+CONST = re.compile(r"constexpr\s+uint16_t\s+(MB_(?:REG|COIL)_\w+)\s*=\s*(\w+)\s*;")
+FAMILY = re.compile(r"constexpr\s+uint16_t\s+(mb(?:Reg|Coil)\w+)\(uint16_t\s+(\w+)\)\s*"
+                    r"\{\s*return\s+([^;]+);\s*\}(.*)")
+RANGE = re.compile(r"(\w+)\s*=\s*(\d+)\s*\.\.\s*(\d+)")
+COIL_FUNCTIONS = (rtu.FC_READ_COILS, rtu.FC_WRITE_COIL, rtu.FC_WRITE_COILS)
+
+
+# --- names -------------------------------------------------------------------------
+
+class MapNames:
+    """Register and coil names read from modbus_map.h; call it as
+    name(fc, addr) (lgs_capture.describe does)."""
+
+    def __init__(self, regs: dict[int, str], coils: dict[int, str]) -> None:
+        self.tables = {False: regs, True: coils}
+        self.keys = {False: sorted(regs), True: sorted(coils)}
+
+    @classmethod
+    def load(cls, path: str = MAP_HEADER) -> "MapNames":
+        """Constants first, then the one-argument families over the range
+        their comment gives — or the family above gives, for the same
+        variable (mbRegProfAvg after mbRegProfMaxHi); else n = 1..8."""
+        regs: dict[int, str] = {}
+        coils: dict[int, str] = {}
+        families = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if m := CONST.search(line):
+                    name, value = m.group(1), int(m.group(2), 0)
+                    (coils if name.startswith("MB_COIL_") else regs).setdefault(value, name)
+                elif m := FAMILY.search(line):
+                    families.append(m.groups())
+        last = ("", 1, 8)
+        for name, var, expr, comment in families:
+            r = RANGE.search(comment)
+            if r and r.group(1) == var:
+                last = (var, int(r.group(2)), int(r.group(3)))
+            elif last[0] != var:
+                last = (var, 1, 8)
+            _, lo, hi = last
+            table = coils if name.startswith("mbCoil") else regs
+            for n in range(lo, hi + 1):
+                table.setdefault(eval(expr, {"__builtins__": {}}, {var: n}), f"{name}({n})")
+        return cls(regs, coils)
+
+    def __call__(self, fc: int, addr: int) -> str:
+        coil = fc in COIL_FUNCTIONS
+        table, keys = self.tables[coil], self.keys[coil]
+        if addr in table:
+            return table[addr]
+        i = bisect_right(keys, addr) - 1
+        if i < 0 or addr - keys[i] > NAME_SPAN:
+            return "unmapped"
+        return f"{table[keys[i]]}+{addr - keys[i]}"
+
+
+# --- frames ------------------------------------------------------------------------
+
+def frame_lengths(head: bytes) -> tuple[int, ...]:
+    """The lengths a frame starting with `head` (ID, function, ...) can have,
+    request or reply, in the functions the LGS map uses."""
+    if len(head) < 2:
+        return ()
+    fc = head[1]
+    if fc & 0x80:
+        return (5,)
+    if fc in (rtu.FC_READ_COILS, rtu.FC_READ_HOLDING):
+        return (8,) + ((5 + head[2],) if len(head) > 2 else ())
+    if fc in (rtu.FC_WRITE_COIL, rtu.FC_WRITE_REGISTER):
+        return (8,)
+    if fc in (rtu.FC_WRITE_COILS, rtu.FC_WRITE_REGISTERS):
+        return (8,) + ((9 + head[6],) if len(head) > 6 else ())
+    return ()
+
+
+def request_length(head: bytes) -> int | None:
+    """What a request starting with `head` is long, None for an exception
+    or a function the map does not use."""
+    fc = head[1]
+    if fc in (rtu.FC_READ_COILS, rtu.FC_READ_HOLDING, rtu.FC_WRITE_COIL, rtu.FC_WRITE_REGISTER):
+        return 8
+    if fc in (rtu.FC_WRITE_COILS, rtu.FC_WRITE_REGISTERS) and len(head) > 6:
+        return 9 + head[6]
+    return None
+
+
+class FrameSplitter:
+    """Bytes in as the line delivers them, RTU frames out (side not known
+    yet: kind MASTER). Holds at most MAX_ADU bytes plus one read."""
+
+    def __init__(self, baud: int, jitter_us: float = 0) -> None:
+        self.jitter_us = jitter_us                  # how far the byte times may be off
+        self.buf = bytearray()
+        self.marks: list[tuple[int, float]] = []    # (offset in buf, that byte's start bit)
+        self.end_us = 0.0                           # the line last carried a byte
+        self.set_baud(baud)
+
+    def set_baud(self, baud: int) -> None:
+        self.baud, self.byte_us = baud, byte_us(baud)
+        self.gap_us = frame_gap_us(baud) + self.jitter_us
+
+    def feed(self, data: bytes, t_us: float) -> list[Frame]:
+        """`data` back to back from t_us, its first start bit (held at the
+        end of what came before if earlier: the host's clock is coarse)."""
+        out = self.close() if self.buf and t_us - self.end_us >= self.gap_us else []
+        t_us = max(t_us, self.end_us)
+        self.marks.append((len(self.buf), t_us))
+        self.buf += data
+        self.end_us = t_us + len(data) * self.byte_us
+        while len(self.buf) > MAX_ADU:
+            out.append(self._front(len(self.buf) - MAX_ADU))
+        return out
+
+    def idle(self, now_us: float) -> list[Frame]:
+        """The frame in hand, once the line has been silent long enough."""
+        return self.close() if self.buf and now_us - self.end_us >= self.gap_us else []
+
+    def close(self) -> list[Frame]:
+        """Whatever is in hand as frames: the silence after it has come."""
+        out = []
+        while self.buf:
+            if rtu.check_adu(bytes(self.buf)) is not None:
+                out.append(self._take(len(self.buf)))
+            else:
+                out.append(self._front(len(self.buf)))
+        return out
+
+    def _good_at(self, k: int) -> int:
+        """Length of a frame with a good CRC starting at buf[k], or 0."""
+        for n in frame_lengths(self.buf[k:k + 7]):
+            if k + n <= len(self.buf) and rtu.check_adu(bytes(self.buf[k:k + n])) is not None:
+                return n
+        return 0
+
+    def _front(self, limit: int) -> Frame:
+        """A good frame off the front; failing that, the bytes before the
+        next good one (or the first `limit`) as one damaged frame."""
+        n = self._good_at(0)
+        if n:
+            return self._take(n)
+        k = next((k for k in range(1, len(self.buf) - 3) if self._good_at(k)), limit)
+        return self._take(min(k, limit))
+
+    def _at(self, offset: int) -> float:
+        i = bisect_right(self.marks, (offset, math.inf)) - 1
+        mark, t = self.marks[i]
+        return t + (offset - mark) * self.byte_us
+
+    def _take(self, n: int) -> Frame:
+        t, end = self._at(0), self._at(n - 1) + self.byte_us
+        data = bytes(self.buf[:n])
+        del self.buf[:n]
+        if self.buf:
+            head = (0, self._at(n))
+            self.marks = [head] + [(o - n, mt) for o, mt in self.marks if o > n]
+        else:
+            self.marks = []
+        return Frame(int(t), end, MASTER, data)
+
+
+# --- statistics --------------------------------------------------------------------
+
+@dataclass
+class SlaveStats:
+    requests: int = 0
+    replies: int = 0
+    exceptions: int = 0
+    unanswered: int = 0
+    bad_crc: int = 0                                    # frames carrying this ID byte
+    latency: Counter = field(default_factory=Counter)   # LATENCY_STEP_US steps -> replies
+
+
+@dataclass
+class Tally:
+    """Line totals over an interval, or the whole run."""
+    busy_us: float = 0.0
+    frames: int = 0
+    bytes: int = 0
+    requests: int = 0
+    broadcasts: int = 0
+    broadcast_us: float = 0.0
+    bad_crc: int = 0
+    unanswered: int = 0
+    stray: int = 0              # good frames neither a request nor the awaited reply
+
+
+def percentile(hist: Counter, q: float) -> float | None:
+    """Nearest-rank percentile of a latency histogram, in ms."""
+    total = sum(hist.values())
+    if not total:
+        return None
+    need, seen = max(1, math.ceil(q * total)), 0
+    for step in sorted(hist):
+        seen += hist[step]
+        if seen >= need:
+            return step * LATENCY_STEP_US / 1000
+    return None
+
+
+class Analyzer:
+    """The splitter, the side guessing and the tallies. feed() bytes as they
+    come, idle() when a read came back empty, finish() at the end."""
+
+    def __init__(self, baud: int, *, jitter_us: float = 0, reply_window_us: float = REPLY_WINDOW_US,
+                 interval_us: float = 1e6, on_frame=None, on_interval=None) -> None:
+        self.splitter = FrameSplitter(baud, jitter_us)
+        self.reply_window_us = reply_window_us
+        self.interval_us = interval_us      # utilization is tallied per interval; its peak reported
+        self.on_frame = on_frame            # (frame with its side, gap before it in us)
+        self.on_interval = on_interval      # (interval end us, its length us, Tally)
+        self.slaves: dict[int, SlaveStats] = {}
+        self.total, self.window = Tally(), Tally()
+        self.pending: Frame | None = None   # the request a reply is awaited for
+        self.first_us: float | None = None
+        self.last_us = 0.0
+        self.window_end = 0.0
+        self.peak_util = 0.0
+
+    def slave(self, uid: int) -> SlaveStats:
+        return self.slaves.setdefault(uid, SlaveStats())
+
+    def feed(self, data: bytes, t_us: float) -> None:
+        if self.first_us is None:
+            self.first_us = t_us
+            self.window_end = t_us + self.interval_us
+        for f in self.splitter.feed(data, t_us):
+            self._frame(f)
+
+    def idle(self, now_us: float) -> None:
+        for f in self.splitter.idle(now_us):
+            self._frame(f)
+        if self.pending and now_us - self.pending.end_us > self.reply_window_us:
+            self._unanswered()
+        self._tick(now_us)
+
+    def set_baud(self, baud: int) -> None:
+        for f in self.splitter.close():
+            self._frame(f)
+        self.splitter.set_baud(baud)
+
+    def finish(self) -> None:
+        for f in self.splitter.close():
+            self._frame(f)
+        if self.pending:
+            self._unanswered()
+        self._tick(self.last_us)
+        start = self.window_end - self.interval_us
+        if self.window.frames and self.last_us > start:
+            self._close_window(self.last_us - start, partial=True)
+
+    def _tally(self, field_: str, n: float = 1) -> None:
+        for t in (self.total, self.window):
+            setattr(t, field_, getattr(t, field_) + n)
+
+    def _unanswered(self) -> None:
+        self.slave(self.pending.data[0]).unanswered += 1
+        self._tally("unanswered")
+        self.pending = None
+
+    def _answers(self, req: Frame, f: Frame) -> bool:
+        uid, fc = f.data[0], f.data[1]
+        if uid != req.data[0] or fc & 0x7F != req.data[1]:
+            return False
+        return len(f.data) == (5 if fc & 0x80 else rtu.reply_length(req.data[1:-2]))
+
+    def _frame(self, f: Frame) -> None:
+        self._tick(f.end_us)
+        gap = max(0.0, f.t_us - self.last_us) if self.total.frames else 0.0
+        self.last_us = f.end_us
+        on_wire = len(f.data) * self.splitter.byte_us
+        self._tally("frames")
+        self._tally("bytes", len(f.data))
+        self._tally("busy_us", on_wire)
+        req = self.pending
+        if req is not None and f.t_us - req.end_us > self.reply_window_us:
+            self._unanswered()
+            req = None
+        uid = f.data[0]
+        if rtu.check_adu(f.data) is None:
+            self._tally("bad_crc")
+            # From the ID awaited: its reply, damaged; the request is settled.
+            if req is not None and uid == req.data[0]:
+                self.pending = None
+            if 1 <= uid <= 247:
+                self.slave(uid).bad_crc += 1
+        elif req is not None and self._answers(req, f):
+            f = replace(f, kind=DEVICE)
+            s = self.slave(uid)
+            s.replies += 1
+            s.exceptions += bool(f.data[1] & 0x80)
+            s.latency[round(max(0.0, f.t_us - req.end_us) / LATENCY_STEP_US)] += 1
+            self.pending = None
+        elif len(f.data) == request_length(f.data) or not frame_lengths(f.data):
+            if req is not None:
+                self._unanswered()
+            self._tally("requests")
+            if uid == 0:
+                self._tally("broadcasts")
+                self._tally("broadcast_us", on_wire)
+            else:
+                self.slave(uid).requests += 1
+                self.pending = f
+        else:
+            self._tally("stray")
+        if self.on_frame:
+            self.on_frame(f, gap)
+
+    def _tick(self, now_us: float) -> None:
+        """Close the intervals that ended by now_us."""
+        while self.first_us is not None and now_us >= self.window_end:
+            self._close_window(self.interval_us)
+            self.window_end += self.interval_us
+
+    def _close_window(self, span_us: float, partial: bool = False) -> None:
+        if not partial:     # a sliver at the end would read as a busy line
+            self.peak_util = max(self.peak_util, min(1.0, self.window.busy_us / span_us))
+        if self.on_interval:
+            self.on_interval(self.window_end - self.interval_us + span_us, span_us, self.window)
+        self.window = Tally()
+
+    def span_us(self) -> float:
+        return self.last_us - self.first_us if self.first_us is not None else 0.0
+
+    def report(self) -> dict:
+        span = self.span_us()
+        t = self.total
+        return {
+            "baud": self.splitter.baud,
+            "span_s": round(span / 1e6, 3),
+            "frames": t.frames,
+            "bytes": t.bytes,
+            "utilization": round(t.busy_us / span, 4) if span else 0.0,
+            "interval_s": self.interval_us / 1e6,
+            "peak_utilization": round(self.peak_util, 4),
+            "requests": t.requests,
+            "broadcasts": t.broadcasts,
+            "broadcast_share": round(t.broadcast_us / span, 4) if span else 0.0,
+            "bad_crc": t.bad_crc,
+            "unanswered": t.unanswered,
+            "stray": t.stray,
+            "slaves": {
+                uid: {
+                    "requests": s.requests, "replies": s.replies, "exceptions": s.exceptions,
+                    "unanswered": s.unanswered, "bad_crc": s.bad_crc,
+                    **{f"p{round(q * 100)}_ms": percentile(s.latency, q) for q in (0.5, 0.9, 0.99)},
+                    "max_ms": max(s.latency) * LATENCY_STEP_US / 1000 if s.latency else None,
+                } for uid, s in sorted(self.slaves.items())
+            },
+        }
+
+
+# --- output ----------------------------------------------------------------------------
+
+def interval_line(end_us: float, span_us: float, w: Tally) -> str:
+    util = min(1.0, w.busy_us / span_us) if span_us else 0.0
+    bcast = f"{w.broadcasts} ({w.broadcast_us / span_us:.1%} of line)" if w.broadcasts else "0"
+    return (f"{end_us / 1e6:10.1f} s  util {util:6.1%}  frames {w.frames:4}  req {w.requests:4}  "
+            f"bcast {bcast}  bad CRC {w.bad_crc}  unanswered {w.unanswered}")
+
+
+def print_report(r: dict, out=print) -> None:
+    out(f"{r['span_s']:.1f} s at {r['baud']} baud: {r['frames']} frames, {r['bytes']} B, "
+        f"utilization {r['utilization']:.1%} (busiest {r['interval_s']:g} s: {r['peak_utilization']:.1%})")
+    per_s = r["broadcasts"] / r["span_s"] if r["span_s"] else 0.0
+    out(f"requests {r['requests']}, broadcast {r['broadcasts']} ({per_s:.2f}/s, "
+        f"{r['broadcast_share']:.1%} of line time); bad CRC {r['bad_crc']} "
+        f"({r['bad_crc'] / r['frames'] if r['frames'] else 0:.2%} of frames); "
+        f"unanswered {r['unanswered']}; stray {r['stray']}")
+    if not r["slaves"]:
+        return
+
+    def ms(v):
+        return "-" if v is None else f"{v:.1f}"
+
+    out(f"{'id':>5}{'req':>8}{'reply':>8}{'exc':>6}{'unans':>7}{'badCRC':>8}"
+        f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for uid, s in r["slaves"].items():
+        out(f"{uid:>5}{s['requests']:>8}{s['replies']:>8}{s['exceptions']:>6}{s['unanswered']:>7}"
+            f"{s['bad_crc']:>8}{ms(s['p50_ms']):>9}{ms(s['p90_ms']):>9}{ms(s['p99_ms']):>9}"
+            f"{ms(s['max_ms']):>9}")
+
+
+def frame_printer(names: MapNames, out=print):
+    def show(f: Frame, gap_us: float) -> None:
+        side = "D" if f.kind == DEVICE else "M"
+        out(f"{f.t_us / 1000:12.3f} {gap_us / 1000:10.3f} {side} {len(f.data):4}  {describe(f, names)}")
+    return show
+
+
+# --- sources ---------------------------------------------------------------------------
+
+def sniff_capture(path: str, analyzer_args: dict) -> Analyzer:
+    """A capture read as the tap would hear it (its sides ignored)."""
+    baud, runs = read_capture(path)
+    an = Analyzer(baud, **analyzer_args)
+    for r in runs:
+        if r.kind == BAUD:
+            an.set_baud(r.baud)
+        else:
+            an.feed(r.data, r.t_us)
+    an.finish()
+    return an
+
+
+def sniff_port(port: str, baud: int, analyzer_args: dict, duration_s: float | None = None,
+               capture: str | None = None) -> Analyzer:
+    """Listen until --duration or Ctrl+C; never writes to the port."""
+    try:
+        import serial
+    except ImportError as e:
+        raise rtu.LgsError("pyserial not installed.  Run:  pip install pyserial") from e
+    try:
+        ser = serial.Serial(port, baud, bytesize=8, parity="N", stopbits=1, timeout=READ_TIMEOUT_S)
+    except (serial.SerialException, OSError) as e:
+        raise rtu.LgsError(f"cannot open {port}: {e}") from e
+    writer = CaptureWriter(capture, baud) if capture else None
+    if writer:
+        shown = analyzer_args.get("on_frame")
+
+        def record(f: Frame, gap_us: float) -> None:
+            writer.write(f.kind, f.data, f.t_us)
+            if shown:
+                shown(f, gap_us)
+        analyzer_args = {**analyzer_args, "on_frame": record}
+    an = Analyzer(baud, **analyzer_args)
+    t0 = time.perf_counter()
+    step_us = byte_us(baud)
+    try:
+        while duration_s is None or time.perf_counter() - t0 < duration_s:
+            data = ser.read(READ_SIZE)
+            now = (time.perf_counter() - t0) * 1e6
+            if data:
+                an.feed(data, now - len(data) * step_us)
+            an.idle(now)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ser.close()
+        an.finish()
+        if writer:
+            writer.close()
+    return an
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="LGS R5.0 passive RS485 bus analyzer.")
+    ap.add_argument("capture", nargs="?", help="a capture file to analyze (instead of --port)")
+    ap.add_argument("-p", "--port", help="listen on this USB-RS485 adapter (receive only)")
+    ap.add_argument("-b", "--baud", type=int, default=9600, help="line rate for --port")
+    ap.add_argument("--duration", type=float, help="stop listening after S seconds (default: Ctrl+C)")
+    ap.add_argument("--interval", type=float,
+                    help="report line every S seconds (default 1 for --port, none for a file)")
+    ap.add_argument("--frames", action="store_true", help="print every frame, decoded")
+    ap.add_argument("--jitter", type=float, default=JITTER_US / 1000,
+                    help="ms a live tap's byte times may be off (the adapter's latency timer)")
+    ap.add_argument("--reply-window", type=float, default=REPLY_WINDOW_US / 1000,
+                    help="ms after a request a reply still counts as its own")
+    ap.add_argument("--map", default=MAP_HEADER, help="modbus_map.h to take names from")
+    ap.add_argument("--capture", dest="record", metavar="FILE", help="record what --port heard")
+    ap.add_argument("--json", help="write the final report here")
+    args = ap.parse_args()
+
+    if bool(args.capture) == bool(args.port):
+        print("[ERR] give a capture file or --port, not both or neither")
+        return 2
+    if args.record and not args.port:
+        print("[ERR] --capture records a live tap; a file is already one")
+        return 2
+    try:
+        names = MapNames.load(args.map)
+    except OSError as e:
+        print(f"[ERR] {args.map}: {e}")
+        return 2
+    shown = args.interval is not None or bool(args.port)
+    if args.interval is not None and args.interval <= 0:
+        print("[ERR] --interval must be above 0")
+        return 2
+    analyzer_args = {
+        "jitter_us": args.jitter * 1000 if args.port else 0,
+        "reply_window_us": args.reply_window * 1000,
+        "interval_us": (args.interval or 1.0) * 1e6,
+        "on_frame": frame_printer(names) if args.frames else None,
+        "on_interval": (lambda end, span, w: print(interval_line(end, span, w))) if shown else None,
+    }
+    if args.frames:
+        print(f"{'t ms':>12} {'gap ms':>10} S {'B':>4}  frame")
+    try:
+        if args.port:
+            print(f"listening on {args.port} @ {args.baud} (Ctrl+C to stop)")
+            an = sniff_port(args.port, args.baud, analyzer_args, args.duration, args.record)
+        else:
+            an = sniff_capture(args.capture, analyzer_args)
+    except (OSError, ValueError, rtu.LgsError) as e:
+        print(f"[ERR] {e}")
+        return 2
+    report = an.report()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        print(f"report -> {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LGS R5.0 - desired-state configuration sync for a fleet of modules
+==================================================================
+Pushing a colour scheme used to mean writing regs 110-184 on every module,
+whether it already held those values or not. This reads what each module
+has (block FC03s), diffs it against a declarative config, writes only the
+registers that differ (adjacent ones as one FC16), verifies them, and
+persists with coil 503 only on modules where something changed.
+
+  ... tools/lgs_sync.py -p COM30 fleet.json                # sync every device listed
+  ... tools/lgs_sync.py -p COM30 fleet.json --ids 21-40    # or these IDs
+  ... tools/lgs_sync.py -p COM30 fleet.json --dry-run      # show the diff only
+  ... tools/lgs_sync.py -p COM30 fleet.json --persist
+
+Config (JSON). Later layers override earlier ones, field by field:
+defaults, then each group the module belongs to (ascending), then the
+module's own entry.
+
+  {
+    "defaults": {"presets": {"1": {"rgb": [255, 0, 0], "brightness": 80}},
+                 "unlock_delay_ms": 300},
+    "groups":   {"2": {"presets": {"1": {"rgb": [0, 0, 255]}}}},
+    "devices":  {"21": {"groups": [2]},
+                 "22": {"presets": {"3": {"max_on_s": 600}}, "baud": 19200}}
+  }
+
+  presets          {"1".."8": {"rgb": [r, g, b], "brightness": 0-100,
+                               "max_on_s": 0-65535}}   any subset of fields
+  unlock_delay_ms  0-8000 (reg 80)
+  groups           (devices only) membership, reg 82; omitted = the module's
+                   current membership decides which groups apply
+  baud             9600/19200/38400/57600 (reg 3); takes effect at the
+                   persist reset, so a baud change needs --persist and the
+                   module then answers at the new rate only (a whole bus:
+                   tools/lgs_baud.py, which stages, re-discovers and rolls
+                   stragglers back)
+
+The run ends with the bytes it put on the wire (reads and verification
+included) against a blind full push of the same config: every configured
+register written to every module, one FC16 per contiguous range, and a
+coil 503 on each when persisting. Requirements: pyserial.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+
+from lgs_client import PERSIST_SETTLE_S, LgsClient, LgsError, SerialTransport, parse_ids
+from lgs_client import regmap as rm
+from lgs_client import rtu
+
+PRESET_FIELDS = {"brightness": (0, 0, 100), "max_on_s": (4, 0, 0xFFFF)}   # name: (offset, lo, hi)
+
+
+# ---------------------------------------------------------------------------
+# Config -> desired registers
+# ---------------------------------------------------------------------------
+
+def _ranged(name, value, lo, hi):
+    if not isinstance(value, int) or not lo <= value <= hi:
+        raise ValueError(f"{name} = {value!r}: expected an integer {lo}-{hi}")
+    return value
+
+
+LAYER_KEYS = {"presets", "unlock_delay_ms", "baud"}
+
+
+def layer_registers(layer, where, allow_groups=False):
+    """{addr: value} one config layer (defaults / a group / a device) sets."""
+    unknown = set(layer) - LAYER_KEYS - ({"groups"} if allow_groups else set())
+    if unknown:
+        raise ValueError(f"{where}: unknown key(s) {sorted(unknown)}")
+    regs = {}
+    for key, spec in (layer.get("presets") or {}).items():
+        n = _ranged(f"{where}: preset", int(key), 1, rm.PRESET_COUNT)
+        base = rm.reg_preset(n)
+        for name, value in spec.items():
+            if name == "rgb":
+                if not isinstance(value, list) or len(value) != 3:
+                    raise ValueError(f"{where}: preset {n} rgb must be [r, g, b]")
+                for k, c in enumerate(value):
+                    regs[base + 1 + k] = _ranged(f"{where}: preset {n} rgb", c, 0, 255)
+            elif name in PRESET_FIELDS:
+                offset, lo, hi = PRESET_FIELDS[name]
+                regs[base + offset] = _ranged(f"{where}: preset {n} {name}", value, lo, hi)
+            else:
+                raise ValueError(f"{where}: preset {n}: unknown field {name!r}")
+    if "unlock_delay_ms" in layer:
+        regs[rm.REG_UNLOCK_DELAY] = _ranged(f"{where}: unlock_delay_ms",
+                                            layer["unlock_delay_ms"], 0, 8000)
+    if "baud" in layer:
+        if layer["baud"] not in rm.BAUD_RATES:
+            raise ValueError(f"{where}: baud {layer['baud']} not one of {rm.BAUD_RATES}")
+        regs[rm.REG_BAUD_RATE] = layer["baud"]
+    if "groups" in layer:
+        mask = 0
+        for g in layer["groups"]:
+            mask |= 1 << (_ranged(f"{where}: group", g, 1, rm.GROUP_COUNT) - 1)
+        regs[rm.REG_GROUP_MASK] = mask
+    return regs
+
+
+class FleetConfig:
+    def __init__(self, doc):
+        self.defaults = layer_registers(doc.get("defaults") or {}, "defaults")
+        self.groups = {_ranged("groups", int(g), 1, rm.GROUP_COUNT): layer_registers(spec, f"group {g}")
+                       for g, spec in (doc.get("groups") or {}).items()}
+        self.devices = {}
+        for uid, spec in (doc.get("devices") or {}).items():
+            uid = _ranged("devices", int(uid), 1, 247)
+            self.devices[uid] = layer_registers(spec, f"device {uid}", allow_groups=True)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def managed(self, uid):
+        """Every register the config could set on uid (reg 82 included when
+        groups are in play, to learn the membership)."""
+        addrs = set(self.defaults) | set(self.devices.get(uid, {}))
+        for regs in self.groups.values():
+            addrs |= set(regs)
+        if self.groups:
+            addrs.add(rm.REG_GROUP_MASK)
+        return addrs
+
+    def desired(self, uid, current_mask):
+        own = self.devices.get(uid, {})
+        mask = own.get(rm.REG_GROUP_MASK, current_mask)
+        want = dict(self.defaults)
+        for g in sorted(self.groups):
+            if mask & (1 << (g - 1)):
+                want.update(self.groups[g])
+        want.update(own)
+        return want
+
+
+# ---------------------------------------------------------------------------
+# Wire cost of a blind push (what a script without a read-back would send)
+# ---------------------------------------------------------------------------
+
+def _runs(addrs):
+    addrs = sorted(addrs)
+    runs = []
+    for a in addrs:
+        if runs and a == runs[-1][0] + runs[-1][1] and runs[-1][1] < rtu.MAX_WRITE_REGS:
+            runs[-1][1] += 1
+        else:
+            runs.append([a, 1])
+    return runs
+
+
+def blind_push_bytes(desired, persist):
+    """Request + reply bytes to write every desired register, no reads."""
+    total = 0
+    for first, count in _runs(desired):
+        total += len(rtu.adu(1, rtu.write_registers(first, [0] * count))) + 8   # + the echo
+    if persist:
+        total += len(rtu.adu(1, rtu.write_coil(rm.COIL_WRITE_TO_EEPROM, True)))
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------------
+
+@dataclass
+class DeviceResult:
+    uid: int
+    status: str = "ok"             # ok / unchanged / dry-run / skipped / no reply / mismatch
+    changed: dict = field(default_factory=dict)    # addr: (was, want)
+    writes: int = 0
+    persisted: bool = False
+    blind_bytes: int = 0
+    note: str = ""
+
+
+def describe(addr):
+    if rm.REG_PRESETS_FIRST <= addr <= rm.REG_PRESETS_LAST:
+        n, k = (addr - 100) // 10, (addr - 100) % 10
+        return f"preset {n} {('brightness', 'r', 'g', 'b', 'max-on')[k]}"
+    return {rm.REG_UNLOCK_DELAY: "unlock delay", rm.REG_BAUD_RATE: "baud",
+            rm.REG_GROUP_MASK: "groups"}.get(addr, f"reg {addr}")
+
+
+def sync_device(dev, config, *, persist=False, dry_run=False):
+    """Bring one module to its desired state; returns what happened."""
+    res = DeviceResult(dev.uid)
+    try:
+        current = dev.read_map(config.managed(dev.uid))
+    except LgsError as e:
+        res.status, res.note = "no reply", str(e)
+        return res
+    want = config.desired(dev.uid, current.get(rm.REG_GROUP_MASK) or 0)
+    res.blind_bytes = blind_push_bytes(want, persist)
+    missing = [a for a in want if current.get(a) is None]
+    if missing:
+        res.status, res.note = "no reply", f"registers {missing} unsupported (older firmware?)"
+        return res
+    res.changed = {a: (current[a], v) for a, v in sorted(want.items()) if current[a] != v}
+    if not res.changed:
+        res.status = "unchanged"
+        return res
+    if dry_run:
+        res.status = "dry-run"
+        return res
+    if rm.REG_BAUD_RATE in res.changed and not persist:
+        res.status, res.note = "skipped", "a baud change only takes effect with --persist"
+        return res
+
+    try:
+        with dev.batch(fill=current) as b:
+            for a in res.changed:
+                b.write(a, want[a])
+            res.writes = len(b.plan())
+        back = dev.read_map(res.changed)
+    except LgsError as e:
+        res.status, res.note = "no reply", str(e)
+        return res
+    wrong = {a: back[a] for a in res.changed if back[a] != want[a]}
+    if wrong:
+        res.status = "mismatch"
+        res.note = ", ".join(f"{describe(a)} reads {v}" for a, v in wrong.items())
+        return res
+    if persist:
+        dev.persist()
+        res.persisted = True
+        dev.pause(PERSIST_SETTLE_S)
+        if rm.REG_BAUD_RATE in res.changed:
+            res.note = f"now at {want[rm.REG_BAUD_RATE]} baud"
+    return res
+
+
+def sync_fleet(bus, config, ids, *, persist=False, dry_run=False, out=print):
+    """Sync every ID; prints per device and returns (results, bytes used)."""
+    before = bus.stats.tx_bytes + bus.stats.rx_bytes
+    results = []
+    for uid in ids:
+        r = sync_device(LgsClient(bus, uid), config, persist=persist, dry_run=dry_run)
+        results.append(r)
+        diff = ", ".join(f"{describe(a)} {was}->{want}" for a, (was, want) in r.changed.items())
+        line = f"  id {uid:>3}: {r.status:<9}"
+        if r.changed:
+            line += f" {len(r.changed)} reg(s) [{diff}]"
+        if r.writes:
+            line += f" in {r.writes} write(s)"
+        if r.persisted:
+            line += ", saved"
+        if r.note:
+            line += f"  ({r.note})"
+        out(line)
+    return results, bus.stats.tx_bytes + bus.stats.rx_bytes - before
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="LGS R5.0 fleet sync: write only what differs from a declarative config.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    ap.add_argument("config", help="JSON config (see the module docstring)")
+    ap.add_argument("-p", "--port", default="COM30", help="USB-RS485 serial port")
+    ap.add_argument("-b", "--baud", type=int, default=9600, choices=rm.BAUD_RATES,
+                    help="bus baud rate")
+    ap.add_argument("--ids", help="IDs to sync, e.g. 21,22,30-40 (default: the config's devices)")
+    ap.add_argument("--persist", action="store_true",
+                    help="save changed modules with coil 503 (each resets, ~1.5 s)")
+    ap.add_argument("--dry-run", action="store_true", help="read and diff only")
+    ap.add_argument("--gap", type=float, default=25.0, help="inter-frame gap in ms")
+    args = ap.parse_args()
+
+    try:
+        config = FleetConfig.load(args.config)
+    except (OSError, ValueError) as e:
+        print(f"[ERR] {e}")
+        return 2
+    try:
+        ids = parse_ids(args.ids) if args.ids else sorted(config.devices)
+    except ValueError as e:
+        print(f"[ERR] --ids: {e}")
+        return 2
+    if not ids:
+        print("[ERR] no devices: list them in the config or pass --ids")
+        return 2
+
+    try:
+        bus = SerialTransport(args.port, args.baud, timeout=1.0, retries=1, gap_s=args.gap / 1000.0)
+    except LgsError as e:
+        print(f"[ERR] {e}")
+        return 2
+    with bus:
+        print(f"syncing {len(ids)} device(s) on {args.port} @ {args.baud}"
+              + (" (dry run)" if args.dry_run else ""))
+        results, used = sync_fleet(bus, config, ids, persist=args.persist, dry_run=args.dry_run)
+
+    blind = sum(r.blind_bytes for r in results)
+    counts = {s: sum(r.status == s for r in results) for s in ("ok", "unchanged", "dry-run")}
+    print(f"\n{counts['ok']} updated, {counts['unchanged']} already in sync"
+          + (f", {counts['dry-run']} would change" if args.dry_run else "")
+          + f", {len(results) - sum(counts.values())} failed")
+    print(f"bus: {bus.stats.transactions} transactions, {used:,} bytes"
+          f" ({used * 10 / args.baud:.2f} s of line time)")
+    if blind:
+        print(f"blind full push: {blind:,} bytes -> saved {blind - used:,} bytes"
+              f" ({(blind - used) * 100 / blind:.0f}%)")
+    return 0 if len(results) == sum(counts.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
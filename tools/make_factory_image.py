@@ -9,7 +9,10 @@ except the recipe now lives here instead of in a commit message.
     python tools/make_factory_image.py --out my.bin    # somewhere else
 
 Verifies that the app carries exactly one valid commissioning block, so an
-image that cannot be commissioned never reaches assets/.
+image that cannot be commissioned never reaches assets/. To patch that block
+for a whole production lot, see tools/commission_lot.py. Both inputs are
+read through the asset catalog (tools/asset_catalog.py), and both outputs
+go into it.
 """
 from __future__ import annotations
 
@@ -80,6 +83,8 @@ def fw_version() -> str:
 
 
 def main() -> int:
+    from asset_catalog import Catalog   # it imports this module's constants
+
     ap = argparse.ArgumentParser()
     ap.add_argument("--out", type=Path, default=None)
     args = ap.parse_args()
@@ -94,6 +99,9 @@ def main() -> int:
 
     boot = BOOT_BIN.read_bytes()
     app = APP_BIN.read_bytes()
+    catalog = Catalog.load()
+    app_meta = catalog.entry(APP_BIN, app)
+    catalog.entry(BOOT_BIN, boot)
 
     if len(boot) > BOOT_SLOT:
         print(f"bootloader is {len(boot)} B, over its {BOOT_SLOT} B slot")
@@ -101,17 +109,16 @@ def main() -> int:
 
     # The app must look like a vector table for this offset, or the bootloader
     # will refuse to jump to it (src/boot/boot.c) and the board idles forever.
-    sp, pc = struct.unpack_from("<2I", app, 0)
+    sp, pc = app_meta["sp"], app_meta["pc"]
     if not (RAM_START <= sp <= RAM_END):
         print(f"app stack pointer 0x{sp:08X} is not in RAM — wrong build?")
         return 1
-    if not (APP_ADDR <= pc < 0x08010800):
+    if app_meta["kind"] != "ota":
         print(f"app entry 0x{pc:08X} is not in the app slot — wrong flash_offset?")
         return 1
 
-    blocks = valid_blocks(app)
-    if len(blocks) != 1:
-        print(f"app carries {len(blocks)} valid commissioning blocks, expected 1")
+    if app_meta["block_count"] != 1:
+        print(f"app carries {app_meta['block_count']} valid commissioning blocks, expected 1")
         print("Run pio run -e LGS_STM32G070CBT6 and read the post-build check.")
         return 1
 
@@ -133,9 +140,12 @@ def main() -> int:
     # OTA them at all — the gap went unnoticed until someone needed it.
     ota_out = out.parent / f"firmware_stm32g070_{stamp}.bin"
     ota_out.write_bytes(app)
+    catalog.entry(out, image)
+    catalog.entry(ota_out, app)
+    catalog.save()
 
     print(f"boot {len(boot):>6} B  (padded to {BOOT_SLOT})")
-    print(f"app  {len(app):>6} B  (commissioning block at 0x{blocks[0]:05X})")
+    print(f"app  {len(app):>6} B  (commissioning block at 0x{app_meta['block_offset']:05X})")
     print(f"->   {len(image):>6} B  {out.relative_to(ROOT) if out.is_relative_to(ROOT) else out}")
     print(f"     sha256 {hashlib.sha256(image).hexdigest()}")
     print(f"     first install over ST-Link, flash at 0x08000000")
@@ -0,0 +1,471 @@
+"""Compressed OTA chunks: the host encoder, a reference decoder, and a check
+of both (and of src/util/lzss.c) against the images in assets/.
+
+An OTA chunk carries 128 raw bytes (or the negotiated size, up to 232); a
+firmware image is Thumb code, string tables and zero-filled initialisers,
+and compresses to ~0.8 of that with an LZ77 coder small enough for the
+board (src/util/lzss.c, a few hundred bytes of flash, no RAM but the 512 B
+decode buffer). With reg 289 bit 2 set (ota_sender.py --lz) each chunk's
+bytes are instead:
+
+    byte 0-1   decoded offset in the image (big-endian, a multiple of 8)
+    byte 2     back: chunks before this one that its copies read from
+               (0 = self-contained); the board drops the chunk until those
+               are in its bitmap, and the ascending repair rounds bring them
+    byte 3     decoded length / 8, rounded up (the last chunk stops at the
+               image size); at most 512 bytes
+    byte 4-    LZSS bitstream, MSB first, zero-padded to a byte:
+                 0 + 8 bits                   a literal byte
+                 1 + gamma(hi) + 7 bits + gamma(len - 1)
+                                              copy len >= 2 bytes from
+                                              distance ((hi - 1) << 7 | low) + 1
+               gamma(n), n >= 1: Elias gamma — bit_length(n) - 1 zeros,
+               then n in binary
+
+Each chunk decodes into whole doublewords of its own, so the bitmap, the
+repair rounds, resume and erase-ahead all work per chunk as before; a copy
+can reach into earlier chunks already staged in flash, up to WINDOW bytes
+back but never past the start of its GROUP: chunks are coded in runs of
+GROUP that copy only from inside the run, so a chunk lost on the bus holds
+up at most the rest of its run, not the rest of the image (every 29th chunk
+lost costs ~70 extra re-sends instead of ~340 for a 60 KB image). The image
+size and CRC32 are those of the decoded image, so finalize and the
+bootloader do not change.
+
+The encoder parses each run optimally (shortest bit cost, matches from a
+hash chain) and cuts it into chunks at doubleword boundaries, splitting a
+copy that straddles one.
+
+Usage:
+    <python> tools/ota_lz.py                   # every image in assets/
+    <python> tools/ota_lz.py firmware.bin --window 4096 --baud 57600
+    <python> tools/ota_lz.py --chunk 232       # the wide window's chunks
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(HERE, ".."))
+LZSS_C = os.path.join(ROOT, "src", "util", "lzss.c")
+
+# --- include/flash_layout.h --------------------------------------------------
+CHUNK_SIZE = 128           # the original window; negotiated sizes go up to 232
+WIDE_CHUNK_SIZE = 232      # FLASH_OTA_WIDE_CHUNK_SIZE
+MAX_DECODED = 512          # FLASH_OTA_LZ_MAX_DECODED: the board's decode buffer
+MAX_CHUNKS = 480           # bitmap regs 360-389
+MAX_IMAGE_SIZE = 61440
+
+HEADER = 4
+WINDOW = 2048              # default look-back; the format allows up to 61,440
+MIN_MATCH = 2
+LOW_BITS = 7
+LITERAL_BITS = 9
+CHAIN_DEPTH = 24           # hash-chain candidates per position
+GROUP = 12                 # chunks that may copy from one another
+
+# Bus model for the session estimate: an OTA chunk frame is FC16 of the
+# payload plus 17 bytes (ADU 145 bytes for 128, 249 for 232; 8N1) plus
+# ota_sender.py's default gap.
+FRAME_OVERHEAD = 17
+GAP_S = 0.025
+
+
+def _gamma_bits(n: int) -> int:
+    return 2 * n.bit_length() - 1
+
+
+def _match_bits(dist: int, length: int) -> int:
+    return 1 + _gamma_bits(((dist - 1) >> LOW_BITS) + 1) + LOW_BITS + _gamma_bits(length - 1)
+
+
+# --- encoder -----------------------------------------------------------------
+
+def _candidates(data: bytes, window: int) -> list[list[tuple[int, int]]]:
+    """Per position, (length, distance) pairs of strictly increasing length,
+    nearest first: the matches worth pricing."""
+    n = len(data)
+    heads: dict[bytes, int] = {}
+    prev = [-1] * n
+    out: list[list[tuple[int, int]]] = [[] for _ in range(n)]
+    for i in range(n - 1):
+        key = data[i:i + 2]
+        j = heads.get(key, -1)
+        limit = min(n - i, MAX_DECODED)
+        best = MIN_MATCH - 1
+        depth = CHAIN_DEPTH
+        while j >= 0 and i - j <= window and depth:
+            m = 2
+            while m + 16 <= limit and data[i + m:i + m + 16] == data[j + m:j + m + 16]:
+                m += 16
+            while m < limit and data[i + m] == data[j + m]:
+                m += 1
+            if m > best:
+                best = m
+                out[i].append((m, i - j))
+                if m == limit:
+                    break
+            j = prev[j]
+            depth -= 1
+        prev[i] = heads.get(key, -1)
+        heads[key] = i
+    return out
+
+
+def _parse(cands: list[list[tuple[int, int]]], lo: int, hi: int) -> list[tuple[int, int]]:
+    """Cheapest token per position of [lo, hi), copying only from inside it,
+    as (length, distance); distance 0 = literal. Index 0 is position lo."""
+    cost = [0] * (hi - lo + 1)
+    choice: list[tuple[int, int]] = [(1, 0)] * (hi - lo)
+    for i in range(hi - 1, lo - 1, -1):
+        best = LITERAL_BITS + cost[i + 1 - lo]
+        pick = (1, 0)
+        shorter = MIN_MATCH - 1
+        for m, dist in cands[i]:
+            if dist > i - lo:
+                break                   # nearest first: the rest reach further
+            # Lengths a nearer candidate already covers cost no less here.
+            for length in range(shorter + 1, min(m, hi - i) + 1):
+                c = _match_bits(dist, length) + cost[i + length - lo]
+                if c < best:
+                    best, pick = c, (length, dist)
+            shorter = m
+        cost[i - lo] = best
+        choice[i - lo] = pick
+    return choice
+
+
+class _Bits:
+    def __init__(self) -> None:
+        self.out = bytearray()
+        self.acc = 0
+        self.n = 0
+
+    def put(self, value: int, width: int) -> None:
+        for shift in range(width - 1, -1, -1):
+            self.acc = (self.acc << 1) | ((value >> shift) & 1)
+            self.n += 1
+            if self.n == 8:
+                self.out.append(self.acc)
+                self.acc = self.n = 0
+
+    def gamma(self, value: int) -> None:
+        width = value.bit_length()
+        self.put(0, width - 1)
+        self.put(value, width)
+
+    def flush(self) -> bytes:
+        if self.n:
+            self.out.append(self.acc << (8 - self.n))
+            self.acc = self.n = 0
+        return bytes(self.out)
+
+
+def encode(image: bytes, window: int = WINDOW, group: int = GROUP,
+           chunk: int = CHUNK_SIZE) -> list[bytes]:
+    """The image as compressed chunk payloads (header + bitstream) of at most
+    `chunk` bytes each, in order."""
+    n = len(image)
+    cands = _candidates(image, window)
+    chunks: list[bytes] = []
+    starts: list[int] = []
+    pos = 0
+    while pos < n:
+        # A group of chunks copies only from inside itself: a lost chunk
+        # holds up the rest of its group on the board, never the next group.
+        lo, hi = pos, min(n, pos + group * MAX_DECODED)
+        choice = _parse(cands, lo, hi)
+        cover = [0] * (hi - lo)         # start of the parse token covering p
+        p = lo
+        while p < hi:
+            length = choice[p - lo][0]
+            cover[p - lo:p - lo + length] = [p] * length
+            p += length
+        for _ in range(group):
+            if pos >= hi:
+                break
+            payload, pos = _pack(image, choice, cover, lo, pos, hi, starts, (chunk - HEADER) * 8)
+            chunks.append(payload)
+    return chunks
+
+
+def _pack(image: bytes, choice: list[tuple[int, int]], cover: list[int], lo: int,
+          pos: int, hi: int, starts: list[int], budget: int) -> tuple[bytes, int]:
+    """One chunk from pos: as much of the parse as fits, cut at a doubleword
+    boundary (or the image end), splitting the copy that straddles it."""
+    n = len(image)
+    cap = min(hi, pos + MAX_DECODED)
+    tokens: list[tuple[int, int, int]] = []     # (position, length, distance)
+    bits = 0
+    best = None
+    p = pos
+    while p < cap:
+        s = cover[p - lo]
+        length, dist = choice[s - lo]
+        length = min(s + length, cap) - p
+        if dist == 0 or length < MIN_MATCH:
+            length, dist = 1, 0
+        shortest = MIN_MATCH if dist else 1
+        ends = list(range((p + shortest + 7) & ~7, p + length + 1, 8))
+        if p + shortest <= n <= p + length:
+            ends.append(n)
+        for end in ends:
+            c = bits + (_match_bits(dist, end - p) if dist else LITERAL_BITS)
+            if c <= budget:
+                best = (end, len(tokens), (p, end - p, dist))
+        c = _match_bits(dist, length) if dist else LITERAL_BITS
+        if bits + c > budget:
+            break
+        tokens.append((p, length, dist))
+        bits += c
+        p += length
+    end, keep, tail = best
+    tokens = tokens[:keep] + [tail]
+
+    lowest = min([q - d for q, _, d in tokens if d] + [pos])
+    back = len(starts) - bisect.bisect_right(starts, lowest) + 1 if lowest < pos else 0
+    out = _Bits()
+    for q, length, dist in tokens:
+        if dist:
+            out.put(1, 1)
+            out.gamma(((dist - 1) >> LOW_BITS) + 1)
+            out.put((dist - 1) & ((1 << LOW_BITS) - 1), LOW_BITS)
+            out.gamma(length - 1)
+        else:
+            out.put(image[q], LITERAL_BITS)
+    starts.append(pos)
+    return bytes([pos >> 8, pos & 0xFF, back, (end - pos + 7) // 8]) + out.flush(), end
+
+
+# --- decoder (the reference for src/util/lzss.c) ------------------------------
+
+def chunk_span(payload: bytes, size: int) -> tuple[int, int, int]:
+    """(decoded offset, decoded length, back) from a chunk header."""
+    offset = (payload[0] << 8) | payload[1]
+    return offset, min(payload[3] * 8, size - offset), payload[2]
+
+
+def decode_chunk(payload: bytes, size: int, prior: bytes) -> tuple[int, bytes, int]:
+    """Decode one chunk against the image staged so far. Returns its offset,
+    the bytes, and the lowest image position a copy read (offset if none)."""
+    offset, length, _back = chunk_span(payload, size)
+    if offset % 8 or length <= 0 or length > MAX_DECODED:
+        raise ValueError(f"bad chunk header {payload[:HEADER].hex()}")
+    bits = iter(((byte >> (7 - k)) & 1) for byte in payload[HEADER:] for k in range(8))
+
+    def take(width: int) -> int:
+        v = 0
+        for _ in range(width):
+            v = (v << 1) | next(bits)
+        return v
+
+    def gamma() -> int:
+        zeros = 0
+        while next(bits) == 0:
+            zeros += 1
+        return (1 << zeros) | take(zeros)
+
+    out = bytearray()
+    lowest = offset
+    try:
+        while len(out) < length:
+            if not take(1):
+                out.append(take(8))
+                continue
+            hi = gamma()
+            dist = (((hi - 1) << LOW_BITS) | take(LOW_BITS)) + 1
+            count = gamma() + 1
+            src = offset + len(out) - dist
+            if src < 0 or len(out) + count > length:
+                raise ValueError(f"chunk at {offset}: copy outside the image or chunk")
+            lowest = min(lowest, src)
+            for _ in range(count):
+                out.append(prior[src] if src < offset else out[src - offset])
+                src += 1
+    except StopIteration:
+        raise ValueError(f"chunk at {offset}: bitstream ends early") from None
+    return offset, bytes(out), lowest
+
+
+def decode(chunks: list[bytes], size: int) -> bytes:
+    image = bytearray(b"\xff" * size)
+    for payload in chunks:
+        offset, data, _ = decode_chunk(payload, size, image)
+        image[offset:offset + len(data)] = data
+    return bytes(image)
+
+
+# --- check -------------------------------------------------------------------
+
+HARNESS = r"""
+#include <cstdio>
+#include <cstring>
+#include "util/lzss.h"
+
+// stdin: "S <size>", then "C <hex payload>" per chunk in order, then "E":
+// prints the decoded image as hex, or "FAIL <chunk>".
+static uint8_t image[61440];
+static char line[600];
+
+int main()
+{
+    unsigned size = 0, chunk = 0;
+    bool failed = false;
+    while (std::scanf("%599s", line) == 1)
+    {
+        if (line[0] == 'S')
+        {
+            std::scanf("%u", &size);
+            std::memset(image, 0xFF, sizeof(image));
+            chunk = 0;
+            failed = false;
+        }
+        else if (line[0] == 'C')
+        {
+            static uint8_t p[232];
+            std::scanf("%599s", line);
+            size_t n = std::strlen(line) / 2;
+            for (size_t i = 0; i < n; i++)
+            {
+                unsigned v;
+                std::sscanf(line + 2 * i, "%2x", &v);
+                p[i] = (uint8_t)v;
+            }
+            unsigned off = (p[0] << 8) | p[1];
+            unsigned len = p[3] * 8u;
+            if (len > size - off) len = size - off;
+            static uint8_t out[512];
+            if (!failed && !lzssDecode(p + 4, n - 4, out, len, image, off))
+            {
+                std::printf("FAIL %u\n", chunk);
+                failed = true;
+            }
+            std::memcpy(image + off, out, len);
+            chunk++;
+        }
+        else if (!failed)
+        {
+            for (unsigned i = 0; i < size; i++) std::printf("%02x", image[i]);
+            std::printf("\n");
+        }
+    }
+    return 0;
+}
+"""
+
+
+def find_cxx(requested: str | None) -> str | None:
+    for name in filter(None, [requested, os.environ.get("CXX"), "c++", "g++", "clang++"]):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def stream_s(chunks: int, baud: int, chunk: int = CHUNK_SIZE) -> float:
+    return chunks * ((chunk + FRAME_OVERHEAD) * 10 / baud + GAP_S)
+
+
+def check_image(image: bytes, chunks: list[bytes], chunk: int = CHUNK_SIZE) -> list[str]:
+    """Decode in order, each chunk reading only the chunks its header names."""
+    problems = []
+    starts = [chunk_span(c, len(image))[0] for c in chunks]
+    staged = bytearray(b"\xff" * len(image))
+    for idx, payload in enumerate(chunks):
+        if len(payload) > chunk:
+            problems.append(f"chunk {idx}: {len(payload)} bytes")
+        offset, data, lowest = decode_chunk(payload, len(image), staged)
+        back = payload[2]
+        if lowest < starts[idx - back]:
+            problems.append(f"chunk {idx}: reads {lowest}, before chunk {idx - back}")
+        if offset != (starts[idx - 1] + chunk_span(chunks[idx - 1], len(image))[1] if idx else 0):
+            problems.append(f"chunk {idx}: starts at {offset}, not where the last one ended")
+        staged[offset:offset + len(data)] = data
+    if bytes(staged) != image:
+        problems.append("decoded image differs")
+    if len(chunks) > MAX_CHUNKS:
+        problems.append(f"{len(chunks)} chunks, the bitmap holds {MAX_CHUNKS}")
+    return problems
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("images", nargs="*", help="images to check (default: assets/*.bin)")
+    ap.add_argument("--window", type=int, default=WINDOW, help="look-back in bytes")
+    ap.add_argument("--group", type=int, default=GROUP, help="chunks per self-contained run")
+    ap.add_argument("--baud", type=int, default=9600, help="bus rate for the session estimate")
+    ap.add_argument("--chunk", type=int, default=CHUNK_SIZE,
+                    help=f"chunk size, a multiple of 8 from {CHUNK_SIZE} to {WIDE_CHUNK_SIZE}")
+    ap.add_argument("--cxx", help="host C++ compiler for the src/util/lzss.c check")
+    args = ap.parse_args()
+    if args.chunk % 8 or not CHUNK_SIZE <= args.chunk <= WIDE_CHUNK_SIZE:
+        ap.error(f"--chunk {args.chunk}: a multiple of 8 from {CHUNK_SIZE} to {WIDE_CHUNK_SIZE}")
+
+    paths = args.images or sorted(glob.glob(os.path.join(ROOT, "assets", "*.bin")))
+    results = []
+    failures = []
+    for path in paths:
+        with open(path, "rb") as f:
+            image = f.read()
+        if len(image) > MAX_IMAGE_SIZE:
+            print(f"skipped {os.path.basename(path)}: {len(image):,} B is no OTA image "
+                  f"(cap {MAX_IMAGE_SIZE:,})")
+            continue
+        t0 = time.perf_counter()
+        chunks = encode(image, args.window, args.group, args.chunk)
+        took = time.perf_counter() - t0
+        failures += [f"{os.path.basename(path)}: {p}" for p in check_image(image, chunks, args.chunk)]
+        results.append((path, image, chunks, took))
+
+    cxx = find_cxx(args.cxx)
+    if cxx:
+        with tempfile.TemporaryDirectory() as tmp:
+            src, exe = os.path.join(tmp, "harness.cpp"), os.path.join(tmp, "lzss")
+            with open(src, "w", encoding="utf-8") as f:
+                f.write(HARNESS)
+            subprocess.run([cxx, "-std=c++14", "-O2", "-Wall", "-Wextra", "-Werror",
+                            "-I", os.path.join(ROOT, "src"), src, "-x", "c++", LZSS_C,
+                            "-o", exe], check=True)
+            stdin = "".join(f"S {len(image)}\n" + "".join(f"C {c.hex()}\n" for c in chunks) + "E\n"
+                            for _, image, chunks, _ in results)
+            out = subprocess.run([exe], input=stdin, capture_output=True, text=True,
+                                 check=True).stdout.split()
+        for path, image, _, _ in results:
+            got = out.pop(0) if out else ""
+            if got == "FAIL":
+                failures.append(f"{os.path.basename(path)}: lzss.c rejected chunk {out.pop(0)}")
+            elif got != image.hex():
+                failures.append(f"{os.path.basename(path)}: lzss.c decoded a different image")
+
+    print(f"{'image':<46}{'bytes':>7}{'chunks':>8}{'--lz':>6}{'ratio':>7}"
+          f"{'stream s':>10}{'--lz s':>8}{'gain':>7}{'encode s':>10}")
+    for path, image, chunks, took in results:
+        raw = -(-len(image) // args.chunk)
+        wire = sum(len(c) for c in chunks)
+        print(f"{os.path.basename(path):<46}{len(image):>7,}{raw:>8}{len(chunks):>6}"
+              f"{len(image) / wire:>7.2f}{stream_s(raw, args.baud, args.chunk):>10.1f}"
+              f"{stream_s(len(chunks), args.baud, args.chunk):>8.1f}{1 - len(chunks) / raw:>7.0%}{took:>10.1f}")
+    print(f"({args.chunk} B chunks, window {args.window} B, runs of {args.group} chunks, {args.baud} baud, "
+          f"{args.chunk + FRAME_OVERHEAD} B frame + {GAP_S * 1000:.0f} ms gap per chunk; ratio = image bytes / compressed payload bytes incl. headers)")
+    if cxx:
+        print(f"src/util/lzss.c decoded all {len(results)} image(s): "
+              + ("OK" if not any("lzss.c" in f for f in failures) else "MISMATCH"))
+    else:
+        print("(no host C++ compiler found: src/util/lzss.c not checked; pass --cxx)")
+
+    for f in failures[:20]:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,45 +18,113 @@ Scriptable CLI (unchanged, for automation):
   ... tools/ota_sender.py -p COM30 --abort
 
 Flow (device side: src/app/ota_control.cpp, layout: include/flash_layout.h):
-  probe -> broadcast metadata + coil 505 (staging erase) -> stream 128B chunks
+  probe (+ chunk size, fingerprint) -> broadcast metadata + coil 505 (staging erase) -> stream chunks
   -> per-device bitmap repair rounds -> coil 506 verify -> coil 507 apply
-  (bootloader copies staging -> app slot) -> confirm new FW version (reg 1).
+  (bootloader copies staging -> app slot) -> confirm the new image (regs 390-395,
+  or the FW version in reg 1 on firmware before them).
+
+Boards already running the image are left out: the probe reads each one's
+fingerprint (size and CRC32 of its app image, build ID: regs 390-395) and
+drops the ones that match the file. Re-running a fleet send after a partial
+failure touches only the boards that still need it, and a test build that
+kept the release's FW version is still told apart. --force sends anyway.
+With a board left out, metadata and coil 505 go to each remaining ID instead
+of the broadcast, and apply is per ID (--broadcast-apply included): the
+boards left out never open a session, so they ignore the broadcast chunks
+and coil 506, keep their staging as it was and are not rebooted.
+A board flashed by ST-Link with a patched commissioning block runs a copy
+that differs from the .bin in that block, so it matches only after its
+first OTA.
+
+Interrupted sends resume: a checkpoint next to the image (<image>.ota-resume.json:
+image hash, device IDs, stream position, last-known bitmaps) is kept until
+the devices are verified, and the boards hold a timed-out session until
+abort or reset. Run the same send again and it asks each board to resume
+(reg 289 bit 1) and streams only what the bitmaps lack; --fresh starts over.
+
+Chunks are as large as every board on the list takes (reg 358): 232 B on
+firmware with the 512 B RX ring, through the wide window (regs 690-809),
+128 B on anything older. Each frame carries 17 bytes besides the chunk,
+so 232 B chunks cut a session by ~11% at 9600 baud and ~23% at 57600
+(tools/host_bench.py chunk). --max-chunk caps the size.
+
+--lz sends the image compressed (reg 289 bit 2; codec and chunk format in
+tools/ota_lz.py): ~15-18% fewer chunks for a G070 image, decoded by the board
+as they arrive. Boards on firmware without it must get raw chunks.
+
+Images are read through the asset catalog (tools/asset_catalog.py): the
+CRC32 and per-chunk CRC16s of a file in assets/ or .pio/build come from the
+index, and -f takes a version ("-f v3.3.0": the newest OTA asset of it) as
+well as a path. Anything but a G070 app-slot image whose vector table
+checks out (initial SP in RAM, reset handler in the app slot) is refused —
+a factory, bootloader or STM32F103 image, or an app built without the
+flash offset: the bootloader would copy it into the app slot and never
+jump to it.
+
+--capture FILE records every byte of the session on the bus, timestamped
+(tools/lgs_capture.py shows it, and replays it into the host build).
 
 The image must be built for the app slot (board_build.flash_offset=0x1000)
-and be <= 61,440 bytes. Requirements: pymodbus>=3.7, pyserial.
+and be <= 61,440 bytes. Transactions go through tools/lgs_client (its
+transport keeps the inter-frame gap). Requirements: pyserial.
 """
 
 import argparse
-import logging
+import json
 import os
 import sys
 import time
-import zlib
 
-try:
-    from pymodbus.client import ModbusSerialClient
-except ImportError:
-    print("Error: pymodbus not installed.  Run:  pip install pymodbus pyserial")
-    sys.exit(1)
+import asset_catalog
+import ota_lz
+from lgs_client import LgsClient, LgsError, SerialTransport
+from lgs_client import regmap as rm
 
 try:
     from serial.tools import list_ports as serial_list_ports
 except ImportError:
     serial_list_ports = None
 
-logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
-
-# --- Wire contract (mirrors src/svc/modbus_map.h + include/flash_layout.h) --
-REG_STATE        = 282   # lo=state (0 idle/1 rx/2 verified/3 failed), hi=error
-REG_CHUNKS_RX    = 283
-REG_META_FIRST   = 284   # size_hi, size_lo, crc_hi, crc_lo, total_chunks
-REG_CHUNK_FIRST  = 290   # index, len, crc16, data x64, commit  (68 regs)
-REG_BITMAP_FIRST = 360
-BITMAP_REGS      = 30
-COIL_ENTER, COIL_FINALIZE, COIL_APPLY, COIL_ABORT = 505, 506, 507, 508
+# --- Wire contract (addresses: lgs_client/regmap.py; layout: include/flash_layout.h)
+REG_STATE        = rm.REG_OTA_STATE        # lo=state (0 idle/1 rx/2 verified/3 failed), hi=error
+REG_META_FIRST   = rm.REG_OTA_META_FIRST   # size_hi, size_lo, crc_hi, crc_lo, total_chunks, flags
+REG_CHUNK_FIRST  = rm.REG_OTA_CHUNK_FIRST  # index, len, crc16, data x64, commit  (68 regs)
+REG_WIDE_FIRST   = rm.REG_OTA_WIDE_FIRST   # the same, data x116                   (120 regs)
+REG_MAX_CHUNK    = rm.REG_OTA_MAX_CHUNK    # largest chunk the board takes, 0 = 128
+REG_BITMAP_FIRST = rm.REG_OTA_BITMAP_FIRST
+REG_FINGERPRINT  = rm.REG_OTA_FINGERPRINT  # running image size, CRC32, build ID (u32 each)
+FINGERPRINT_REGS = rm.OTA_FINGERPRINT_REGS
+BITMAP_REGS      = rm.OTA_BITMAP_REGS
+COIL_ENTER, COIL_FINALIZE = rm.COIL_OTA_ENTER, rm.COIL_OTA_FINALIZE
+COIL_APPLY, COIL_ABORT = rm.COIL_OTA_APPLY, rm.COIL_OTA_ABORT
 CHUNK_SIZE       = 128
+WIDE_CHUNK_SIZE  = rm.OTA_WIDE_CHUNK_SIZE  # 232: the most one FC16 frame carries
+PAGE_SIZE        = 2048
 MAX_IMAGE_SIZE   = 61440
-BAUD_CHOICES     = (9600, 19200, 38400, 57600)
+BAUD_CHOICES     = rm.BAUD_RATES
+
+# After apply the bootloader rewrites only the pages that changed and checks
+# CRCs in hardware, so a board is usually answering again within 1-2 s (the
+# old erase-everything copy took ~4 s). Poll for it instead of sleeping the
+# worst case; the deadline still covers a full 30-page rewrite.
+APPLY_SETTLE_S   = 0.5
+APPLY_POLL_S     = 0.25
+APPLY_CONFIRM_TIMEOUT_S = 10.0
+
+# Erase-ahead (reg 289 bit 0): coil 505 erases the header and the first
+# image page only, and the board erases each further page in the loop right
+# after the first chunk of the page before it lands. That stall (22-40 ms)
+# is buffered by the RX ring at 9600 baud but not at the top rates,
+# so the stream leaves it room. Firmware without reg 289 ignores the flag
+# and erases everything at entry, which ENTER_TIMEOUT_S covers.
+ERASE_PAUSE_S    = 0.045
+ENTER_POLL_S     = 0.1
+ENTER_TIMEOUT_S  = 3.0
+
+CHECKPOINT_SUFFIX = ".ota-resume.json"
+CHECKPOINT_EVERY = 32                      # chunks between stream-position saves
+INTERRUPTED = ("interrupted - the boards hold the session (it times out after ~30s but is kept "
+               "for a resume); send the same file again to continue, or abort")
 
 STATE_NAMES = {0: "idle", 1: "receiving", 2: "verified", 3: "failed"}
 ERROR_NAMES = {0: "-", 1: "bad size", 2: "bad chunk count", 3: "image CRC32 mismatch",
@@ -77,26 +145,25 @@ def crc16_ccitt(data: bytes) -> int:
 
 
 class OtaSession:
-    def __init__(self, client, ids, gap_s):
-        self.c = client
+    def __init__(self, bus, ids):
+        self.bus = bus
+        self.all = LgsClient(bus, rm.BROADCAST)
         self.ids = ids
-        self.gap = gap_s
         self.tx_counter = 0
+        self.chunk = CHUNK_SIZE             # the session's chunk size (reg 289 bits 8-15)
+        self.chunk_crcs = None              # CRC16 per raw chunk, from the catalog
 
     # --- low-level helpers -------------------------------------------------
     def bcast_regs(self, addr, values):
-        self.c.write_registers(addr, values, device_id=0, no_response_expected=True)
-        time.sleep(self.gap)
+        self.all.write_registers(addr, values)
 
     def bcast_coil(self, addr):
-        self.c.write_coil(addr, True, device_id=0, no_response_expected=True)
-        time.sleep(self.gap)
+        self.all.write_coil(addr, True)
 
     def read_regs(self, uid, addr, count):
         try:
-            r = self.c.read_holding_registers(addr, count=count, device_id=uid)
-            return r.registers if (r and not r.isError()) else None
-        except Exception:
+            return LgsClient(self.bus, uid).read_registers(addr, count)
+        except LgsError:
             return None
 
     def state_of(self, uid):
@@ -106,25 +173,97 @@ class OtaSession:
         return {"state": r[0] & 0xFF, "error": r[0] >> 8, "chunks": r[1]}
 
     # --- chunk streaming ----------------------------------------------------
-    def send_chunk(self, image, idx):
-        offset = idx * CHUNK_SIZE
-        payload = image[offset:offset + CHUNK_SIZE]
+    def send_chunk(self, payloads, idx):
+        # 128 B chunks go to the original window; larger ones to the wide
+        # window, always whole, so the frame reaches its commit register.
+        window, window_bytes = ((REG_CHUNK_FIRST, CHUNK_SIZE) if self.chunk <= CHUNK_SIZE
+                                else (REG_WIDE_FIRST, WIDE_CHUNK_SIZE))
+        payload = payloads[idx]
         length = len(payload)
         padded = payload + b"\xff" * (-length % 2)
         data_regs = [(padded[i] << 8) | padded[i + 1] for i in range(0, len(padded), 2)]
-        data_regs += [0xFFFF] * (64 - len(data_regs))
+        data_regs += [0xFFFF] * (window_bytes // 2 - len(data_regs))
         self.tx_counter = (self.tx_counter + 1) & 0xFFFF
-        frame = [idx, length, crc16_ccitt(payload)] + data_regs + [self.tx_counter]
-        self.bcast_regs(REG_CHUNK_FIRST, frame)
+        crc = self.chunk_crcs[idx] if self.chunk_crcs else crc16_ccitt(payload)
+        frame = [idx, length, crc] + data_regs + [self.tx_counter]
+        self.bcast_regs(window, frame)
+
+    def max_chunk(self, uid):
+        """Largest chunk the board takes; firmware before reg 358 reads 0 there."""
+        r = self.read_regs(uid, REG_MAX_CHUNK, 1)
+        return r[0] if r and r[0] else CHUNK_SIZE
+
+    def fingerprint(self, uid):
+        """(size, CRC32, build ID) of the image the board runs; None with no
+        reply or from firmware before regs 390-395 (they read 0 there)."""
+        r = self.read_regs(uid, REG_FINGERPRINT, FINGERPRINT_REGS)
+        if not r or not (r[0] or r[1]):
+            return None
+        return (r[0] << 16) | r[1], (r[2] << 16) | r[3], (r[4] << 16) | r[5]
+
+    def bitmap(self, uid):
+        return self.read_regs(uid, REG_BITMAP_FIRST, BITMAP_REGS)
 
-    def missing_chunks(self, uid, total_chunks):
-        regs = self.read_regs(uid, REG_BITMAP_FIRST, BITMAP_REGS)
+    def missing_chunks(self, uid, total_chunks, regs=None):
+        regs = regs if regs is not None else self.bitmap(uid)
         if regs is None:
             return None
         return [idx for idx in range(total_chunks)
                 if not (regs[idx // 16] >> (idx % 16)) & 1]
 
 
+class Checkpoint:
+    """What an interrupted send needs to pick up again: the image (SHA-256,
+    size, CRC32, raw or compressed chunks, chunk size), the devices, how far the stream
+    got and each board's last-read bitmap. Saved as the send goes; the
+    boards' own bitmaps stay the authority, this says what to expect of them."""
+
+    def __init__(self, path, sha256, size, crc32, lz, chunk, ids):
+        self.path = path
+        self.sha256, self.size, self.crc32, self.lz = sha256, size, crc32, lz
+        self.chunk = chunk
+        self.ids = list(ids)
+        self.started = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.sent = 0                       # stream position reached
+        self.bitmaps = {}                   # uid -> bitmap regs
+
+    @classmethod
+    def load(cls, path, sha256, size, crc32, lz, chunk):
+        """The checkpoint for this exact image, encoding and chunk size, None if there is none."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if ((d.get("sha256"), d.get("size"), d.get("crc32"), d.get("lz", False), d.get("chunk", CHUNK_SIZE))
+                != (sha256, size, crc32, lz, chunk)):
+            return None
+        c = cls(path, sha256, size, crc32, lz, chunk, d.get("ids", []))
+        c.started, c.sent = d.get("started", "?"), d.get("sent", 0)
+        c.bitmaps = {int(k): v for k, v in d.get("bitmaps", {}).items()}
+        return c
+
+    def received(self, uid):
+        return sum(bin(r).count("1") for r in self.bitmaps.get(uid, []))
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"sha256": self.sha256, "size": self.size, "crc32": self.crc32,
+                           "lz": self.lz, "chunk": self.chunk, "ids": self.ids, "started": self.started, "sent": self.sent,
+                           "bitmaps": self.bitmaps}, f)
+            os.replace(tmp, self.path)      # a crash mid-write keeps the old one
+        except OSError as e:
+            print(f"\n  [WARN] checkpoint not saved ({e}); an interrupted send restarts in full")
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
 def human(n):
     return f"{n:,}"
 
@@ -161,10 +300,13 @@ def available_ports():
     return [(p.device, p.description) for p in serial_list_ports.comports()]
 
 
-def open_client(port, baud):
-    client = ModbusSerialClient(port=port, baudrate=baud, bytesize=8,
-                                parity="N", stopbits=1, timeout=1.0, retries=1)
-    return client if client.connect() else None
+def open_client(port, baud, gap_s, capture=None):
+    """The bus transport, None if the port cannot be opened."""
+    try:
+        return SerialTransport(port, baud, timeout=1.0, retries=1, gap_s=gap_s, capture=capture)
+    except LgsError as e:
+        print(f"  {e}")
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -172,7 +314,7 @@ def open_client(port, baud):
 # ---------------------------------------------------------------------------
 
 def action_status(client, ids):
-    s = OtaSession(client, ids, 0.02)
+    s = OtaSession(client, ids)
     for uid in ids:
         st = s.state_of(uid)
         if st is None:
@@ -183,14 +325,21 @@ def action_status(client, ids):
     return 0
 
 
-def action_abort(client, gap_s):
-    OtaSession(client, [], gap_s).bcast_coil(COIL_ABORT)
+def action_abort(client):
+    OtaSession(client, []).bcast_coil(COIL_ABORT)
     print("broadcast OTA abort sent")
     return 0
 
 
-def action_send(client, ids, image_path, *, gap_s, repair_rounds, broadcast_apply,
-                yes, drop_every=0):
+def action_send(client, ids, image_path, *, repair_rounds, broadcast_apply,
+                yes, drop_every=0, erase_ahead=True, fresh=False, lz=False, max_chunk=WIDE_CHUNK_SIZE,
+                force=False):
+    catalog = asset_catalog.Catalog.load()
+    if not os.path.isfile(image_path):
+        found = catalog.find(image_path)    # a version: "v3.3.0"
+        if found:
+            print(f"{image_path}: {os.path.relpath(found, asset_catalog.ROOT)}")
+            image_path = found
     try:
         image = open(image_path, "rb").read()
     except OSError as e:
@@ -199,23 +348,75 @@ def action_send(client, ids, image_path, *, gap_s, repair_rounds, broadcast_appl
     if not (8 <= len(image) <= MAX_IMAGE_SIZE):
         print(f"[ERR] image is {human(len(image))} B; OTA cap is {human(MAX_IMAGE_SIZE)} B")
         return 2
+    meta = catalog.entry(image_path, image)
+    catalog.save()
+    if meta["kind"] != "ota" or not meta["vector_ok"]:
+        why = (f"initial SP {meta['sp']:08X}, PC {meta['pc']:08X}" if meta["kind"] == "ota"
+               else f"{meta['kind']}, {meta['mcu']}")
+        print(f"[ERR] {meta['name']} is not an app-slot image ({why}); OTA takes "
+              f"firmware_stm32g070_vX.Y.Z_<date>.bin, built with board_build.flash_offset=0x1000")
+        return 2
 
-    s = OtaSession(client, ids, gap_s)
-    crc32 = zlib.crc32(image) & 0xFFFFFFFF
-    total_chunks = (len(image) + CHUNK_SIZE - 1) // CHUNK_SIZE
+    s = OtaSession(client, ids)
+    crc32 = int(meta["crc32"], 16)
     print(f"image: {image_path}")
-    print(f"  size {human(len(image))} B, CRC32 {crc32:08X}, {total_chunks} chunks of {CHUNK_SIZE} B")
+    print(f"  size {human(len(image))} B, CRC32 {crc32:08X}")
 
     # 1. PROBE
     print(f"\n[1/8] probing devices {ids} ...")
-    old_fw = {}
+    old_fw, takes, running = {}, {}, []
     for uid in ids:
         r = s.read_regs(uid, 0, 5)
         if r is None:
             print(f"  id {uid}: NO REPLY - aborting (fix the bus or drop it from the device list)")
             return 2
         old_fw[uid] = r[1]
-        print(f"  id {uid}: type {r[0]}, FW {r[1]}, HW {r[2]}")
+        takes[uid] = s.max_chunk(uid)
+        fp = s.fingerprint(uid)
+        same = fp is not None and fp[:2] == (len(image), crc32)
+        if same and not force:
+            running.append(uid)
+        print(f"  id {uid}: type {r[0]}, FW {r[1]}, HW {r[2]}, chunks up to {takes[uid]} B"
+              + (f", build {fp[2]:08x}" if fp else "")
+              + (" - already running this image" if same else ""))
+    if running:
+        ids = [uid for uid in ids if uid not in running]
+        print(f"  skipping {running}: nothing to send them (--force to send anyway)")
+        if not ids:
+            print("\nRESULT: every device already runs this image")
+            return 0
+        s.ids = ids
+    # The smallest any board takes, so one broadcast stream suits them all;
+    # whole doublewords, never below the original window.
+    chunk = min([max_chunk, WIDE_CHUNK_SIZE] + [takes[uid] for uid in ids])
+    s.chunk = chunk = max(CHUNK_SIZE, chunk // 8 * 8)
+
+    payloads = [image[i:i + chunk] for i in range(0, len(image), chunk)]
+    spans = [(i * chunk, len(p)) for i, p in enumerate(payloads)]
+    print(f"  {len(payloads)} chunks of {chunk} B"
+          + (f" ({1 - len(payloads) / -(-len(image) // CHUNK_SIZE):.0%} fewer frames than "
+             f"{CHUNK_SIZE} B)" if chunk > CHUNK_SIZE else ""))
+    if lz:
+        packed = ota_lz.encode(image, chunk=chunk)
+        if len(packed) < len(payloads):
+            print(f"  compressed: {len(packed)} chunks ({1 - len(packed) / len(payloads):.0%} fewer)")
+            payloads = packed
+            spans = [ota_lz.chunk_span(p, len(image))[:2] for p in packed]
+        else:
+            print(f"  compressed: {len(packed)} chunks, no fewer - sending raw")
+            lz = False
+    if not lz and str(chunk) in meta.get("chunks", {}):
+        s.chunk_crcs = asset_catalog.split_crcs(meta["chunks"][str(chunk)])
+    total_chunks = len(payloads)
+    sha256 = meta["sha256"]
+    ckpt_path = image_path + CHECKPOINT_SUFFIX
+    ckpt = None if fresh else Checkpoint.load(ckpt_path, sha256, len(image), crc32, lz, chunk)
+    if ckpt:
+        print(f"  checkpoint from {ckpt.started}: devices {ckpt.ids}, stream reached "
+              f"{ckpt.sent}/{total_chunks} - resuming (--fresh to start over)")
+        extra = sorted(set(ids) - set(ckpt.ids))
+        if extra:
+            print(f"  id(s) {extra} were not in that send: they start from scratch")
 
     if not yes:
         try:
@@ -227,51 +428,118 @@ def action_send(client, ids, image_path, *, gap_s, repair_rounds, broadcast_appl
             return 1
 
     # 2+3. METADATA + ENTER
-    print("[2/8] broadcasting metadata ...")
-    s.bcast_regs(REG_META_FIRST, [len(image) >> 16, len(image) & 0xFFFF,
-                                  crc32 >> 16, crc32 & 0xFFFF, total_chunks])
-    print("[3/8] entering OTA mode (staging erase ~1s) ...")
-    s.bcast_coil(COIL_ENTER)
-    time.sleep(2.0)
+    print(f"[2/8] {'sending metadata to ' + str(ids) if running else 'broadcasting metadata'} ...")
+    started = client.now()
+    flags = ((rm.OTA_FLAG_ERASE_AHEAD if erase_ahead else 0) | (rm.OTA_FLAG_RESUME if ckpt else 0)
+             | (rm.OTA_FLAG_LZ if lz else 0)
+             | ((chunk // 8) << rm.OTA_FLAGS_CHUNK_SHIFT if chunk != CHUNK_SIZE else 0))
+    meta_regs = [len(image) >> 16, len(image) & 0xFFFF, crc32 >> 16, crc32 & 0xFFFF,
+                 total_chunks, flags]
+    try:
+        if running:
+            for uid in ids:
+                LgsClient(client, uid).write_registers(REG_META_FIRST, meta_regs)
+        else:
+            s.bcast_regs(REG_META_FIRST, meta_regs)
+    except LgsError as e:
+        print(f"  [ERR] {e}")
+        return 2
+    pages = (len(image) + PAGE_SIZE - 1) // PAGE_SIZE
+    # The board erases page k + 1 right after the first chunk that lands in page k.
+    first_in_page = {}
+    for idx, (offset, length) in enumerate(spans):
+        for page in range(offset // PAGE_SIZE, (offset + length - 1) // PAGE_SIZE + 1):
+            first_in_page.setdefault(page, idx)
+    erase_after = {idx for page, idx in first_in_page.items() if page + 1 < pages}
+    print(f"[3/8] entering OTA mode (staging erase: "
+          f"{'1 page now, the rest as chunks arrive' if erase_ahead else f'{pages} pages'}) ...")
+    try:
+        if running:
+            # Only the boards that need the image: a broadcast would erase
+            # the staging of the ones left out and put them in the session.
+            for uid in ids:
+                LgsClient(client, uid).write_coil(COIL_ENTER, True)
+        else:
+            s.bcast_coil(COIL_ENTER)
+    except LgsError as e:
+        print(f"  [ERR] {e}")
+        return 2
+    entered_at = client.now()
     for uid in ids:
         st = s.state_of(uid)
+        while (st is None or st["state"] != 1) and client.now() - entered_at < ENTER_TIMEOUT_S:
+            client.pause(ENTER_POLL_S)
+            st = s.state_of(uid)
         if st is None or st["state"] != 1:
             print(f"  id {uid}: did not enter OTA "
                   f"({'no reply' if st is None else ERROR_NAMES.get(st['error'], st['error'])})")
             return 2
     print(f"  all {len(ids)} device(s) receiving")
 
+    # A board that kept its session answers with its bitmap; one that was
+    # reset (or never had this image) starts at 0 and needs everything.
+    to_send = range(total_chunks)
+    if ckpt:
+        union = set()
+        for uid in ids:
+            regs = s.bitmap(uid)
+            if regs is None:
+                print(f"  id {uid}: bitmap read failed")
+                return 2
+            miss = s.missing_chunks(uid, total_chunks, regs)
+            had = ckpt.received(uid) or (ckpt.sent if uid in ckpt.ids else 0)
+            lost = " (session lost: reset or power cycle?)" if had and len(miss) == total_chunks else ""
+            print(f"  id {uid}: holds {total_chunks - len(miss)}/{total_chunks} chunks{lost}")
+            ckpt.bitmaps[uid] = regs
+            union.update(miss)
+        to_send = sorted(union)
+    else:
+        ckpt = Checkpoint(ckpt_path, sha256, len(image), crc32, lz, chunk, ids)
+    ckpt.ids = sorted((set(ckpt.ids) - set(running)) | set(ids))
+    ckpt.save()
+
     # 4. STREAM
-    print(f"[4/8] streaming {total_chunks} chunks ...")
-    t0 = time.time()
-    for idx in range(total_chunks):
+    print(f"[4/8] streaming {len(to_send)} of {total_chunks} chunks ...")
+    t0 = client.now()
+    for n, idx in enumerate(to_send):
+        if n % CHECKPOINT_EVERY == 0 and n:
+            ckpt.sent = idx
+            ckpt.save()
         if drop_every and idx % drop_every == drop_every - 1:
             continue  # TEST: simulate a lost broadcast frame
-        s.send_chunk(image, idx)
-        if idx % 32 == 31 or idx == total_chunks - 1:
-            pct = (idx + 1) * 100 // total_chunks
-            print(f"\r  {idx + 1}/{total_chunks}  ({pct}%)  "
-                  f"{time.time() - t0:.0f}s", end="", flush=True)
+        s.send_chunk(payloads, idx)
+        if erase_ahead and idx in erase_after:
+            client.pause(ERASE_PAUSE_S)   # the board erases the next page now
+        if n % 32 == 31 or n == len(to_send) - 1:
+            pct = (n + 1) * 100 // len(to_send)
+            print(f"\r  {n + 1}/{len(to_send)}  ({pct}%)  "
+                  f"{client.now() - t0:.0f}s", end="", flush=True)
     print()
+    ckpt.sent = total_chunks
 
     # 5. REPAIR
     print("[5/8] bitmap check + repair ...")
     for round_no in range(1, repair_rounds + 1):
         union_missing = set()
         for uid in ids:
-            miss = s.missing_chunks(uid, total_chunks)
-            if miss is None:
+            regs = s.bitmap(uid)
+            if regs is None:
                 print(f"  id {uid}: bitmap read failed")
                 return 2
+            ckpt.bitmaps[uid] = regs
+            miss = s.missing_chunks(uid, total_chunks, regs)
             if miss:
                 print(f"  id {uid}: missing {len(miss)} chunk(s)")
             union_missing.update(miss)
+        ckpt.save()
         if not union_missing:
             print("  all devices report a complete image")
             break
         print(f"  repair round {round_no}: re-sending {len(union_missing)} chunk(s)")
+        # Ascending: a compressed chunk is only taken once the chunks it
+        # copies from are in.
         for idx in sorted(union_missing):
-            s.send_chunk(image, idx)
+            s.send_chunk(payloads, idx)
     else:
         print("  [ERR] chunks still missing after all repair rounds")
         return 2
@@ -279,7 +547,7 @@ def action_send(client, ids, image_path, *, gap_s, repair_rounds, broadcast_appl
     # 6. FINALIZE
     print("[6/8] finalize (device-side CRC32) ...")
     s.bcast_coil(COIL_FINALIZE)
-    time.sleep(1.0)
+    client.pause(1.0)
     verified = []
     for uid in ids:
         st = s.state_of(uid)
@@ -291,36 +559,53 @@ def action_send(client, ids, image_path, *, gap_s, repair_rounds, broadcast_appl
     if not verified:
         print("  [ERR] no device verified the image")
         return 2
+    print(f"  transfer took {client.now() - started:.1f}s")
+    # Applying ends the verified boards' sessions; what is left to resume is
+    # the rest (a failed CRC32 already dropped theirs on the board).
+    ckpt.ids = [uid for uid in ckpt.ids if uid not in verified]
+    if ckpt.ids:
+        ckpt.save()
+    else:
+        ckpt.discard()
 
     # 7. APPLY
-    print(f"[7/8] applying to {verified} (reboot + bootloader copy ~4s) ...")
-    if broadcast_apply:
+    print(f"[7/8] applying to {verified} (reboot + bootloader copies changed pages) ...")
+    if broadcast_apply and running:
+        print(f"  per ID, not broadcast: {running} are left out of this send")
+    if broadcast_apply and not running:
         s.bcast_coil(COIL_APPLY)
     else:
         for uid in verified:
-            try:
-                s.c.write_coil(COIL_APPLY, True, device_id=uid)
-            except Exception:
-                pass  # the device may reset before answering
-            time.sleep(0.1)
-    time.sleep(5.0)
+            # The device may reset before answering: don't wait for an echo.
+            LgsClient(client, uid).send_coil(COIL_APPLY)
+            client.pause(0.1)
+    applied_at = client.now()
+    client.pause(APPLY_SETTLE_S)
 
     # 8. CONFIRM
-    print("[8/8] confirming new firmware version ...")
+    print("[8/8] confirming the new image ...")
     ok = 0
     for uid in verified:
-        r = None
-        for _ in range(5):
+        r = s.read_regs(uid, 1, 1)
+        while r is None and client.now() - applied_at < APPLY_CONFIRM_TIMEOUT_S:
+            client.pause(APPLY_POLL_S)
             r = s.read_regs(uid, 1, 1)
-            if r is not None:
-                break
-            time.sleep(1.0)
         if r is None:
             print(f"  id {uid}: no reply after reboot")
-        else:
+            continue
+        # The fingerprint settles it where the new image has one; an image
+        # from before regs 390-395 only has its version to show.
+        fp = s.fingerprint(uid)
+        if fp is None:
             changed = "UPDATED" if r[0] != old_fw[uid] else "same version"
-            print(f"  id {uid}: FW {old_fw[uid]} -> {r[0]}  [{changed}]")
-            ok += 1
+        elif fp[:2] == (len(image), crc32):
+            changed = f"running this image, build {fp[2]:08x}"
+        else:
+            print(f"  id {uid}: FW {old_fw[uid]} -> {r[0]}  [RUNNING A DIFFERENT IMAGE: "
+                  f"{human(fp[0])} B, CRC32 {fp[1]:08X}]")
+            continue
+        print(f"  id {uid}: FW {old_fw[uid]} -> {r[0]}  [{changed}]")
+        ok += 1
     print(f"\nRESULT: {ok}/{len(verified)} device(s) running the new image")
     return 0 if ok == len(verified) else 1
 
@@ -403,22 +688,24 @@ def interactive_menu(args):
                 print("  no file selected")
                 continue
 
-        client = open_client(port, baud)
+        client = open_client(port, baud, args.gap / 1000.0)
         if client is None:
             print(f"  [ERR] cannot open {port} (in use? unplugged?)")
             continue
         try:
             if choice == "1":
                 action_send(client, ids, path,
-                            gap_s=args.gap / 1000.0, repair_rounds=args.repair_rounds,
+                            repair_rounds=args.repair_rounds,
                             broadcast_apply=args.broadcast_apply, yes=False,
-                            drop_every=args.drop_every)
+                            drop_every=args.drop_every, erase_ahead=not args.erase_all,
+                            fresh=args.fresh, lz=args.lz, max_chunk=args.max_chunk,
+                            force=args.force)
             elif choice == "2":
                 action_status(client, ids)
             else:
-                action_abort(client, args.gap / 1000.0)
+                action_abort(client)
         except KeyboardInterrupt:
-            print("\n  interrupted - the device session times out by itself (~30s)")
+            print(f"\n  {INTERRUPTED}")
         finally:
             client.close()
 
@@ -435,7 +722,8 @@ def main():
     ap.add_argument("-p", "--port", default="COM30", help="USB-RS485 serial port")
     ap.add_argument("-b", "--baud", type=int, default=9600,
                     choices=BAUD_CHOICES, help="bus baud rate")
-    ap.add_argument("-f", "--file", help="firmware .bin; omit to browse (CLI send) or use the menu")
+    ap.add_argument("-f", "--file", help="firmware .bin, or a version (v3.3.0: the newest OTA image of it in "
+                         "assets/); omit to browse (CLI send) or use the menu")
     ap.add_argument("--ids", default="21",
                     help="comma-separated device IDs to verify/apply (e.g. 21,22,23)")
     ap.add_argument("--gap", type=float, default=25.0, help="inter-frame gap in ms")
@@ -446,7 +734,23 @@ def main():
     ap.add_argument("--abort", action="store_true", help="broadcast OTA abort (coil 508) and exit")
     ap.add_argument("--send", action="store_true",
                     help="CLI send even without -f (opens the browse dialog)")
+    ap.add_argument("--erase-all", action="store_true",
+                    help="erase every image page at coil 505 instead of one page "
+                         "ahead of the stream")
+    ap.add_argument("--lz", action="store_true",
+                    help="send the image compressed (~15%% fewer chunks; needs firmware "
+                         "that decodes reg 289 bit 2)")
+    ap.add_argument("--max-chunk", type=int, default=WIDE_CHUNK_SIZE, metavar="BYTES",
+                    help=f"largest chunk to negotiate, {CHUNK_SIZE}-{WIDE_CHUNK_SIZE} "
+                         f"({CHUNK_SIZE} = the original window, as older senders)")
+    ap.add_argument("--fresh", action="store_true",
+                    help="ignore a checkpoint from an interrupted send and start over")
+    ap.add_argument("--force", action="store_true",
+                    help="send even to devices whose fingerprint (regs 390-395) says "
+                         "they already run this image")
     ap.add_argument("-y", "--yes", action="store_true", help="skip the confirmation prompt")
+    ap.add_argument("--capture", metavar="FILE",
+                    help="record the bus traffic to FILE (tools/lgs_capture.py)")
     ap.add_argument("--drop-every", type=int, default=0, metavar="N",
                     help="TEST: skip every Nth chunk in the main stream so the "
                          "bitmap repair rounds have real work to do")
@@ -457,13 +761,13 @@ def main():
         return interactive_menu(args)
 
     ids = [int(x) for x in args.ids.split(",") if x.strip()]
-    client = open_client(args.port, args.baud)
+    client = open_client(args.port, args.baud, args.gap / 1000.0, args.capture)
     if client is None:
         print(f"[ERR] cannot open {args.port}")
         return 2
     try:
         if args.abort:
-            return action_abort(client, args.gap / 1000.0)
+            return action_abort(client)
         if args.status:
             return action_status(client, ids)
 
@@ -472,9 +776,14 @@ def main():
             print("[ERR] no firmware file selected")
             return 2
         return action_send(client, ids, path,
-                           gap_s=args.gap / 1000.0, repair_rounds=args.repair_rounds,
+                           repair_rounds=args.repair_rounds,
                            broadcast_apply=args.broadcast_apply, yes=args.yes,
-                           drop_every=args.drop_every)
+                           drop_every=args.drop_every, erase_ahead=not args.erase_all,
+                           fresh=args.fresh, lz=args.lz, max_chunk=args.max_chunk,
+                           force=args.force)
+    except KeyboardInterrupt:
+        print(f"\n{INTERRUPTED}")
+        return 130
     finally:
         client.close()
 
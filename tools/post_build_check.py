@@ -10,6 +10,16 @@ So the guarantee lives here instead: if the block is missing, duplicated, or
 inconsistent, the build fails. A silent regression becomes a red build rather
 than a batch of boards that cannot be commissioned.
 
+The same hook then runs the flash/RAM budget (tools/size_budget.py): sizes
+per section and symbol go into .pio/size_history/, the build prints what
+moved since the previous one, and it fails when the image creeps too close
+to the OTA cap. Thresholds: custom_size_* in platformio.ini.
+
+Last, it checks that the image size the app publishes in its fingerprint
+(regs 390-391, worked out at run time from the linker's .data symbols) is
+the size of firmware.bin: if a section ever lands after .data's initialisers,
+the fingerprint would stop matching every file ota_sender.py compares it to.
+
 Wired in from platformio.ini as an extra_script; PlatformIO calls it with the
 build environment in scope.
 """
@@ -19,6 +29,11 @@ import struct
 import sys
 from pathlib import Path
 
+# SCons exec()s this file, so there is no __file__ to find siblings by.
+sys.path.insert(0, str(Path(env.subst("$PROJECT_DIR")) / "tools"))  # noqa: F821
+import size_budget  # noqa: E402
+from make_factory_image import APP_ADDR  # noqa: E402
+
 MAGIC_TEXT = b"LGS-COMMISSION"         # the block stores it NUL-padded in char[16]
 # v2 added deviceType; v1 images (ID only) are still valid and still flashed,
 # so both layouts are accepted here and by src/svc/commission.cpp.
@@ -37,10 +52,10 @@ def crc16_ccitt(data: bytes) -> int:
     return crc
 
 
-def fail(message: str) -> None:
+def fail(message: str, title: str = "COMMISSIONING BLOCK CHECK FAILED") -> None:
     print("")
     print("=" * 72)
-    print("COMMISSIONING BLOCK CHECK FAILED")
+    print(title)
     print(message)
     print("=" * 72)
     sys.exit(1)
@@ -128,9 +143,61 @@ def check(source, target, env):  # noqa: ARG001 — SCons signature
     # commissionRead(); the proof it worked is the hardware test — patch an
     # ID, flash, confirm the board adopts it. Re-run that after any toolchain
     # bump, alongside the boot/ISR check platformio.ini already calls for.
-    flash_addr = 0x08001000 + offset
+    flash_addr = APP_ADDR + offset
     print(f"commissioning block: ok at 0x{offset:06X} (flash 0x{flash_addr:08X}), "
           f"v{version}, id={identifier}, type={device_type}, crc=0x{crc:04X}")
 
 
+def budget(source, target, env):  # noqa: ARG001 — SCons signature
+    build = Path(env.subst("$BUILD_DIR"))
+    elf = build / env.subst("${PROGNAME}.elf")
+    if not elf.exists():
+        return
+
+    def option(name: str, default: int) -> int:
+        return int(env.GetProjectOption(f"custom_size_{name}", default))
+
+    limits = size_budget.Limits(**{k: option(k, v) for k, v in vars(size_budget.Limits()).items()})
+    # The toolchain's own c++filt knows its mangling; the host one is a fallback.
+    cxxfilt = env.WhereIs(env.subst("$CXX").replace("g++", "c++filt"))
+    warnings, failures = size_budget.run(
+        str(elf), bin_path=str(build / "firmware.bin"),
+        history_dir=str(Path(env.subst("$PROJECT_DIR")) / ".pio" / "size_history"),
+        env_name=env.subst("$PIOENV"), limits=limits,
+        ram_total=int(env.BoardConfig().get("upload.maximum_ram_size", 0)),
+        cxxfilt=cxxfilt)
+    for w in warnings:
+        print(f"size budget: WARNING {w}")
+    if failures:
+        fail("\n".join(failures) + "\n"
+             "The build is recorded in .pio/size_history/ — the diff above shows\n"
+             "what moved. Win the bytes back, or raise custom_size_* in\n"
+             "platformio.ini with a note in doc/ARCHITECTURE.md (Flash budget).",
+             title="FLASH/RAM BUDGET CHECK FAILED")
+
+
+def fingerprint(source, target, env):  # noqa: ARG001 — SCons signature
+    build = Path(env.subst("$BUILD_DIR"))
+    elf = build / env.subst("${PROGNAME}.elf")
+    binary = build / "firmware.bin"
+    if not elf.exists() or not binary.exists():
+        return
+    sym = size_budget.read_elf(str(elf)).linker
+    if set(sym) != set(size_budget.LINKER_SYMBOLS):
+        fail(f"Linker symbols {', '.join(size_budget.LINKER_SYMBOLS)} not all in the ELF\n"
+             f"(found: {', '.join(sorted(sym)) or 'none'}). flashHalAppSize() in\n"
+             "src/drivers/flash_stage_hal.cpp reads them: check the linker script.",
+             title="FIRMWARE FINGERPRINT CHECK FAILED")
+    computed = sym["_sidata"] + (sym["_edata"] - sym["_sdata"]) - APP_ADDR
+    actual = binary.stat().st_size
+    if computed != actual:
+        fail(f"The app would report an image of {computed} B; firmware.bin is {actual} B.\n"
+             "Something is placed in flash after the .data initialisers, so\n"
+             "flashHalAppSize() no longer finds the end of the image.",
+             title="FIRMWARE FINGERPRINT CHECK FAILED")
+    print(f"fingerprint: image size {actual} B matches the linker's end of .data")
+
+
 env.AddPostAction("$BUILD_DIR/firmware.bin", check)  # noqa: F821
+env.AddPostAction("$BUILD_DIR/firmware.bin", budget)  # noqa: F821
+env.AddPostAction("$BUILD_DIR/firmware.bin", fingerprint)  # noqa: F821
@@ -0,0 +1,274 @@
+"""Host model of the bootloader's apply step (src/boot/boot.c).
+
+applyStagedImage() copies a verified staged image into the app slot. It now
+erases and reprograms only the pages the image covers whose bytes differ,
+and it computes CRC-32/ISO-HDLC on the CRC peripheral. Both are easy to get
+subtly wrong, and a wrong bootloader is only fixable over ST-Link. This
+script runs a line-for-line port of the apply logic against a simulated
+G0 flash and checks it:
+
+  * flash model: 2 KB pages, erase -> 0xFF, 8-byte programming only onto an
+    erased doubleword (PROGERR otherwise), a torn erase or program leaves
+    garbage with a broken ECC that raises the NMI when read
+  * scenarios: identical image, one-byte patch, small image over a large
+    app, completely new image, shrinking and growing images — correctness
+    of the slot and page-erase counts against the old erase-everything apply
+  * power loss after every flash operation of an apply, with the operation
+    in flight torn, followed by reboots until the header is consumed: the
+    slot must always end up equal to the image
+  * the CRC peripheral configuration (REV_IN = byte up to a word boundary
+    and for the tail, word in between, REV_OUT) modelled bit by bit at all
+    four alignments and compared with zlib.crc32
+
+Exit status is non-zero if a check fails.
+
+Usage:
+    <python> tools/sim_boot_apply.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import zlib
+
+# --- include/flash_layout.h -------------------------------------------------
+PAGE = 0x800
+APP_PAGES = 31
+MAX_IMAGE = 30 * PAGE
+ERASED_DW = b"\xFF" * 8
+
+ERASE_MS = 22.0          # G0 datasheet typical page erase
+PROGRAM_US = 85.0        # G0 datasheet typical doubleword program
+
+
+class PowerLoss(Exception):
+    pass
+
+
+class Flash:
+    """The app slot only — staging is read-only during apply."""
+
+    def __init__(self, content: bytes, rng: random.Random) -> None:
+        self.mem = bytearray(content.ljust(APP_PAGES * PAGE, b"\xFF"))
+        self.bad_ecc: set[int] = set()        # doubleword offsets
+        self.erases = 0
+        self.programs = 0
+        self.ops = 0
+        self.cut_after: int | None = None     # power fails during op #n
+        self.ecc_fault = False
+        self.rng = rng
+
+    def _tick(self) -> bool:
+        self.ops += 1
+        return self.cut_after is not None and self.ops > self.cut_after
+
+    def erase(self, page: int) -> None:
+        torn = self._tick()
+        start = page * PAGE
+        if torn:
+            for dw in range(start, start + PAGE, 8):
+                if self.rng.random() < 0.5:
+                    self.mem[dw:dw + 8] = self.rng.randbytes(8)
+                    self.bad_ecc.add(dw)
+            raise PowerLoss
+        self.erases += 1
+        self.mem[start:start + PAGE] = b"\xFF" * PAGE
+        self.bad_ecc -= set(range(start, start + PAGE, 8))
+
+    def program(self, off: int, data: bytes) -> None:
+        torn = self._tick()
+        assert off % 8 == 0 and len(data) == 8
+        if bytes(self.mem[off:off + 8]) != ERASED_DW or off in self.bad_ecc:
+            raise AssertionError(f"PROGERR: doubleword {off:#x} not erased")
+        if torn:
+            self.mem[off:off + 8] = bytes(a & b for a, b in zip(data, self.rng.randbytes(8)))
+            self.bad_ecc.add(off)
+            raise PowerLoss
+        self.programs += 1
+        self.mem[off:off + 8] = data
+
+    def read_dw(self, off: int) -> bytes:
+        if off in self.bad_ecc:
+            self.ecc_fault = True                 # NMI_Handler sets eccFault
+        return bytes(self.mem[off:off + 8])
+
+
+# --- boot.c port -------------------------------------------------------------
+
+def app_matches_staged(flash: Flash, staged: bytes, off: int, length: int) -> bool:
+    flash.ecc_fault = False
+    for i in range(off, off + length, 8):
+        if flash.read_dw(i) != staged[i:i + 8]:
+            return False
+    return not flash.ecc_fault
+
+
+def apply_staged_image(flash: Flash, staged: bytes, size: int) -> None:
+    padded = (size + 7) & ~7
+    for off in range(0, padded, PAGE):
+        length = min(padded - off, PAGE)
+        if app_matches_staged(flash, staged, off, length):
+            continue
+        flash.erase(off // PAGE)
+        for i in range(off, off + length, 8):
+            dw = staged[i:i + 8]
+            if dw != ERASED_DW:
+                flash.program(i, dw)
+
+
+def apply_erase_all(flash: Flash, staged: bytes, size: int) -> None:
+    """The previous apply, for the comparison column."""
+    for p in range(APP_PAGES):
+        flash.erase(p)
+    for i in range(0, (size + 7) & ~7, 8):
+        flash.program(i, staged[i:i + 8])
+
+
+def boot(flash: Flash, staged: bytes, size: int, crc: int, fn) -> bool:
+    """One boot with a valid header: apply, verify; True = header consumed."""
+    fn(flash, staged, size)
+    # zlib here for speed; main() checks the peripheral model against it.
+    return zlib.crc32(bytes(flash.mem[:size])) == crc
+
+
+# --- CRC peripheral model ----------------------------------------------------
+
+def _rev(value: int, bits: int) -> int:
+    return int(f"{value:0{bits}b}"[::-1], 2)
+
+
+def crc32_peripheral(data: bytes, addr: int = 0) -> int:
+    """crc32Zlib() (src/util/crc.c) on the part: POL 0x04C11DB7, INIT
+    all-ones, bytes up to the first word boundary after `addr` and the tail
+    with REV_IN=byte, aligned words with REV_IN=word, REV_OUT, final xor."""
+    state = 0xFFFFFFFF
+
+    def feed(value: int, bits: int) -> None:
+        nonlocal state
+        state ^= value << (32 - bits)
+        for _ in range(bits):
+            state = ((state << 1) ^ 0x04C11DB7) & 0xFFFFFFFF if state & 0x80000000 \
+                else (state << 1) & 0xFFFFFFFF
+
+    head = min(-addr % 4, len(data))
+    whole = head + (len(data) - head) // 4 * 4
+    for b in data[:head]:
+        feed(_rev(b, 8), 8)
+    for i in range(head, whole, 4):
+        word = int.from_bytes(data[i:i + 4], "little")   # the CPU's 32-bit load
+        feed(_rev(word, 32), 32)
+    for b in data[whole:]:
+        feed(_rev(b, 8), 8)
+    return _rev(state, 32) ^ 0xFFFFFFFF
+
+
+# --- checks ------------------------------------------------------------------
+
+def staged_area(image: bytes) -> bytes:
+    return image.ljust(MAX_IMAGE + 8, b"\xFF")
+
+
+def scenarios(rng: random.Random) -> list[tuple[str, bytes, bytes]]:
+    app = rng.randbytes(58_000)
+    patched = bytearray(app)
+    patched[5 * PAGE + 17] ^= 0x40
+    relinked = bytearray(app)
+    relinked[9_000:9_400] = rng.randbytes(400)            # one function changed size...
+    relinked[40_000:40_008] = rng.randbytes(8)            # ...and a literal elsewhere
+    return [
+        ("identical image", app, app),
+        ("one-byte patch", app, bytes(patched)),
+        ("two local edits", app, bytes(relinked)),
+        ("20 KB image over 58 KB app", app, rng.randbytes(20_000)),
+        ("new image, same size", app, rng.randbytes(58_000)),
+        ("image shrinks by 1 page", app, app[:58_000 - PAGE]),
+        ("image grows to the cap", app, app + rng.randbytes(MAX_IMAGE - 58_000)),
+        ("odd size (not a doubleword)", app, app[:30_003]),
+    ]
+
+
+def run_scenario(name: str, old: bytes, new: bytes, rng: random.Random) -> tuple[list, list[str]]:
+    problems = []
+    staged = staged_area(new)
+    crc = zlib.crc32(new)
+    row = [name]
+    for fn in (apply_erase_all, apply_staged_image):
+        flash = Flash(old, rng)
+        if not boot(flash, staged, len(new), crc, fn):
+            problems.append(f"{name} [{fn.__name__}]: slot CRC mismatch after apply")
+        if bytes(flash.mem[:len(new)]) != new:
+            problems.append(f"{name} [{fn.__name__}]: slot differs from the image")
+        ms = flash.erases * ERASE_MS + flash.programs * PROGRAM_US / 1000
+        row += [flash.erases, f"{ms:.0f}"]
+    return row, problems
+
+
+def power_loss_sweep(old: bytes, new: bytes, rng: random.Random) -> list[str]:
+    """Cut power at every flash op of the first apply, then reboot to done."""
+    problems = []
+    staged = staged_area(new)
+    crc = zlib.crc32(new)
+    total_ops = Flash(old, rng)
+    apply_staged_image(total_ops, staged, len(new))
+    for cut in range(total_ops.ops):
+        flash = Flash(old, rng)
+        flash.cut_after = cut
+        try:
+            apply_staged_image(flash, staged, len(new))
+        except PowerLoss:
+            pass
+        flash.cut_after = None
+        for _ in range(3):                          # the header survives: retry
+            if boot(flash, staged, len(new), crc, apply_staged_image):
+                break
+        else:
+            problems.append(f"power loss at op {cut}: never converged")
+            continue
+        if bytes(flash.mem[:len(new)]) != new:
+            problems.append(f"power loss at op {cut}: slot differs from the image")
+    return problems
+
+
+def main() -> int:
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    rng = random.Random(0xB007)
+    failures = []
+
+    for n in list(range(0, 16)) + [1021, 2048, 30_003, MAX_IMAGE]:
+        data = rng.randbytes(n)
+        for addr in range(4):
+            if crc32_peripheral(data, addr) != zlib.crc32(data):
+                failures.append(f"CRC peripheral model != zlib for {n} bytes at +{addr}")
+    print("CRC peripheral configuration vs zlib.crc32: "
+          + ("OK" if not failures else "MISMATCH"))
+
+    print(f"\n{'scenario':<30}{'old erases':>11}{'ms':>7}{'new erases':>12}{'ms':>7}")
+    rows = []
+    for name, old, new in scenarios(rng):
+        row, problems = run_scenario(name, old, new, rng)
+        rows.append(row)
+        failures += problems
+        print(f"{row[0]:<30}{row[1]:>11}{row[2]:>7}{row[3]:>12}{row[4]:>7}")
+
+    app = rng.randbytes(12_000)
+    new = bytearray(app)
+    new[3 * PAGE:3 * PAGE + 100] = rng.randbytes(100)
+    new += rng.randbytes(2_000)
+    sweep = power_loss_sweep(app, bytes(new), rng)
+    failures += sweep
+    print(f"\npower-loss sweep: cut at every flash op of an apply, reboot until done — "
+          + ("OK" if not sweep else f"{len(sweep)} failure(s)"))
+
+    print()
+    if failures:
+        for f in failures:
+            print("FAIL", f)
+        return 1
+    print("all checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
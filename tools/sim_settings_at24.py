@@ -0,0 +1,235 @@
+"""Host model of the AT24C32D settings blob, for counting what a save costs.
+
+settingsSave() blocks the main loop while the AT24 runs its internal write
+cycles (~5 ms of ack-polling each), so the number of cycles a save issues is
+what the bus sees as a stall. This script replays the firmware's two save
+paths against a byte-exact model of the chip and the driver's chunking:
+
+    full   writePayload       — every payload byte + CRC, every save
+    delta  writePayloadDelta  — only the differing span of each page + CRC
+
+and prints the cycles each one needs for typical edits (one preset colour,
+the slave ID, the baud rate, a factory reset, ...).
+
+It also checks the torn-write guarantee the architecture doc promises, for
+both paths: power lost after ANY write cycle of a save must leave either the
+old blob, the new blob, or a bad-CRC blob whose identifier is the old or the
+new one (the salvage path) — never a valid CRC over a mix of old and new
+values. Exit status is non-zero if a check fails.
+
+Layout and chunking mirror src/svc/settings.cpp and
+src/drivers/eeprom_at24.cpp; keep them in step.
+
+Usage:
+    <python> tools/sim_settings_at24.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import sys
+
+# --- src/drivers/eeprom_at24.cpp -------------------------------------------
+AT24_SIZE = 4096
+AT24_PAGE = 32
+AT24_WRITE_CHUNK = 30      # Wire buffer 32 minus the 2-byte memory address
+WRITE_CYCLE_MS = 5.0       # datasheet typical; the driver times out at 10
+
+# --- src/svc/settings.cpp / include/config.h -------------------------------
+SETTINGS_AT24_ADDR = 0
+SETTINGS_MAGIC = 0x4C475335    # 'LGS5'
+SETTINGS_SCHEMA = 3
+HEADER_FMT = "<IHH"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)          # 8
+PAYLOAD_WORDS = 3 + 8 * 5 + 2                      # identifier, baud, delay, presets,
+                                                   # groupMask, reserved
+PAYLOAD_SIZE = PAYLOAD_WORDS * 2                   # 90
+BLOB_SIZE = HEADER_SIZE + PAYLOAD_SIZE + 2         # 100
+CRC_AT = HEADER_SIZE + PAYLOAD_SIZE                # 98
+GROUP_MASK_AT = 3 + 8 * 5                          # word index
+
+DEFAULT_IDENTIFIER = 247
+DEFAULT_PALETTE = [
+    (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 215, 0),
+    (0, 255, 255), (255, 0, 255), (255, 60, 0), (255, 245, 120),
+]
+
+
+def crc16_ccitt(data: bytes) -> int:
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+    return crc
+
+
+def defaults() -> list[int]:
+    words = [DEFAULT_IDENTIFIER, 9600, 0]
+    for r, g, b in DEFAULT_PALETTE:
+        words += [80, r, g, b, 3600]
+    return words + [0, 0]
+
+
+def preset_index(n: int, field: str) -> int:
+    """Word index of preset n (1-8) field within the payload."""
+    return 3 + (n - 1) * 5 + ["brightness", "r", "g", "b", "maxOnTimeS"].index(field)
+
+
+def blob_bytes(words: list[int]) -> bytes:
+    payload = struct.pack(f"<{PAYLOAD_WORDS}H", *words)
+    header = struct.pack(HEADER_FMT, SETTINGS_MAGIC, SETTINGS_SCHEMA, PAYLOAD_SIZE)
+    return header + payload + struct.pack("<H", crc16_ccitt(payload))
+
+
+class At24:
+    """The array plus at24Write's chunking: one entry in `cycles` per write
+    transaction, i.e. per internal write cycle the driver ack-polls."""
+
+    def __init__(self) -> None:
+        self.mem = bytearray(b"\xFF" * AT24_SIZE)
+        self.cycles: list[tuple[int, bytes]] = []
+
+    def write(self, addr: int, data: bytes) -> None:
+        done = 0
+        while done < len(data):
+            cur = addr + done
+            n = min(len(data) - done, AT24_WRITE_CHUNK, AT24_PAGE - cur % AT24_PAGE)
+            self.cycles.append((cur, bytes(data[done:done + n])))
+            self.mem[cur:cur + n] = data[done:done + n]
+            done += n
+
+
+def write_payload(chip: At24, words: list[int]) -> None:
+    blob = blob_bytes(words)
+    chip.write(SETTINGS_AT24_ADDR + HEADER_SIZE, blob[HEADER_SIZE:])
+
+
+def write_payload_delta(chip: At24, words: list[int], before: list[int]) -> None:
+    a = blob_bytes(words)
+    b = blob_bytes(before)
+    for page in range(0, BLOB_SIZE, AT24_PAGE):
+        lo = max(page, HEADER_SIZE)
+        hi = min(page + AT24_PAGE, BLOB_SIZE)
+        diff = [i for i in range(lo, hi) if a[i] != b[i]]
+        first = diff[0] if diff else hi
+        last = diff[-1] + 1 if diff else lo
+        if lo <= CRC_AT < hi:
+            first = min(first, CRC_AT)
+            last = hi
+        if first == hi:
+            continue
+        chip.write(SETTINGS_AT24_ADDR + first, a[first:last])
+
+
+def boot_decode(mem: bytes) -> tuple[str, int]:
+    """settingsInit's view: ('intact', payload-crc) or ('torn', salvaged id)."""
+    magic, schema, size = struct.unpack_from(HEADER_FMT, mem, SETTINGS_AT24_ADDR)
+    assert (magic, schema, size) == (SETTINGS_MAGIC, SETTINGS_SCHEMA, PAYLOAD_SIZE), \
+        "a routine save must never touch the header"
+    payload = bytes(mem[HEADER_SIZE:CRC_AT])
+    (crc,) = struct.unpack_from("<H", mem, CRC_AT)
+    if crc == crc16_ccitt(payload):
+        return "intact", crc
+    ident = struct.unpack_from("<H", payload, 0)[0]
+    return "torn", ident if 1 <= ident <= 246 else DEFAULT_IDENTIFIER
+
+
+def replay(old: list[int], new: list[int], delta: bool) -> list[tuple[int, bytes]]:
+    chip = At24()
+    chip.write(SETTINGS_AT24_ADDR, blob_bytes(old))
+    chip.cycles.clear()
+    if delta:
+        write_payload_delta(chip, new, old)
+    else:
+        write_payload(chip, new)
+    assert chip.mem[:BLOB_SIZE] == blob_bytes(new), "save did not reach the new blob"
+    return chip.cycles
+
+
+def check_torn(old: list[int], new: list[int], cycles: list[tuple[int, bytes]]) -> list[str]:
+    """Apply the first k cycles for every k and decode what a reboot sees."""
+    problems = []
+    old_blob = blob_bytes(old)
+    old_crc = struct.unpack_from("<H", old_blob, CRC_AT)[0]
+    new_crc = struct.unpack_from("<H", blob_bytes(new), CRC_AT)[0]
+    ids = {old[0], new[0]}
+    for k in range(len(cycles) + 1):
+        mem = bytearray(old_blob)
+        for addr, data in cycles[:k]:
+            mem[addr:addr + len(data)] = data
+        state, value = boot_decode(mem)
+        if state == "intact":
+            payload_ok = mem[:BLOB_SIZE] in (old_blob, blob_bytes(new))
+            if not payload_ok or value not in (old_crc, new_crc):
+                problems.append(f"tear after cycle {k}: valid CRC over a mixed payload")
+        elif value not in ids and value != DEFAULT_IDENTIFIER:
+            problems.append(f"tear after cycle {k}: salvaged foreign identifier {value}")
+    return problems
+
+
+def scenarios() -> list[tuple[str, list[int], list[int]]]:
+    base = defaults()
+    base[0] = 17
+
+    def edit(**changes: int) -> list[int]:
+        w = list(base)
+        for key, value in changes.items():
+            if key.startswith("p"):
+                n, field = key[1], key[3:]
+                w[preset_index(int(n), field)] = value
+            elif key == "groups":
+                w[GROUP_MASK_AT] = value
+            else:
+                w[["identifier", "baud", "delay"].index(key)] = value
+        return w
+
+    reset = defaults()
+    reset[0] = 17
+    custom = list(base)
+    for n in range(1, 9):
+        custom[preset_index(n, "brightness")] = 40
+        custom[preset_index(n, "maxOnTimeS")] = 600
+    return [
+        ("preset 1 red",             base, edit(p1_r=10)),
+        ("preset 3 colour (r,g,b)",  base, edit(p3_r=1, p3_g=2, p3_b=3)),
+        ("preset 8 max on time",     base, edit(p8_maxOnTimeS=60)),
+        ("slave ID",                 base, edit(identifier=42)),
+        ("baud rate",                base, edit(baud=38400)),
+        ("unlock delay",             base, edit(delay=1500)),
+        ("group membership",         base, edit(groups=0b10010)),
+        ("global brightness fan-out", base, [
+            40 if i in [preset_index(n, "brightness") for n in range(1, 9)] else w
+            for i, w in enumerate(base)]),
+        ("factory reset (keep ID)",  custom, reset),
+    ]
+
+
+def main() -> int:
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+
+    failures = []
+    print(f"{'scenario':<28}{'full':>6}{'delta':>7}{'full ms':>9}{'delta ms':>10}")
+    for name, old, new in scenarios():
+        full = replay(old, new, delta=False)
+        delta = replay(old, new, delta=True)
+        print(f"{name:<28}{len(full):>6}{len(delta):>7}"
+              f"{len(full) * WRITE_CYCLE_MS:>9.0f}{len(delta) * WRITE_CYCLE_MS:>10.0f}")
+        for label, cycles in (("full", full), ("delta", delta)):
+            failures += [f"{name} [{label}]: {p}" for p in check_torn(old, new, cycles)]
+        if len(delta) > len(full):
+            failures.append(f"{name}: delta issued more cycles than a full write")
+
+    print()
+    if failures:
+        for f in failures:
+            print("FAIL", f)
+        return 1
+    print("torn-write check: every tear point decodes to old, new or bad-CRC "
+          "with a salvageable identifier — OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
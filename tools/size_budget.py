@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Flash/RAM budget tracking for firmware.elf: sizes, history, diff, gates.
+
+The image has to fit the OTA cap (FLASH_OTA_MAX_IMAGE_SIZE, 61,440 B), and
+at v3.2.0 it sat 400 B under it. doc/ARCHITECTURE.md kept that story in a
+hand-maintained table, filled in at milestones — after the bytes were
+already spent. This records every build instead:
+
+  - per-section sizes and every sized symbol, read straight from the ELF
+    (no toolchain binutils needed; names are demangled when c++filt is
+    around);
+  - one line per build in .pio/size_history/<env>.jsonl (sections, image,
+    RAM, the top symbols) plus the full symbol table of the last build;
+  - a diff against the previous build, down to the symbols that moved;
+  - gates: warn or fail when the image or RAM grows by more than a
+    threshold in one build, or the headroom under the OTA cap drops below
+    a margin.
+
+post_build_check.py runs it after every `pio run` (thresholds come from
+platformio.ini, custom_size_*). Standalone, for a build tree or an ELF
+kept from a release:
+
+    <python> tools/size_budget.py .pio/build/LGS_STM32G070CBT6/firmware.elf
+    <python> tools/size_budget.py firmware.elf --bin firmware.bin --no-record
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+SHF_WRITE, SHF_ALLOC = 0x1, 0x2
+SHT_SYMTAB, SHT_NOBITS = 2, 8
+STT_OBJECT, STT_FUNC = 1, 2
+
+TOP_N = 25               # symbols per region kept in each history line
+DIFF_MIN_BYTES = 8       # smaller moves are layout noise (alignment, literal pools)
+DIFF_LINES = 20
+# Linker-script symbols whose addresses read_elf keeps (SizeReport.linker):
+# the app computes its own firmware.bin size from them (flashHalAppSize).
+LINKER_SYMBOLS = ("_sidata", "_sdata", "_edata")
+
+
+@dataclass
+class Limits:
+    """Gates. 0 disables one. Growth is per build, against the last record."""
+    image_growth_warn: int = 512
+    image_growth_fail: int = 0
+    ram_growth_warn: int = 256
+    ram_growth_fail: int = 0
+    ota_margin_warn: int = 1024
+    ota_margin_fail: int = 256
+
+
+@dataclass
+class SizeReport:
+    sections: dict[str, int]                 # name -> bytes (allocated sections only)
+    flash: int                               # bytes stored in flash (code, constants, .data init)
+    ram: int                                 # .data + .bss + heap/stack reservations
+    symbols: dict[str, tuple[str, int]]      # name -> (region "flash"/"ram", bytes)
+    image: int = 0                           # firmware.bin size when known, else `flash`
+    meta: dict = field(default_factory=dict)
+    linker: dict[str, int] = field(default_factory=dict)  # LINKER_SYMBOLS name -> address
+
+
+# --- ELF ------------------------------------------------------------------------
+
+def read_elf(path: str) -> SizeReport:
+    """Sections, sized FUNC/OBJECT symbols and LINKER_SYMBOLS of an ELF32/ELF64 file."""
+    data = open(path, "rb").read()
+    if data[:4] != b"\x7fELF":
+        raise ValueError(f"{path}: not an ELF file")
+    is64 = data[4] == 2
+    end = "<" if data[5] == 1 else ">"
+    if is64:
+        shoff, = struct.unpack_from(end + "Q", data, 0x28)
+        shentsize, shnum, shstrndx = struct.unpack_from(end + "3H", data, 0x3A)
+        sh_fmt, sym_fmt, sym_size = end + "IIQQQQIIQQ", end + "IBBHQQ", 24
+    else:
+        shoff, = struct.unpack_from(end + "I", data, 0x20)
+        shentsize, shnum, shstrndx = struct.unpack_from(end + "3H", data, 0x2E)
+        sh_fmt, sym_fmt, sym_size = end + "IIIIIIIIII", end + "IIIBBH", 16
+
+    headers = []
+    for i in range(shnum):
+        name, kind, flags, _addr, offset, size, link, _info, _align, _entsize = \
+            struct.unpack_from(sh_fmt, data, shoff + i * shentsize)
+        headers.append((name, kind, flags, offset, size, link))
+    strtab_off = headers[shstrndx][3]
+
+    def cstr(base: int, at: int) -> str:
+        stop = data.index(b"\0", base + at)
+        return data[base + at:stop].decode("utf-8", "replace")
+
+    sections, region_of = {}, {}
+    flash = ram = 0
+    for i, (name, kind, flags, _offset, size, _link) in enumerate(headers):
+        if not flags & SHF_ALLOC or not size:
+            continue
+        sname = cstr(strtab_off, name)
+        sections[sname] = sections.get(sname, 0) + size
+        if kind == SHT_NOBITS:                 # .bss, heap/stack: RAM only
+            ram += size
+            region_of[i] = "ram"
+        elif flags & SHF_WRITE:                # .data: initialiser in flash, copy in RAM
+            flash += size
+            ram += size
+            region_of[i] = "ram"
+        else:
+            flash += size
+            region_of[i] = "flash"
+
+    symbols: dict[str, tuple[str, int]] = {}
+    linker: dict[str, int] = {}
+    for _name, kind, _flags, offset, size, link in headers:
+        if kind != SHT_SYMTAB:
+            continue
+        names_off = headers[link][3]
+        for at in range(offset, offset + size, sym_size):
+            if is64:
+                st_name, st_info, _other, st_shndx, value, st_size = struct.unpack_from(sym_fmt, data, at)
+            else:
+                st_name, value, st_size, st_info, _other, st_shndx = struct.unpack_from(sym_fmt, data, at)
+            if st_name and not st_size and cstr(names_off, st_name) in LINKER_SYMBOLS:
+                linker[cstr(names_off, st_name)] = value
+            if st_size == 0 or st_info & 0xF not in (STT_OBJECT, STT_FUNC) or st_shndx not in region_of:
+                continue
+            sym = cstr(names_off, st_name)
+            region = region_of[st_shndx]
+            # Same-named statics from different units: keep them apart.
+            key, n = sym, 2
+            while key in symbols:
+                key, n = f"{sym}#{n}", n + 1
+            symbols[key] = (region, st_size)
+    return SizeReport(sections, flash, ram, symbols, image=flash, linker=linker)
+
+
+def demangle(report: SizeReport, cxxfilt: str | None) -> None:
+    """Readable C++ names, in one c++filt call; left as-is without one."""
+    tool = cxxfilt or shutil.which("arm-none-eabi-c++filt") or shutil.which("c++filt")
+    if not tool or not report.symbols:
+        return
+    keys = list(report.symbols)
+    try:
+        out = subprocess.run([tool], input="\n".join(keys) + "\n", capture_output=True,
+                             text=True, check=True, timeout=30).stdout.splitlines()
+    except (OSError, subprocess.SubprocessError):
+        return
+    if len(out) == len(keys):
+        report.symbols = {new: report.symbols[old] for old, new in zip(keys, out)}
+
+
+# --- project facts ---------------------------------------------------------------
+
+def ota_cap(root: str = ROOT) -> int:
+    """FLASH_OTA_MAX_IMAGE_SIZE, worked out from include/flash_layout.h."""
+    text = open(os.path.join(root, "include", "flash_layout.h"), encoding="utf-8").read()
+
+    def define(name: str) -> int:
+        return int(re.search(rf"#define {name}\s+(0x[0-9A-Fa-f]+|\d+)u?", text).group(1), 0)
+    return define("FLASH_STAGING_IMAGE_PAGES") * define("FLASH_LAYOUT_PAGE_SIZE")
+
+
+def build_meta(root: str = ROOT) -> dict:
+    meta = {"time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    try:
+        text = open(os.path.join(root, "include", "version.h"), encoding="utf-8").read()
+        meta["fw"] = int(re.search(r"#define FW_VERSION\s+(\d+)", text).group(1))
+    except (OSError, AttributeError):
+        pass
+    try:
+        rev = subprocess.run(["git", "-C", root, "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=10).stdout.strip()
+        dirty = subprocess.run(["git", "-C", root, "status", "--porcelain", "-uno"],
+                               capture_output=True, text=True, timeout=10).stdout.strip()
+        if rev:
+            meta["git"] = rev + ("+" if dirty else "")
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return meta
+
+
+# --- history ---------------------------------------------------------------------
+
+def history_paths(history_dir: str, env_name: str) -> tuple[str, str]:
+    return (os.path.join(history_dir, f"{env_name}.jsonl"),
+            os.path.join(history_dir, f"{env_name}.symbols.json"))
+
+
+def load_previous(history_dir: str, env_name: str) -> tuple[dict | None, dict]:
+    """The last history line and the last build's full symbol table."""
+    lines_path, symbols_path = history_paths(history_dir, env_name)
+    last = None
+    if os.path.exists(lines_path):
+        with open(lines_path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    last = json.loads(line)
+    symbols = {}
+    if os.path.exists(symbols_path):
+        with open(symbols_path, encoding="utf-8") as fh:
+            symbols = {k: tuple(v) for k, v in json.load(fh).items()}
+    return last, symbols
+
+
+def record(history_dir: str, env_name: str, report: SizeReport, status: str) -> None:
+    os.makedirs(history_dir, exist_ok=True)
+    lines_path, symbols_path = history_paths(history_dir, env_name)
+    top = {}
+    for region in ("flash", "ram"):
+        ranked = sorted(((size, name) for name, (r, size) in report.symbols.items() if r == region),
+                        reverse=True)[:TOP_N]
+        top[region] = [[name, size] for size, name in ranked]
+    entry = {**report.meta, "image": report.image, "flash": report.flash, "ram": report.ram,
+             "sections": report.sections, "top": top, "status": status}
+    with open(lines_path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    with open(symbols_path, "w", encoding="utf-8") as fh:
+        json.dump(report.symbols, fh, separators=(",", ":"))
+
+
+# --- report ----------------------------------------------------------------------
+
+def symbol_diff(old: dict, new: dict) -> list[tuple[int, str, str, str]]:
+    """(delta, region, name, tag) for every symbol that moved >= DIFF_MIN_BYTES."""
+    rows = []
+    for name in set(old) | set(new):
+        o, n = old.get(name), new.get(name)
+        before, after = (o[1] if o else 0), (n[1] if n else 0)
+        delta = after - before
+        if abs(delta) >= DIFF_MIN_BYTES:
+            tag = "new" if not o else "gone" if not n else ""
+            rows.append((delta, (n or o)[0], name, tag))
+    rows.sort(key=lambda r: (-abs(r[0]), r[2]))
+    return rows
+
+
+def evaluate(report: SizeReport, previous: dict | None, prev_symbols: dict,
+             cap: int, ram_total: int, limits: Limits, out=print) -> tuple[list[str], list[str]]:
+    """Print the size summary and diff; return (warnings, failures)."""
+    warnings, failures = [], []
+    headroom = cap - report.image
+    ram_pct = f" ({report.ram * 100 / ram_total:.1f}% of {ram_total:,})" if ram_total else ""
+    out(f"size: image {report.image:,} B / OTA cap {cap:,} (headroom {headroom:,} B), "
+        f"RAM {report.ram:,} B{ram_pct}")
+    out("  sections: " + "  ".join(f"{k} {v:,}" for k, v in report.sections.items()))
+
+    def gate(value: int, warn: int, fail: int, message: str, above: bool) -> None:
+        hit = (lambda limit: limit and (value > limit if above else value < limit))
+        if hit(fail):
+            failures.append(f"{message} (limit {fail:,} B)")
+        elif hit(warn):
+            warnings.append(f"{message} (warn at {warn:,} B)")
+
+    gate(headroom, limits.ota_margin_warn, limits.ota_margin_fail,
+         f"only {headroom:,} B left under the OTA cap", above=False)
+    if previous:
+        d_image, d_ram = report.image - previous["image"], report.ram - previous["ram"]
+        out(f"  vs previous build ({previous.get('git', '?')}, {previous.get('time', '?')}): "
+            f"image {d_image:+,} B, RAM {d_ram:+,} B")
+        moved = [f"{k} {report.sections.get(k, 0) - previous['sections'].get(k, 0):+,}"
+                 for k in sorted(set(report.sections) | set(previous["sections"]))
+                 if report.sections.get(k, 0) != previous["sections"].get(k, 0)]
+        if moved:
+            out("  sections moved: " + "  ".join(moved))
+        rows = symbol_diff(prev_symbols, report.symbols)
+        if rows:
+            out(f"  symbols (|delta| >= {DIFF_MIN_BYTES} B, {min(len(rows), DIFF_LINES)} of {len(rows)}):")
+            for delta, region, name, tag in rows[:DIFF_LINES]:
+                out(f"    {delta:+7,}  {region:<5} {name}" + (f"  [{tag}]" if tag else ""))
+        gate(d_image, limits.image_growth_warn, limits.image_growth_fail,
+             f"image grew {d_image:,} B in one build", above=True)
+        gate(d_ram, limits.ram_growth_warn, limits.ram_growth_fail,
+             f"RAM grew {d_ram:,} B in one build", above=True)
+    else:
+        out("  (no previous build recorded: this one becomes the baseline)")
+    return warnings, failures
+
+
+def run(elf: str, *, bin_path: str | None = None, history_dir: str | None = None,
+        env_name: str = "firmware", limits: Limits = Limits(), ram_total: int = 0,
+        cxxfilt: str | None = None, out=print) -> tuple[list[str], list[str]]:
+    """Measure, compare against the last record, record (when history_dir is
+    given). Returns (warnings, failures); the caller decides what fails."""
+    report = read_elf(elf)
+    if bin_path and os.path.exists(bin_path):
+        report.image = os.path.getsize(bin_path)
+    report.meta = build_meta()
+    demangle(report, cxxfilt)
+    previous, prev_symbols = load_previous(history_dir, env_name) if history_dir else (None, {})
+    warnings, failures = evaluate(report, previous, prev_symbols, ota_cap(), ram_total, limits, out)
+    if history_dir:
+        record(history_dir, env_name, report, "fail" if failures else "warn" if warnings else "ok")
+    return warnings, failures
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("elf")
+    ap.add_argument("--bin", help="firmware.bin (default: next to the ELF)")
+    ap.add_argument("--env", help="history name (default: the build directory's name)")
+    ap.add_argument("--history", default=os.path.join(ROOT, ".pio", "size_history"))
+    ap.add_argument("--no-record", action="store_true", help="compare only, leave the history alone")
+    ap.add_argument("--ram", type=int, default=36 * 1024, help="RAM size for the percentage")
+    for name, default in vars(Limits()).items():
+        ap.add_argument("--" + name.replace("_", "-"), type=int, default=default, metavar="B")
+    args = ap.parse_args()
+
+    limits = Limits(**{k: getattr(args, k) for k in vars(Limits())})
+    bin_path = args.bin or os.path.join(os.path.dirname(args.elf), "firmware.bin")
+    env_name = args.env or os.path.basename(os.path.dirname(os.path.abspath(args.elf)))
+    warnings, failures = run(args.elf, bin_path=bin_path, env_name=env_name, limits=limits,
+                             history_dir=None if args.no_record else args.history,
+                             ram_total=args.ram)
+    for w in warnings:
+        print("WARN", w)
+    for f in failures:
+        print("FAIL", f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,8 @@ LGS Standard Module (R5.0) - Modbus RTU serial sweep tester
 Connects to the board over a USB-to-RS485 adapter (a COM port) and exercises
 the whole R5.0 Modbus address set defined in src/svc/modbus_map.h, logging every
 transaction to a CSV under logs/. This is the on-hardware "golden-log" gate that
-doc/ARCHITECTURE.md asks for.
+doc/ARCHITECTURE.md asks for; tools/compare_sweeps.py compares two such logs
+(value changes, new exceptions, latency shifts per address).
 
 Phases (run in order):
   1. CONNECT   - open the port, auto-discover the slave ID (or use --id)
@@ -28,45 +29,43 @@ would reboot the board or drop it off the bus mid-sweep. The latch coils fire a
 real solenoid and are gated behind a confirmation prompt (skip with --yes,
 disable with --no-latch).
 
-Requirements: pymodbus>=3.7, pyserial>=3.5  (installed in the conda base env).
+Transactions go through tools/lgs_client: reads are planned into block FC03s
+(one per feature block instead of one per register), snapshots and restores
+of the preset blocks are one FC03 and one FC16, and the transport keeps the
+RS485 inter-frame gap, so the per-transaction sleeps are gone.
+
+Requirements: pyserial>=3.5  (installed in the conda base env).
 
 Usage (Windows / conda base):
   & "$env:USERPROFILE\\miniconda3\\python.exe" tools/test_modbus_rtu.py --list-ports
   & "$env:USERPROFILE\\miniconda3\\python.exe" tools/test_modbus_rtu.py --port COM30
   & "$env:USERPROFILE\\miniconda3\\python.exe" tools/test_modbus_rtu.py --port COM30 --id 247 --no-latch
   & "$env:USERPROFILE\\miniconda3\\python.exe" tools/test_modbus_rtu.py --port COM30 --yes --loops 3
+  & "$env:USERPROFILE\\miniconda3\\python.exe" tools/test_modbus_rtu.py --port COM30 --capture sweep.lgscap
 """
 
 import argparse
 import csv
-import logging
 import os
 import sys
 import time
 from datetime import datetime
 
-try:
-    from pymodbus.client import ModbusSerialClient
-except ImportError:
-    print("Error: pymodbus not installed.  Run:  pip install pymodbus pyserial")
-    sys.exit(1)
+from lgs_client import LgsClient, LgsError, SerialTransport, plan_reads
+from lgs_client import regmap as rm
 
 try:
     from serial.tools import list_ports
 except ImportError:
     list_ports = None
 
-# Keep pymodbus from flooding the console; we do our own reporting. (CRITICAL
-# hides the per-timeout "No response received" spam during an ID scan.)
-logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
-
 # --------------------------------------------------------------------------- #
-# R5.0 address map - mirrors src/svc/modbus_map.h (the firmware SSOT).
-# Keep in lock-step with that header: one row here per address there.
+# R5.0 address map - names and decoders for the sweep. The addresses mirror
+# src/svc/modbus_map.h (the firmware SSOT) through lgs_client/regmap.py.
 # --------------------------------------------------------------------------- #
 
-DEVICE_TYPES = {10: "STANDARD", 20: "NARCOTIC", 30: "LITE", 40: "DELIVERY"}
-BAUD_WHITELIST = (9600, 19200, 38400, 57600)
+DEVICE_TYPES = rm.DEVICE_TYPES
+BAUD_WHITELIST = rm.BAUD_RATES
 
 
 def dec_plain(raw, unit=""):
@@ -136,6 +135,7 @@ REGISTERS = [
     (41,  "Latch Locked",         "",    dec_plain),
     (60,  "Display Number",       "",    dec_plain),
     (80,  "Unlock Delay",         "ms",  dec_plain),
+    (82,  "Group Membership",     "",    dec_plain),
     (190, "Global Brightness",    "%",   dec_plain),
     (194, "Global Max On-Time",   "s",   dec_plain),
     (200, "Total LED On Count",   "",    dec_plain),
@@ -167,6 +167,20 @@ for _n in range(1, 9):
     REGISTERS.append((421 + 4 * (_n - 1), f"S2 Preset {_n} On Count (lo)", "", dec_plain))
     REGISTERS.append((422 + 4 * (_n - 1), f"S2 Preset {_n} On Time (hi)", "s", dec_plain))
     REGISTERS.append((423 + 4 * (_n - 1), f"S2 Preset {_n} On Time (lo)", "s", dec_plain))
+
+# Loop profile (460-547, R5.0-new): per tick-pipeline stage max (u32 hi/lo)
+# and rolling average in microseconds; the histograms are left to the bench.
+REGISTERS.append((460, "Profile Loops (hi)", "", dec_plain))
+REGISTERS.append((461, "Profile Loops (lo)", "", dec_plain))
+for _s, _stage in enumerate(["Modbus", "Latch", "LED", "OTA", "Diag", "Mode", "Loop"]):
+    REGISTERS.append((464 + 12 * _s, f"Profile {_stage} Max (hi)", "us", dec_plain))
+    REGISTERS.append((465 + 12 * _s, f"Profile {_stage} Max (lo)", "us", dec_plain))
+    REGISTERS.append((466 + 12 * _s, f"Profile {_stage} Avg", "us", dec_plain))
+
+# Latch timing (810-839, R5.0-new): the most recent sample of each pulse
+# histogram (0xFFFF on 820: the latch did not open); buckets to the bench.
+for _h, _hname in enumerate(["Energize Lateness", "Open Time", "Pulse Width"]):
+    REGISTERS.append((810 + 10 * _h, f"Latch {_hname} (last)", "ms", dec_plain))
 REGISTERS.sort(key=lambda r: r[0])
 
 # Coils (FC01 read / FC05 write). danger: excluded from every write path.
@@ -180,6 +194,7 @@ COILS = [
     (509,  "Identify (blink white 5s)",   False),
     (510,  "Clear Statistics",            False),
     (511,  "All Off (ring + display)",    False),
+    (512,  "Reset Loop Profile",          False),
     (1010, "Display Enable",              False),
     (1019, "Latch Force Trigger",         False),  # gated separately (physical)
     (1020, "Latch Trigger (Safety)",      False),  # gated separately (physical)
@@ -200,6 +215,7 @@ COILS.sort(key=lambda c: c[0])
 WRITE_TESTS = [
     (60,  "Display Number",       45, 60),   # in-range; the >99 clamp is checked in the DISPLAY phase
     (80,  "Unlock Delay",        250, 80),
+    (82,  "Group Membership",      5, 82),
     (110, "LED Brightness",       50, 110),
     (111, "LED Red",              11, 111),
     (112, "LED Green",            22, 112),
@@ -220,7 +236,7 @@ STATE_COILS = [
 ]
 
 LATCH_COOLDOWN_S = 2.2   # firmware enforces >=2000 ms between unlock pulses
-INTER_TXN_S = 0.025      # small RS485 breather between transactions
+INTER_TXN_S = 0.025      # RS485 breather between transactions (the transport's gap)
 
 # --------------------------------------------------------------------------- #
 # Counters + CSV logging
@@ -258,43 +274,36 @@ def log_row(writer, loop, phase, fc, addr, name, op, raw, decoded,
 
 
 # --------------------------------------------------------------------------- #
-# Transaction wrappers - always return (ok, value, latency_ms, note)
+# Transaction wrappers - always return (ok, value, latency_ms, note).
+# `client` is an lgs_client.LgsClient bound to the slave ID under test.
 # --------------------------------------------------------------------------- #
 
 def _timed(fn):
     t = time.time()
     try:
-        rsp = fn()
-    except Exception as exc:                      # noqa: BLE001 - report anything
-        return None, (time.time() - t) * 1000.0, f"EXC {type(exc).__name__}: {exc}"
-    dt = (time.time() - t) * 1000.0
-    if rsp is None or rsp.isError():
-        return None, dt, f"ERR {rsp}"
-    return rsp, dt, ""
+        value = fn()
+    except LgsError as exc:
+        return False, None, (time.time() - t) * 1000.0, f"ERR {exc}"
+    return True, value, (time.time() - t) * 1000.0, ""
 
 
-def read_reg(client, addr, unit):
-    rsp, dt, note = _timed(lambda: client.read_holding_registers(addr, count=1, device_id=unit))
-    if rsp is None:
-        return False, None, dt, note
-    return True, rsp.registers[0], dt, ""
+def read_reg(client, addr):
+    return _timed(lambda: client.read_register(addr))
 
 
-def read_coil(client, addr, unit):
-    rsp, dt, note = _timed(lambda: client.read_coils(addr, count=1, device_id=unit))
-    if rsp is None:
-        return False, None, dt, note
-    return True, 1 if rsp.bits[0] else 0, dt, ""
+def read_coil(client, addr):
+    ok, val, dt, note = _timed(lambda: client.read_coil(addr))
+    return ok, (int(val) if ok else None), dt, note
 
 
-def write_reg(client, addr, value, unit):
-    rsp, dt, note = _timed(lambda: client.write_register(addr, value, device_id=unit))
-    return (rsp is not None), dt, note
+def write_reg(client, addr, value):
+    ok, _val, dt, note = _timed(lambda: client.write_register(addr, value))
+    return ok, dt, note
 
 
-def write_coil(client, addr, value, unit):
-    rsp, dt, note = _timed(lambda: client.write_coil(addr, bool(value), device_id=unit))
-    return (rsp is not None), dt, note
+def write_coil(client, addr, value):
+    ok, _val, dt, note = _timed(lambda: client.write_coil(addr, bool(value)))
+    return ok, dt, note
 
 
 # --------------------------------------------------------------------------- #
@@ -316,27 +325,25 @@ def list_serial_ports():
 def discover_id(port, baud, candidates, scan_timeout=0.25):
     """Probe reg 0 (device type) across candidate IDs; return the first responder.
 
-    Uses a FRESH client per probe (open -> read -> close). A persistent pymodbus
-    client wedges its transaction state after the first no-response and then
-    misses even a valid ID; a fresh client sidesteps that. retries=0 keeps each
-    miss to a single timeout so a full 1..247 sweep stays quick.
+    One port for the whole scan: the transport flushes any late reply before
+    each probe, so a no-response cannot wedge the next one. retries=0 keeps
+    each miss to a single timeout so a full 1..247 sweep stays quick.
     """
     print(f"  scanning IDs on {port} @ {baud} 8N1 (probe reg 0)...")
-    for i, uid in enumerate(candidates):
-        c = ModbusSerialClient(port=port, baudrate=baud, bytesize=8,
-                               parity="N", stopbits=1, timeout=scan_timeout, retries=0)
-        if not c.connect():
-            print(f"  [ERR] cannot open {port} @ {baud} for scan")
-            return None
-        ok, val, _dt, _note = read_reg(c, 0, uid)
-        c.close()
-        if ok:
-            dtype = DEVICE_TYPES.get(val, "?")
-            print(f"  [OK] ID {uid} responded  (Device Type {val} = {dtype})")
-            return uid
-        if i and i % 25 == 0:
-            print(f"  ...probed {i}/{len(candidates)}")
-        time.sleep(0.02)   # let the OS release the port between opens
+    try:
+        bus = SerialTransport(port, baud, timeout=scan_timeout, retries=0, gap_s=INTER_TXN_S)
+    except LgsError as exc:
+        print(f"  [ERR] {exc}")
+        return None
+    with bus:
+        for i, uid in enumerate(candidates):
+            ok, val, _dt, _note = read_reg(LgsClient(bus, uid), rm.REG_DEVICE_TYPE)
+            if ok:
+                dtype = DEVICE_TYPES.get(val, "?")
+                print(f"  [OK] ID {uid} responded  (Device Type {val} = {dtype})")
+                return uid
+            if i and i % 25 == 0:
+                print(f"  ...probed {i}/{len(candidates)}")
     return None
 
 
@@ -355,61 +362,114 @@ def banner(title):
     print("=" * 72)
 
 
-def phase_read(client, unit, loop, writer, stats):
-    banner("PHASE 2 - READ SWEEP (holding registers + coil states)")
+def _sweep_blocks(read_map, addrs, fences):
+    """{addr: (value | None, block latency ms, note)} - one timed transaction
+    group per planned block, so the CSV still shows what each read cost."""
+    out = {}
+    for first, count in plan_reads(addrs, fences=fences):
+        block = [a for a in addrs if first <= a < first + count]
+        ok, values, dt, note = _timed(lambda: read_map(block))
+        tag = f"block {first}+{count}"
+        for a in block:
+            v = values.get(a) if ok else None
+            out[a] = (v, dt, tag if v is not None else (note or f"ERR exception 02 ({tag})"))
+    return out
+
+
+def phase_read(client, loop, writer, stats):
+    banner("PHASE 2 - READ SWEEP (holding registers + coil states, block reads)")
     print(f"  {'Addr':>5}  {'Name':<22} {'Value (decoded)':<34} {'ms':>6}")
     print("  " + "-" * 70)
+    regs = _sweep_blocks(client.read_map, [r[0] for r in REGISTERS], rm.READ_FENCES)
     for addr, name, unit_s, decoder in REGISTERS:
-        ok, val, dt, note = read_reg(client, addr, unit)
-        if ok:
+        val, dt, note = regs[addr]
+        if val is not None:
             decoded = decoder(val, unit_s)
             print(f"  {addr:>5}  {name:<22} {decoded:<34} {dt:>6.1f}  [OK]")
-            log_row(writer, loop, "READ", 3, addr, name, "read", val, decoded, "", "OK", dt)
+            log_row(writer, loop, "READ", 3, addr, name, "read", val, decoded, "", "OK", dt, note)
             stats.add("OK")
         else:
             print(f"  {addr:>5}  {name:<22} {'<no reply>':<34} {dt:>6.1f}  [ERR] {note}")
             log_row(writer, loop, "READ", 3, addr, name, "read", "", "", "", "ERR", dt, note)
             stats.add("ERR")
-        time.sleep(INTER_TXN_S)
 
     print()
+    coils = _sweep_blocks(client.read_coil_map, [c[0] for c in COILS], ())
     for addr, name, _danger in COILS:
-        ok, val, dt, note = read_coil(client, addr, unit)
-        if ok:
+        val, dt, note = coils[addr]
+        if val is not None:
+            val = int(val)
             print(f"  {addr:>5}  {name:<28} state={val}   {dt:>6.1f}  [OK]")
-            log_row(writer, loop, "READ", 1, addr, name, "read", val, f"coil={val}", "", "OK", dt)
+            log_row(writer, loop, "READ", 1, addr, name, "read", val, f"coil={val}", "", "OK", dt, note)
             stats.add("OK")
         else:
             print(f"  {addr:>5}  {name:<28} <no reply>  {dt:>6.1f}  [ERR] {note}")
             log_row(writer, loop, "READ", 1, addr, name, "read", "", "", "", "ERR", dt, note)
             stats.add("ERR")
-        time.sleep(INTER_TXN_S)
 
 
-def _read_reg_val(client, addr, unit):
-    ok, val, _dt, _note = read_reg(client, addr, unit)
+def _read_reg_val(client, addr):
+    ok, val, _dt, _note = read_reg(client, addr)
     return val if ok else None
 
 
-def phase_write(client, unit, loop, writer, stats):
+def _read_map_vals(client, addrs):
+    """{addr: value | None} in block reads; all None if the device is silent."""
+    try:
+        return client.read_map(addrs)
+    except LgsError:
+        return {a: None for a in addrs}
+
+
+def _restore(client, original):
+    """Write a snapshot back - adjacent registers as one FC16."""
+    try:
+        with client.batch() as b:
+            for a, v in original.items():
+                if v is not None:
+                    b.write(a, v)
+    except LgsError as exc:
+        print(f"  [ERR] restore: {exc}")
+
+
+def _read_preset_regs(client):
+    """Registers 110-184 in one FC03 ({} if the device is silent)."""
+    try:
+        return client.preset_registers()
+    except LgsError:
+        return {}
+
+
+def _restore_presets(client, snapshot, addrs):
+    """Write addrs back from a preset_registers() snapshot: one FC16, the
+    fields in between re-written with the values they already hold."""
+    if not snapshot:
+        return
+    try:
+        with client.batch(fill=snapshot) as b:
+            for a in addrs:
+                b.write(a, snapshot[a])
+    except LgsError as exc:
+        print(f"  [ERR] preset restore: {exc}")
+
+
+def phase_write(client, loop, writer, stats):
     banner("PHASE 3 - WRITE / VERIFY / RESTORE (safe registers + state coils)")
 
     # Snapshot every target register up-front so restores are exact even for the
     # fan-out pairs (190->110, 194->114) that share a target.
     targets = sorted({vaddr for _, _, _, vaddr in WRITE_TESTS} |
                      {addr for addr, _, _, _ in WRITE_TESTS if addr not in (190, 194)})
-    original = {a: _read_reg_val(client, a, unit) for a in targets}
+    original = _read_map_vals(client, targets)
 
     for addr, name, test_val, vaddr in WRITE_TESTS:
-        wok, dt, note = write_reg(client, addr, test_val, unit)
+        wok, dt, note = write_reg(client, addr, test_val)
         if not wok:
             print(f"  {addr:>5}  {name:<22} write {test_val:<6} [ERR] {note}")
             log_row(writer, loop, "WRITE", 6, addr, name, "write", test_val, "", test_val, "ERR", dt, note)
             stats.add("ERR")
-            time.sleep(INTER_TXN_S)
             continue
-        time.sleep(INTER_TXN_S)
-        rok, rb, dt2, note2 = read_reg(client, vaddr, unit)
+        rok, rb, dt2, note2 = read_reg(client, vaddr)
         if not rok:
             print(f"  {addr:>5}  {name:<22} write {test_val:<6} readback [ERR] {note2}")
             log_row(writer, loop, "WRITE", 3, vaddr, name, "verify", "", "", test_val, "ERR", dt2, note2)
@@ -423,23 +483,18 @@ def phase_write(client, unit, loop, writer, stats):
             print(f"  {addr:>5}  {name:<22} write {test_val:<6} readback={rb}  [FAIL] expected {test_val}")
             log_row(writer, loop, "WRITE", 3, vaddr, name, "verify", rb, "mismatch", test_val, "FAIL", dt2)
             stats.add("FAIL")
-        time.sleep(INTER_TXN_S)
 
     # Restore originals (targets last-writer-wins is fine; we restore all).
-    for a in targets:
-        if original[a] is not None:
-            write_reg(client, a, original[a], unit)
-            time.sleep(INTER_TXN_S)
+    _restore(client, original)
     print(f"  restored registers: {', '.join(str(a) for a in targets)}")
 
     # State coils: toggle to a known value, verify, restore.
     print()
     for addr, name in STATE_COILS:
-        ok0, orig, _dt, _n = read_coil(client, addr, unit)
+        ok0, orig, _dt, _n = read_coil(client, addr)
         target = 0 if (ok0 and orig == 1) else 1
-        wok, dt, note = write_coil(client, addr, target, unit)
-        time.sleep(INTER_TXN_S)
-        rok, rb, dt2, note2 = read_coil(client, addr, unit)
+        wok, dt, note = write_coil(client, addr, target)
+        rok, rb, dt2, note2 = read_coil(client, addr)
         if wok and rok and rb == target:
             print(f"  {addr:>5}  {name:<28} set {target} readback={rb}  [OK]")
             log_row(writer, loop, "WRITE", 1, addr, name, "coil-verify", rb, f"coil={rb}", target, "OK", dt2)
@@ -454,8 +509,7 @@ def phase_write(client, unit, loop, writer, stats):
             stats.add("FAIL")
         # restore
         if ok0:
-            write_coil(client, addr, orig, unit)
-            time.sleep(INTER_TXN_S)
+            write_coil(client, addr, orig)
 
 
 def _check(cond, label, writer, loop, phase, fc, addr, name, raw, expected, stats):
@@ -465,73 +519,69 @@ def _check(cond, label, writer, loop, phase, fc, addr, name, raw, expected, stat
     stats.add(result)
 
 
-def phase_validate(client, unit, loop, writer, stats):
+def phase_validate(client, loop, writer, stats):
     """Write-range guards: bad values must be rejected/clamped ON THE WIRE."""
     banner("PHASE 3.5 - VALIDATION (range guards; includes one persist+reboot)")
 
     # -- reg 80: clamp+reflect immediately (watch-based)
-    orig80 = _read_reg_val(client, 80, unit)
-    write_reg(client, 80, 9000, unit); time.sleep(0.1)
-    rb = _read_reg_val(client, 80, unit)
+    orig80 = _read_reg_val(client, 80)
+    write_reg(client, 80, 9000); time.sleep(0.1)
+    rb = _read_reg_val(client, 80)
     _check(rb == 8000, f"reg 80 = 9000 clamps to 8000 (readback {rb})",
            writer, loop, "VALIDATE", 3, 80, "Unlock Delay", rb, 8000, stats)
-    write_reg(client, 80, orig80 if orig80 is not None else 0, unit); time.sleep(INTER_TXN_S)
-
-    # -- reg 190: clamp + fan-out the clamped value (not silently ignored)
-    origb = {n: _read_reg_val(client, 100 + 10 * n, unit) for n in range(1, 9)}
-    write_reg(client, 190, 150, unit); time.sleep(0.1)
-    rb190 = _read_reg_val(client, 190, unit)
-    rb110 = _read_reg_val(client, 110, unit)
+    write_reg(client, 80, orig80 if orig80 is not None else 0)
+
+    # -- reg 190: clamp + fan-out the clamped value (not silently ignored).
+    #    Snapshot and restore the preset blocks in one FC03 + one FC16.
+    presets = _read_preset_regs(client)
+    origb = {n: presets.get(rm.reg_preset(n)) for n in range(1, 9)}
+    write_reg(client, 190, 150); time.sleep(0.1)
+    rb190 = _read_reg_val(client, 190)
+    rb110 = _read_reg_val(client, 110)
     _check(rb190 == 100 and rb110 == 100,
            f"reg 190 = 150 clamps to 100 + fans out (190={rb190}, 110={rb110})",
            writer, loop, "VALIDATE", 3, 190, "Global Brightness", rb190, 100, stats)
-    for n in range(1, 9):
-        if origb[n] is not None:
-            write_reg(client, 100 + 10 * n, origb[n], unit); time.sleep(INTER_TXN_S)
+    _restore_presets(client, presets, [rm.reg_preset(n) for n in range(1, 9)])
 
     # -- coil 500 alone: must self-clear, must NOT reset or factory-reset
-    write_reg(client, 60, 42, unit); time.sleep(INTER_TXN_S)  # volatile reboot canary
-    write_coil(client, 500, 1, unit); time.sleep(0.5)
-    _ok, c500, _dt, _n = read_coil(client, 500, unit)
-    canary = _read_reg_val(client, 60, unit)
+    write_reg(client, 60, 42)  # volatile reboot canary
+    write_coil(client, 500, 1); time.sleep(0.5)
+    _ok, c500, _dt, _n = read_coil(client, 500)
+    canary = _read_reg_val(client, 60)
     _check(c500 == 0, f"coil 500 without 501/502 self-clears (readback {c500})",
            writer, loop, "VALIDATE", 1, 500, "Factory Reset (arm)", c500, 0, stats)
     _check(canary == 42, f"...and the device did not reset (reg 60 canary {canary})",
            writer, loop, "VALIDATE", 3, 60, "Display Number", canary, 42, stats)
-    write_reg(client, 60, 0, unit); time.sleep(INTER_TXN_S)
+    write_reg(client, 60, 0)
 
     # -- coil 511 All Off: one command from any state to everything-off
-    write_coil(client, 1003, 1, unit); time.sleep(INTER_TXN_S)
-    write_coil(client, 1010, 1, unit); time.sleep(INTER_TXN_S)
-    write_coil(client, 511, 1, unit); time.sleep(0.3)
-    _ok, c1003, _dt, _n = read_coil(client, 1003, unit)
-    _ok, c1010, _dt, _n = read_coil(client, 1010, unit)
+    write_coil(client, 1003, 1)
+    write_coil(client, 1010, 1)
+    write_coil(client, 511, 1); time.sleep(0.3)
+    _ok, c1003, _dt, _n = read_coil(client, 1003)
+    _ok, c1010, _dt, _n = read_coil(client, 1010)
     _check(c1003 == 0 and c1010 == 0,
            f"coil 511 All Off cleared ring+display (1003={c1003}, 1010={c1010})",
            writer, loop, "VALIDATE", 1, 511, "All Off", c1003, 0, stats)
 
     # -- coil 509 Identify: self-clears; ring blinks white ~5s (visual)
-    write_coil(client, 509, 1, unit); time.sleep(0.3)
-    _ok, c509, _dt, _n = read_coil(client, 509, unit)
+    write_coil(client, 509, 1); time.sleep(0.3)
+    _ok, c509, _dt, _n = read_coil(client, 509)
     _check(c509 == 0, "coil 509 Identify accepted + self-cleared (ring blinks WHITE ~5s)",
            writer, loop, "VALIDATE", 1, 509, "Identify", c509, 0, stats)
 
     # -- coil 510 Clear Statistics: counters read zero afterwards.
     #    On fw >= v3.3.0 the v2 block (latch fires 404/405, presses 406/407,
     #    per-preset 420+) must clear too while Boot Count (reg 7) survives.
-    boots_before = _read_reg_val(client, 7, unit)
-    write_coil(client, 510, 1, unit); time.sleep(0.5)
-    rb210 = _read_reg_val(client, 210, unit)
-    rb200 = _read_reg_val(client, 200, unit)
+    boots_before = _read_reg_val(client, 7)
+    write_coil(client, 510, 1); time.sleep(0.5)
+    after = _read_map_vals(client, [7, 200, 210, 404, 405, 406, 407, 420])
+    rb210, rb200 = after[210], after[200]
     _check(rb210 == 0 and rb200 == 0,
            f"coil 510 cleared the statistics (210={rb210}, 200={rb200})",
            writer, loop, "VALIDATE", 3, 210, "LED 1 On Count", rb210, 0, stats)
-    rb404 = _read_reg_val(client, 404, unit)
-    rb405 = _read_reg_val(client, 405, unit)
-    rb406 = _read_reg_val(client, 406, unit)
-    rb407 = _read_reg_val(client, 407, unit)
-    rb420 = _read_reg_val(client, 420, unit)
-    boots_after = _read_reg_val(client, 7, unit)
+    rb404, rb405, rb406, rb407, rb420 = (after[a] for a in (404, 405, 406, 407, 420))
+    boots_after = after[7]
     if rb404 is None:
         print("  (fw < v3.3.0: no Statistics v2 block - exception 02 as expected, skipping)")
     else:
@@ -541,23 +591,40 @@ def phase_validate(client, unit, loop, writer, stats):
         _check(boots_after == boots_before,
                f"coil 510 kept Boot Count (before={boots_before}, after={boots_after})",
                writer, loop, "VALIDATE", 3, 7, "Boot Count", boots_after, boots_before, stats)
+    timing = _read_map_vals(client, [812 + 10 * h + b for h in range(3) for b in range(8)])
+    if None in timing.values():
+        print("  (no latch-timing block - exception 02 as expected, skipping)")
+    else:
+        counts = sum(timing.values())
+        _check(counts == 0, f"coil 510 cleared the latch timing histograms ({counts} pulses left)",
+               writer, loop, "VALIDATE", 3, 812, "Latch Energize Bucket 0", counts, 0, stats)
+
+    # -- coil 512 Reset Loop Profile: self-clears and restarts the loop count
+    #    (republished within a second; a second of loops fits the lo word).
+    #    Older builds answer exception 02.
+    if _read_reg_val(client, 460) is None:
+        print("  (no loop-profile block - exception 02 as expected, skipping)")
+    else:
+        write_coil(client, 512, 1); time.sleep(1.2)
+        _ok, c512, _dt, _n = read_coil(client, 512)
+        loops = _read_map_vals(client, [460, 461])
+        loops_hi, loops_lo = loops[460], loops[461]
+        _check(c512 == 0 and loops_hi == 0 and loops_lo,
+               f"coil 512 restarted the loop profile (loops {loops_hi}/{loops_lo})",
+               writer, loop, "VALIDATE", 1, 512, "Reset Loop Profile", loops_hi, 0, stats)
 
     # -- persist-path validation (reg 3 garbage, reg 4=246, preset clamp):
     #    needs coil 503 = persist + REBOOT. Two reboots total (test + restore).
-    orig3 = _read_reg_val(client, 3, unit)
-    orig4 = _read_reg_val(client, 4, unit)
-    write_reg(client, 3, 12345, unit); time.sleep(INTER_TXN_S)
-    write_reg(client, 4, 246, unit); time.sleep(INTER_TXN_S)
-    write_reg(client, 120, 999, unit); time.sleep(INTER_TXN_S)   # preset 2 brightness
+    ident = _read_map_vals(client, [3, 4])
+    orig3, orig4 = ident[3], ident[4]
+    with client.batch() as b:
+        b.write_many(3, [12345, 246])   # one FC16: a bad baud and the reserved ID
+    write_reg(client, 120, 999)   # preset 2 brightness
     print("  persisting via coil 503 (device reboots ~3s)...")
-    try:
-        client.write_coil(503, True, device_id=unit)
-    except Exception:
-        pass  # device resets before answering
+    client.persist()   # the device resets before answering
     time.sleep(4.0)
-    rb3 = _read_reg_val(client, 3, unit)
-    rb4 = _read_reg_val(client, 4, unit)
-    rb120 = _read_reg_val(client, 120, unit)
+    after = _read_map_vals(client, [3, 4, 120])
+    rb3, rb4, rb120 = after[3], after[4], after[120]
     _check(rb3 == orig3, f"reg 3 = 12345 rejected across persist (readback {rb3})",
            writer, loop, "VALIDATE", 3, 3, "Baud Rate", rb3, orig3, stats)
     _check(rb4 == orig4, f"reg 4 = 246 (SET_ID reserved) rejected (readback {rb4})",
@@ -565,33 +632,29 @@ def phase_validate(client, unit, loop, writer, stats):
     _check(rb120 == 100, f"preset brightness 999 clamped to 100 at persist (readback {rb120})",
            writer, loop, "VALIDATE", 3, 120, "Preset 2 Brightness", rb120, 100, stats)
     # restore preset 2 brightness and persist the clean value back
-    write_reg(client, 120, origb[2] if origb[2] is not None else 80, unit)
-    time.sleep(INTER_TXN_S)
+    write_reg(client, 120, origb[2] if origb[2] is not None else 80)
     print("  restoring + persisting via coil 503 (device reboots ~3s)...")
-    try:
-        client.write_coil(503, True, device_id=unit)
-    except Exception:
-        pass
+    client.persist()
     time.sleep(4.0)
-    rb120 = _read_reg_val(client, 120, unit)
+    rb120 = _read_reg_val(client, 120)
     _check(rb120 == (origb[2] if origb[2] is not None else 80),
            f"preset 2 brightness restored (readback {rb120})",
            writer, loop, "VALIDATE", 3, 120, "Preset 2 Brightness", rb120, origb[2], stats)
 
 
-def phase_preset(client, unit, loop, writer, stats):
+def phase_preset(client, loop, writer, stats):
     banner("PHASE 4 - LED PRESETS (radio switching; ring changes color)")
 
     # Radio: enable preset 1 (red), then preset 3 (blue) - 1001 must auto-clear.
-    write_coil(client, 1001, 1, unit); time.sleep(INTER_TXN_S)
-    _ok, c1, _dt, _n = read_coil(client, 1001, unit)
+    write_coil(client, 1001, 1)
+    _ok, c1, _dt, _n = read_coil(client, 1001)
     _check(c1 == 1, "enable 1001 -> coil 1001 reads 1 (ring red)", writer, loop,
            "PRESET", 1, 1001, "Enable Preset 1", c1, 1, stats)
     time.sleep(0.8)
 
-    write_coil(client, 1003, 1, unit); time.sleep(INTER_TXN_S)
-    _ok, c3, _dt, _n = read_coil(client, 1003, unit)
-    _ok, c1, _dt, _n = read_coil(client, 1001, unit)
+    write_coil(client, 1003, 1)
+    _ok, c3, _dt, _n = read_coil(client, 1003)
+    _ok, c1, _dt, _n = read_coil(client, 1001)
     _check(c3 == 1, "enable 1003 -> coil 1003 reads 1 (ring blue)", writer, loop,
            "PRESET", 1, 1003, "Enable Preset 3", c3, 1, stats)
     _check(c1 == 0, "radio: coil 1001 auto-cleared after enabling 1003", writer, loop,
@@ -601,77 +664,69 @@ def phase_preset(client, unit, loop, writer, stats):
     # Global fan-outs: 190 (brightness, offset +0) and 194 (max-on-time,
     # offset +4) must land in EVERY preset's register. Snapshot + restore all
     # 8 so no test state leaks into presets 2-8.
+    # One FC03 over 110-184 snapshots (and checks) all eight at once; the
+    # restore is one FC16 bridged over the untouched fields by the snapshot.
     for gaddr, gname, offset, test_val in ((190, "Global Brightness", 0, 37),
                                            (194, "Global Max On-Time", 4, 2400)):
-        orig = {}
-        for n in range(1, 9):
-            orig[n] = _read_reg_val(client, 100 + 10 * n + offset, unit)
-            time.sleep(INTER_TXN_S)
-        write_reg(client, gaddr, test_val, unit); time.sleep(INTER_TXN_S)
-        fanout_ok = True
-        for n in range(1, 9):
-            if _read_reg_val(client, 100 + 10 * n + offset, unit) != test_val:
-                fanout_ok = False
-            time.sleep(INTER_TXN_S)
+        targets = [rm.reg_preset(n) + offset for n in range(1, 9)]
+        orig = _read_preset_regs(client)
+        write_reg(client, gaddr, test_val)
+        now = _read_preset_regs(client)
+        fanout_ok = all(now.get(a) == test_val for a in targets)
         _check(fanout_ok, f"reg {gaddr} = {test_val} fanned out to all 8 preset regs", writer,
                loop, "PRESET", 3, gaddr, gname, test_val if fanout_ok else -1, test_val, stats)
-        for n in range(1, 9):   # restore every preset
-            if orig[n] is not None:
-                write_reg(client, 100 + 10 * n + offset, orig[n], unit)
-                time.sleep(INTER_TXN_S)
+        _restore_presets(client, orig, targets)
 
     # Off via the active preset's coil.
-    write_coil(client, 1003, 0, unit); time.sleep(INTER_TXN_S)
-    _ok, c3, _dt, _n = read_coil(client, 1003, unit)
+    write_coil(client, 1003, 0)
+    _ok, c3, _dt, _n = read_coil(client, 1003)
     _check(c3 == 0, "disable 1003 -> ring off", writer, loop,
            "PRESET", 1, 1003, "Enable Preset 3", c3, 0, stats)
 
 
-def phase_display(client, unit, loop, writer, stats):
+def phase_display(client, loop, writer, stats):
     banner("PHASE 5 - DISPLAY (OLED big number via reg 60 + coil 1010)")
 
-    write_reg(client, 60, 45, unit); time.sleep(INTER_TXN_S)
-    write_coil(client, 1010, 1, unit); time.sleep(INTER_TXN_S)
-    _ok, c, _dt, _n = read_coil(client, 1010, unit)
+    write_reg(client, 60, 45)
+    write_coil(client, 1010, 1)
+    _ok, c, _dt, _n = read_coil(client, 1010)
     _check(c == 1, "coil 1010 on -> OLED should show '45'", writer, loop,
            "DISPLAY", 1, 1010, "Display Enable", c, 1, stats)
     time.sleep(1.5)
 
     # Immediate re-render on a reg-60 write while enabled.
-    write_reg(client, 60, 7, unit)
+    write_reg(client, 60, 7)
     print("  wrote reg 60 = 7 while enabled -> OLED should now show '07'")
     time.sleep(1.2)
 
     # Clamp: >99 must read back (and display) 99.
-    write_reg(client, 60, 1234, unit); time.sleep(0.1)
-    rb = _read_reg_val(client, 60, unit)
+    write_reg(client, 60, 1234); time.sleep(0.1)
+    rb = _read_reg_val(client, 60)
     _check(rb == 99, f"reg 60 = 1234 clamps: readback {rb} (OLED shows '99')", writer, loop,
            "DISPLAY", 3, 60, "Display Number", rb, 99, stats)
     time.sleep(1.2)
 
-    write_coil(client, 1010, 0, unit); time.sleep(INTER_TXN_S)
-    _ok, c, _dt, _n = read_coil(client, 1010, unit)
+    write_coil(client, 1010, 0)
+    _ok, c, _dt, _n = read_coil(client, 1010)
     _check(c == 0, "coil 1010 off -> OLED blank", writer, loop,
            "DISPLAY", 1, 1010, "Display Enable", c, 0, stats)
-    write_reg(client, 60, 0, unit)   # restore the boot value
-    time.sleep(INTER_TXN_S)
+    write_reg(client, 60, 0)   # restore the boot value
 
 
-def phase_led(client, unit, loop, writer, stats):
+def phase_led(client, loop, writer, stats):
     banner("PHASE 6 - LED ACTUATION (visible: blue ring for ~1.5 s)")
-    orig = {a: _read_reg_val(client, a, unit) for a in (110, 111, 112, 113)}
-    _ok, orig_en, _dt, _n = read_coil(client, 1001, unit)
-
-    # Clean enable edge: force off, set colour, then on.
-    write_coil(client, 1001, 0, unit); time.sleep(INTER_TXN_S)
-    write_reg(client, 110, 60, unit);  time.sleep(INTER_TXN_S)   # brightness
-    write_reg(client, 111, 0, unit);   time.sleep(INTER_TXN_S)   # R
-    write_reg(client, 112, 0, unit);   time.sleep(INTER_TXN_S)   # G
-    write_reg(client, 113, 255, unit); time.sleep(INTER_TXN_S)   # B -> blue
-
-    wok, dt, note = write_coil(client, 1001, 1, unit)
-    time.sleep(INTER_TXN_S)
-    rok, rb, dt2, _n2 = read_coil(client, 1001, unit)
+    orig = _read_map_vals(client, [110, 111, 112, 113])
+    _ok, orig_en, _dt, _n = read_coil(client, 1001)
+
+    # Clean enable edge: force off, set colour (one FC16), then on.
+    write_coil(client, 1001, 0)
+    try:
+        client.set_preset(1, rgb=(0, 0, 255), brightness=60)
+    except LgsError as exc:
+        print(f"  [ERR] preset 1 colour: {exc}")
+
+    wok, dt, note = write_coil(client, 1001, 1)
+    rok, rb, dt2, _n2 = read_coil(client, 1001)
     if wok and rok and rb == 1:
         print(f"  coil 1001 -> ON, readback={rb}  [OK]  (ring should be BLUE now)")
         log_row(writer, loop, "LED", 1, 1001, "LED 1 Enable", "on", rb, "ring blue", 1, "OK", dt2)
@@ -683,18 +738,16 @@ def phase_led(client, unit, loop, writer, stats):
 
     time.sleep(1.5)   # keep it visible
 
-    write_coil(client, 1001, 0, unit); time.sleep(INTER_TXN_S)
-    for a, v in orig.items():
-        if v is not None:
-            write_reg(client, a, v, unit); time.sleep(INTER_TXN_S)
+    write_coil(client, 1001, 0)
+    _restore(client, orig)
     if orig_en is not None:
-        write_coil(client, 1001, orig_en, unit); time.sleep(INTER_TXN_S)
+        write_coil(client, 1001, orig_en)
     print("  ring off; LED config restored")
 
 
-def _fire_latch(client, unit, coil, name, loop, writer, stats):
-    t40_before = _read_reg_val(client, 40, unit)
-    wok, dt, note = write_coil(client, coil, 1, unit)
+def _fire_latch(client, coil, name, loop, writer, stats):
+    t40_before = _read_reg_val(client, 40)
+    wok, dt, note = write_coil(client, coil, 1)
     if not wok:
         print(f"  coil {coil} ({name}) write [ERR] {note}")
         log_row(writer, loop, "LATCH", 5, coil, name, "fire", 1, "", "", "ERR", dt, note)
@@ -705,14 +758,14 @@ def _fire_latch(client, unit, coil, name, loop, writer, stats):
     cleared_ms = None
     last = 1
     while time.time() - t0 < 1.5:
-        ok, val, _d, _n = read_coil(client, coil, unit)
+        ok, val, _d, _n = read_coil(client, coil)
         if ok:
             last = val
             if val == 0:
                 cleared_ms = (time.time() - t0) * 1000.0
                 break
         time.sleep(0.02)
-    t40_after = _read_reg_val(client, 40, unit)
+    t40_after = _read_reg_val(client, 40)
     if cleared_ms is not None:
         hint = ("pulsed" if cleared_ms > 150
                 else "accepted; no pulse (sense-aware guard: latch not locked)")
@@ -728,38 +781,38 @@ def _fire_latch(client, unit, coil, name, loop, writer, stats):
         stats.add("FAIL")
 
 
-def phase_latch(client, unit, loop, writer, stats, fires, test_1021, test_force=True,
+def phase_latch(client, loop, writer, stats, fires, test_1021, test_force=True,
                 test_combos=False):
     banner("PHASE 7 - LATCH ACTUATION (PHYSICAL solenoid; safety/force/combos)")
     for n in range(fires):
         print(f"  --- fire {n + 1}/{fires} : coil 1020 (Safety Trigger, sense-aware) ---")
-        _fire_latch(client, unit, 1020, "Safety Trigger", loop, writer, stats)
+        _fire_latch(client, 1020, "Safety Trigger", loop, writer, stats)
         if n < fires - 1 or test_1021 or test_force or test_combos:
             print(f"  cooldown {LATCH_COOLDOWN_S:.1f} s (firmware min interval)...")
             time.sleep(LATCH_COOLDOWN_S)
     if test_force:
         print("  --- coil 1019 (Force Trigger, ignore sense, fixed 500 ms) ---")
-        _fire_latch(client, unit, 1019, "Force Trigger", loop, writer, stats)
+        _fire_latch(client, 1019, "Force Trigger", loop, writer, stats)
         if test_1021 or test_combos:
             print(f"  cooldown {LATCH_COOLDOWN_S:.1f} s (firmware min interval)...")
             time.sleep(LATCH_COOLDOWN_S)
     if test_combos:
         print("  --- coil 1022 (Preset 2 + Latch: ring green + safety pulse) ---")
-        _fire_latch(client, unit, 1022, "Preset 2 + Latch", loop, writer, stats)
+        _fire_latch(client, 1022, "Preset 2 + Latch", loop, writer, stats)
         time.sleep(0.3)
-        _ok, c, _dt, _n = read_coil(client, 1002, unit)
+        _ok, c, _dt, _n = read_coil(client, 1002)
         _check(c == 1, "enable coil 1002 synced after the 1022 request resolved",
                writer, loop, "LATCH", 1, 1002, "Enable Preset 2", c, 1, stats)
-        write_coil(client, 1002, 0, unit)   # ring off
+        write_coil(client, 1002, 0)   # ring off
         print(f"  cooldown {LATCH_COOLDOWN_S:.1f} s (firmware min interval)...")
         time.sleep(LATCH_COOLDOWN_S)
 
         print("  --- coil 1031 (Preset 1 + Latch + Display: red + number + pulse) ---")
-        _fire_latch(client, unit, 1031, "Preset 1 + Latch + Display", loop, writer, stats)
+        _fire_latch(client, 1031, "Preset 1 + Latch + Display", loop, writer, stats)
         time.sleep(0.3)
-        _ok, d, _dt, _n = read_coil(client, 1010, unit)
-        _ok, e, _dt, _n = read_coil(client, 1001, unit)
-        _ok, m, _dt, _n = read_coil(client, 1011, unit)
+        _ok, d, _dt, _n = read_coil(client, 1010)
+        _ok, e, _dt, _n = read_coil(client, 1001)
+        _ok, m, _dt, _n = read_coil(client, 1011)
         _check(d == 1, "display coil 1010 turned on by the 1031 combo",
                writer, loop, "LATCH", 1, 1010, "Display Enable", d, 1, stats)
         _check(e == 1, "enable coil 1001 synced after the 1031 request resolved",
@@ -768,9 +821,9 @@ def phase_latch(client, unit, loop, writer, stats, fires, test_1021, test_force=
                writer, loop, "LATCH", 1, 1011, "Preset 1 + Display", m, 1, stats)
         time.sleep(1.0)
         # A9: ONE write closes everything the combo opened.
-        write_coil(client, 1011, 0, unit); time.sleep(0.3)
-        _ok, e, _dt, _n = read_coil(client, 1001, unit)
-        _ok, d, _dt, _n = read_coil(client, 1010, unit)
+        write_coil(client, 1011, 0); time.sleep(0.3)
+        _ok, e, _dt, _n = read_coil(client, 1001)
+        _ok, d, _dt, _n = read_coil(client, 1010)
         _check(e == 0 and d == 0,
                f"single 1011=0 shut ring AND display (1001={e}, 1010={d})",
                writer, loop, "LATCH", 1, 1011, "Preset 1 + Display", e, 0, stats)
@@ -779,10 +832,10 @@ def phase_latch(client, unit, loop, writer, stats, fires, test_1021, test_force=
             time.sleep(LATCH_COOLDOWN_S)
     if test_1021:
         print("  --- coil 1021 (LED 1 + Latch) ---")
-        _fire_latch(client, unit, 1021, "LED 1 + Latch", loop, writer, stats)
+        _fire_latch(client, 1021, "LED 1 + Latch", loop, writer, stats)
         # 1021 leaves the ring on; turn it back off.
         time.sleep(0.2)
-        write_coil(client, 1001, 0, unit)
+        write_coil(client, 1001, 0)
 
 
 # --------------------------------------------------------------------------- #
@@ -814,6 +867,8 @@ def main():
     ap.add_argument("-y", "--yes", action="store_true", help="skip the latch confirmation prompt")
     ap.add_argument("--csv", default=None, help="CSV log path (default: logs/rtu_sweep_<ts>.csv)")
     ap.add_argument("--timeout", type=float, default=1.0, help="RTU response timeout (s)")
+    ap.add_argument("--capture", metavar="FILE",
+                    help="record the sweep's bus traffic to FILE (tools/lgs_capture.py replays it)")
     ap.add_argument("--list-ports", action="store_true", help="list serial ports and exit")
     args = ap.parse_args()
 
@@ -836,11 +891,13 @@ def main():
             return 2
     print(f"  using slave ID {unit}")
 
-    client = ModbusSerialClient(port=args.port, baudrate=args.baud, bytesize=8,
-                                parity="N", stopbits=1, timeout=args.timeout, retries=1)
-    if not client.connect():
-        print(f"  [ERR] could not open {args.port}")
+    try:
+        bus = SerialTransport(args.port, args.baud, timeout=args.timeout, retries=1,
+                              gap_s=INTER_TXN_S, capture=args.capture)
+    except LgsError as exc:
+        print(f"  [ERR] {exc}")
         return 2
+    client = LgsClient(bus, unit)
 
     # Confirm the physical latch phase before doing anything.
     do_latch = not args.no_latch
@@ -866,34 +923,31 @@ def main():
         for loop in range(1, args.loops + 1):
             if args.loops > 1:
                 banner(f"LOOP {loop}/{args.loops}")
-            phase_read(client, unit, loop, writer, stats)
-            phase_write(client, unit, loop, writer, stats)
+            phase_read(client, loop, writer, stats)
+            phase_write(client, loop, writer, stats)
             if not args.no_validate:
-                phase_validate(client, unit, loop, writer, stats)
+                phase_validate(client, loop, writer, stats)
             if not args.no_led:
-                phase_preset(client, unit, loop, writer, stats)
-                phase_display(client, unit, loop, writer, stats)
-                phase_led(client, unit, loop, writer, stats)
+                phase_preset(client, loop, writer, stats)
+                phase_display(client, loop, writer, stats)
+                phase_led(client, loop, writer, stats)
             if do_latch:
-                phase_latch(client, unit, loop, writer, stats, args.latch_fires,
+                phase_latch(client, loop, writer, stats, args.latch_fires,
                             args.test_1021, test_force=not args.no_force,
                             test_combos=args.test_combos)
     except KeyboardInterrupt:
         print("\n  interrupted - driving latch/LED off before exit...")
-        try:
-            write_coil(client, 1019, 0, unit)
-            write_coil(client, 1020, 0, unit)
-            write_coil(client, 1001, 0, unit)
-            write_coil(client, 1010, 0, unit)
-        except Exception:
-            pass
+        for coil in (1019, 1020, 1001, 1010):
+            write_coil(client, coil, 0)
     finally:
-        client.close()
+        bus.close()
         fh.close()
 
     banner("SUMMARY")
     total = stats.ok + stats.fail + stats.err
-    print(f"  transactions: {total}   OK={stats.ok}   FAIL={stats.fail}   ERR={stats.err}")
+    print(f"  checks: {total}   OK={stats.ok}   FAIL={stats.fail}   ERR={stats.err}")
+    print(f"  bus: {bus.stats.transactions} transactions ({bus.stats.retries} retries), "
+          f"{bus.stats.broadcasts} unanswered, {bus.stats.tx_bytes + bus.stats.rx_bytes} bytes")
     print(f"  CSV log: {csv_path}")
     if stats.fail == 0 and stats.err == 0:
         print("  RESULT: PASS")